@@ -5,7 +5,7 @@ Economic Tracker - Manages economic balance and token costs for LiveBench agents
 import os
 import json
 from datetime import datetime
-from typing import Dict, Optional, List
+from typing import Callable, Dict, Optional, List
 from pathlib import Path
 
 
@@ -28,7 +28,8 @@ class EconomicTracker:
         input_token_price: float = 2.5,  # per 1M tokens
         output_token_price: float = 10.0,  # per 1M tokens
         data_path: Optional[str] = None,
-        min_evaluation_threshold: float = 0.6  # Minimum score to receive payment
+        min_evaluation_threshold: float = 0.6,  # Minimum score to receive payment
+        portfolio_valuer: Optional[Callable[[], float]] = None
     ):
         """
         Initialize Economic Tracker
@@ -40,12 +41,15 @@ class EconomicTracker:
             output_token_price: Price per 1M output tokens
             data_path: Path to store economic data
             min_evaluation_threshold: Minimum evaluation score to receive payment (default 0.6)
+            portfolio_valuer: Optional callable returning the trading portfolio's
+                mark-to-market value (unrealized P&L), added to balance for net worth
         """
         self.signature = signature
         self.initial_balance = initial_balance
         self.input_token_price = input_token_price
         self.output_token_price = output_token_price
         self.min_evaluation_threshold = min_evaluation_threshold
+        self.portfolio_valuer = portfolio_valuer
 
         # Set data paths
         self.data_path = data_path or f"./data/agent_data/{signature}/economic"
@@ -462,6 +466,8 @@ class EconomicTracker:
 
         print(f"💾 Saved daily state for {date}")
         print(f"   Balance: ${self.current_balance:.2f}")
+        if self.portfolio_valuer is not None:
+            print(f"   Net worth: ${self.get_net_worth():.2f}")
         print(f"   Status: {self.get_survival_status()}")
 
     def _save_balance_record(
@@ -474,6 +480,7 @@ class EconomicTracker:
         completed_tasks: Optional[List[str]] = None
     ) -> None:
         """Save balance record to file"""
+        portfolio_value = self.get_portfolio_value()
         record = {
             "date": date,
             "balance": balance,
@@ -483,7 +490,8 @@ class EconomicTracker:
             "total_token_cost": self.total_token_cost,
             "total_work_income": self.total_work_income,
             "total_trading_profit": self.total_trading_profit,
-            "net_worth": balance,  # TODO: Add trading portfolio value
+            "portfolio_value": portfolio_value,
+            "net_worth": balance + portfolio_value,
             "survival_status": self.get_survival_status(),
             "completed_tasks": completed_tasks or [],
             "task_id": self.daily_task_ids[0] if self.daily_task_ids else None,
@@ -505,10 +513,19 @@ class EconomicTracker:
         """Get current balance"""
         return self.current_balance
 
+    def get_portfolio_value(self) -> float:
+        """Get trading portfolio value from the portfolio valuer (0 when none is set)"""
+        if self.portfolio_valuer is None:
+            return 0.0
+        try:
+            return float(self.portfolio_valuer())
+        except Exception as e:
+            print(f"⚠️ Portfolio valuation failed: {e}")
+            return 0.0
+
     def get_net_worth(self) -> float:
         """Get net worth (balance + portfolio value)"""
-        # TODO: Add trading portfolio value calculation
-        return self.current_balance
+        return self.current_balance + self.get_portfolio_value()
 
     def get_survival_status(self) -> str:
         """
@@ -545,10 +562,12 @@ class EconomicTracker:
         Returns:
             Dictionary with all economic metrics
         """
+        portfolio_value = self.get_portfolio_value()
         return {
             "signature": self.signature,
             "balance": self.current_balance,
-            "net_worth": self.get_net_worth(),
+            "portfolio_value": portfolio_value,
+            "net_worth": self.current_balance + portfolio_value,
             "total_token_cost": self.total_token_cost,
             "total_work_income": self.total_work_income,
             "total_trading_profit": self.total_trading_profit,
@@ -126,12 +126,17 @@ class LiveAgent:
         self.openai_base_url = openai_base_url or os.getenv("OPENAI_API_BASE")
 
         # Initialize components
+        # Net worth marks the FYERS account to market when a token and FX rate are configured;
+        # the account book is only created on the first valuation.
+        from livebench.trading.portfolio import fyers_net_worth_valuer
+
         self.economic_tracker = EconomicTracker(
             signature=signature,
             initial_balance=initial_balance,
             input_token_price=input_token_price,
             output_token_price=output_token_price,
-            data_path=os.path.join(self.data_path, "economic")
+            data_path=os.path.join(self.data_path, "economic"),
+            portfolio_valuer=fyers_net_worth_valuer()
         )
 
         # Initialize TaskManager with new parameters
@@ -196,6 +201,11 @@ class LiveAgent:
         self.tools = get_all_tools()
         print(f"✅ Loaded {len(self.tools)} LiveBench tools")
 
+        # Download today's FYERS symbol files in the background, before the first screener run
+        from livebench.trading.symbol_master import warm_symbol_master
+
+        warm_symbol_master()
+
         # Set tool state
         set_tool_state(
             signature=self.signature,
@@ -445,8 +455,12 @@ class LiveAgent:
         for tool in self.tools:
             if hasattr(tool, 'name') and tool.name == tool_name:
                 try:
-                    # LangChain tools can be invoked directly
-                    result = tool.invoke(tool_args)
+                    # Tools with an async variant (e.g. FYERS) are awaited so
+                    # network I/O does not block the event loop
+                    if getattr(tool, "coroutine", None) is not None:
+                        result = await tool.ainvoke(tool_args)
+                    else:
+                        result = tool.invoke(tool_args)
 
                     # Print result to console and terminal log (format for logging to avoid binary data)
                     formatted_result = format_result_for_logging(result)
@@ -470,17 +470,39 @@ async def get_leaderboard():
     return {"agents": agents}
 
 
+def _ensure_project_on_path() -> None:
+    """Run as a script (python livebench/api/server.py) the project root is not on sys.path"""
+    import sys
+    root = str(Path(__file__).resolve().parent.parent.parent)
+    if root not in sys.path:
+        sys.path.insert(0, root)
+
+
+def _screener_changes_file() -> Path:
+    """The screener scheduler's state file, resolved exactly as the scheduler does"""
+    _ensure_project_on_path()
+    from livebench.trading.screener_scheduler import screener_changes_path
+
+    return screener_changes_path()
+
+
 @app.get("/api/fyers/screener/latest")
-async def get_latest_fyers_screener():
-    """Get the most recent FYERS screener output JSON."""
-    if not FYERS_DATA_PATH.exists():
+async def get_latest_fyers_screener(since: Optional[int] = Query(default=None, ge=0)):
+    """Get the most recent FYERS screener output JSON.
+
+    When the screener scheduler is running this is its diff state (current
+    non-WATCH signals plus recent transition events); ``since`` keeps only
+    events after that sequence number.
+    """
+    changes_file = _screener_changes_file()
+    if not FYERS_DATA_PATH.exists() and not changes_file.exists():
         return {"available": False, "message": "No FYERS screener data directory found"}
 
-    screener_files = sorted(
-        FYERS_DATA_PATH.glob("screener_*.json"),
-        key=lambda p: p.stat().st_mtime,
-        reverse=True,
-    )
+    # The scheduler's state file (wherever FYERS_SCREENER_CHANGES_PATH puts it) plus any other screener outputs
+    candidates = {changes_file} if changes_file.exists() else set()
+    if FYERS_DATA_PATH.exists():
+        candidates.update(FYERS_DATA_PATH.glob("screener_*.json"))
+    screener_files = sorted(candidates, key=lambda p: p.stat().st_mtime, reverse=True)
 
     if not screener_files:
         return {"available": False, "message": "No screener runs found"}
@@ -491,6 +513,9 @@ async def get_latest_fyers_screener():
     except json.JSONDecodeError:
         raise HTTPException(status_code=500, detail=f"Invalid JSON in {latest_file.name}")
 
+    if since is not None and payload.get("type") == "screener_changes":
+        payload["events"] = [event for event in payload.get("events", []) if event.get("seq", 0) > since]
+
     return {
         "available": True,
         "file": latest_file.name,
@@ -499,6 +524,21 @@ async def get_latest_fyers_screener():
     }
 
 
+
+@app.get("/api/fyers/triggers")
+async def get_fyers_triggers(since: Optional[int] = Query(default=None, ge=0)):
+    """Get active price triggers and recently fired ones; ``since`` keeps only later events."""
+    triggers_file = Path(os.getenv("FYERS_TRIGGERS_PATH") or FYERS_DATA_PATH / "triggers.json")
+    if not triggers_file.exists():
+        return {"available": False, "message": "No FYERS triggers armed yet"}
+    try:
+        payload = json.loads(triggers_file.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=500, detail=f"Invalid JSON in {triggers_file.name}")
+    if since is not None:
+        payload["events"] = [event for event in payload.get("events", []) if event.get("seq", 0) > since]
+    return {"available": True, "data": payload}
+
 ARTIFACT_EXTENSIONS = {'.pdf', '.docx', '.xlsx', '.pptx'}
 ARTIFACT_MIME_TYPES = {
     '.pdf': 'application/pdf',
@@ -695,10 +735,59 @@ async def watch_agent_files():
         await asyncio.sleep(1)  # Check every second
 
 
+async def watch_fyers_events(state_file: Path, message_type: str):
+    """Broadcast events with a new ``seq`` from a FYERS state file (``{"seq", "events": [...]}``)"""
+    last_mtime = None
+    last_seq = None
+
+    while True:
+        try:
+            if state_file.exists():
+                mtime = state_file.stat().st_mtime
+                if mtime != last_mtime:
+                    last_mtime = mtime
+                    state = json.loads(state_file.read_text(encoding="utf-8"))
+                    events = state.get("events", [])
+                    if last_seq is None:
+                        # Do not replay history to clients on server start
+                        last_seq = state.get("seq", 0)
+                    for event in events:
+                        if event.get("seq", 0) > last_seq:
+                            await manager.broadcast({
+                                "type": message_type,
+                                "data": event
+                            })
+                    last_seq = max([last_seq] + [event.get("seq", 0) for event in events])
+        except Exception as e:
+            print(f"Error watching {state_file.name}: {e}")
+
+        await asyncio.sleep(1)
+
+
+async def watch_fyers_screener_changes():
+    """Broadcast new screener transition events written by the screener scheduler"""
+    await watch_fyers_events(_screener_changes_file(), "fyers_screener_update")
+
+
+async def watch_fyers_triggers():
+    """Broadcast fired stop-loss/target/alert triggers written by the trigger engine"""
+    triggers_file = Path(os.getenv("FYERS_TRIGGERS_PATH") or FYERS_DATA_PATH / "triggers.json")
+    await watch_fyers_events(triggers_file, "fyers_trigger_fired")
+
+
 @app.on_event("startup")
 async def startup_event():
     """Start background tasks on startup"""
     asyncio.create_task(watch_agent_files())
+    asyncio.create_task(watch_fyers_screener_changes())
+    asyncio.create_task(watch_fyers_triggers())
+    _ensure_project_on_path()
+    from livebench.trading.env import env_flag
+
+    if env_flag("FYERS_SCREENER_SCHEDULER", False):
+        from livebench.trading.screener_scheduler import get_screener_scheduler
+
+        get_screener_scheduler(start=True)
 
 
 if __name__ == "__main__":
@@ -6,34 +6,42 @@ Productivity tools: Imported from livebench.tools.productivity
 """
 
 from langchain_core.tools import tool
-from typing import Dict, Any, Union
+from typing import Dict, Any, Optional, Tuple, Union
+import asyncio
 import json
 import os
 from datetime import datetime
 
 from livebench.utils.logger import get_logger
+from livebench.trading.async_fyers_client import AsyncFyersClient
+from livebench.trading.env import env_flag, env_int
 from livebench.trading.fyers_client import FyersClient
-from livebench.trading.screener import run_screener
+from livebench.trading.options import option_chain_summary
+from livebench.trading.order_book import OPEN_ORDER_STATUSES, get_account_book
+from livebench.trading.paper_trading import ORDER_STATUS_PENDING, get_paper_broker
+from livebench.trading.portfolio import get_portfolio_valuer
+from livebench.trading.position_monitor import get_position_monitor
+from livebench.trading.quote_cache import get_quote_cache
+from livebench.trading.ranking import run_ranking
+from livebench.trading.risk import current_risk_state, get_risk_engine, risk_checks_enabled
+from livebench.trading.screener import parse_watchlist, run_screener
+from livebench.trading.screener_scheduler import get_screener_scheduler
+from livebench.trading.symbol_master import get_symbol_master
+from livebench.trading.tick_store import TickStore
+from livebench.trading.triggers import get_trigger_engine, triggers_enabled
 
 
 # Global state (will be set by agent)
 _global_state = {}
 
 
-def _env_flag(name: str, default: bool) -> bool:
-    value = os.getenv(name)
-    if value is None:
-        return default
-    return value.strip().lower() in {"1", "true", "yes", "on"}
-
-
-def _record_fyers_order_attempt(entry: Dict[str, Any]) -> None:
-    """Persist FYERS order attempts for audit/debugging."""
+def _fyers_trading_dir() -> Optional[str]:
+    """Agent-specific directory for FYERS audit logs, or None without a data path."""
     data_path = _global_state.get("data_path")
     signature = _global_state.get("signature")
 
     if not data_path:
-        return
+        return None
 
     # data_path is typically already agent-specific (e.g., .../agent_data/<signature>)
     trading_dir = os.path.join(data_path, "trading")
@@ -41,25 +49,35 @@ def _record_fyers_order_attempt(entry: Dict[str, Any]) -> None:
         trading_dir = os.path.join(data_path, signature, "trading")
 
     os.makedirs(trading_dir, exist_ok=True)
+    return trading_dir
+
+
+def _record_fyers_order_attempt(entry: Dict[str, Any]) -> None:
+    """Persist FYERS order attempts for audit/debugging."""
+    trading_dir = _fyers_trading_dir()
+    if not trading_dir:
+        return
+
     log_file = os.path.join(trading_dir, "fyers_orders.jsonl")
 
     with open(log_file, "a", encoding="utf-8") as f:
         f.write(json.dumps(entry, ensure_ascii=False) + "\n")
 
 
-def _record_fyers_screener_run(entry: Dict[str, Any]) -> None:
-    """Persist FYERS screener runs for audit/debugging."""
-    data_path = _global_state.get("data_path")
-    signature = _global_state.get("signature")
+def _record_fyers_screener_run(entry: Dict[str, Any], quote_rows: Optional[list] = None) -> None:
+    """Persist FYERS screener runs for audit/debugging.
 
-    if not data_path:
+    Quotes go to the binary tick store under trading/ticks/; the JSONL line
+    keeps the summary and the non-WATCH signals.
+    """
+    trading_dir = _fyers_trading_dir()
+    if not trading_dir:
         return
 
-    trading_dir = os.path.join(data_path, "trading")
-    if signature and not os.path.basename(os.path.normpath(data_path)) == signature:
-        trading_dir = os.path.join(data_path, signature, "trading")
+    if quote_rows:
+        store = TickStore(os.path.join(trading_dir, "ticks"))
+        entry["tick_store"] = {"records": store.append_quote_rows(quote_rows), "path": "ticks"}
 
-    os.makedirs(trading_dir, exist_ok=True)
     log_file = os.path.join(trading_dir, "fyers_screener.jsonl")
 
     with open(log_file, "a", encoding="utf-8") as f:
@@ -421,21 +439,94 @@ def fyers_profile() -> Dict[str, Any]:
 def fyers_funds() -> Dict[str, Any]:
     """Fetch FYERS funds and margin details."""
     client = FyersClient()
-    return client.funds()
+    result = client.funds()
+    get_account_book().load_funds(result)
+    return result
 
 
 @tool
 def fyers_holdings() -> Dict[str, Any]:
     """Fetch FYERS holdings."""
     client = FyersClient()
-    return client.holdings()
+    result = client.holdings()
+    get_account_book().load_holdings(result)
+    return result
 
 
 @tool
 def fyers_positions() -> Dict[str, Any]:
     """Fetch FYERS open and day positions."""
     client = FyersClient()
-    return client.positions()
+    result = client.positions()
+    get_account_book().load_positions(result)
+    return result
+
+
+@tool
+def fyers_position_monitor(refresh: bool = False) -> Dict[str, Any]:
+    """
+    Live PnL of open FYERS positions, priced from the streaming feed.
+
+    Args:
+        refresh: Re-fetch positions from FYERS first (default uses the last fetched positions)
+    """
+    monitor = get_position_monitor()
+    if refresh or monitor.refreshed_at is None:
+        refreshed = monitor.refresh(FyersClient())
+        if not refreshed["success"]:
+            return refreshed
+    return monitor.snapshot()
+
+
+def _account_book_unavailable(book: Any) -> Dict[str, Any]:
+    return {"success": False, "error": book.last_error, "message": "Account book has no FYERS data yet"}
+
+
+def _account_book_view(book: Any, view: str, symbol: Optional[str]) -> Dict[str, Any]:
+    views = {
+        "positions": lambda: {"positions": book.positions(symbol)},
+        "exposure": lambda: {"exposure": book.exposure(symbol)},
+        "open_orders": lambda: {"open_orders": book.open_orders(symbol)},
+        "funds": lambda: {"funds": book.funds()},
+        "holdings": lambda: {"holdings": book.holdings()},
+        "valuation": lambda: {"valuation": get_portfolio_valuer().valuation()},
+        "summary": lambda: {
+            "exposure": book.exposure(symbol),
+            "open_positions": len(book.positions(symbol)),
+            "open_orders": len(book.open_orders(symbol)),
+        },
+    }
+    if view not in views:
+        return {"success": False, "error": f"Unknown view '{view}'", "views": sorted(views)}
+    status = book.status()
+    return {
+        "success": True,
+        "view": view,
+        **views[view](),
+        "reconciled_age_seconds": status["reconciled_age_seconds"],
+        "last_divergences": status["last_divergences"],
+    }
+
+
+@tool
+def fyers_account_book(view: str = "summary", symbol: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Answer position, exposure and open-order questions from the in-memory account book.
+
+    The book is updated from order acknowledgements and reconciled with FYERS in the
+    background, so this does not re-fetch full account payloads.
+
+    Args:
+        view: "summary", "positions", "exposure", "open_orders", "funds", "holdings" or "valuation"
+              (mark-to-market value and unrealized PnL of holdings and positions)
+        symbol: Optional FYERS symbol to filter positions, exposure and open orders
+    """
+    book = get_account_book()
+    if book.reconciled_at is None:
+        reconciled = book.reconcile(FyersClient())
+        if "positions" in reconciled["failed"]:
+            return _account_book_unavailable(book)
+    return _account_book_view(book, view, symbol)
 
 
 @tool
@@ -449,17 +540,19 @@ def fyers_quotes(symbols: str) -> Dict[str, Any]:
     if not symbols or not symbols.strip():
         return {"success": False, "error": "symbols is required"}
 
-    client = FyersClient()
-    return client.quotes(symbols=symbols.strip())
+    # Served from the shared short-TTL cache; only stale/missing symbols hit FYERS
+    return get_quote_cache().get_quotes(FyersClient(), parse_watchlist(symbols))
 
 
-@tool
-def fyers_place_order(order_payload: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
-    """
-    Place an order via FYERS /orders endpoint.
+def _paper_audit(paper: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: paper.get(key) for key in ("order_id", "status", "fill_price", "error")}
 
-    Args:
-        order_payload: JSON object (or JSON string) matching FYERS order schema.
+
+def _gate_fyers_order(order_payload: Union[str, Dict[str, Any]]) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+    """Validate an order payload and apply the dry-run safety switches.
+
+    Returns (response, audit_entry). A response means the order must not be
+    sent; otherwise audit_entry carries the parsed payload for a live send.
     """
     if isinstance(order_payload, str):
         try:
@@ -468,16 +561,16 @@ def fyers_place_order(order_payload: Union[str, Dict[str, Any]]) -> Dict[str, An
             return {
                 "success": False,
                 "error": f"order_payload must be valid JSON: {exc}"
-            }
+            }, {}
 
     if not isinstance(order_payload, dict):
         return {
             "success": False,
             "error": "order_payload must be a JSON object"
-        }
+        }, {}
 
-    dry_run = _env_flag("FYERS_DRY_RUN", True)
-    allow_live_orders = _env_flag("FYERS_ALLOW_LIVE_ORDERS", False)
+    dry_run = env_flag("FYERS_DRY_RUN", True)
+    allow_live_orders = env_flag("FYERS_ALLOW_LIVE_ORDERS", False)
 
     audit_entry = {
         "timestamp": datetime.now().isoformat(),
@@ -488,11 +581,27 @@ def fyers_place_order(order_payload: Union[str, Dict[str, Any]]) -> Dict[str, An
         "order_payload": order_payload,
     }
 
+    # Paper orders are risk-checked and filled at the paper broker's own price.
+    broker = get_paper_broker() if (dry_run or not allow_live_orders) and env_flag("FYERS_PAPER_TRADING", True) else None
+    price = broker.price(str(order_payload.get("symbol") or "")) if broker is not None and order_payload.get("symbol") else None
+
+    # Pre-trade risk checks run from memory before anything (paper or live) is placed.
+    if risk_checks_enabled():
+        risk = get_risk_engine().check(order_payload, current_risk_state(), price)
+        audit_entry["risk"] = {key: risk[key] for key in ("allowed", "violations", "warnings", "notional")}
+        if not risk["allowed"]:
+            audit_entry["result"] = "blocked_risk"
+            _record_fyers_order_attempt(audit_entry)
+            return {
+                "success": False,
+                "error": "Order rejected by pre-trade risk checks",
+                "risk": risk,
+                "preview_order_payload": order_payload,
+            }, audit_entry
+
     # Safety-first behavior: default dry-run, and explicit live permission required.
     if dry_run or not allow_live_orders:
-        audit_entry["result"] = "blocked_dry_run"
-        _record_fyers_order_attempt(audit_entry)
-        return {
+        response = {
             "success": True,
             "dry_run": True,
             "order_sent": False,
@@ -504,10 +613,26 @@ def fyers_place_order(order_payload: Union[str, Dict[str, Any]]) -> Dict[str, An
             "preview_order_payload": order_payload,
             "message": "DRY RUN: order not sent to FYERS"
         }
+        if audit_entry.get("risk", {}).get("warnings"):
+            response["risk_warnings"] = audit_entry["risk"]["warnings"]
+        if broker is not None:
+            paper = broker.place(order_payload, price)
+            response["paper_order"] = paper
+            response["message"] += (
+                f"; paper order {paper['status']}" if paper.get("success") else f"; paper order rejected: {paper.get('error')}"
+            )
+            audit_entry["paper"] = _paper_audit(paper)
+        audit_entry["result"] = "blocked_dry_run"
+        _record_fyers_order_attempt(audit_entry)
+        return response, audit_entry
+
+    return None, audit_entry
 
-    client = FyersClient()
-    result = client.place_order(order_payload=order_payload)
 
+def _record_live_fyers_order(audit_entry: Dict[str, Any], result: Dict[str, Any]) -> None:
+    audit_entry["order_id"] = get_account_book().record_ack(audit_entry["order_payload"], result)
+    if audit_entry.get("risk", {}).get("warnings"):
+        result["risk_warnings"] = audit_entry["risk"]["warnings"]
     audit_entry["result"] = "live_sent"
     audit_entry["response"] = {
         "success": result.get("success"),
@@ -515,22 +640,305 @@ def fyers_place_order(order_payload: Union[str, Dict[str, Any]]) -> Dict[str, An
         "error": result.get("error"),
     }
     _record_fyers_order_attempt(audit_entry)
+
+
+def _place_triggered_order(order_payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Order handler for fired triggers: same risk checks, dry-run switches and audit as fyers_place_order."""
+    response, audit_entry = _gate_fyers_order(order_payload)
+    if response is not None:
+        return response
+    result = FyersClient().place_order(order_payload=audit_entry["order_payload"])
+    _record_live_fyers_order(audit_entry, result)
     return result
 
 
+def _trigger_engine():
+    return get_trigger_engine(order_handler=_place_triggered_order)
+
+
+# Fill sources already feeding the trigger engine's entry watches ("paper", "live").
+_ENTRY_FILL_SOURCES: set = set()
+
+
+def _follow_entry_fills(engine: Any, source: str) -> None:
+    """Route paper-broker or account-book order updates to ``engine.entry_update`` (once per source)."""
+    if source in _ENTRY_FILL_SOURCES:
+        return
+    _ENTRY_FILL_SOURCES.add(source)
+    if source == "paper":
+        get_paper_broker().add_listener(
+            lambda order: engine.entry_update(order["id"], order["filledQty"], order["status"] != ORDER_STATUS_PENDING)
+        )
+    else:
+        get_account_book().add_listener(
+            lambda row: engine.entry_update(row["id"], row["filled_qty"], row["status"] not in OPEN_ORDER_STATUSES)
+        )
+
+
+def _arm_order_triggers(audit_entry: Dict[str, Any], result: Dict[str, Any]) -> None:
+    """Watch the stop_loss_level/target_level of a placed order (paper or live) as an OCO pair.
+
+    The pair is armed when the entry fills, for the filled quantity, and is
+    dropped if the entry is cancelled or rejected first.
+    """
+    payload = audit_entry.get("order_payload") or {}
+    if not triggers_enabled() or not env_flag("FYERS_TRIGGER_BRACKETS", True):
+        return
+    if not (payload.get("stop_loss_level") or payload.get("target_level")):
+        return
+    if result.get("dry_run"):
+        paper = result.get("paper_order") or {}
+        order_id = paper.get("order_id") if paper.get("success") else None
+        source, lookup = "paper", get_paper_broker().order
+    else:
+        order_id = audit_entry.get("order_id") if result.get("success") else None
+        source, lookup = "live", get_account_book().order
+    if not order_id:
+        return
+
+    engine = _trigger_engine()
+    _follow_entry_fills(engine, source)
+    engine.watch_entry(order_id, payload)
+    # The entry may already have filled (market orders, or an update that beat the watch).
+    order = lookup(order_id) or {}
+    if source == "paper":
+        filled, done = order.get("filledQty", 0), order.get("status", ORDER_STATUS_PENDING) != ORDER_STATUS_PENDING
+    else:
+        filled, done = order.get("filled_qty", 0), order.get("status", ORDER_STATUS_PENDING) not in OPEN_ORDER_STATUSES
+    armed = engine.entry_update(order_id, filled, done)
+    result["triggers"] = armed
+    result["bracket"] = "armed" if armed else ("awaiting_fill" if not done else "not_armed")
+
+
+def _symbol_search(query: str, limit: int) -> Dict[str, Any]:
+    if not query or not query.strip():
+        return {"success": False, "error": "query is required"}
+    master = get_symbol_master()
+    if not master.available:
+        return {
+            "success": False,
+            "error": "FYERS symbol master is not available yet (downloading in the background)",
+            "status": master.status(),
+        }
+    canonical = master.normalize(query)
+    return {
+        "success": True,
+        "symbol": canonical,
+        "instrument": master.get(canonical) if canonical else None,
+        "matches": master.search(query, limit=max(int(limit), 1)),
+        "master_date": master.meta.get("date"),
+    }
+
+
 @tool
-def fyers_run_screener(watchlist: Union[str, list, None] = None) -> Dict[str, Any]:
+def fyers_symbol_search(query: str, limit: int = 10) -> Dict[str, Any]:
     """
-    Run beginner-friendly watchlist screener and produce dry-run order previews.
+    Look up FYERS symbols locally (no quote call): exact match plus prefix matches,
+    with lot size, tick size, segment and expiry metadata.
 
     Args:
-        watchlist: Optional comma-separated symbols or JSON list.
-                  If omitted, uses FYERS_WATCHLIST from .env.
-                  Example: "NSE:RELIANCE-EQ,NSE:TCS-EQ,NSE:HDFCBANK-EQ"
+        query: Ticker or prefix, e.g. "SBIN", "NSE:SBIN-EQ" or "NSE:NIFTY24DEC"
+        limit: Maximum prefix matches to return
     """
+    return _symbol_search(query, limit)
+
+
+@tool
+def fyers_place_order(order_payload: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Place an order via FYERS /orders endpoint.
+
+    Args:
+        order_payload: JSON object (or JSON string) matching FYERS order schema.
+    """
+    response, audit_entry = _gate_fyers_order(order_payload)
+    if response is not None:
+        _arm_order_triggers(audit_entry, response)
+        return response
+
     client = FyersClient()
-    result = run_screener(client=client, watchlist=watchlist)
+    result = client.place_order(order_payload=audit_entry["order_payload"])
+    _record_live_fyers_order(audit_entry, result)
+    _arm_order_triggers(audit_entry, result)
+    return result
+
+
+_BASKET_ORDER_TYPES = {1, 2, 3, 4}
+
+
+def _validate_basket(orders: Union[str, list]) -> Tuple[Optional[list], Optional[Dict[str, Any]]]:
+    """Parse a basket and check every order's required fields; any invalid order rejects the basket."""
+    if isinstance(orders, str):
+        try:
+            orders = json.loads(orders)
+        except json.JSONDecodeError as exc:
+            return None, {"success": False, "error": f"orders must be valid JSON: {exc}"}
+    if not isinstance(orders, list) or not orders:
+        return None, {"success": False, "error": "orders must be a non-empty JSON list of order objects"}
+    max_orders = env_int("FYERS_BASKET_MAX_ORDERS", 50)
+    if len(orders) > max_orders:
+        return None, {"success": False, "error": f"Basket has {len(orders)} orders (max {max_orders})"}
+
+    invalid = []
+    for index, order in enumerate(orders):
+        if not isinstance(order, dict):
+            invalid.append({"index": index, "error": "order must be a JSON object"})
+            continue
+        try:
+            qty, side, order_type = int(order.get("qty")), int(order.get("side")), int(order.get("type"))
+        except (TypeError, ValueError):
+            invalid.append({"index": index, "symbol": order.get("symbol"), "error": "qty, side and type must be integers"})
+            continue
+        if not order.get("symbol") or qty <= 0 or side not in (1, -1) or order_type not in _BASKET_ORDER_TYPES:
+            invalid.append(
+                {"index": index, "symbol": order.get("symbol"), "error": "symbol is required, qty must be positive, side 1/-1 and type 1-4"}
+            )
+    if invalid:
+        return None, {"success": False, "error": f"{len(invalid)} invalid order(s); nothing was placed", "invalid_orders": invalid}
+    return orders, None
+
+
+def _basket_response(results: list, audit_entry: Dict[str, Any], **extra: Any) -> Dict[str, Any]:
+    accepted = sum(1 for result in results if result.get("success"))
+    return {
+        "success": accepted == len(results),
+        "dry_run": audit_entry["dry_run"] or not audit_entry["allow_live_orders"],
+        "order_count": len(results),
+        "accepted": accepted,
+        "rejected": len(results) - accepted,
+        **extra,
+        "results": [{"index": index, "symbol": order.get("symbol"), **result} for index, (order, result) in enumerate(zip(audit_entry["orders"], results))],
+    }
+
+
+def _gate_fyers_basket(orders: Union[str, list]) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any], list]:
+    """Validate, risk-check and (in dry run) paper-fill a basket.
+
+    Returns (response, audit_entry, results). A response means nothing is
+    sent live; otherwise the orders whose result is still None go to FYERS.
+    """
+    orders, error = _validate_basket(orders)
+    if error is not None:
+        return error, {}, []
+
+    dry_run = env_flag("FYERS_DRY_RUN", True)
+    allow_live_orders = env_flag("FYERS_ALLOW_LIVE_ORDERS", False)
+    audit_entry = {
+        "timestamp": datetime.now().isoformat(),
+        "signature": _global_state.get("signature"),
+        "date": _global_state.get("current_date"),
+        "dry_run": dry_run,
+        "allow_live_orders": allow_live_orders,
+        "basket": True,
+        "orders": orders,
+    }
+    results: list = [None] * len(orders)
+    broker = get_paper_broker() if (dry_run or not allow_live_orders) and env_flag("FYERS_PAPER_TRADING", True) else None
+    prices = [broker.price(str(order.get("symbol") or "")) if order.get("symbol") else None for order in orders] if broker is not None else None
+
+    if risk_checks_enabled():
+        risk = get_risk_engine().check_batch(orders, current_risk_state(), prices)
+        for index, (allowed, violations) in enumerate(zip(risk["allowed"].tolist(), risk["violations"])):
+            if not allowed:
+                results[index] = {
+                    "success": False,
+                    "error": "Order rejected by pre-trade risk checks",
+                    "risk": {"allowed": False, "violations": violations},
+                }
+        audit_entry["risk"] = {
+            "blocked": risk["blocked"],
+            "violations": {index: violations for index, violations in enumerate(risk["violations"]) if violations},
+            "warnings": {index: warnings for index, warnings in enumerate(risk["warnings"]) if warnings},
+        }
+
+    if all(result is not None for result in results):
+        audit_entry["result"] = "blocked_risk"
+        _record_fyers_order_attempt(audit_entry)
+        return _basket_response(results, audit_entry, message="All basket orders rejected by pre-trade risk checks"), audit_entry, results
+
+    if dry_run or not allow_live_orders:
+        paper_audit = {}
+        for index, order in enumerate(orders):
+            if results[index] is not None:
+                continue
+            results[index] = {"success": True, "dry_run": True, "order_sent": False}
+            if broker is not None:
+                paper = broker.place(order, prices[index])
+                results[index]["paper_order"] = paper
+                paper_audit[index] = _paper_audit(paper)
+        if paper_audit:
+            audit_entry["paper"] = paper_audit
+        audit_entry["result"] = "blocked_dry_run"
+        _record_fyers_order_attempt(audit_entry)
+        return _basket_response(
+            results,
+            audit_entry,
+            message="DRY RUN: basket not sent to FYERS" + ("; orders simulated by the paper broker" if broker is not None else ""),
+            required_to_go_live={"FYERS_DRY_RUN": "false", "FYERS_ALLOW_LIVE_ORDERS": "true"},
+        ), audit_entry, results
+
+    return None, audit_entry, results
+
+
+def _record_live_fyers_basket(audit_entry: Dict[str, Any], results: list, sendable: list, basket: Dict[str, Any]) -> Dict[str, Any]:
+    book = get_account_book()
+    for index, result in zip(sendable, basket["results"]):
+        results[index] = result
+        book.record_ack(audit_entry["orders"][index], result)
+    audit_entry["result"] = "live_sent"
+    audit_entry["mode"] = basket["mode"]
+    audit_entry["response"] = [
+        {"success": result.get("success"), "status_code": result.get("status_code"), "error": result.get("error")}
+        for result in results
+    ]
+    _record_fyers_order_attempt(audit_entry)
+    return _basket_response(results, audit_entry, mode=basket["mode"], elapsed_ms=basket["elapsed_ms"])
+
+
+@tool
+def fyers_place_basket(orders: Union[str, list]) -> Dict[str, Any]:
+    """
+    Place several orders in one call (e.g. the screener's BUY_CANDIDATE order_previews).
+
+    Every order is validated and risk-checked first; an invalid order rejects the whole
+    basket. Live baskets use the FYERS multi-order endpoint (10 orders per request) or
+    concurrent single orders. Same dry-run safety switches as fyers_place_order.
+
+    Args:
+        orders: JSON list (or JSON string) of FYERS order objects
+    """
+    response, audit_entry, results = _gate_fyers_basket(orders)
+    if response is not None:
+        return response
+
+    sendable = [index for index, result in enumerate(results) if result is None]
+    basket = FyersClient().place_basket([audit_entry["orders"][index] for index in sendable])
+    return _record_live_fyers_basket(audit_entry, results, sendable, basket)
+
 
+@tool
+def fyers_paper_account(include_orders: bool = False) -> Dict[str, Any]:
+    """
+    Paper-trading account behind dry-run orders: cash, positions and PnL.
+
+    Args:
+        include_orders: Also list open (resting) paper orders
+    """
+    return get_paper_broker().snapshot(include_orders=include_orders)
+
+
+@tool
+def fyers_paper_cancel_order(order_id: str) -> Dict[str, Any]:
+    """
+    Cancel an open paper order placed while FYERS_DRY_RUN is on.
+
+    Args:
+        order_id: Paper order id returned in paper_order.order_id
+    """
+    return get_paper_broker().cancel(order_id)
+
+
+def _record_screener_result(watchlist: Union[str, list, None], result: Dict[str, Any]) -> None:
     audit_entry = {
         "timestamp": datetime.now().isoformat(),
         "signature": _global_state.get("signature"),
@@ -539,12 +947,290 @@ def fyers_run_screener(watchlist: Union[str, list, None] = None) -> Dict[str, An
         "success": result.get("success"),
         "summary": result.get("summary"),
         "message": result.get("message"),
-        "results": result.get("results"),
+        "signals": [
+            {key: row.get(key) for key in ("symbol", "signal", "reason", "last_price", "change_pct", "order_preview")}
+            for row in result.get("results") or []
+            if row.get("signal") != "WATCH"
+        ],
+    }
+    _record_fyers_screener_run(audit_entry, result.get("results"))
+
+
+@tool
+def fyers_run_screener(watchlist: Union[str, list, None] = None) -> Dict[str, Any]:
+    """
+    Run beginner-friendly watchlist screener and produce dry-run order previews.
+
+    Args:
+        watchlist: Optional comma-separated symbols or JSON list.
+                  If omitted, uses FYERS_WATCHLIST from .env.
+                  Example: "NSE:RELIANCE-EQ,NSE:TCS-EQ,NSE:HDFCBANK-EQ"
+    """
+    client = FyersClient()
+    result = run_screener(client=client, watchlist=watchlist)
+    _record_screener_result(watchlist, result)
+    return result
+
+
+def _screener_changes(refresh: bool) -> Dict[str, Any]:
+    scheduler = get_screener_scheduler(start=True)
+    if refresh or scheduler.last_run_at is None:
+        ran = scheduler.run_once()
+        if not ran["success"]:
+            return ran
+    return {"success": True, **scheduler.pending_changes(), "scheduler": scheduler.status()}
+
+
+@tool
+def fyers_screener_changes(refresh: bool = False) -> Dict[str, Any]:
+    """
+    Screener signal transitions (e.g. WATCH -> BUY_CANDIDATE) since you last asked.
+
+    A background scheduler reruns the screener on FYERS_WATCHLIST during market hours;
+    this returns only the symbols whose signal changed, with order previews for new
+    BUY_CANDIDATEs. Prefer it over fyers_run_screener for monitoring.
+
+    Args:
+        refresh: Run the screener now instead of waiting for the next scheduled run
+    """
+    return _screener_changes(refresh)
+
+
+@tool
+def fyers_rank_universe(watchlist: Union[str, list, None] = None, top_k: int = 20) -> Dict[str, Any]:
+    """
+    Rank the whole watchlist against itself and return the top symbols by sector.
+
+    Scores momentum (change %), volume surge (volume vs average daily volume) and
+    volatility-adjusted return as percentiles across the universe. Use it to pick
+    relative leaders; fyers_run_screener applies absolute thresholds instead.
+
+    Args:
+        watchlist: Optional comma-separated symbols or JSON list (default FYERS_WATCHLIST)
+        top_k: Number of top-ranked symbols to return
+    """
+    return run_ranking(FyersClient(), watchlist, top_k)
+
+
+@tool
+def fyers_option_chain(symbol: str, expiry: Optional[str] = None, strikes: int = 10, around: int = 5) -> Dict[str, Any]:
+    """
+    Fetch an option chain and summarize implied volatility and Greeks.
+
+    Returns ATM IV, 25-delta skew, put/call OI ratio, max pain, the largest call
+    and put OI strikes, and per-strike IV/delta/gamma/theta/vega for both legs
+    around the money. Chains are cached for a few seconds per expiry.
+
+    Args:
+        symbol: Underlying symbol (e.g. 'NSE:NIFTY50-INDEX', 'NSE:SBIN-EQ')
+        expiry: Optional expiry date (YYYY-MM-DD) or index into the listed expiries (0 = nearest)
+        strikes: Strikes on each side of the money to fetch
+        around: Strikes on each side of the money to include in the result
+    """
+    return option_chain_summary(FyersClient(), symbol, expiry, strikes, around)
+
+
+def _add_trigger(
+    symbol: str,
+    level: float,
+    direction: str,
+    order_payload: Union[str, Dict[str, Any], None],
+    note: Optional[str],
+) -> Dict[str, Any]:
+    if isinstance(order_payload, str):
+        try:
+            order_payload = json.loads(order_payload)
+        except json.JSONDecodeError as exc:
+            return {"success": False, "error": f"order_payload must be valid JSON: {exc}"}
+    if not triggers_enabled():
+        return {"success": False, "error": "Price triggers are disabled (FYERS_TRIGGERS=false)"}
+    return _trigger_engine().add(symbol, level, direction, order=order_payload or None, note=note)
+
+
+@tool
+def fyers_add_trigger(
+    symbol: str,
+    level: float,
+    direction: str = "auto",
+    order_payload: Union[str, Dict[str, Any], None] = None,
+    note: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Arm a price trigger that fires on the streaming feed when the price crosses a level.
+
+    Orders placed with stop_loss_level/target_level are watched automatically as an
+    OCO pair once they fill; use this for extra alerts or your own exit orders.
+
+    Args:
+        symbol: FYERS symbol, e.g. "NSE:SBIN-EQ"
+        level: Trigger price
+        direction: "above", "below" or "auto" (side of the last traded price)
+        order_payload: Optional FYERS order placed (with the usual safety switches) when it fires
+        note: Optional reminder returned with the fired event
+    """
+    return _add_trigger(symbol, level, direction, order_payload, note)
+
+
+def _list_triggers(symbol: Optional[str], cancel_id: Optional[str], since: int) -> Dict[str, Any]:
+    engine = _trigger_engine()
+    cancelled = engine.cancel(cancel_id) if cancel_id else None
+    result = {
+        "success": True,
+        "active": engine.active(symbol),
+        "fired": [event for event in engine.events_since(since) if symbol is None or event["symbol"] == symbol],
+        "status": engine.status(),
     }
-    _record_fyers_screener_run(audit_entry)
+    if cancelled is not None:
+        result["cancelled"] = cancelled
+        result["success"] = cancelled["success"]
+    return result
+
+
+@tool
+def fyers_triggers(symbol: Optional[str] = None, cancel_id: Optional[str] = None, since: int = 0) -> Dict[str, Any]:
+    """
+    Active price triggers (stops, targets, alerts) and recently fired ones with their order results.
+
+    Args:
+        symbol: Optional FYERS symbol to filter by
+        cancel_id: Trigger id to cancel first (an OCO sibling stays armed)
+        since: Only return fired events with a higher seq
+    """
+    return _list_triggers(symbol, cancel_id, since)
+
+
+# Async variants used by LiveAgent._execute_tool (via tool.ainvoke) so FYERS
+# round-trips do not block the agent's event loop.
+async def _afyers_profile() -> Dict[str, Any]:
+    return await AsyncFyersClient().profile()
+
+
+async def _afyers_funds() -> Dict[str, Any]:
+    result = await AsyncFyersClient().funds()
+    get_account_book().load_funds(result)
+    return result
+
+
+async def _afyers_holdings() -> Dict[str, Any]:
+    result = await AsyncFyersClient().holdings()
+    get_account_book().load_holdings(result)
     return result
 
 
+async def _afyers_positions() -> Dict[str, Any]:
+    result = await AsyncFyersClient().positions()
+    get_account_book().load_positions(result)
+    return result
+
+
+async def _afyers_position_monitor(refresh: bool = False) -> Dict[str, Any]:
+    monitor = get_position_monitor()
+    if refresh or monitor.refreshed_at is None:
+        refreshed = monitor.load_positions(await AsyncFyersClient().positions())
+        if not refreshed["success"]:
+            return refreshed
+    return monitor.snapshot()
+
+
+async def _afyers_account_book(view: str = "summary", symbol: Optional[str] = None) -> Dict[str, Any]:
+    book = get_account_book()
+    if book.reconciled_at is None:
+        # The first read reconciles over four REST calls; keep them off the loop.
+        reconciled = await asyncio.to_thread(book.reconcile, FyersClient())
+        if "positions" in reconciled["failed"]:
+            return _account_book_unavailable(book)
+    return _account_book_view(book, view, symbol)
+
+
+async def _afyers_quotes(symbols: str) -> Dict[str, Any]:
+    if not symbols or not symbols.strip():
+        return {"success": False, "error": "symbols is required"}
+    # The cache coalesces across threads, so concurrent callers share fetches
+    return await asyncio.to_thread(get_quote_cache().get_quotes, FyersClient(), parse_watchlist(symbols))
+
+
+async def _afyers_symbol_search(query: str, limit: int = 10) -> Dict[str, Any]:
+    # The first lookup after a download builds the ticker index over the whole table.
+    return await asyncio.to_thread(_symbol_search, query, limit)
+
+
+async def _afyers_place_order(order_payload: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+    # A dry-run paper fill may fall back to a REST quote; keep it off the loop.
+    response, audit_entry = await asyncio.to_thread(_gate_fyers_order, order_payload)
+    if response is not None:
+        _arm_order_triggers(audit_entry, response)
+        return response
+
+    result = await AsyncFyersClient().place_order(order_payload=audit_entry["order_payload"])
+    _record_live_fyers_order(audit_entry, result)
+    _arm_order_triggers(audit_entry, result)
+    return result
+
+
+async def _afyers_place_basket(orders: Union[str, list]) -> Dict[str, Any]:
+    response, audit_entry, results = await asyncio.to_thread(_gate_fyers_basket, orders)
+    if response is not None:
+        return response
+
+    sendable = [index for index, result in enumerate(results) if result is None]
+    basket = await AsyncFyersClient().place_basket([audit_entry["orders"][index] for index in sendable])
+    return _record_live_fyers_basket(audit_entry, results, sendable, basket)
+
+
+async def _afyers_screener_changes(refresh: bool = False) -> Dict[str, Any]:
+    return await asyncio.to_thread(_screener_changes, refresh)
+
+
+async def _afyers_add_trigger(
+    symbol: str,
+    level: float,
+    direction: str = "auto",
+    order_payload: Union[str, Dict[str, Any], None] = None,
+    note: Optional[str] = None,
+) -> Dict[str, Any]:
+    # The first use re-arms persisted triggers from disk.
+    return await asyncio.to_thread(_add_trigger, symbol, level, direction, order_payload, note)
+
+
+async def _afyers_triggers(symbol: Optional[str] = None, cancel_id: Optional[str] = None, since: int = 0) -> Dict[str, Any]:
+    return await asyncio.to_thread(_list_triggers, symbol, cancel_id, since)
+
+
+async def _afyers_rank_universe(watchlist: Union[str, list, None] = None, top_k: int = 20) -> Dict[str, Any]:
+    # First ranking of the day reads each symbol's daily candles from disk.
+    return await asyncio.to_thread(run_ranking, FyersClient(), watchlist, top_k)
+
+
+async def _afyers_option_chain(symbol: str, expiry: Optional[str] = None, strikes: int = 10, around: int = 5) -> Dict[str, Any]:
+    # Fetches are coalesced by the chain cache's per-key locks; the IV solve is CPU-bound.
+    return await asyncio.to_thread(option_chain_summary, FyersClient(), symbol, expiry, strikes, around)
+
+
+async def _afyers_run_screener(watchlist: Union[str, list, None] = None) -> Dict[str, Any]:
+    # The screener fans quote chunks out on its own thread pool; run it off-loop.
+    result = await asyncio.to_thread(run_screener, FyersClient(), watchlist)
+    _record_screener_result(watchlist, result)
+    return result
+
+
+fyers_profile.coroutine = _afyers_profile
+fyers_funds.coroutine = _afyers_funds
+fyers_holdings.coroutine = _afyers_holdings
+fyers_positions.coroutine = _afyers_positions
+fyers_position_monitor.coroutine = _afyers_position_monitor
+fyers_account_book.coroutine = _afyers_account_book
+fyers_quotes.coroutine = _afyers_quotes
+fyers_symbol_search.coroutine = _afyers_symbol_search
+fyers_place_order.coroutine = _afyers_place_order
+fyers_place_basket.coroutine = _afyers_place_basket
+fyers_run_screener.coroutine = _afyers_run_screener
+fyers_screener_changes.coroutine = _afyers_screener_changes
+fyers_rank_universe.coroutine = _afyers_rank_universe
+fyers_option_chain.coroutine = _afyers_option_chain
+fyers_add_trigger.coroutine = _afyers_add_trigger
+fyers_triggers.coroutine = _afyers_triggers
+
+
 # Import productivity tools from separate modules (if available)
 try:
     from livebench.tools.productivity import (
@@ -714,7 +1400,9 @@ def get_all_tools():
 
     Returns:
     - 4 core tools (decide_activity, submit_work, learn, get_status)
-    - 7 FYERS tools (profile, funds, holdings, positions, quotes, place_order, run_screener)
+    - 18 FYERS tools (profile, funds, holdings, positions, position_monitor, account_book, quotes, symbol_search,
+      place_order, place_basket, paper_account, paper_cancel_order, run_screener, screener_changes, rank_universe,
+      option_chain, add_trigger, triggers)
     - 6 productivity tools (search_web, read_webpage, create_file, execute_code_sandbox, read_file, create_video) if available
     """
     core_tools = [
@@ -727,9 +1415,20 @@ def get_all_tools():
         fyers_funds,
         fyers_holdings,
         fyers_positions,
+        fyers_position_monitor,
+        fyers_account_book,
         fyers_quotes,
+        fyers_symbol_search,
         fyers_place_order,
+        fyers_place_basket,
+        fyers_paper_account,
+        fyers_paper_cancel_order,
         fyers_run_screener,
+        fyers_screener_changes,
+        fyers_rank_universe,
+        fyers_option_chain,
+        fyers_add_trigger,
+        fyers_triggers,
     ]
 
     if PRODUCTIVITY_TOOLS_AVAILABLE:
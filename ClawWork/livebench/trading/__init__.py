@@ -1,4 +1,36 @@
+from .async_fyers_client import AsyncFyersClient
 from .fyers_client import FyersClient
+from .market_feed import LastPriceTable, MarketFeed, get_last_price_table
+from .order_book import AccountBook, get_account_book
+from .paper_trading import PaperBroker, get_paper_broker
+from .position_monitor import PositionMonitor, get_position_monitor
+from .quote_batcher import fetch_quotes_batched
+from .quote_cache import QuoteCache, get_quote_cache
+from .rate_limiter import FyersRateLimiter, get_rate_limiter
+from .risk import RiskEngine, RiskLimits, get_risk_engine
 from .screener import run_screener, parse_watchlist, load_screener_config
 
-__all__ = ["FyersClient", "run_screener", "parse_watchlist", "load_screener_config"]
+__all__ = [
+    "AsyncFyersClient",
+    "FyersClient",
+    "LastPriceTable",
+    "MarketFeed",
+    "get_last_price_table",
+    "AccountBook",
+    "get_account_book",
+    "PaperBroker",
+    "get_paper_broker",
+    "PositionMonitor",
+    "get_position_monitor",
+    "fetch_quotes_batched",
+    "QuoteCache",
+    "get_quote_cache",
+    "FyersRateLimiter",
+    "get_rate_limiter",
+    "RiskEngine",
+    "RiskLimits",
+    "get_risk_engine",
+    "run_screener",
+    "parse_watchlist",
+    "load_screener_config",
+]
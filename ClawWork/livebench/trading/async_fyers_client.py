@@ -0,0 +1,209 @@
+"""Asyncio-native FYERS REST client built on httpx.AsyncClient."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from .env import env_flag, env_int
+from .fyers_client import MULTI_ORDER_MAX, MULTI_ORDER_PATH, FyersClientBase
+from .rate_limiter import classify_endpoint, get_rate_limiter
+
+# httpx.AsyncClient is bound to the event loop that created it, so the shared
+# pool is kept per running loop, then per (api_base_url, access_token).
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, str], httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+_ASYNC_CLIENTS_LOCK = threading.Lock()
+
+
+def _build_async_http_client() -> httpx.AsyncClient:
+    pool_size = max(env_int("FYERS_POOL_SIZE", 10), 1)
+    keep_alive = env_flag("FYERS_KEEP_ALIVE", True)
+    limits = httpx.Limits(
+        max_connections=pool_size,
+        max_keepalive_connections=pool_size if keep_alive else 0,
+    )
+    # httpx transport retries cover connection failures only, so POSTs are never replayed.
+    transport = httpx.AsyncHTTPTransport(limits=limits, retries=max(env_int("FYERS_POOL_MAX_RETRIES", 2), 0))
+    return httpx.AsyncClient(transport=transport, trust_env=False)
+
+
+def get_shared_async_http_client(api_base_url: str, access_token: Optional[str] = None) -> httpx.AsyncClient:
+    """Return the pooled httpx client for the running loop and base URL/token pair."""
+    loop = asyncio.get_running_loop()
+    key = (api_base_url.rstrip("/"), (access_token or "").strip())
+    with _ASYNC_CLIENTS_LOCK:
+        clients = _ASYNC_CLIENTS.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None or client.is_closed:
+            client = _build_async_http_client()
+            clients[key] = client
+        return client
+
+
+async def close_shared_async_http_clients() -> None:
+    """Close the pooled httpx clients owned by the running loop."""
+    loop = asyncio.get_running_loop()
+    with _ASYNC_CLIENTS_LOCK:
+        clients = list(_ASYNC_CLIENTS.pop(loop, {}).values())
+    for client in clients:
+        await client.aclose()
+
+
+class AsyncFyersClient(FyersClientBase):
+    """Async counterpart of FyersClient with the same endpoint surface."""
+
+    def __init__(
+        self,
+        access_token: Optional[str] = None,
+        api_base_url: Optional[str] = None,
+        timeout_seconds: Optional[float] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        super().__init__(access_token=access_token, api_base_url=api_base_url, timeout_seconds=timeout_seconds)
+        self._http_client = http_client
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        return self._http_client or get_shared_async_http_client(self.api_base_url, self.access_token)
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        payload: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        if not self.access_token:
+            return self._missing_token_result()
+
+        url = self._url(path)
+        limiter = get_rate_limiter()
+        category = classify_endpoint(method, path)
+        waited = 0.0
+        if not limiter.try_acquire(category):
+            # Only block a worker thread when the limiter actually has to wait
+            waited = await asyncio.to_thread(limiter.acquire, category)
+        try:
+            response = await self.http_client.request(
+                method=method.upper(),
+                url=url,
+                headers=self._headers(),
+                json=payload,
+                params=params,
+                timeout=self.timeout_seconds,
+            )
+        except httpx.HTTPError as exc:
+            return {
+                "success": False,
+                "error": f"Request failed: {exc}",
+                "url": url,
+            }
+
+        body: Any
+        try:
+            body = response.json()
+        except ValueError:
+            body = {"raw": response.text}
+
+        result = self._build_result(response.status_code, body, url)
+        if waited > 0:
+            result["rate_limit_wait_ms"] = round(waited * 1000.0, 3)
+        return result
+
+    async def profile(self) -> Dict[str, Any]:
+        return await self._request("GET", "/profile")
+
+    async def funds(self) -> Dict[str, Any]:
+        return await self._request("GET", "/funds")
+
+    async def holdings(self) -> Dict[str, Any]:
+        return await self._request("GET", "/holdings")
+
+    async def positions(self) -> Dict[str, Any]:
+        return await self._request("GET", "/positions")
+
+    async def orders(self) -> Dict[str, Any]:
+        return await self._request("GET", "/orders")
+
+    async def quotes(self, symbols: str) -> Dict[str, Any]:
+        attempts = self._quote_attempts(symbols)
+
+        learned = self._learned_quote_attempt(attempts)
+        if learned:
+            method, path, payload, params = learned
+            result = await self._request(method, path, payload=payload, params=params)
+            result = self._record_learned_quote_result(f"{method} {path}", result)
+            if result is not None:
+                return result
+
+        errors: List[Dict[str, Any]] = []
+        for method, path, payload, params in attempts:
+            result = await self._request(method, path, payload=payload, params=params)
+            if self._record_quote_probe(f"{method} {path}", result, errors):
+                return result
+
+        return self._quote_discovery_failed(errors)
+
+    async def history(self, symbol: str, resolution: str, range_from: int, range_to: int) -> Dict[str, Any]:
+        params = self._history_params(symbol, resolution, range_from, range_to)
+        return await self._request("GET", f"{self.api_root_url}/data/history", params=params)
+
+    async def option_chain(self, symbol: str, strike_count: int = 10, expiry: Optional[int] = None) -> Dict[str, Any]:
+        params = self._option_chain_params(symbol, strike_count, expiry)
+        return await self._request("GET", f"{self.api_root_url}/data/options-chain-v3", params=params)
+
+    async def place_order(self, order_payload: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._request("POST", "/orders", payload=order_payload)
+
+    async def place_basket(self, orders: List[Dict[str, Any]], max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """Async counterpart of ``FyersClient.place_basket``; multi-order chunks are sent concurrently."""
+        started = time.perf_counter()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(orders)
+        pending = list(range(len(orders)))
+        if self._multi_order_usable() and orders:
+            chunks = [list(range(offset, min(offset + MULTI_ORDER_MAX, len(orders)))) for offset in range(0, len(orders), MULTI_ORDER_MAX)]
+            # Probe the route with the first chunk before fanning out the rest.
+            first = await self._request("POST", MULTI_ORDER_PATH, payload=[orders[i] for i in chunks[0]])
+            splits = [self._split_multi_order_result(first, len(chunks[0]))]
+            if splits[0] is not None:
+                pending = []
+                responses = await asyncio.gather(
+                    *(self._request("POST", MULTI_ORDER_PATH, payload=[orders[i] for i in chunk]) for chunk in chunks[1:])
+                )
+                splits += [self._split_multi_order_result(response, len(chunk)) for chunk, response in zip(chunks[1:], responses)]
+                for chunk, split in zip(chunks, splits):
+                    if split is None:
+                        pending.extend(chunk)
+                        continue
+                    for index, result in zip(chunk, split):
+                        results[index] = result
+
+        if pending:
+            semaphore = asyncio.Semaphore(self._basket_workers(max_workers))
+
+            async def place(index: int) -> Dict[str, Any]:
+                async with semaphore:
+                    return await self.place_order(orders[index])
+
+            for index, result in zip(pending, await asyncio.gather(*(place(i) for i in pending))):
+                results[index] = result
+
+        mode = "concurrent" if len(pending) == len(orders) else "multi_order" if not pending else "mixed"
+        return self._basket_result(results, mode, started)
+
+    async def account_snapshot(self) -> Dict[str, Any]:
+        """Fetch funds, holdings and positions concurrently."""
+        funds, holdings, positions = await asyncio.gather(self.funds(), self.holdings(), self.positions())
+        return {
+            "success": all(item.get("success") for item in (funds, holdings, positions)),
+            "funds": funds,
+            "holdings": holdings,
+            "positions": positions,
+        }
@@ -0,0 +1,307 @@
+"""Vectorized backtest of the screener rules over cached candles.
+
+Each bar of each symbol is treated like a screener run at that bar's close:
+``change_pct`` is measured against the previous session's close (what FYERS
+reports as ``chp``), the ``evaluate_symbols`` thresholds decide BUY_CANDIDATE,
+the entry fills at the bar close and is sized exactly like
+``_build_order_preview``. The trade then exits on a later bar at the stop
+(checked first, filled at the open on gaps), at the target, or at the close
+of the last holding bar. Everything runs as array operations over a
+symbols x bars panel; only the holding period is looped.
+
+Trades are independent: capital is not shared between simultaneous
+positions, matching how the screener sizes every candidate on its own.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .candle_store import CandleStore, TimeLike
+from .columnar_screener import indicator_rule_masks, preview_sizing
+from .screener import ScreenerConfig
+
+IST_OFFSET_SECONDS = 5 * 3600 + 30 * 60
+
+EXIT_STOP = 0
+EXIT_TARGET = 1
+EXIT_TIME = 2
+EXIT_NAMES = ("stop", "target", "time")
+
+
+@dataclass
+class CandlePanel:
+    """OHLCV for many symbols on a shared time axis; missing bars are NaN."""
+
+    symbols: List[str]
+    ts: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @property
+    def shape(self) -> tuple:
+        return self.close.shape
+
+
+def panel_from_series(series: Dict[str, Dict[str, np.ndarray]]) -> CandlePanel:
+    """Align per-symbol candle arrays (``CandleStore.load`` output) on the union of timestamps."""
+    symbols = list(series)
+    ts_all = [np.asarray(series[symbol]["ts"], dtype=np.int64) for symbol in symbols]
+    ts = np.unique(np.concatenate(ts_all)) if ts_all else np.empty(0, dtype=np.int64)
+
+    fields = {name: np.full((len(symbols), len(ts)), np.nan) for name in ("open", "high", "low", "close", "volume")}
+    for row, symbol in enumerate(symbols):
+        cols = np.searchsorted(ts, ts_all[row])
+        for name, grid in fields.items():
+            grid[row, cols] = series[symbol][name]
+    return CandlePanel(symbols=symbols, ts=ts, **fields)
+
+
+def load_panel(
+    symbols: Iterable[str],
+    resolution: str,
+    start: Optional[TimeLike] = None,
+    end: Optional[TimeLike] = None,
+    store: Optional[CandleStore] = None,
+) -> CandlePanel:
+    """Build a panel from the local candle cache (no network access)."""
+    store = store or CandleStore()
+    return panel_from_series({symbol: store.load(symbol, resolution, start, end) for symbol in symbols})
+
+
+def _forward_fill(values: np.ndarray) -> np.ndarray:
+    cols = np.arange(values.shape[1])
+    last_valid = np.maximum.accumulate(np.where(np.isfinite(values), cols, -1), axis=1)
+    filled = values[np.arange(values.shape[0])[:, None], np.maximum(last_valid, 0)]
+    filled[last_valid < 0] = np.nan
+    return filled
+
+
+def session_change_pct(panel: CandlePanel) -> tuple:
+    """Percent change of every bar close vs the previous session close, plus session start columns.
+
+    For daily bars the previous session is simply the previous bar.
+    """
+    n_symbols, n_bars = panel.shape
+    day = (panel.ts + IST_OFFSET_SECONDS) // 86400
+    new_session = np.ones(n_bars, dtype=bool)
+    new_session[1:] = day[1:] != day[:-1]
+    session_start = np.maximum.accumulate(np.where(new_session, np.arange(n_bars), 0))
+
+    prev_session_col = session_start - 1
+    reference = np.full((n_symbols, n_bars), np.nan)
+    has_prev = prev_session_col >= 0
+    if n_bars:
+        reference[:, has_prev] = _forward_fill(panel.close)[:, prev_session_col[has_prev]]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        change_pct = (panel.close - reference) / reference * 100.0
+    change_pct[~(reference > 0)] = np.nan
+    return change_pct, session_start
+
+
+class Backtester:
+    """Runs one or more ``ScreenerConfig`` values over a panel, reusing the shared precomputation."""
+
+    def __init__(self, panel: CandlePanel, hold_bars: int = 1, cost_bps: float = 0.0, first_signal_per_session: bool = True) -> None:
+        self.panel = panel
+        self.hold_bars = max(int(hold_bars), 1)
+        self.cost_bps = cost_bps
+        self.first_signal_per_session = first_signal_per_session
+        self.change_pct, self.session_start = session_change_pct(panel)
+        with np.errstate(invalid="ignore"):
+            self.tradable = np.isfinite(self.change_pct) & (panel.close > 0)
+        # An entry on the final bar has nothing to exit into.
+        if self.tradable.shape[1]:
+            self.tradable[:, -1] = False
+        self._indicators: Optional[Dict[str, np.ndarray]] = None
+
+    @property
+    def indicators(self) -> Dict[str, np.ndarray]:
+        """Batch indicators over the panel bars, computed on first use.
+
+        Gaps are forward-filled and bars before a symbol's first candle take
+        its first close, so one missing bar does not blank the rest of the row.
+        """
+        if self._indicators is None:
+            from . import indicators as ind
+
+            panel = self.panel
+
+            def filled(values: np.ndarray) -> np.ndarray:
+                values = _forward_fill(values)
+                return _forward_fill(values[:, ::-1])[:, ::-1] if values.shape[1] else values
+
+            close = filled(panel.close)
+            high = np.where(np.isfinite(panel.high), panel.high, close)
+            low = np.where(np.isfinite(panel.low), panel.low, close)
+            day = (panel.ts + IST_OFFSET_SECONDS) // 86400
+            windows = ind.StreamingIndicators(capacity=1)  # env-configured windows, shared with live runs
+            self._indicators = {
+                "sma": ind.sma(close, windows.sma_window),
+                "ema": ind.ema(close, windows.ema_span),
+                "rsi": ind.rsi(close, windows.rsi_period),
+                "atr": ind.atr(high, low, close, windows.atr_period),
+                "vwap": ind.vwap(high, low, close, panel.volume, session=day),
+                "volatility": ind.volatility(close, windows.volatility_window),
+            }
+        return self._indicators
+
+    def signals(self, config: ScreenerConfig) -> np.ndarray:
+        """Boolean symbols x bars mask of BUY_CANDIDATE entries."""
+        change_pct = self.change_pct
+        with np.errstate(invalid="ignore"):
+            buy = (
+                self.tradable
+                & (change_pct > config.avoid_drawdown_pct)
+                & (change_pct >= config.buy_min_pct)
+                & (change_pct <= config.buy_max_pct)
+            )
+        if config.indicator_rules_active():
+            for failed, *_ in indicator_rule_masks(self.panel.close, self.indicators, config):
+                buy &= ~failed
+        if self.first_signal_per_session and buy.shape[1]:
+            running = np.cumsum(buy, axis=1, dtype=np.int32)
+            before_session = np.where(self.session_start > 0, running[:, np.maximum(self.session_start - 1, 0)], 0)
+            buy &= (running - before_session) == 1
+        return buy
+
+    def trades(self, config: ScreenerConfig) -> Dict[str, np.ndarray]:
+        """Entry/exit arrays for every simulated trade under ``config``."""
+        panel = self.panel
+        sym_idx, bar_idx = np.nonzero(self.signals(config))
+        entry = panel.close[sym_idx, bar_idx]
+        quantity, stop_level, target_level = preview_sizing(entry, config)
+        stop_level = np.round(stop_level, 2)
+        target_level = np.round(target_level, 2)
+
+        n_bars = panel.shape[1]
+        exit_price = np.full(entry.shape, np.nan)
+        exit_bar = np.full(entry.shape, -1, dtype=np.int64)
+        exit_kind = np.full(entry.shape, EXIT_TIME, dtype=np.int8)
+        last_close = np.full(entry.shape, np.nan)
+        last_bar = np.full(entry.shape, -1, dtype=np.int64)
+        is_open = np.ones(entry.shape, dtype=bool)
+
+        for step in range(1, self.hold_bars + 1):
+            bar = bar_idx + step
+            in_range = bar < n_bars
+            bar = np.minimum(bar, n_bars - 1)
+            bar_open = panel.open[sym_idx, bar]
+            bar_high = panel.high[sym_idx, bar]
+            bar_low = panel.low[sym_idx, bar]
+            bar_close = panel.close[sym_idx, bar]
+            live = is_open & in_range & np.isfinite(bar_close)
+
+            with np.errstate(invalid="ignore"):
+                stop_hit = live & (bar_low <= stop_level)
+                target_hit = live & ~stop_hit & (bar_high >= target_level)
+                stop_fill = np.where(bar_open <= stop_level, bar_open, stop_level)
+                target_fill = np.where(bar_open >= target_level, bar_open, target_level)
+
+            exit_price[stop_hit] = stop_fill[stop_hit]
+            exit_kind[stop_hit] = EXIT_STOP
+            exit_price[target_hit] = target_fill[target_hit]
+            exit_kind[target_hit] = EXIT_TARGET
+            exit_bar[stop_hit | target_hit] = bar[stop_hit | target_hit]
+            is_open &= ~(stop_hit | target_hit)
+
+            still_open = live & is_open
+            last_close[still_open] = bar_close[still_open]
+            last_bar[still_open] = bar[still_open]
+
+        timed_out = is_open & (last_bar >= 0)
+        exit_price[timed_out] = last_close[timed_out]
+        exit_bar[timed_out] = last_bar[timed_out]
+
+        # Trades with no later bar at all (data ends) are dropped.
+        filled = exit_bar >= 0
+        quantity = quantity[filled]
+        entry = entry[filled]
+        exit_price = exit_price[filled]
+        costs = (entry + exit_price) * quantity * (self.cost_bps / 10_000.0)
+        return {
+            "symbol_index": sym_idx[filled],
+            "entry_bar": bar_idx[filled],
+            "exit_bar": exit_bar[filled],
+            "entry_price": entry,
+            "exit_price": exit_price,
+            "quantity": quantity,
+            "exit_kind": exit_kind[filled],
+            "pnl": (exit_price - entry) * quantity - costs,
+        }
+
+    def run(self, config: ScreenerConfig, include_trades: bool = False) -> Dict[str, Any]:
+        """Backtest one configuration and summarize PnL, hit rate and drawdown."""
+        started = time.perf_counter()
+        trades = self.trades(config)
+        pnl = trades["pnl"]
+        n_trades = int(pnl.size)
+
+        equity = np.cumsum(np.bincount(trades["exit_bar"], weights=pnl, minlength=self.panel.shape[1]))
+        peak = np.maximum.accumulate(np.maximum(equity, 0.0)) if equity.size else equity
+        max_drawdown = float(np.max(peak - equity)) if equity.size else 0.0
+
+        notional = trades["entry_price"] * trades["quantity"]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            returns_pct = np.where(notional > 0, pnl / notional * 100.0, 0.0)
+        exit_counts = np.bincount(trades["exit_kind"], minlength=len(EXIT_NAMES))
+
+        summary: Dict[str, Any] = {
+            "config": config.__dict__.copy(),
+            "trades": n_trades,
+            "wins": int(np.count_nonzero(pnl > 0)),
+            "hit_rate": round(float(np.mean(pnl > 0)), 4) if n_trades else None,
+            "total_pnl": round(float(pnl.sum()), 2),
+            "avg_pnl": round(float(pnl.mean()), 4) if n_trades else None,
+            "avg_return_pct": round(float(returns_pct.mean()), 4) if n_trades else None,
+            "max_drawdown": round(max_drawdown, 2),
+            "exits": {name: int(exit_counts[code]) for code, name in enumerate(EXIT_NAMES)},
+            "symbol_bars": int(self.panel.close.size),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 3),
+        }
+        if include_trades:
+            summary["trade_log"] = [
+                {
+                    "symbol": self.panel.symbols[int(sym)],
+                    "entry_ts": int(self.panel.ts[int(entry_bar)]),
+                    "exit_ts": int(self.panel.ts[int(exit_bar)]),
+                    "entry_price": float(entry_price),
+                    "exit_price": float(exit_price),
+                    "qty": int(qty),
+                    "exit": EXIT_NAMES[int(kind)],
+                    "pnl": round(float(trade_pnl), 2),
+                }
+                for sym, entry_bar, exit_bar, entry_price, exit_price, qty, kind, trade_pnl in zip(
+                    trades["symbol_index"],
+                    trades["entry_bar"],
+                    trades["exit_bar"],
+                    trades["entry_price"],
+                    trades["exit_price"],
+                    trades["quantity"],
+                    trades["exit_kind"],
+                    pnl,
+                )
+            ]
+        return summary
+
+    def run_many(self, configs: Sequence[ScreenerConfig]) -> List[Dict[str, Any]]:
+        return [self.run(config) for config in configs]
+
+
+def run_backtest(
+    panel: CandlePanel,
+    config: Optional[ScreenerConfig] = None,
+    hold_bars: int = 1,
+    cost_bps: float = 0.0,
+    include_trades: bool = False,
+) -> Dict[str, Any]:
+    """Convenience wrapper for a single configuration."""
+    return Backtester(panel, hold_bars=hold_bars, cost_bps=cost_bps).run(config or ScreenerConfig(), include_trades)
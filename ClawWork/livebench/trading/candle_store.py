@@ -0,0 +1,271 @@
+"""On-disk OHLCV candle cache for FYERS history, stored as Parquet.
+
+Layout under ``livebench/data/fyers/candles/`` (override with FYERS_CANDLE_DIR)::
+
+    <resolution>/<symbol>.parquet        ts, open, high, low, close, volume
+    <resolution>/<symbol>.coverage.json  time ranges already synced
+
+Coverage is tracked separately from the rows so holidays and other ranges
+without candles are not fetched again. Syncs only request the ranges that
+are not covered yet; loads read only the requested columns and time range.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+CANDLE_COLUMNS = ("ts", "open", "high", "low", "close", "volume")
+DEFAULT_CANDLE_DIR = Path(__file__).resolve().parents[1] / "data" / "fyers" / "candles"
+
+# FYERS candle timestamps and date ranges are in exchange time (IST).
+IST = timezone(timedelta(hours=5, minutes=30))
+
+TimeLike = Union[int, float, str, date, datetime]
+Interval = Tuple[int, int]
+
+
+def to_epoch(value: TimeLike, end_of_day: bool = False) -> int:
+    """Convert epoch seconds, ``YYYY-MM-DD`` strings, dates or datetimes to epoch seconds.
+
+    Bare dates are interpreted in IST; ``end_of_day`` maps them to 23:59:59.
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, datetime):
+        moment = value if value.tzinfo else value.replace(tzinfo=IST)
+        return int(moment.timestamp())
+    if isinstance(value, date):
+        value = value.isoformat()
+    text = str(value).strip()
+    if text.isdigit():
+        return int(text)
+    if len(text) == 10:
+        moment = datetime.strptime(text, "%Y-%m-%d").replace(tzinfo=IST)
+        if end_of_day:
+            moment += timedelta(days=1, seconds=-1)
+        return int(moment.timestamp())
+    moment = datetime.fromisoformat(text)
+    return int((moment if moment.tzinfo else moment.replace(tzinfo=IST)).timestamp())
+
+
+def resolution_seconds(resolution: str) -> int:
+    """Length of one bar for a FYERS resolution string (``"5"``, ``"15S"``, ``"D"``...)."""
+    res = str(resolution).strip().upper()
+    if res in {"D", "1D"}:
+        return 86400
+    if res == "W":
+        return 7 * 86400
+    if res == "M":
+        return 30 * 86400
+    if res.endswith("S"):
+        return int(res[:-1] or 1)
+    return int(res) * 60
+
+
+def max_request_span(resolution: str) -> int:
+    """Largest range FYERS serves in one history request for this resolution."""
+    res = str(resolution).strip().upper()
+    if res in {"D", "1D", "W", "M"}:
+        return 366 * 86400
+    if res.endswith("S"):
+        return 30 * 86400
+    return 100 * 86400
+
+
+def _merge_intervals(intervals: Iterable[Sequence[int]]) -> List[Interval]:
+    merged: List[Interval] = []
+    for start, end in sorted((int(a), int(b)) for a, b in intervals if int(b) >= int(a)):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_intervals(covered: Sequence[Interval], start: int, end: int) -> List[Interval]:
+    """Sub-ranges of [start, end] not present in ``covered`` (which must be merged)."""
+    gaps: List[Interval] = []
+    cursor = start
+    for cov_start, cov_end in covered:
+        if cov_end < cursor:
+            continue
+        if cov_start > end:
+            break
+        if cov_start > cursor:
+            gaps.append((cursor, min(cov_start - 1, end)))
+        cursor = max(cursor, cov_end + 1)
+        if cursor > end:
+            break
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def _safe_name(symbol: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", symbol)
+
+
+class CandleStore:
+    """Incrementally synced, column-selective Parquet cache of FYERS candles."""
+
+    def __init__(self, root: Optional[Union[str, Path]] = None) -> None:
+        self.root = Path(root or os.getenv("FYERS_CANDLE_DIR") or DEFAULT_CANDLE_DIR)
+
+    def _paths(self, symbol: str, resolution: str) -> Tuple[Path, Path]:
+        directory = self.root / _safe_name(str(resolution).upper())
+        name = _safe_name(symbol)
+        return directory / f"{name}.parquet", directory / f"{name}.coverage.json"
+
+    def coverage(self, symbol: str, resolution: str) -> List[Interval]:
+        _, coverage_path = self._paths(symbol, resolution)
+        if not coverage_path.exists():
+            return []
+        try:
+            stored = json.loads(coverage_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return []
+        return _merge_intervals(stored.get("intervals", []))
+
+    def sync(
+        self,
+        client: Any,
+        symbol: str,
+        resolution: str,
+        start: TimeLike,
+        end: TimeLike,
+    ) -> Dict[str, Any]:
+        """Fetch only the parts of [start, end] not synced yet and merge them into the cache."""
+        range_from = to_epoch(start)
+        range_to = to_epoch(end, end_of_day=True)
+        # Never mark the still-forming latest bar as covered; it is refetched next sync.
+        coverable_to = min(range_to, int(time.time()) - resolution_seconds(resolution))
+
+        covered = self.coverage(symbol, resolution)
+        gaps = missing_intervals(covered, range_from, range_to)
+        span = max_request_span(resolution)
+
+        new_candles: List[List[float]] = []
+        newly_covered: List[Interval] = []
+        errors: List[Dict[str, Any]] = []
+        requests_made = 0
+
+        for gap_start, gap_end in gaps:
+            chunk_start = gap_start
+            while chunk_start <= gap_end:
+                chunk_end = min(chunk_start + span - 1, gap_end)
+                requests_made += 1
+                response = client.history(symbol, resolution, chunk_start, chunk_end)
+                if not response.get("success"):
+                    errors.append(
+                        {"range": [chunk_start, chunk_end], "status_code": response.get("status_code"), "error": response.get("error")}
+                    )
+                else:
+                    payload = response.get("data", {})
+                    candles = payload.get("candles", []) if isinstance(payload, dict) else []
+                    new_candles.extend(c for c in candles if isinstance(c, list) and len(c) >= 6)
+                    if chunk_start <= coverable_to:
+                        newly_covered.append((chunk_start, min(chunk_end, coverable_to)))
+                chunk_start = chunk_end + 1
+
+        rows_added = self._merge_rows(symbol, resolution, new_candles) if new_candles else 0
+        if newly_covered:
+            self._write_coverage(symbol, resolution, _merge_intervals(covered + newly_covered))
+
+        return {
+            "success": not errors,
+            "symbol": symbol,
+            "resolution": resolution,
+            "requests": requests_made,
+            "missing_ranges": len(gaps),
+            "rows_received": len(new_candles),
+            "rows_added": rows_added,
+            "errors": errors,
+        }
+
+    def sync_many(
+        self,
+        client: Any,
+        symbols: Iterable[str],
+        resolution: str,
+        start: TimeLike,
+        end: TimeLike,
+    ) -> Dict[str, Any]:
+        results = {symbol: self.sync(client, symbol, resolution, start, end) for symbol in symbols}
+        return {
+            "success": all(item["success"] for item in results.values()),
+            "requests": sum(item["requests"] for item in results.values()),
+            "rows_added": sum(item["rows_added"] for item in results.values()),
+            "symbols": results,
+        }
+
+    def load(
+        self,
+        symbol: str,
+        resolution: str,
+        start: Optional[TimeLike] = None,
+        end: Optional[TimeLike] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Read cached candles as NumPy arrays, limited to ``columns`` and the time range."""
+        data_path, _ = self._paths(symbol, resolution)
+        wanted = list(columns or CANDLE_COLUMNS)
+        if not data_path.exists():
+            return {name: np.empty(0, dtype=np.int64 if name == "ts" else np.float64) for name in wanted}
+
+        filters = []
+        if start is not None:
+            filters.append(("ts", ">=", to_epoch(start)))
+        if end is not None:
+            filters.append(("ts", "<=", to_epoch(end, end_of_day=True)))
+        table = pq.read_table(data_path, columns=wanted, filters=filters or None)
+        return {name: table.column(name).to_numpy() for name in wanted}
+
+    def _merge_rows(self, symbol: str, resolution: str, candles: List[List[float]]) -> int:
+        data_path, _ = self._paths(symbol, resolution)
+        fresh = np.asarray([c[:6] for c in candles], dtype=np.float64)
+        incoming = {
+            "ts": fresh[:, 0].astype(np.int64),
+            "open": fresh[:, 1],
+            "high": fresh[:, 2],
+            "low": fresh[:, 3],
+            "close": fresh[:, 4],
+            "volume": fresh[:, 5],
+        }
+
+        existing_rows = 0
+        if data_path.exists():
+            existing = pq.read_table(data_path)
+            existing_rows = existing.num_rows
+            # New rows first so np.unique keeps them over older copies of the same bar.
+            merged = {name: np.concatenate([incoming[name], existing.column(name).to_numpy()]) for name in CANDLE_COLUMNS}
+        else:
+            merged = incoming
+
+        _, keep = np.unique(merged["ts"], return_index=True)
+        table = pa.table({name: merged[name][keep] for name in CANDLE_COLUMNS})
+
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = data_path.with_suffix(".parquet.tmp")
+        pq.write_table(table, tmp_path, compression="zstd")
+        tmp_path.replace(data_path)
+        return table.num_rows - existing_rows
+
+    def _write_coverage(self, symbol: str, resolution: str, intervals: List[Interval]) -> None:
+        _, coverage_path = self._paths(symbol, resolution)
+        coverage_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = coverage_path.with_suffix(".tmp")
+        tmp_path.write_text(
+            json.dumps({"symbol": symbol, "resolution": resolution, "intervals": intervals, "synced_at": int(time.time())}),
+            encoding="utf-8",
+        )
+        tmp_path.replace(coverage_path)
@@ -0,0 +1,276 @@
+"""Columnar (NumPy) screener path.
+
+Quotes are decoded once into float arrays, classification and order-preview
+sizing run as array operations, and result dicts (with their reason strings)
+are only built for the rows a caller asks for. Output is identical to
+``screener.evaluate_symbols``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .screener import ScreenerConfig, iter_quote_values
+from .symbol_master import round_order_preview
+
+SIGNAL_WATCH = 0
+SIGNAL_BUY = 1
+SIGNAL_AVOID = 2
+SIGNAL_NAMES = ("WATCH", "BUY_CANDIDATE", "AVOID")
+
+REASON_NO_DATA = 0
+REASON_NO_CHANGE = 1
+REASON_WEAK = 2
+REASON_BUY_ZONE = 3
+REASON_EXTENDED = 4
+REASON_BELOW = 5
+REASON_INDICATOR = 6
+
+
+@dataclass
+class QuoteColumns:
+    """Quote fields as parallel arrays; ``has_*`` masks mark values that were not None."""
+
+    symbols: List[Any]
+    last_price: np.ndarray
+    prev_close: np.ndarray
+    change_pct: np.ndarray
+    volume: np.ndarray
+    has_last_price: np.ndarray
+    has_prev_close: np.ndarray
+    has_change_pct: np.ndarray
+    has_volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+
+@dataclass
+class ColumnarEvaluation:
+    signal: np.ndarray
+    reason: np.ndarray
+    quantity: np.ndarray
+    stop_loss_raw: np.ndarray
+    target_raw: np.ndarray
+    indicators: Optional[Dict[str, np.ndarray]] = None
+    notes: Optional[Dict[int, str]] = None
+
+    def indices(self, signal_code: int) -> np.ndarray:
+        return np.flatnonzero(self.signal == signal_code)
+
+    def counts(self) -> Dict[str, int]:
+        totals = np.bincount(self.signal, minlength=len(SIGNAL_NAMES))
+        return {name: int(totals[code]) for code, name in enumerate(SIGNAL_NAMES)}
+
+
+def _column(values: List[Optional[float]]) -> tuple:
+    # dtype=float turns None into NaN; the mask keeps real NaNs distinguishable.
+    return np.array(values, dtype=np.float64), np.array([value is not None for value in values], dtype=bool)
+
+
+def columns_from_values(values: Iterable[Sequence[Any]]) -> QuoteColumns:
+    """Build columns from (symbol, last_price, prev_close, change_pct, volume) tuples."""
+    symbols: List[Any] = []
+    last_price: List[Optional[float]] = []
+    prev_close: List[Optional[float]] = []
+    change_pct: List[Optional[float]] = []
+    volume: List[Optional[float]] = []
+    for symbol, lp, pc, chp, vol in values:
+        symbols.append(symbol)
+        last_price.append(lp)
+        prev_close.append(pc)
+        change_pct.append(chp)
+        volume.append(vol)
+
+    lp_arr, has_lp = _column(last_price)
+    pc_arr, has_pc = _column(prev_close)
+    chp_arr, has_chp = _column(change_pct)
+    vol_arr, has_vol = _column(volume)
+    return QuoteColumns(symbols, lp_arr, pc_arr, chp_arr, vol_arr, has_lp, has_pc, has_chp, has_vol)
+
+
+def decode_quote_columns(quote_response: Dict[str, Any]) -> QuoteColumns:
+    """Decode a FYERS quotes response straight into columns."""
+    return columns_from_values(iter_quote_values(quote_response))
+
+
+def columns_from_rows(rows: List[Dict[str, Any]]) -> QuoteColumns:
+    """Build columns from ``normalize_quote_rows`` output."""
+    return columns_from_values(
+        (row.get("symbol"), row.get("last_price"), row.get("prev_close"), row.get("change_pct"), row.get("volume"))
+        for row in rows
+    )
+
+
+def preview_sizing(last_price: np.ndarray, config: ScreenerConfig) -> tuple:
+    """Vectorized ``_build_order_preview`` sizing: (quantity, raw stop level, raw target level).
+
+    Stop and target are left unrounded; callers apply Python's ``round(x, 2)``
+    per returned row so values match the scalar path exactly.
+    """
+    risk_amount = max(config.default_capital * (config.risk_pct / 100.0), 1.0)
+    with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+        stop_distance = np.maximum(last_price * (config.stop_loss_pct / 100.0), 0.01)
+        raw_quantity = risk_amount / stop_distance
+        quantity = np.maximum(np.where(np.isfinite(raw_quantity), raw_quantity, 1).astype(np.int64), 1)
+        stop_loss = last_price * (1 - config.stop_loss_pct / 100.0)
+        target = last_price * (1 + config.target_pct / 100.0)
+    return quantity, stop_loss, target
+
+
+def evaluate_columns(columns: QuoteColumns, config: ScreenerConfig) -> ColumnarEvaluation:
+    """Classify every row as BUY_CANDIDATE / WATCH / AVOID with array operations."""
+    has_symbol = np.array([bool(symbol) for symbol in columns.symbols], dtype=bool)
+    last_price = columns.last_price
+    change_pct = columns.change_pct
+
+    with np.errstate(invalid="ignore"):
+        no_data = ~has_symbol | ~columns.has_last_price | (last_price <= 0)
+        no_change = ~no_data & ~columns.has_change_pct
+        rated = ~no_data & ~no_change
+        weak = rated & (change_pct <= config.avoid_drawdown_pct)
+        buy = rated & ~weak & (change_pct >= config.buy_min_pct) & (change_pct <= config.buy_max_pct)
+        extended = rated & ~weak & ~buy & (change_pct > config.buy_max_pct)
+
+    reason = np.full(len(columns), REASON_BELOW, dtype=np.int8)
+    reason[extended] = REASON_EXTENDED
+    reason[buy] = REASON_BUY_ZONE
+    reason[weak] = REASON_WEAK
+    reason[no_change] = REASON_NO_CHANGE
+    reason[no_data] = REASON_NO_DATA
+
+    signal = np.full(len(columns), SIGNAL_WATCH, dtype=np.int8)
+    signal[buy] = SIGNAL_BUY
+    signal[weak] = SIGNAL_AVOID
+
+    quantity, stop_loss, target = preview_sizing(last_price, config)
+    return ColumnarEvaluation(signal=signal, reason=reason, quantity=quantity, stop_loss_raw=stop_loss, target_raw=target)
+
+
+def indicator_rule_masks(
+    last_price: np.ndarray, indicators: Dict[str, np.ndarray], config: ScreenerConfig
+) -> List[tuple]:
+    """(failed mask, label, values, comparison) for every active indicator rule.
+
+    Missing indicator values (NaN) fail the rule.
+    """
+    rules = []
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if config.rsi_min is not None:
+            rules.append((~(indicators["rsi"] >= config.rsi_min), "RSI", indicators["rsi"], f"< {config.rsi_min:.2f}"))
+        if config.rsi_max is not None:
+            rules.append((~(indicators["rsi"] <= config.rsi_max), "RSI", indicators["rsi"], f"> {config.rsi_max:.2f}"))
+        if config.max_volatility_pct is not None:
+            volatility = indicators["volatility"]
+            rules.append((~(volatility <= config.max_volatility_pct), "Volatility %", volatility, f"> {config.max_volatility_pct:.2f}"))
+        if config.min_pct_above_sma is not None:
+            gap = (last_price - indicators["sma"]) / indicators["sma"] * 100.0
+            rules.append((~(gap >= config.min_pct_above_sma), "% above SMA", gap, f"< {config.min_pct_above_sma:.2f}"))
+        if config.min_pct_above_ema is not None:
+            gap = (last_price - indicators["ema"]) / indicators["ema"] * 100.0
+            rules.append((~(gap >= config.min_pct_above_ema), "% above EMA", gap, f"< {config.min_pct_above_ema:.2f}"))
+    return rules
+
+
+def apply_indicator_rules(
+    columns: QuoteColumns,
+    evaluation: ColumnarEvaluation,
+    indicators: Dict[str, np.ndarray],
+    config: ScreenerConfig,
+) -> ColumnarEvaluation:
+    """Downgrade BUY candidates that fail an indicator rule to WATCH (first failing rule is reported)."""
+    evaluation.indicators = indicators
+    notes: Dict[int, str] = {}
+    for failed, label, values, comparison in indicator_rule_masks(columns.last_price, indicators, config):
+        for i in np.flatnonzero(failed & (evaluation.signal == SIGNAL_BUY)).tolist():
+            value = float(values[i])
+            notes[i] = (
+                f"Indicator filter: {label} unavailable"
+                if value != value
+                else f"Indicator filter: {label} {value:.2f} {comparison}"
+            )
+            evaluation.signal[i] = SIGNAL_WATCH
+            evaluation.reason[i] = REASON_INDICATOR
+    evaluation.notes = notes
+    return evaluation
+
+
+def _reason_text(code: int, change_pct: float, config: ScreenerConfig) -> str:
+    if code == REASON_NO_DATA:
+        return "Insufficient quote data"
+    if code == REASON_NO_CHANGE:
+        return "Change % unavailable"
+    if code == REASON_WEAK:
+        return f"Weak momentum ({change_pct:.2f}% <= {config.avoid_drawdown_pct:.2f}%)"
+    if code == REASON_BUY_ZONE:
+        return (
+            f"Momentum in buy zone ({change_pct:.2f}% between "
+            f"{config.buy_min_pct:.2f}% and {config.buy_max_pct:.2f}%)"
+        )
+    if code == REASON_EXTENDED:
+        return f"Extended move ({change_pct:.2f}% > {config.buy_max_pct:.2f}%)"
+    return f"Below momentum threshold ({change_pct:.2f}% < {config.buy_min_pct:.2f}%)"
+
+
+def materialize_results(
+    columns: QuoteColumns,
+    evaluation: ColumnarEvaluation,
+    config: ScreenerConfig,
+    indices: Optional[Iterable[int]] = None,
+) -> List[Dict[str, Any]]:
+    """Build ``evaluate_symbols``-shaped dicts for the selected rows (all rows by default)."""
+    selected = range(len(columns)) if indices is None else [int(i) for i in indices]
+
+    last_price = columns.last_price.tolist()
+    prev_close = columns.prev_close.tolist()
+    change_pct = columns.change_pct.tolist()
+    volume = columns.volume.tolist()
+    has_last_price = columns.has_last_price.tolist()
+    has_prev_close = columns.has_prev_close.tolist()
+    has_change_pct = columns.has_change_pct.tolist()
+    has_volume = columns.has_volume.tolist()
+    signal = evaluation.signal.tolist()
+    reason = evaluation.reason.tolist()
+    notes = evaluation.notes or {}
+    indicators = {name: values.tolist() for name, values in evaluation.indicators.items()} if evaluation.indicators else None
+
+    results: List[Dict[str, Any]] = []
+    for i in selected:
+        symbol = columns.symbols[i]
+        chp = change_pct[i] if has_change_pct[i] else None
+        order_preview = None
+        if signal[i] == SIGNAL_BUY:
+            order_preview = round_order_preview({
+                "symbol": symbol,
+                "qty": int(evaluation.quantity[i]),
+                "type": 2,
+                "side": 1,
+                "productType": "INTRADAY",
+                "limitPrice": 0,
+                "stopPrice": 0,
+                "validity": "DAY",
+                "disclosedQty": 0,
+                "offlineOrder": False,
+                "stop_loss_level": round(float(evaluation.stop_loss_raw[i]), 2),
+                "target_level": round(float(evaluation.target_raw[i]), 2),
+                "orderTag": "dryrun_screener",
+            })
+        row = {
+            "symbol": symbol,
+            "last_price": last_price[i] if has_last_price[i] else None,
+            "prev_close": prev_close[i] if has_prev_close[i] else None,
+            "change_pct": chp,
+            "volume": volume[i] if has_volume[i] else None,
+            "signal": SIGNAL_NAMES[signal[i]],
+            "reason": notes[i] if i in notes else _reason_text(reason[i], chp, config),
+            "order_preview": order_preview,
+        }
+        if indicators is not None:
+            row["indicators"] = {
+                name: (None if value != value else round(value, 4)) for name, value in ((k, v[i]) for k, v in indicators.items())
+            }
+        results.append(row)
+    return results
@@ -0,0 +1,37 @@
+"""Typed readers for the ``FYERS_*`` environment settings.
+
+Unset, blank or unparsable values fall back to ``default``, so a typo in
+``.env`` never stops the agent from starting.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Optional
+
+
+def env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        return default
+
+
+def env_float(name: str, default: Optional[float]) -> Optional[float]:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
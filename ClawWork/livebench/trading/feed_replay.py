@@ -0,0 +1,279 @@
+"""Local websocket server that replays recorded ticks over the ``market_feed`` protocol.
+
+Sources are a ``TickStore`` directory (screener runs write one under
+``trading/ticks/``; ``MarketFeed(tick_store=...)`` records into one), tick
+JSONL files written by ``MarketFeed(record_path=...)``, or older screener
+audit logs that still carry full ``results`` rows. Each connection gets its own
+playback of the subscribed symbols, paced by the recorded timestamps divided
+by ``speed`` (``speed <= 0`` sends as fast as possible).
+
+Usage:
+    python -m livebench.trading.feed_replay --ticks data/ticks.jsonl --port 8765 --speed 10 --loop
+    python -m livebench.trading.feed_replay --tick-store <agent_data>/trading/ticks --speed 0
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import websockets
+
+from .tick_store import TickStore
+
+ReplayTick = Tuple[float, Dict[str, Any]]
+
+
+def _timestamp(entry: Dict[str, Any]) -> Optional[float]:
+    for key in ("received_at", "exch_feed_time", "last_traded_time"):
+        value = entry.get(key)
+        if isinstance(value, (int, float)):
+            return float(value)
+    stamp = entry.get("timestamp")
+    if isinstance(stamp, str):
+        try:
+            return datetime.fromisoformat(stamp).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+def load_ticks(path: Union[str, Path]) -> List[ReplayTick]:
+    """Read recorded ticks or screener runs into time-ordered (timestamp, tick) pairs."""
+    ticks: List[ReplayTick] = []
+    with Path(path).open(encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(entry, dict):
+                continue
+            stamp = _timestamp(entry)
+            if stamp is None:
+                continue
+
+            if isinstance(entry.get("results"), list):
+                for row in entry["results"]:
+                    if isinstance(row, dict) and row.get("symbol") and row.get("last_price") is not None:
+                        ticks.append(
+                            (
+                                stamp,
+                                {
+                                    "symbol": row["symbol"],
+                                    "ltp": row["last_price"],
+                                    "prev_close_price": row.get("prev_close"),
+                                    "chp": row.get("change_pct"),
+                                    "vol_traded_today": row.get("volume"),
+                                },
+                            )
+                        )
+            elif entry.get("symbol"):
+                tick = {key: value for key, value in entry.items() if key != "received_at"}
+                ticks.append((stamp, tick))
+
+    ticks.sort(key=lambda item: item[0])
+    return ticks
+
+
+def load_tick_store(root: Union[str, Path], start: Optional[float] = None, end: Optional[float] = None) -> List[ReplayTick]:
+    """Read a ``TickStore`` range into (timestamp, tick) pairs in time order."""
+    store = TickStore(root)
+    records = store.read(start, end)
+    ticks: List[ReplayTick] = [
+        (
+            row["ts"],
+            {
+                "symbol": row["symbol"],
+                "ltp": row["ltp"],
+                "prev_close_price": row["prev_close"],
+                "chp": row["change_pct"],
+                "vol_traded_today": row["volume"],
+            },
+        )
+        for row in store.to_rows(records)
+        if row["symbol"] and row["ltp"] is not None
+    ]
+    ticks.sort(key=lambda item: item[0])
+    return ticks
+
+
+def synthetic_ticks(symbols: Iterable[str], updates: int, interval_seconds: float = 0.01, seed: int = 5) -> List[ReplayTick]:
+    """Random-walk ticks: every symbol updates once per ``interval_seconds`` for ``updates`` rounds."""
+    rng = random.Random(seed)
+    symbols = list(symbols)
+    prev_close = {symbol: round(rng.uniform(50, 3000), 2) for symbol in symbols}
+    last = dict(prev_close)
+    volume = {symbol: 0 for symbol in symbols}
+    start = time.time()
+    ticks: List[ReplayTick] = []
+    for step in range(updates):
+        stamp = start + step * interval_seconds
+        for symbol in symbols:
+            last[symbol] = round(last[symbol] * (1 + rng.gauss(0, 0.001)), 2)
+            volume[symbol] += rng.randint(1, 500)
+            ticks.append(
+                (
+                    stamp,
+                    {
+                        "symbol": symbol,
+                        "ltp": last[symbol],
+                        "prev_close_price": prev_close[symbol],
+                        "vol_traded_today": volume[symbol],
+                        "exch_feed_time": int(stamp),
+                    },
+                )
+            )
+    return ticks
+
+
+class FeedReplayServer:
+    """Serves recorded ticks to ``MarketFeed`` clients; runs on its own thread."""
+
+    def __init__(
+        self,
+        ticks: List[ReplayTick],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        speed: float = 1.0,
+        loop: bool = False,
+        batch_size: int = 500,
+    ) -> None:
+        self.ticks = ticks
+        self.host = host
+        self.port = port
+        self.speed = speed
+        self.loop = loop
+        self.batch_size = batch_size
+        self.stats = {"connections": 0, "ticks_sent": 0, "messages_sent": 0}
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Any = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._stop: Optional[asyncio.Event] = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    def start(self) -> "FeedReplayServer":
+        self._thread = threading.Thread(target=self._run_thread, name="fyers-feed-replay", daemon=True)
+        self._thread.start()
+        self._ready.wait(5.0)
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if self._loop is not None and self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run_thread(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self.serve())
+        finally:
+            self._loop.close()
+
+    async def serve(self) -> None:
+        self._stop = asyncio.Event()
+        async with websockets.serve(self._handle, self.host, self.port, max_size=None) as server:
+            self.port = server.sockets[0].getsockname()[1]
+            self._ready.set()
+            await self._stop.wait()
+
+    async def _handle(self, ws: Any, *_: Any) -> None:
+        self.stats["connections"] += 1
+        subscribed: Set[str] = set()
+        subscribed_event = asyncio.Event()
+        player = asyncio.ensure_future(self._play(ws, subscribed, subscribed_event))
+        try:
+            async for message in ws:
+                try:
+                    payload = json.loads(message)
+                except ValueError:
+                    continue
+                symbols = payload.get("symbols") or []
+                if payload.get("type") == "subscribe":
+                    subscribed.update(symbols)
+                    subscribed_event.set()
+                elif payload.get("type") == "unsubscribe":
+                    subscribed.difference_update(symbols)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            player.cancel()
+
+    async def _play(self, ws: Any, subscribed: Set[str], subscribed_event: asyncio.Event) -> None:
+        await subscribed_event.wait()
+        if not self.ticks:
+            return
+        try:
+            while True:
+                await self._play_once(ws, subscribed)
+                if not self.loop:
+                    break
+        except websockets.ConnectionClosed:
+            pass
+
+    async def _play_once(self, ws: Any, subscribed: Set[str]) -> None:
+        first_stamp = self.ticks[0][0]
+        started = time.monotonic()
+        index = 0
+        total = len(self.ticks)
+        while index < total:
+            if self.speed > 0:
+                due = started + (self.ticks[index][0] - first_stamp) / self.speed
+                delay = due - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            # Send everything that is due now as one batch.
+            now = time.monotonic()
+            batch: List[Dict[str, Any]] = []
+            while index < total and len(batch) < self.batch_size:
+                stamp, tick = self.ticks[index]
+                if self.speed > 0 and started + (stamp - first_stamp) / self.speed > now:
+                    break
+                if tick["symbol"] in subscribed:
+                    batch.append(tick)
+                index += 1
+
+            if batch:
+                await ws.send(json.dumps({"type": "ticks", "data": batch, "sent_at": time.time()}))
+                self.stats["ticks_sent"] += len(batch)
+                self.stats["messages_sent"] += 1
+            else:
+                await asyncio.sleep(0)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Replay recorded FYERS ticks over a local websocket.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--ticks", help="Tick JSONL recorded by MarketFeed, or a screener audit JSONL")
+    source.add_argument("--tick-store", help="TickStore directory")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--speed", type=float, default=1.0, help="Playback speed multiplier; 0 = as fast as possible")
+    parser.add_argument("--loop", action="store_true")
+    args = parser.parse_args(argv)
+
+    ticks = load_tick_store(args.tick_store) if args.tick_store else load_ticks(args.ticks)
+    server = FeedReplayServer(ticks, host=args.host, port=args.port, speed=args.speed, loop=args.loop)
+    print(f"Replaying {len(ticks)} ticks on ws://{args.host}:{args.port} (speed {args.speed or 'max'})")
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,128 @@ from __future__ import annotations
 
 import json
 import os
-from typing import Any, Dict, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from .env import env_flag, env_float, env_int
+from .rate_limiter import classify_endpoint, get_rate_limiter
 
-class FyersClient:
-    """Thin FYERS v3 HTTP client with env-driven configuration."""
+
+# Process-wide keep-alive sessions, keyed by (api_base_url, access_token).
+_SESSIONS: Dict[Tuple[str, str], requests.Session] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    """Create a pooled session configured from FYERS_POOL_* env settings.
+
+    Retries only cover idempotent methods (GET) so order placement is never
+    replayed by the transport layer.
+    """
+    pool_size = max(env_int("FYERS_POOL_SIZE", 10), 1)
+    max_retries = max(env_int("FYERS_POOL_MAX_RETRIES", 2), 0)
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=env_float("FYERS_POOL_BACKOFF_SECONDS", 0.3),
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if not env_flag("FYERS_KEEP_ALIVE", True):
+        session.headers["Connection"] = "close"
+    return session
+
+
+def get_shared_session(api_base_url: str, access_token: Optional[str] = None) -> requests.Session:
+    """Return the shared pooled session for a base URL and token pair."""
+    key = (api_base_url.rstrip("/"), (access_token or "").strip())
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(key)
+        if session is None:
+            session = _build_session()
+            _SESSIONS[key] = session
+        return session
+
+
+def close_shared_sessions() -> None:
+    """Close every pooled session (e.g. after a token refresh or at shutdown)."""
+    with _SESSIONS_LOCK:
+        sessions = list(_SESSIONS.values())
+        _SESSIONS.clear()
+    for session in sessions:
+        session.close()
+
+
+# Learned quote endpoint per api_base_url, persisted so new processes skip discovery.
+_QUOTE_ROUTES: Dict[str, Dict[str, Any]] = {}
+_QUOTE_ROUTES_LOADED = False
+_QUOTE_ROUTES_LOCK = threading.Lock()
+_DEFAULT_QUOTE_ROUTE_CACHE = Path(__file__).resolve().parents[1] / "data" / "fyers" / "quote_routes.json"
+
+
+def _quote_route_cache_path() -> Path:
+    return Path(os.getenv("FYERS_QUOTE_ROUTE_CACHE") or _DEFAULT_QUOTE_ROUTE_CACHE)
+
+
+def _load_quote_routes() -> None:
+    """Populate the in-memory route table from disk once per process."""
+    global _QUOTE_ROUTES_LOADED
+    if _QUOTE_ROUTES_LOADED:
+        return
+    _QUOTE_ROUTES_LOADED = True
+    path = _quote_route_cache_path()
+    if not path.exists():
+        return
+    try:
+        stored = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return
+    if isinstance(stored, dict):
+        _QUOTE_ROUTES.update({k: v for k, v in stored.items() if isinstance(v, dict)})
+
+
+def _save_quote_routes() -> None:
+    path = _quote_route_cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(_QUOTE_ROUTES, indent=2), encoding="utf-8")
+        tmp_path.replace(path)
+    except OSError:
+        pass
+
+
+QuoteAttempt = Tuple[str, str, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+# FYERS accepts at most 10 orders per multi-order request.
+MULTI_ORDER_PATH = "/multi-order/sync"
+MULTI_ORDER_MAX = 10
+
+# API bases that answered the multi-order route with 404/405; baskets there go
+# straight to concurrent single-order dispatch.
+_MULTI_ORDER_UNSUPPORTED: set = set()
+
+
+class FyersClientBase:
+    """Transport-independent FYERS configuration, auth headers and quote routing.
+
+    Subclasses provide ``_request`` (sync or async) and the endpoint methods.
+    """
 
     def __init__(
         self,
@@ -23,7 +138,7 @@ class FyersClient:
         self.access_token = access_token or os.getenv("FYERS_ACCESS_TOKEN")
         self.app_id = os.getenv("FYERS_APP_ID") or os.getenv("FYERS_CLIENT_ID")
         self.auth_header = os.getenv("FYERS_AUTH_HEADER")
-        self.timeout_seconds = timeout_seconds or float(os.getenv("FYERS_TIMEOUT_SECONDS", "30"))
+        self.timeout_seconds = timeout_seconds or env_float("FYERS_TIMEOUT_SECONDS", 30.0)
 
     @staticmethod
     def _derive_api_root(base_url: str) -> str:
@@ -60,6 +175,236 @@ class FyersClient:
                 headers["Authorization"] = token
         return headers
 
+    def _url(self, path: str) -> str:
+        if path.startswith("http://") or path.startswith("https://"):
+            return path
+        return f"{self.api_base_url}/{path.lstrip('/')}"
+
+    @staticmethod
+    def _missing_token_result() -> Dict[str, Any]:
+        return {
+            "success": False,
+            "error": "FYERS_ACCESS_TOKEN is not set",
+            "message": "Set FYERS_ACCESS_TOKEN in .env before calling FYERS tools",
+        }
+
+    @classmethod
+    def _build_result(cls, status_code: int, body: Any, url: str) -> Dict[str, Any]:
+        success = 200 <= status_code < 300
+        result = {
+            "success": success,
+            "status_code": status_code,
+            "url": url,
+            "data": body,
+        }
+
+        if not success:
+            result["error"] = cls._extract_error(body)
+
+        return result
+
+    @staticmethod
+    def _extract_error(body: Any) -> str:
+        if isinstance(body, dict):
+            for key in ("message", "error", "reason", "s"):
+                value = body.get(key)
+                if isinstance(value, str) and value.strip():
+                    return value
+            return json.dumps(body)
+        return str(body)
+
+    def _quote_attempts(self, symbols: str) -> List[QuoteAttempt]:
+        return [
+            ("POST", "/quotes", {"symbols": symbols}, None),
+            ("GET", "/quotes", None, {"symbols": symbols}),
+            ("GET", "/data/quotes", None, {"symbols": symbols}),
+            ("POST", "/data/quotes", {"symbols": symbols}, None),
+            ("GET", f"{self.api_root_url}/data/quotes", None, {"symbols": symbols}),
+            ("POST", f"{self.api_root_url}/data/quotes", {"symbols": symbols}, None),
+            ("GET", f"{self.api_root_url}/quotes", None, {"symbols": symbols}),
+            ("POST", f"{self.api_root_url}/quotes", {"symbols": symbols}, None),
+        ]
+
+    @staticmethod
+    def _history_params(symbol: str, resolution: str, range_from: int, range_to: int) -> Dict[str, Any]:
+        # date_format=0 means range_from/range_to are epoch seconds.
+        return {
+            "symbol": symbol,
+            "resolution": str(resolution),
+            "date_format": 0,
+            "range_from": int(range_from),
+            "range_to": int(range_to),
+            "cont_flag": 1,
+        }
+
+    @staticmethod
+    def _option_chain_params(symbol: str, strike_count: int, expiry: Optional[int] = None) -> Dict[str, Any]:
+        # An empty timestamp returns the nearest expiry.
+        return {"symbol": symbol, "strikecount": int(strike_count), "timestamp": "" if expiry is None else str(int(expiry))}
+
+    def _quote_route(self) -> Dict[str, Any]:
+        """Return (creating if needed) the route record for this base URL. Caller holds the lock."""
+        _load_quote_routes()
+        return _QUOTE_ROUTES.setdefault(
+            self.api_base_url,
+            {"endpoint": None, "learned_at": None, "consecutive_failures": 0, "discovery_probes": 0, "discoveries": 0},
+        )
+
+    def _learned_quote_attempt(self, attempts: List[QuoteAttempt]) -> Optional[QuoteAttempt]:
+        ttl_seconds = env_float("FYERS_QUOTE_ROUTE_TTL_SECONDS", 86400.0)
+        with _QUOTE_ROUTES_LOCK:
+            route = self._quote_route()
+            endpoint = route.get("endpoint")
+            learned_at = route.get("learned_at") or 0.0
+            if endpoint and time.time() - learned_at > ttl_seconds:
+                route["endpoint"] = None
+                route["learned_at"] = None
+                _save_quote_routes()
+                return None
+        if not endpoint:
+            return None
+        for attempt in attempts:
+            if f"{attempt[0]} {attempt[1]}" == endpoint:
+                return attempt
+        return None
+
+    def _record_learned_quote_result(self, endpoint: str, result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Track a call on the learned route; returns None once the route has been dropped."""
+        with _QUOTE_ROUTES_LOCK:
+            route = self._quote_route()
+            if result.get("success"):
+                route["consecutive_failures"] = 0
+            else:
+                route["consecutive_failures"] = route.get("consecutive_failures", 0) + 1
+                if route["consecutive_failures"] >= env_int("FYERS_QUOTE_ROUTE_MAX_FAILURES", 3):
+                    # Forget the route so the caller falls through to a fresh discovery.
+                    route["endpoint"] = None
+                    route["learned_at"] = None
+                    route["consecutive_failures"] = 0
+                    _save_quote_routes()
+                    return None
+        result["quote_endpoint_used"] = endpoint
+        result["quote_endpoint_learned"] = True
+        return result
+
+    def _record_quote_probe(self, endpoint: str, result: Dict[str, Any], errors: List[Dict[str, Any]]) -> bool:
+        """Track one discovery probe; returns True when it found a working endpoint."""
+        with _QUOTE_ROUTES_LOCK:
+            route = self._quote_route()
+            route["discovery_probes"] = route.get("discovery_probes", 0) + 1
+            if result.get("success"):
+                route["endpoint"] = endpoint
+                route["learned_at"] = time.time()
+                route["consecutive_failures"] = 0
+                route["discoveries"] = route.get("discoveries", 0) + 1
+                _save_quote_routes()
+
+        if result.get("success"):
+            result["quote_endpoint_used"] = endpoint
+            result["quote_endpoint_learned"] = False
+            result["quote_discovery_probes"] = len(errors) + 1
+            return True
+
+        errors.append(
+            {
+                "attempt": endpoint,
+                "status_code": result.get("status_code"),
+                "error": result.get("error"),
+                "url": result.get("url"),
+            }
+        )
+        return False
+
+    @staticmethod
+    def _quote_discovery_failed(errors: List[Dict[str, Any]]) -> Dict[str, Any]:
+        with _QUOTE_ROUTES_LOCK:
+            _save_quote_routes()
+
+        return {
+            "success": False,
+            "error": "All FYERS quote endpoint attempts failed",
+            "attempts": errors,
+            "quote_discovery_probes": len(errors),
+        }
+
+    def _multi_order_usable(self) -> bool:
+        return env_flag("FYERS_MULTI_ORDER", True) and self.api_base_url not in _MULTI_ORDER_UNSUPPORTED
+
+    @staticmethod
+    def _basket_workers(max_workers: Optional[int]) -> int:
+        return max(max_workers or env_int("FYERS_BASKET_CONCURRENCY", 5), 1)
+
+    def _split_multi_order_result(self, result: Dict[str, Any], count: int) -> Optional[List[Dict[str, Any]]]:
+        """Per-order results from a multi-order response; None when the route is unavailable.
+
+        Only 404/405 falls back to single orders: any other failure may have
+        reached the exchange, so resending the chunk could duplicate orders.
+        """
+        status = result.get("status_code")
+        if status in (404, 405):
+            _MULTI_ORDER_UNSUPPORTED.add(self.api_base_url)
+            return None
+        url = result.get("url", self._url(MULTI_ORDER_PATH))
+        if not result.get("success"):
+            return [dict(result) for _ in range(count)]
+        body = result.get("data")
+        items = body.get("data") if isinstance(body, dict) else None
+        items = items if isinstance(items, list) else []
+        results = []
+        for index in range(count):
+            item = items[index] if index < len(items) and isinstance(items[index], dict) else None
+            if item is None:
+                results.append({"success": False, "error": "No result for this order in the multi-order response", "url": url})
+                continue
+            item_status = int(item.get("statusCode") or status or 200)
+            item_body = item.get("body", item)
+            if isinstance(item_body, dict) and item_body.get("s") == "error" and 200 <= item_status < 300:
+                item_status = 400
+            results.append(self._build_result(item_status, item_body, url))
+        return results
+
+    @staticmethod
+    def _basket_result(results: List[Dict[str, Any]], mode: str, started: float) -> Dict[str, Any]:
+        placed = sum(1 for result in results if result.get("success"))
+        return {
+            "success": placed == len(results),
+            "mode": mode,
+            "placed": placed,
+            "failed": len(results) - placed,
+            "results": results,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 3),
+        }
+
+    def quote_route_info(self) -> Dict[str, Any]:
+        """Describe the learned quote endpoint and discovery cost for this base URL."""
+        ttl_seconds = env_float("FYERS_QUOTE_ROUTE_TTL_SECONDS", 86400.0)
+        with _QUOTE_ROUTES_LOCK:
+            route = dict(self._quote_route())
+        learned_at = route.get("learned_at")
+        return {
+            "api_base_url": self.api_base_url,
+            "endpoint": route.get("endpoint"),
+            "learned_at": learned_at,
+            "expires_at": learned_at + ttl_seconds if learned_at else None,
+            "consecutive_failures": route.get("consecutive_failures", 0),
+            "discovery_probes": route.get("discovery_probes", 0),
+            "discoveries": route.get("discoveries", 0),
+        }
+
+
+class FyersClient(FyersClientBase):
+    """Thin FYERS v3 HTTP client with env-driven configuration."""
+
+    def __init__(
+        self,
+        access_token: Optional[str] = None,
+        api_base_url: Optional[str] = None,
+        timeout_seconds: Optional[float] = None,
+        session: Optional[requests.Session] = None,
+    ) -> None:
+        super().__init__(access_token=access_token, api_base_url=api_base_url, timeout_seconds=timeout_seconds)
+        self.session = session or get_shared_session(self.api_base_url, self.access_token)
+
     def _request(
         self,
         method: str,
@@ -68,18 +413,12 @@ class FyersClient:
         params: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         if not self.access_token:
-            return {
-                "success": False,
-                "error": "FYERS_ACCESS_TOKEN is not set",
-                "message": "Set FYERS_ACCESS_TOKEN in .env before calling FYERS tools",
-            }
+            return self._missing_token_result()
 
-        if path.startswith("http://") or path.startswith("https://"):
-            url = path
-        else:
-            url = f"{self.api_base_url}/{path.lstrip('/')}"
+        url = self._url(path)
+        waited = get_rate_limiter().acquire(classify_endpoint(method, path))
         try:
-            response = requests.request(
+            response = self.session.request(
                 method=method.upper(),
                 url=url,
                 headers=self._headers(),
@@ -100,29 +439,11 @@ class FyersClient:
         except ValueError:
             body = {"raw": response.text}
 
-        success = 200 <= response.status_code < 300
-        result = {
-            "success": success,
-            "status_code": response.status_code,
-            "url": url,
-            "data": body,
-        }
-
-        if not success:
-            result["error"] = self._extract_error(body)
-
+        result = self._build_result(response.status_code, body, url)
+        if waited > 0:
+            result["rate_limit_wait_ms"] = round(waited * 1000.0, 3)
         return result
 
-    @staticmethod
-    def _extract_error(body: Any) -> str:
-        if isinstance(body, dict):
-            for key in ("message", "error", "reason", "s"):
-                value = body.get(key)
-                if isinstance(value, str) and value.strip():
-                    return value
-            return json.dumps(body)
-        return str(body)
-
     def profile(self) -> Dict[str, Any]:
         return self._request("GET", "/profile")
 
@@ -135,38 +456,88 @@ class FyersClient:
     def positions(self) -> Dict[str, Any]:
         return self._request("GET", "/positions")
 
+    def orders(self) -> Dict[str, Any]:
+        return self._request("GET", "/orders")
+
     def quotes(self, symbols: str) -> Dict[str, Any]:
-        attempts = [
-            ("POST", "/quotes", {"symbols": symbols}, None),
-            ("GET", "/quotes", None, {"symbols": symbols}),
-            ("GET", "/data/quotes", None, {"symbols": symbols}),
-            ("POST", "/data/quotes", {"symbols": symbols}, None),
-            ("GET", f"{self.api_root_url}/data/quotes", None, {"symbols": symbols}),
-            ("POST", f"{self.api_root_url}/data/quotes", {"symbols": symbols}, None),
-            ("GET", f"{self.api_root_url}/quotes", None, {"symbols": symbols}),
-            ("POST", f"{self.api_root_url}/quotes", {"symbols": symbols}, None),
-        ]
+        attempts = self._quote_attempts(symbols)
 
-        errors: list[Dict[str, Any]] = []
+        learned = self._learned_quote_attempt(attempts)
+        if learned:
+            method, path, payload, params = learned
+            result = self._request(method, path, payload=payload, params=params)
+            result = self._record_learned_quote_result(f"{method} {path}", result)
+            if result is not None:
+                return result
+
+        errors: List[Dict[str, Any]] = []
         for method, path, payload, params in attempts:
             result = self._request(method, path, payload=payload, params=params)
-            if result.get("success"):
-                result["quote_endpoint_used"] = f"{method} {path}"
+            if self._record_quote_probe(f"{method} {path}", result, errors):
                 return result
-            errors.append(
-                {
-                    "attempt": f"{method} {path}",
-                    "status_code": result.get("status_code"),
-                    "error": result.get("error"),
-                    "url": result.get("url"),
-                }
-            )
 
+        return self._quote_discovery_failed(errors)
+
+    def history(self, symbol: str, resolution: str, range_from: int, range_to: int) -> Dict[str, Any]:
+        """Raw OHLCV candles for one symbol; ``range_from``/``range_to`` are epoch seconds."""
+        params = self._history_params(symbol, resolution, range_from, range_to)
+        return self._request("GET", f"{self.api_root_url}/data/history", params=params)
+
+    def option_chain(self, symbol: str, strike_count: int = 10, expiry: Optional[int] = None) -> Dict[str, Any]:
+        """Option chain around the money for one expiry (``expiry`` is the epoch listed in ``expiryData``)."""
+        params = self._option_chain_params(symbol, strike_count, expiry)
+        return self._request("GET", f"{self.api_root_url}/data/options-chain-v3", params=params)
+
+    def candles(
+        self,
+        symbol: str,
+        resolution: str,
+        start: Any,
+        end: Any,
+        columns: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Sync the local candle cache for the range, then load it as NumPy arrays."""
+        from .candle_store import CandleStore
+
+        store = CandleStore()
+        sync = store.sync(self, symbol, resolution, start, end)
         return {
-            "success": False,
-            "error": "All FYERS quote endpoint attempts failed",
-            "attempts": errors,
+            "success": sync["success"],
+            "sync": sync,
+            "candles": store.load(symbol, resolution, start, end, columns=columns),
         }
 
     def place_order(self, order_payload: Dict[str, Any]) -> Dict[str, Any]:
         return self._request("POST", "/orders", payload=order_payload)
+
+    def place_basket(self, orders: List[Dict[str, Any]], max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """Place several orders: multi-order requests of up to 10, else concurrent single orders.
+
+        ``results`` follows the order of ``orders``.
+        """
+        started = time.perf_counter()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(orders)
+        pending = list(range(len(orders)))
+        if self._multi_order_usable():
+            pending = []
+            for offset in range(0, len(orders), MULTI_ORDER_MAX):
+                chunk = list(range(offset, min(offset + MULTI_ORDER_MAX, len(orders))))
+                if pending:
+                    pending.extend(chunk)
+                    continue
+                response = self._request("POST", MULTI_ORDER_PATH, payload=[orders[i] for i in chunk])
+                split = self._split_multi_order_result(response, len(chunk))
+                if split is None:
+                    pending.extend(chunk)
+                    continue
+                for index, result in zip(chunk, split):
+                    results[index] = result
+
+        if pending:
+            # The shared rate limiter paces these across the worker threads.
+            with ThreadPoolExecutor(max_workers=min(self._basket_workers(max_workers), len(pending))) as pool:
+                for index, result in zip(pending, pool.map(lambda i: self.place_order(orders[i]), pending)):
+                    results[index] = result
+
+        mode = "concurrent" if len(pending) == len(orders) else "multi_order" if not pending else "mixed"
+        return self._basket_result(results, mode, started)
@@ -0,0 +1,16 @@
+"""Technical indicators in batch (NumPy arrays) and streaming (O(1) per update) form."""
+
+from .batch import atr, ema, rsi, sma, true_range, volatility, vwap
+from .streaming import INDICATOR_NAMES, StreamingIndicators
+
+__all__ = [
+    "atr",
+    "ema",
+    "rsi",
+    "sma",
+    "true_range",
+    "volatility",
+    "vwap",
+    "INDICATOR_NAMES",
+    "StreamingIndicators",
+]
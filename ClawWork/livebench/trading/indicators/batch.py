@@ -0,0 +1,141 @@
+"""Batch indicators over NumPy candle arrays.
+
+Every function works on the last axis, so a 1-D series and a symbols x bars
+panel are handled the same way. Values are NaN until enough bars exist.
+Definitions match ``StreamingIndicators`` exactly:
+
+- SMA: mean of the last ``window`` closes
+- EMA: seeded with the SMA of the first ``span`` closes, then ``alpha = 2 / (span + 1)``
+- RSI / ATR: Wilder smoothing, seeded with the simple mean of the first ``period`` values
+- VWAP: cumulative typical-price x volume / volume, reset at each new session
+- Volatility: sample std (ddof=1) of the last ``window`` log returns, in percent
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+
+def _as_float(values: np.ndarray) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def sma(close: np.ndarray, window: int) -> np.ndarray:
+    close = _as_float(close)
+    out = np.full(close.shape, np.nan)
+    if close.shape[-1] < window:
+        return out
+    csum = np.cumsum(close, axis=-1)
+    out[..., window - 1] = csum[..., window - 1]
+    out[..., window:] = csum[..., window:] - csum[..., :-window]
+    out[..., window - 1 :] /= window
+    return out
+
+
+def ema(close: np.ndarray, span: int) -> np.ndarray:
+    close = _as_float(close)
+    out = np.full(close.shape, np.nan)
+    n_bars = close.shape[-1]
+    if n_bars < span:
+        return out
+    alpha = 2.0 / (span + 1.0)
+    value = close[..., :span].sum(axis=-1) / span
+    out[..., span - 1] = value
+    for t in range(span, n_bars):
+        value = value + alpha * (close[..., t] - value)
+        out[..., t] = value
+    return out
+
+
+def rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    close = _as_float(close)
+    out = np.full(close.shape, np.nan)
+    n_bars = close.shape[-1]
+    if n_bars <= period:
+        return out
+    diff = np.diff(close, axis=-1)
+    gains = np.maximum(diff, 0.0)
+    losses = np.maximum(-diff, 0.0)
+    avg_gain = gains[..., :period].sum(axis=-1) / period
+    avg_loss = losses[..., :period].sum(axis=-1) / period
+    out[..., period] = _rsi_from_averages(avg_gain, avg_loss)
+    for t in range(period + 1, n_bars):
+        avg_gain = (avg_gain * (period - 1) + gains[..., t - 1]) / period
+        avg_loss = (avg_loss * (period - 1) + losses[..., t - 1]) / period
+        out[..., t] = _rsi_from_averages(avg_gain, avg_loss)
+    return out
+
+
+def _rsi_from_averages(avg_gain: np.ndarray, avg_loss: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    value = np.where(avg_loss == 0, np.where(avg_gain == 0, 50.0, 100.0), value)
+    return value
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    tr = high - low
+    prev_close = close[..., :-1]
+    tr[..., 1:] = np.maximum.reduce(
+        [tr[..., 1:], np.abs(high[..., 1:] - prev_close), np.abs(low[..., 1:] - prev_close)]
+    )
+    return tr
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    tr = true_range(high, low, close)
+    out = np.full(tr.shape, np.nan)
+    n_bars = tr.shape[-1]
+    if n_bars < period:
+        return out
+    value = tr[..., :period].sum(axis=-1) / period
+    out[..., period - 1] = value
+    for t in range(period, n_bars):
+        value = (value * (period - 1) + tr[..., t]) / period
+        out[..., t] = value
+    return out
+
+
+def vwap(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+    session: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """VWAP of typical price; ``session`` (one id per bar) restarts the accumulation."""
+    typical = (_as_float(high) + _as_float(low) + _as_float(close)) / 3.0
+    volume = np.nan_to_num(_as_float(volume))
+    cum_pv = np.cumsum(typical * volume, axis=-1)
+    cum_v = np.cumsum(volume, axis=-1)
+    if session is not None:
+        session = np.asarray(session)
+        n_bars = session.shape[-1]
+        starts = np.ones(n_bars, dtype=bool)
+        starts[1:] = session[1:] != session[:-1]
+        start_col = np.maximum.accumulate(np.where(starts, np.arange(n_bars), 0))
+        before = start_col - 1
+        has_before = before >= 0
+        base_pv = np.zeros_like(cum_pv)
+        base_v = np.zeros_like(cum_v)
+        base_pv[..., has_before] = cum_pv[..., before[has_before]]
+        base_v[..., has_before] = cum_v[..., before[has_before]]
+        cum_pv = cum_pv - base_pv
+        cum_v = cum_v - base_v
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(cum_v > 0, cum_pv / cum_v, np.nan)
+
+
+def volatility(close: np.ndarray, window: int = 20) -> np.ndarray:
+    close = _as_float(close)
+    out = np.full(close.shape, np.nan)
+    if close.shape[-1] <= window:
+        return out
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.diff(np.log(close), axis=-1)
+    windows = np.lib.stride_tricks.sliding_window_view(returns, window, axis=-1)
+    out[..., window:] = windows.std(axis=-1, ddof=1) * 100.0
+    return out
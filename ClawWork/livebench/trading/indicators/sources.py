@@ -0,0 +1,110 @@
+"""Where the screener and live feed get indicator values from.
+
+``DailyIndicatorSource`` warms a ``StreamingIndicators`` engine from the local
+daily candle cache once per IST day and then peeks today's forming bar with
+the current last price, so a screener run costs one vectorized step.
+``TickIndicators`` treats every streamed tick as an observation and keeps
+per-tick indicators (including session VWAP) current from the last-price
+table.
+"""
+
+from __future__ import annotations
+
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from ..candle_store import IST, CandleStore
+from .streaming import StreamingIndicators
+
+
+class DailyIndicatorSource:
+    """Daily-bar indicators from cached candles, evaluated at the current price.
+
+    VWAP is intraday-only and is always NaN here. Symbols without cached
+    candles get NaN values (sync them with ``CandleStore.sync`` first).
+    """
+
+    def __init__(
+        self,
+        store: Optional[CandleStore] = None,
+        engine: Optional[StreamingIndicators] = None,
+        history_bars: int = 250,
+    ) -> None:
+        self.store = store or CandleStore()
+        self.engine = engine if engine is not None else StreamingIndicators()
+        self.history_bars = history_bars
+        self._warmed_on: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _warm(self, symbols: Sequence[str], today: str) -> None:
+        today_start = int(datetime.strptime(today, "%Y-%m-%d").replace(tzinfo=IST).timestamp())
+        closes, highs, lows = [], [], []
+        for symbol in symbols:
+            candles = self.store.load(symbol, "D", columns=["ts", "high", "low", "close"])
+            before_today = candles["ts"] < today_start
+            closes.append(candles["close"][before_today][-self.history_bars :])
+            highs.append(candles["high"][before_today][-self.history_bars :])
+            lows.append(candles["low"][before_today][-self.history_bars :])
+        self.engine.warmup(list(symbols), closes, highs, lows)
+        self.engine.reset_session(symbols)
+        for symbol in symbols:
+            self._warmed_on[symbol] = today
+
+    def snapshot(self, symbols: Sequence[Any], last_price: np.ndarray) -> Dict[str, np.ndarray]:
+        """Indicator arrays aligned with ``symbols``, including today's bar at ``last_price``."""
+        today = datetime.now(IST).strftime("%Y-%m-%d")
+        with self._lock:
+            cold = [symbol for symbol in dict.fromkeys(symbols) if symbol and self._warmed_on.get(symbol) != today]
+            if cold:
+                self._warm(cold, today)
+        price = np.asarray(last_price, dtype=np.float64)
+        return self.engine.peek([symbol or "" for symbol in symbols], price)
+
+
+class TickIndicators:
+    """Per-tick indicators fed from ``LastPriceTable`` listeners.
+
+    Each tick is one observation (close = ltp); traded volume per tick is the
+    change in the feed's cumulative day volume.
+    """
+
+    def __init__(self, engine: Optional[StreamingIndicators] = None) -> None:
+        self.engine = engine if engine is not None else StreamingIndicators()
+        self._last_volume: Dict[str, float] = {}
+
+    def on_tick(self, tick: Dict[str, Any]) -> None:
+        symbol = tick["symbol"]
+        cumulative = tick.get("volume")
+        traded = 0.0
+        if cumulative is not None:
+            previous = self._last_volume.get(symbol)
+            traded = max(cumulative - previous, 0.0) if previous is not None else 0.0
+            self._last_volume[symbol] = cumulative
+        self.engine.update([symbol], [tick["ltp"]], volume=[traded])
+
+    def attach(self, table: Any) -> "TickIndicators":
+        table.add_listener(self.on_tick)
+        return self
+
+    def new_session(self) -> None:
+        self.engine.reset_session()
+        self._last_volume.clear()
+
+    def values(self, symbols: Sequence[str]) -> Dict[str, np.ndarray]:
+        return self.engine.values(symbols)
+
+
+_DAILY_SOURCE: Optional[DailyIndicatorSource] = None
+_DAILY_SOURCE_LOCK = threading.Lock()
+
+
+def get_daily_indicator_source() -> DailyIndicatorSource:
+    """Return the process-wide daily indicator source used by the screener."""
+    global _DAILY_SOURCE
+    with _DAILY_SOURCE_LOCK:
+        if _DAILY_SOURCE is None:
+            _DAILY_SOURCE = DailyIndicatorSource()
+        return _DAILY_SOURCE
@@ -0,0 +1,320 @@
+"""O(1)-per-update indicators for many symbols at once.
+
+Each symbol owns one row of fixed-size state arrays (ring buffers for the
+SMA and volatility windows, running Wilder/EMA averages, VWAP sums), so an
+update touches only that row and never recomputes a window. Updates are
+vectorized over symbols: one call can advance thousands of rows.
+
+``update`` commits a finished bar; ``peek`` returns the values as if one more
+bar were appended without changing any state, which is how a still-forming
+bar (today's last price) is evaluated.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from ..env import env_int
+
+INDICATOR_NAMES = ("sma", "ema", "rsi", "atr", "vwap", "volatility")
+
+
+class StreamingIndicators:
+    """Incremental SMA, EMA, RSI, ATR, VWAP and volatility per symbol."""
+
+    def __init__(
+        self,
+        sma_window: Optional[int] = None,
+        ema_span: Optional[int] = None,
+        rsi_period: Optional[int] = None,
+        atr_period: Optional[int] = None,
+        volatility_window: Optional[int] = None,
+        capacity: int = 256,
+    ) -> None:
+        self.sma_window = sma_window or env_int("FYERS_INDICATOR_SMA_WINDOW", 20)
+        self.ema_span = ema_span or env_int("FYERS_INDICATOR_EMA_SPAN", 20)
+        self.rsi_period = rsi_period or env_int("FYERS_INDICATOR_RSI_PERIOD", 14)
+        self.atr_period = atr_period or env_int("FYERS_INDICATOR_ATR_PERIOD", 14)
+        self.volatility_window = volatility_window or env_int("FYERS_INDICATOR_VOLATILITY_WINDOW", 20)
+        self.alpha = 2.0 / (self.ema_span + 1.0)
+
+        self._lock = threading.Lock()
+        self._rows: Dict[str, int] = {}
+        self._capacity = 0
+        self._state: Dict[str, np.ndarray] = {}
+        self._grow(max(capacity, 1))
+
+    def _blank(self, size: int) -> Dict[str, np.ndarray]:
+        nan = lambda: np.full(size, np.nan)
+        zero = lambda: np.zeros(size)
+        return {
+            "count": np.zeros(size, dtype=np.int64),
+            "last_close": nan(),
+            "sma_buf": np.zeros((size, self.sma_window)),
+            "sma_sum": zero(),
+            "ema": nan(),
+            "ema_seed": zero(),
+            "avg_gain": nan(),
+            "avg_loss": nan(),
+            "gain_seed": zero(),
+            "loss_seed": zero(),
+            "atr": nan(),
+            "atr_seed": zero(),
+            "ret_buf": np.zeros((size, self.volatility_window)),
+            "ret_sum": zero(),
+            "ret_sumsq": zero(),
+            "vwap_pv": zero(),
+            "vwap_v": zero(),
+        }
+
+    def _grow(self, capacity: int) -> None:
+        fresh = self._blank(capacity)
+        for name, array in self._state.items():
+            fresh[name][: len(array)] = array
+        self._state = fresh
+        self._capacity = capacity
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def symbols(self) -> List[str]:
+        return list(self._rows)
+
+    def rows_for(self, symbols: Iterable[str], create: bool = True) -> np.ndarray:
+        with self._lock:
+            rows: List[int] = []
+            for symbol in symbols:
+                row = self._rows.get(symbol)
+                if row is None:
+                    if not create:
+                        rows.append(-1)
+                        continue
+                    row = len(self._rows)
+                    if row >= self._capacity:
+                        self._grow(self._capacity * 2)
+                    self._rows[symbol] = row
+                rows.append(row)
+            return np.asarray(rows, dtype=np.int64)
+
+    def bars(self, symbol: str) -> int:
+        row = self._rows.get(symbol)
+        return int(self._state["count"][row]) if row is not None else 0
+
+    def reset(self, symbols: Optional[Iterable[str]] = None) -> None:
+        """Forget all state for ``symbols`` (all symbols by default)."""
+        rows = np.arange(len(self._rows)) if symbols is None else self.rows_for(symbols, create=False)
+        rows = rows[rows >= 0]
+        blank = self._blank(len(rows))
+        with self._lock:
+            for name, array in self._state.items():
+                array[rows] = blank[name]
+
+    def reset_session(self, symbols: Optional[Iterable[str]] = None) -> None:
+        """Restart VWAP accumulation (call at the start of each trading session)."""
+        rows = np.arange(len(self._rows)) if symbols is None else self.rows_for(symbols, create=False)
+        rows = rows[rows >= 0]
+        with self._lock:
+            self._state["vwap_pv"][rows] = 0.0
+            self._state["vwap_v"][rows] = 0.0
+
+    def update(
+        self,
+        symbols: Sequence[str],
+        close: Sequence[float],
+        high: Optional[Sequence[float]] = None,
+        low: Optional[Sequence[float]] = None,
+        volume: Optional[Sequence[float]] = None,
+    ) -> None:
+        """Commit one bar per entry. Repeated symbols are applied in order."""
+        rows = self.rows_for(symbols)
+        close, high, low, volume = self._inputs(close, high, low, volume)
+        for batch in self._unique_batches(rows):
+            state = self._gather(rows[batch])
+            self._step(state, close[batch], high[batch], low[batch], volume[batch])
+            self._scatter(rows[batch], state)
+
+    def values(self, symbols: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Indicator values after the last committed bar (NaN for unknown symbols)."""
+        rows = self.rows_for(symbols, create=False)
+        known = rows >= 0
+        out = {name: np.full(len(rows), np.nan) for name in INDICATOR_NAMES}
+        if known.any():
+            computed = self._values(self._gather(rows[known]))
+            for name in INDICATOR_NAMES:
+                out[name][known] = computed[name]
+        return out
+
+    def peek(
+        self,
+        symbols: Sequence[str],
+        close: Sequence[float],
+        high: Optional[Sequence[float]] = None,
+        low: Optional[Sequence[float]] = None,
+        volume: Optional[Sequence[float]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Values as if one more bar were appended for each symbol; state is unchanged."""
+        rows = self.rows_for(symbols, create=False)
+        close, high, low, volume = self._inputs(close, high, low, volume)
+        known = rows >= 0
+        out = {name: np.full(len(rows), np.nan) for name in INDICATOR_NAMES}
+        if known.any():
+            state = self._gather(rows[known])
+            self._step(state, close[known], high[known], low[known], volume[known])
+            computed = self._values(state)
+            for name in INDICATOR_NAMES:
+                out[name][known] = computed[name]
+        return out
+
+    @staticmethod
+    def _inputs(close, high, low, volume):
+        close = np.asarray(close, dtype=np.float64)
+        high = close if high is None else np.where(np.isnan(np.asarray(high, dtype=np.float64)), close, high)
+        low = close if low is None else np.where(np.isnan(np.asarray(low, dtype=np.float64)), close, low)
+        volume = np.zeros_like(close) if volume is None else np.nan_to_num(np.asarray(volume, dtype=np.float64))
+        return close, np.asarray(high, dtype=np.float64), np.asarray(low, dtype=np.float64), volume
+
+    @staticmethod
+    def _unique_batches(rows: np.ndarray) -> List[np.ndarray]:
+        if len(np.unique(rows)) == len(rows):
+            return [np.arange(len(rows))]
+        # Occurrence rank of each row: first time seen -> batch 0, second -> batch 1, ...
+        order = np.argsort(rows, kind="stable")
+        sorted_rows = rows[order]
+        starts = np.r_[0, np.flatnonzero(sorted_rows[1:] != sorted_rows[:-1]) + 1]
+        rank_sorted = np.arange(len(rows)) - np.repeat(starts, np.diff(np.r_[starts, len(rows)]))
+        rank = np.empty_like(rank_sorted)
+        rank[order] = rank_sorted
+        return [np.flatnonzero(rank == level) for level in range(int(rank.max()) + 1)]
+
+    def _gather(self, rows: np.ndarray) -> Dict[str, np.ndarray]:
+        with self._lock:
+            return {name: array[rows].copy() for name, array in self._state.items()}
+
+    def _scatter(self, rows: np.ndarray, state: Dict[str, np.ndarray]) -> None:
+        with self._lock:
+            for name, array in state.items():
+                self._state[name][rows] = array
+
+    def _step(self, s: Dict[str, np.ndarray], close: np.ndarray, high: np.ndarray, low: np.ndarray, volume: np.ndarray) -> None:
+        n = s["count"]
+        idx = np.arange(len(n))
+        has_prev = n >= 1
+        prev_close = s["last_close"]
+
+        # SMA ring buffer.
+        pos = n % self.sma_window
+        evicted = np.where(n >= self.sma_window, s["sma_buf"][idx, pos], 0.0)
+        s["sma_sum"] += close - evicted
+        s["sma_buf"][idx, pos] = close
+
+        # EMA: SMA seed over the first span bars, then exponential updates.
+        span = self.ema_span
+        seeding = n < span
+        s["ema_seed"][seeding] += close[seeding]
+        seeded_now = n == span - 1
+        s["ema"][seeded_now] = s["ema_seed"][seeded_now] / span
+        running = n >= span
+        s["ema"][running] += self.alpha * (close[running] - s["ema"][running])
+
+        # RSI (Wilder) over close-to-close changes; change k exists from bar k.
+        period = self.rsi_period
+        delta = np.where(has_prev, close - prev_close, 0.0)
+        gain = np.maximum(delta, 0.0)
+        loss = np.maximum(-delta, 0.0)
+        seeding = has_prev & (n <= period)
+        s["gain_seed"][seeding] += gain[seeding]
+        s["loss_seed"][seeding] += loss[seeding]
+        seeded_now = n == period
+        s["avg_gain"][seeded_now] = s["gain_seed"][seeded_now] / period
+        s["avg_loss"][seeded_now] = s["loss_seed"][seeded_now] / period
+        running = n > period
+        s["avg_gain"][running] = (s["avg_gain"][running] * (period - 1) + gain[running]) / period
+        s["avg_loss"][running] = (s["avg_loss"][running] * (period - 1) + loss[running]) / period
+
+        # ATR (Wilder) over true range.
+        period = self.atr_period
+        tr = high - low
+        tr = np.where(
+            has_prev,
+            np.maximum.reduce([tr, np.abs(high - prev_close), np.abs(low - prev_close)]),
+            tr,
+        )
+        seeding = n < period
+        s["atr_seed"][seeding] += tr[seeding]
+        seeded_now = n == period - 1
+        s["atr"][seeded_now] = s["atr_seed"][seeded_now] / period
+        running = n >= period
+        s["atr"][running] = (s["atr"][running] * (period - 1) + tr[running]) / period
+
+        # Volatility ring buffer of log returns.
+        window = self.volatility_window
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ret = np.where(has_prev, np.log(close / prev_close), 0.0)
+        ret_index = n - 1
+        pos = np.where(has_prev, ret_index % window, 0)
+        evicting = has_prev & (ret_index >= window)
+        old = np.where(evicting, s["ret_buf"][idx, pos], 0.0)
+        s["ret_sum"] += np.where(has_prev, ret - old, 0.0)
+        s["ret_sumsq"] += np.where(has_prev, ret * ret - old * old, 0.0)
+        s["ret_buf"][idx[has_prev], pos[has_prev]] = ret[has_prev]
+
+        # Session VWAP of typical price.
+        typical = (high + low + close) / 3.0
+        s["vwap_pv"] += typical * volume
+        s["vwap_v"] += volume
+
+        s["last_close"] = close.copy()
+        s["count"] = n + 1
+
+    def _values(self, s: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        n = s["count"]
+        window = self.volatility_window
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100.0 - 100.0 / (1.0 + s["avg_gain"] / s["avg_loss"])
+            rsi = np.where(s["avg_loss"] == 0, np.where(s["avg_gain"] == 0, 50.0, 100.0), rsi)
+            variance = (s["ret_sumsq"] - s["ret_sum"] ** 2 / window) / (window - 1)
+            vwap = s["vwap_pv"] / s["vwap_v"]
+        return {
+            "sma": np.where(n >= self.sma_window, s["sma_sum"] / self.sma_window, np.nan),
+            "ema": np.where(n >= self.ema_span, s["ema"], np.nan),
+            "rsi": np.where(n > self.rsi_period, rsi, np.nan),
+            "atr": np.where(n >= self.atr_period, s["atr"], np.nan),
+            "vwap": np.where(s["vwap_v"] > 0, vwap, np.nan),
+            "volatility": np.where(n > window, np.sqrt(np.maximum(variance, 0.0)) * 100.0, np.nan),
+        }
+
+    def warmup(self, symbols: Sequence[str], closes: Sequence[np.ndarray], highs=None, lows=None, volumes=None) -> None:
+        """Commit historical bars for many symbols at once (series may differ in length).
+
+        Series are right-aligned and fed column by column, so the cost is one
+        vectorized update per bar of the longest series.
+        """
+        if not symbols:
+            return
+        self.reset(symbols)
+        length = max((len(series) for series in closes), default=0)
+        if length == 0:
+            return
+
+        def panel(series_list):
+            grid = np.full((len(symbols), length), np.nan)
+            for i, series in enumerate(series_list):
+                if len(series):
+                    grid[i, length - len(series) :] = series
+            return grid
+
+        close = panel(closes)
+        high = panel(highs) if highs is not None else close
+        low = panel(lows) if lows is not None else close
+        volume = panel(volumes) if volumes is not None else np.zeros_like(close)
+        rows = self.rows_for(symbols)
+        for t in range(length):
+            live = ~np.isnan(close[:, t])
+            if not live.any():
+                continue
+            state = self._gather(rows[live])
+            self._step(state, close[live, t], high[live, t], low[live, t], np.nan_to_num(volume[live, t]))
+            self._scatter(rows[live], state)
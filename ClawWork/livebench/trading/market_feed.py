@@ -0,0 +1,373 @@
+"""Streaming market data: a websocket feed client and a shared last-price table.
+
+``MarketFeed`` runs a websocket connection on a background thread, keeps the
+subscribed symbol set across reconnects and pushes every tick into the
+process-wide ``LastPriceTable``. The quote cache, screener, quote tools and
+the position monitor read prices from that table without a network call.
+
+Wire protocol (JSON text frames)::
+
+    client -> {"type": "auth", "access_token": "..."}
+    client -> {"type": "subscribe", "symbols": ["NSE:SBIN-EQ", ...]}
+    client -> {"type": "unsubscribe", "symbols": [...]}
+    server -> {"type": "tick", "symbol": "NSE:SBIN-EQ", "ltp": 812.4, ...}
+    server -> {"type": "ticks", "data": [{...}, ...]}
+
+Tick fields follow the FYERS data socket names (``ltp``, ``prev_close_price``,
+``ch``, ``chp``, ``vol_traded_today``, ``exch_feed_time``). ``feed_replay`` serves
+this protocol from recorded ticks for offline testing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from .env import env_flag, env_float
+from .tick_store import TickStore, default_tick_store_dir
+
+TickListener = Callable[[Dict[str, Any]], None]
+
+
+def _num(value: Any) -> Optional[float]:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def normalize_tick(raw: Dict[str, Any], received_at: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """Map a feed message onto the table's tick shape; None if it has no symbol or price."""
+    symbol = raw.get("symbol") or raw.get("n")
+    ltp = _num(raw.get("ltp", raw.get("lp")))
+    if not symbol or ltp is None:
+        return None
+    prev_close = _num(raw.get("prev_close_price", raw.get("pc")))
+    change_pct = _num(raw.get("chp"))
+    if change_pct is None and prev_close:
+        change_pct = round((ltp - prev_close) / prev_close * 100.0, 2)
+    return {
+        "symbol": symbol,
+        "ltp": ltp,
+        "prev_close": prev_close,
+        "change": _num(raw.get("ch")),
+        "change_pct": change_pct,
+        "volume": _num(raw.get("vol_traded_today", raw.get("volume"))),
+        "exchange_ts": _num(raw.get("exch_feed_time", raw.get("last_traded_time"))),
+        "received_at": received_at if received_at is not None else time.time(),
+    }
+
+
+class LastPriceTable:
+    """Latest tick per symbol, shared by every reader in the process."""
+
+    def __init__(self) -> None:
+        self._ticks: Dict[str, Dict[str, Any]] = {}
+        self._listeners: List[TickListener] = []
+        self._lock = threading.Lock()
+        self.updates = 0
+
+    def __len__(self) -> int:
+        return len(self._ticks)
+
+    def add_listener(self, listener: TickListener) -> None:
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: TickListener) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def update(self, tick: Dict[str, Any]) -> None:
+        with self._lock:
+            previous = self._ticks.get(tick["symbol"])
+            if previous is not None:
+                # Lite-mode ticks only carry ltp; keep the fields we already know.
+                merged = {**previous, **{key: value for key, value in tick.items() if value is not None}}
+                if tick["change_pct"] is None and merged["prev_close"]:
+                    merged["change"] = round(merged["ltp"] - merged["prev_close"], 2)
+                    merged["change_pct"] = round(merged["change"] / merged["prev_close"] * 100.0, 2)
+                tick = merged
+            self._ticks[tick["symbol"]] = tick
+            self.updates += 1
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(tick)
+            except Exception:  # a broken listener must not drop the tick for the others
+                pass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ticks.clear()
+
+    def get(self, symbol: str, max_age_ms: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        tick = self._ticks.get(symbol)
+        if tick is None or max_age_ms is None:
+            return tick
+        return tick if (time.time() - tick["received_at"]) * 1000.0 <= max_age_ms else None
+
+    def last_price(self, symbol: str, max_age_ms: Optional[float] = None) -> Optional[float]:
+        tick = self.get(symbol, max_age_ms)
+        return tick["ltp"] if tick else None
+
+    def snapshot(self, symbols: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            if symbols is None:
+                return dict(self._ticks)
+            return {symbol: self._ticks[symbol] for symbol in symbols if symbol in self._ticks}
+
+    def quote_rows(self, symbols: Iterable[str], max_age_ms: float) -> Dict[str, Dict[str, Any]]:
+        """FYERS quotes-shaped rows (``{"n", "s", "v"}``) for symbols with a fresh tick."""
+        cutoff = time.time() - max_age_ms / 1000.0
+        rows: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for symbol in symbols:
+                tick = self._ticks.get(symbol)
+                if tick is None or tick["received_at"] < cutoff:
+                    continue
+                rows[symbol] = {
+                    "n": symbol,
+                    "s": "ok",
+                    "v": {
+                        "lp": tick["ltp"],
+                        "prev_close_price": tick["prev_close"],
+                        "ch": tick["change"],
+                        "chp": tick["change_pct"],
+                        "volume": tick["volume"],
+                        "source": "stream",
+                    },
+                }
+        return rows
+
+
+class MarketFeed:
+    """Websocket feed client with automatic reconnect and resubscribe."""
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        access_token: Optional[str] = None,
+        table: Optional[LastPriceTable] = None,
+        record_path: Optional[str] = None,
+        tick_store: Optional[TickStore] = None,
+    ) -> None:
+        self.url = url or os.getenv("FYERS_FEED_URL", "")
+        self.access_token = access_token if access_token is not None else os.getenv("FYERS_ACCESS_TOKEN", "")
+        self.table = table if table is not None else get_last_price_table()
+        self.record_path = Path(record_path) if record_path else None
+        self.tick_store = tick_store
+        self.reconnect_initial = env_float("FYERS_FEED_RECONNECT_INITIAL_SECONDS", 0.5)
+        self.reconnect_max = env_float("FYERS_FEED_RECONNECT_MAX_SECONDS", 30.0)
+
+        self._symbols: Set[str] = set()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ws: Any = None
+        self._stopping = threading.Event()
+        self._connected = threading.Event()
+        self._stats = {"connects": 0, "reconnects": 0, "ticks": 0, "bad_messages": 0, "last_error": None, "last_tick_at": None}
+
+    @property
+    def connected(self) -> bool:
+        return self._connected.is_set()
+
+    def start(self) -> "MarketFeed":
+        if self._thread and self._thread.is_alive():
+            return self
+        if not self.url:
+            raise ValueError("FYERS_FEED_URL is not set")
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run_thread, name="fyers-market-feed", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopping.set()
+        loop = self._loop
+        if loop is not None and self._ws is not None:
+            asyncio.run_coroutine_threadsafe(self._ws.close(), loop)
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._connected.clear()
+
+    def wait_connected(self, timeout: float = 5.0) -> bool:
+        return self._connected.wait(timeout)
+
+    def subscribe(self, symbols: Iterable[str]) -> None:
+        new = self._change_subscription(symbols, add=True)
+        if new:
+            self._send({"type": "subscribe", "symbols": new})
+
+    def unsubscribe(self, symbols: Iterable[str]) -> None:
+        removed = self._change_subscription(symbols, add=False)
+        if removed:
+            self._send({"type": "unsubscribe", "symbols": removed})
+
+    def subscriptions(self) -> List[str]:
+        with self._lock:
+            return sorted(self._symbols)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "connected": self.connected,
+            "subscribed": len(self._symbols),
+            "table_symbols": len(self.table),
+            **self._stats,
+        }
+
+    def _change_subscription(self, symbols: Iterable[str], add: bool) -> List[str]:
+        with self._lock:
+            if add:
+                changed = [symbol for symbol in dict.fromkeys(symbols) if symbol not in self._symbols]
+                self._symbols.update(changed)
+            else:
+                changed = [symbol for symbol in dict.fromkeys(symbols) if symbol in self._symbols]
+                self._symbols.difference_update(changed)
+        return changed
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        # While disconnected the subscription set is replayed on the next connect.
+        loop, ws = self._loop, self._ws
+        if loop is not None and ws is not None and self.connected:
+            asyncio.run_coroutine_threadsafe(ws.send(json.dumps(message)), loop)
+
+    def _run_thread(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._run())
+        finally:
+            self._loop.close()
+            self._loop = None
+
+    async def _run(self) -> None:
+        # Imported here so the last-price table (screener, paper broker) works without websockets.
+        try:
+            import websockets
+        except ImportError as exc:
+            self._stats["last_error"] = f"websockets is required for the market feed: {exc}"
+            return
+        delay = self.reconnect_initial
+        while not self._stopping.is_set():
+            try:
+                async with websockets.connect(self.url, max_size=None) as ws:
+                    self._ws = ws
+                    await self._on_connect(ws)
+                    delay = self.reconnect_initial
+                    async for message in ws:
+                        self._on_message(message)
+            except Exception as exc:
+                self._stats["last_error"] = f"{type(exc).__name__}: {exc}"
+            finally:
+                self._ws = None
+                self._connected.clear()
+
+            if self._stopping.is_set():
+                break
+            self._stats["reconnects"] += 1
+            # Full jitter keeps many clients from reconnecting in lockstep.
+            await asyncio.sleep(random.uniform(0, delay))
+            delay = min(delay * 2, self.reconnect_max)
+
+    async def _on_connect(self, ws: Any) -> None:
+        if self.access_token:
+            await ws.send(json.dumps({"type": "auth", "access_token": self.access_token}))
+        # subscribe()/unsubscribe() calls made before _connected is set are not sent
+        # by _send, so keep diffing until the set is unchanged and mark connected
+        # under the same lock that guards changes.
+        sent: Set[str] = set()
+        while True:
+            with self._lock:
+                current = set(self._symbols)
+                if current == sent:
+                    self._connected.set()
+                    break
+            added, removed = sorted(current - sent), sorted(sent - current)
+            if added:
+                await ws.send(json.dumps({"type": "subscribe", "symbols": added}))
+            if removed:
+                await ws.send(json.dumps({"type": "unsubscribe", "symbols": removed}))
+            sent = current
+        self._stats["connects"] += 1
+
+    def _on_message(self, message: Any) -> None:
+        try:
+            payload = json.loads(message)
+        except (TypeError, ValueError):
+            self._stats["bad_messages"] += 1
+            return
+        if not isinstance(payload, dict):
+            self._stats["bad_messages"] += 1
+            return
+
+        if payload.get("type") == "ticks":
+            raw_ticks = payload.get("data") or []
+        elif payload.get("type") == "tick" or "ltp" in payload:
+            raw_ticks = [payload]
+        else:
+            return
+
+        received_at = time.time()
+        accepted: List[Dict[str, Any]] = []
+        for raw in raw_ticks:
+            tick = normalize_tick(raw, received_at) if isinstance(raw, dict) else None
+            if tick is None:
+                self._stats["bad_messages"] += 1
+                continue
+            self.table.update(tick)
+            accepted.append(tick)
+            if self.record_path is not None:
+                self._record(raw, received_at)
+        self._stats["ticks"] += len(accepted)
+        self._stats["last_tick_at"] = received_at
+        if self.tick_store is not None and accepted:
+            self.tick_store.append_ticks(accepted)
+
+    def _record(self, raw: Dict[str, Any], received_at: float) -> None:
+        self.record_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.record_path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps({**raw, "received_at": received_at}) + "\n")
+
+
+_LAST_PRICE_TABLE: Optional[LastPriceTable] = None
+_MARKET_FEED: Optional[MarketFeed] = None
+_FEED_LOCK = threading.Lock()
+
+
+def get_last_price_table() -> LastPriceTable:
+    """Return the process-wide last-price table."""
+    global _LAST_PRICE_TABLE
+    with _FEED_LOCK:
+        if _LAST_PRICE_TABLE is None:
+            _LAST_PRICE_TABLE = LastPriceTable()
+        return _LAST_PRICE_TABLE
+
+
+def get_market_feed(start: bool = True) -> Optional[MarketFeed]:
+    """Return the process-wide feed (started on first use), or None if FYERS_FEED_URL is unset."""
+    global _MARKET_FEED
+    if not os.getenv("FYERS_FEED_URL"):
+        return None
+    table = get_last_price_table()
+    with _FEED_LOCK:
+        if _MARKET_FEED is None:
+            tick_store = TickStore(default_tick_store_dir()) if env_flag("FYERS_FEED_RECORD", False) else None
+            _MARKET_FEED = MarketFeed(table=table, tick_store=tick_store)
+        feed = _MARKET_FEED
+    return feed.start() if start else feed
+
+
+def stream_max_age_ms() -> float:
+    """How old a streamed tick may be and still replace a REST quote."""
+    return env_float("FYERS_FEED_MAX_AGE_MS", 5000.0)
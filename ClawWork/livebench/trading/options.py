@@ -0,0 +1,535 @@
+"""FYERS option chains with implied volatility and Greeks over the whole chain.
+
+``FyersClient.option_chain`` calls ``/data/options-chain-v3``; the response is
+parsed into parallel NumPy arrays (one entry per CE/PE contract) and every
+analytic is an array operation over the chain:
+
+- Black-Scholes prices with a continuous dividend yield (``norm_cdf`` uses a
+  rational ``erfc`` approximation, fractional error below 1.2e-7, so no SciPy)
+- implied volatility from a vectorized Newton iteration that falls back to
+  bisection inside a per-contract bracket whenever a Newton step leaves it
+- delta, gamma, theta (per calendar day) and vega (per volatility point)
+
+``OptionChainCache`` keeps one analysed chain per (underlying, expiry,
+strike count) for ``FYERS_OPTIONS_TTL_MS`` and the expiry list per
+underlying for ``FYERS_OPTIONS_EXPIRY_TTL_SECONDS``; concurrent callers of
+the same chain share one fetch. ``summarize_chain`` turns a chain into the
+compact view the agent tool returns (ATM IV, skew, PCR, max pain, strikes
+around the money).
+
+Usage:
+    python -m livebench.trading.options --symbol NSE:NIFTY50-INDEX --strikes 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .env import env_float
+from .tick_store import IST
+
+SECONDS_PER_YEAR = 365.0 * 86400.0
+MIN_VOL = 1e-4
+MAX_VOL = 5.0
+
+
+def _num(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+# -- Black-Scholes -------------------------------------------------------
+
+
+def _erfc(x: np.ndarray) -> np.ndarray:
+    z = np.abs(x)
+    t = 1.0 / (1.0 + 0.5 * z)
+    poly = -1.26551223 + t * (1.00002368 + t * (0.37409196 + t * (0.09678418 + t * (-0.18628806 + t * (
+        0.27886807 + t * (-1.13520398 + t * (1.48851587 + t * (-0.82215223 + t * 0.17087277))))))))
+    ans = t * np.exp(-z * z + poly)
+    return np.where(x >= 0.0, ans, 2.0 - ans)
+
+
+def norm_cdf(x: np.ndarray) -> np.ndarray:
+    return 0.5 * _erfc(-np.asarray(x, dtype=np.float64) / np.sqrt(2.0))
+
+
+def norm_pdf(x: np.ndarray) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float64)
+    return np.exp(-0.5 * x * x) / np.sqrt(2.0 * np.pi)
+
+
+def _d1_d2(spot: Any, strike: Any, t: Any, vol: Any, rate: float, q: float) -> Tuple[np.ndarray, np.ndarray]:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        root_t = vol * np.sqrt(t)
+        d1 = (np.log(spot / strike) + (rate - q + 0.5 * vol * vol) * t) / root_t
+    return d1, d1 - root_t
+
+
+def bs_price(spot: Any, strike: Any, t: Any, vol: Any, rate: float, is_call: Any, q: float = 0.0) -> np.ndarray:
+    """European option prices; every argument broadcasts."""
+    d1, d2 = _d1_d2(spot, strike, t, vol, rate, q)
+    disc_spot = spot * np.exp(-q * t)
+    disc_strike = strike * np.exp(-rate * t)
+    call = disc_spot * norm_cdf(d1) - disc_strike * norm_cdf(d2)
+    put = disc_strike * norm_cdf(-d2) - disc_spot * norm_cdf(-d1)
+    return np.where(is_call, call, put)
+
+
+def bs_greeks(spot: Any, strike: Any, t: Any, vol: Any, rate: float, is_call: Any, q: float = 0.0) -> Dict[str, np.ndarray]:
+    """Delta, gamma, theta per calendar day and vega per volatility point."""
+    d1, d2 = _d1_d2(spot, strike, t, vol, rate, q)
+    disc_q = np.exp(-q * t)
+    disc_r = np.exp(-rate * t)
+    pdf = norm_pdf(d1)
+    cdf_d1, cdf_d2 = norm_cdf(d1), norm_cdf(d2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        root_t = np.sqrt(t)
+        gamma = disc_q * pdf / (spot * vol * root_t)
+        decay = -spot * disc_q * pdf * vol / (2.0 * root_t)
+    call_theta = decay - rate * strike * disc_r * cdf_d2 + q * spot * disc_q * cdf_d1
+    put_theta = decay + rate * strike * disc_r * (1.0 - cdf_d2) - q * spot * disc_q * (1.0 - cdf_d1)
+    return {
+        "delta": np.where(is_call, disc_q * cdf_d1, disc_q * (cdf_d1 - 1.0)),
+        "gamma": gamma,
+        "theta": np.where(is_call, call_theta, put_theta) / 365.0,
+        "vega": spot * disc_q * pdf * root_t / 100.0,
+    }
+
+
+def implied_volatility(
+    price: Any,
+    spot: Any,
+    strike: Any,
+    t: Any,
+    rate: float,
+    is_call: Any,
+    q: float = 0.0,
+    vol_tol: float = 1e-6,
+    max_iter: int = 64,
+    min_time_value: float = 1e-6,
+) -> np.ndarray:
+    """Solve Black-Scholes IV for every contract at once; NaN where no volatility fits.
+
+    Each contract keeps a bracket [lo, hi] that shrinks with the sign of the
+    pricing error. A Newton step is taken when it lands inside the bracket
+    (fast near the money), otherwise the bracket is bisected (robust for
+    deep in/out of the money contracts with tiny vega). Only contracts that
+    have not converged are re-priced on each pass. Prices whose time value
+    is below ``min_time_value`` times spot are left as NaN.
+    """
+    price, spot, strike, t, is_call = np.broadcast_arrays(
+        np.asarray(price, dtype=np.float64),
+        np.asarray(spot, dtype=np.float64),
+        np.asarray(strike, dtype=np.float64),
+        np.asarray(t, dtype=np.float64),
+        np.asarray(is_call, dtype=bool),
+    )
+    disc_spot = spot * np.exp(-q * t)
+    disc_strike = strike * np.exp(-rate * t)
+    intrinsic = np.where(is_call, np.maximum(disc_spot - disc_strike, 0.0), np.maximum(disc_strike - disc_spot, 0.0))
+    upper = np.where(is_call, disc_spot, disc_strike)
+    with np.errstate(invalid="ignore"):
+        # Deep in-the-money prices with (almost) no time value do not pin down a volatility.
+        solvable = (
+            np.isfinite(price) & (t > 0) & (spot > 0) & (strike > 0)
+            & (price - intrinsic > min_time_value * spot) & (price < upper)
+        )
+
+    iv = np.full(price.shape, np.nan)
+    idx = np.flatnonzero(solvable)
+    if not len(idx):
+        return iv
+    p, s, k, tt, call = price.ravel()[idx], spot.ravel()[idx], strike.ravel()[idx], t.ravel()[idx], is_call.ravel()[idx]
+    lo = np.full(len(idx), MIN_VOL)
+    hi = np.full(len(idx), MAX_VOL)
+    # Brenner-Subrahmanyam starting point, kept inside the bracket.
+    sigma = np.clip(np.sqrt(2.0 * np.pi / tt) * p / s, 0.05, 1.0)
+    price_tol = 1e-9 * s
+    active = np.arange(len(idx))
+    for _ in range(max_iter):
+        a_sigma, a_s, a_k, a_t = sigma[active], s[active], k[active], tt[active]
+        diff = bs_price(a_s, a_k, a_t, a_sigma, rate, call[active], q) - p[active]
+        hi[active] = np.where(diff > 0, a_sigma, hi[active])
+        lo[active] = np.where(diff < 0, a_sigma, lo[active])
+        d1, _ = _d1_d2(a_s, a_k, a_t, a_sigma, rate, q)
+        vega = a_s * np.exp(-q * a_t) * norm_pdf(d1) * np.sqrt(a_t)
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            newton = a_sigma - diff / vega
+        inside = np.isfinite(newton) & (newton > lo[active]) & (newton < hi[active])
+        updated = np.where(inside, newton, 0.5 * (lo[active] + hi[active]))
+        sigma[active] = updated
+        done = (np.abs(diff) <= price_tol[active]) | (np.abs(updated - a_sigma) < vol_tol) | (hi[active] - lo[active] < vol_tol)
+        active = active[~done]
+        if not len(active):
+            break
+    result = iv.ravel()
+    result[idx] = sigma
+    # A solution pinned to the bracket edge means no volatility in range fits.
+    result[idx[(sigma <= MIN_VOL * 1.01) | (sigma >= MAX_VOL * 0.99)]] = np.nan
+    return result.reshape(price.shape)
+
+
+# -- chain parsing -------------------------------------------------------
+
+
+@dataclass
+class OptionChain:
+    """One expiry of an option chain as parallel arrays (a row per contract)."""
+
+    underlying: str
+    spot: float
+    expiry: Optional[int]
+    expiries: List[Dict[str, Any]]
+    symbols: List[str]
+    strike: np.ndarray
+    is_call: np.ndarray
+    ltp: np.ndarray
+    bid: np.ndarray
+    ask: np.ndarray
+    oi: np.ndarray
+    oi_change: np.ndarray
+    volume: np.ndarray
+    vix: Optional[float] = None
+    fetched_at: float = field(default_factory=time.time)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+
+def _expiry_list(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    expiries = []
+    for item in data.get("expiryData") or []:
+        stamp = _num(item.get("expiry"))
+        if stamp == stamp:
+            expiries.append({"date": item.get("date"), "expiry": int(stamp)})
+    return sorted(expiries, key=lambda item: item["expiry"])
+
+
+def parse_option_chain(body: Any, underlying: str, expiry: Optional[int] = None) -> Optional[OptionChain]:
+    """Parse an ``options-chain-v3`` body; None when it has no option rows.
+
+    The row with ``strike_price == -1`` is the underlying; without a requested
+    ``expiry`` the chain belongs to the nearest listed expiry.
+    """
+    data = body.get("data") if isinstance(body, dict) else None
+    rows = (data or {}).get("optionsChain") or []
+    if not isinstance(rows, list):
+        return None
+    spot = float("nan")
+    options = []
+    for row in rows:
+        if not isinstance(row, dict):
+            continue
+        kind = row.get("option_type")
+        if kind in ("CE", "PE"):
+            options.append(row)
+        elif _num(row.get("strike_price")) < 0 or row.get("symbol") == underlying:
+            spot = _num(row.get("ltp"))
+    if not options:
+        return None
+
+    def column(key: str) -> np.ndarray:
+        return np.array([_num(row.get(key)) for row in options], dtype=np.float64)
+
+    expiries = _expiry_list(data)
+    vix = _num(((data.get("indiavixData") or {}).get("ltp")))
+    return OptionChain(
+        underlying=underlying,
+        spot=spot,
+        expiry=expiry if expiry is not None else (expiries[0]["expiry"] if expiries else None),
+        expiries=expiries,
+        symbols=[str(row.get("symbol") or "") for row in options],
+        strike=column("strike_price"),
+        is_call=np.array([row.get("option_type") == "CE" for row in options], dtype=bool),
+        ltp=column("ltp"),
+        bid=column("bid"),
+        ask=column("ask"),
+        oi=np.nan_to_num(column("oi")),
+        oi_change=np.nan_to_num(column("oich")),
+        volume=np.nan_to_num(column("volume")),
+        vix=vix if vix == vix else None,
+    )
+
+
+def option_prices(chain: OptionChain, max_spread_pct: Optional[float] = None) -> np.ndarray:
+    """Mid price where the quote is two-sided and tight enough, else the last traded price."""
+    max_spread_pct = max_spread_pct if max_spread_pct is not None else env_float("FYERS_OPTIONS_MAX_SPREAD_PCT", 10.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mid = (chain.bid + chain.ask) / 2.0
+        tight = (chain.bid > 0) & (chain.ask >= chain.bid) & ((chain.ask - chain.bid) / mid * 100.0 <= max_spread_pct)
+    return np.where(tight, mid, np.where(chain.ltp > 0, chain.ltp, np.nan))
+
+
+def analyze_chain(chain: OptionChain, now: Optional[float] = None, rate: Optional[float] = None, q: Optional[float] = None) -> Dict[str, np.ndarray]:
+    """IV and Greeks for every contract of ``chain`` (NaN where IV has no solution)."""
+    now = time.time() if now is None else now
+    rate = rate if rate is not None else env_float("FYERS_OPTIONS_RISK_FREE_RATE", 0.065)
+    q = q if q is not None else env_float("FYERS_OPTIONS_DIVIDEND_YIELD", 0.0)
+    t = max((chain.expiry or 0) - now, 0.0) / SECONDS_PER_YEAR
+    price = option_prices(chain)
+    # Wing contracts quoted at the exchange's minimum tick carry no volatility information.
+    min_price = env_float("FYERS_OPTIONS_MIN_PRICE", 0.1)
+    with np.errstate(invalid="ignore"):
+        quoted = np.where(price > min_price, price, np.nan)
+    iv = implied_volatility(quoted, chain.spot, chain.strike, t, rate, chain.is_call, q)
+    # In-the-money legs without usable time value take the out-of-the-money leg's IV at the same strike.
+    missing = ~np.isfinite(iv)
+    if missing.any():
+        _, codes = np.unique(chain.strike, return_inverse=True)
+        otm = np.isfinite(iv) & (chain.is_call == (chain.strike >= chain.spot))
+        by_strike = np.full(codes.max() + 1, np.nan)
+        by_strike[codes[otm]] = iv[otm]
+        iv = np.where(missing, by_strike[codes], iv)
+    greeks = bs_greeks(chain.spot, chain.strike, t, iv, rate, chain.is_call, q)
+    return {"price": price, "iv": iv, "t_years": np.full(len(chain), t), **greeks}
+
+
+# -- summary -------------------------------------------------------------
+
+
+def max_pain(strikes: np.ndarray, is_call: np.ndarray, oi: np.ndarray) -> Optional[float]:
+    """Strike at which option writers pay out the least at expiry."""
+    levels = np.unique(strikes[np.isfinite(strikes)])
+    if not len(levels):
+        return None
+    call_oi = np.where(is_call, oi, 0.0)
+    put_oi = np.where(is_call, 0.0, oi)
+    settle = levels[:, None]
+    payout = (np.maximum(settle - strikes, 0.0) * call_oi + np.maximum(strikes - settle, 0.0) * put_oi).sum(axis=1)
+    return float(levels[int(np.argmin(payout))])
+
+
+def _round(value: Any, digits: int) -> Optional[float]:
+    value = float(value)
+    return round(value, digits) if np.isfinite(value) else None
+
+
+def summarize_chain(chain: OptionChain, analytics: Dict[str, np.ndarray], strikes_around: int = 5) -> Dict[str, Any]:
+    """Compact view: ATM IV, 25-delta skew, PCR, max pain, OI walls and strikes around the money."""
+    strikes = np.unique(chain.strike[np.isfinite(chain.strike)])
+    iv, delta = analytics["iv"], analytics["delta"]
+    calls, puts = chain.is_call, ~chain.is_call
+    atm = float(strikes[int(np.argmin(np.abs(strikes - chain.spot)))]) if len(strikes) and np.isfinite(chain.spot) else None
+
+    def near_delta(mask: np.ndarray, target: float) -> Optional[int]:
+        candidates = np.flatnonzero(mask & np.isfinite(delta))
+        return int(candidates[np.argmin(np.abs(delta[candidates] - target))]) if len(candidates) else None
+
+    atm_rows = np.flatnonzero((chain.strike == atm) & np.isfinite(iv)) if atm is not None else np.empty(0, dtype=np.int64)
+    put_25, call_25 = near_delta(puts, -0.25), near_delta(calls, 0.25)
+    call_oi, put_oi = float(chain.oi[calls].sum()), float(chain.oi[puts].sum())
+
+    def wall(mask: np.ndarray) -> Optional[Dict[str, Any]]:
+        rows = np.flatnonzero(mask)
+        if not len(rows):
+            return None
+        top = rows[int(np.argmax(chain.oi[rows]))]
+        return {"strike": float(chain.strike[top]), "oi": int(chain.oi[top])}
+
+    def leg(i: Optional[int]) -> Optional[Dict[str, Any]]:
+        if i is None:
+            return None
+        return {
+            "symbol": chain.symbols[i],
+            "ltp": _round(chain.ltp[i], 2),
+            "iv": _round(iv[i] * 100.0, 2),
+            "delta": _round(delta[i], 3),
+            "gamma": _round(analytics["gamma"][i], 6),
+            "theta": _round(analytics["theta"][i], 2),
+            "vega": _round(analytics["vega"][i], 2),
+            "oi": int(chain.oi[i]),
+            "oi_change": int(chain.oi_change[i]),
+        }
+
+    rows: List[Dict[str, Any]] = []
+    if atm is not None:
+        center = int(np.searchsorted(strikes, atm))
+        call_at = {float(k): i for i, k in enumerate(chain.strike) if calls[i]}
+        put_at = {float(k): i for i, k in enumerate(chain.strike) if puts[i]}
+        for level in strikes[max(center - strikes_around, 0) : center + strikes_around + 1].tolist():
+            rows.append({"strike": level, "ce": leg(call_at.get(level)), "pe": leg(put_at.get(level))})
+
+    expiry = chain.expiry
+    return {
+        "underlying": chain.underlying,
+        "spot": _round(chain.spot, 2),
+        "expiry": datetime.fromtimestamp(expiry, IST).strftime("%Y-%m-%d") if expiry else None,
+        "days_to_expiry": round(float(analytics["t_years"][0]) * 365.0, 2) if len(chain) else None,
+        "expiries": [datetime.fromtimestamp(item["expiry"], IST).strftime("%Y-%m-%d") for item in chain.expiries],
+        "contracts": len(chain),
+        "iv_solved": int(np.isfinite(iv).sum()),
+        "atm_strike": atm,
+        "atm_iv": _round(iv[atm_rows].mean() * 100.0, 2) if len(atm_rows) else None,
+        "skew_25d": _round((iv[put_25] - iv[call_25]) * 100.0, 2) if put_25 is not None and call_25 is not None else None,
+        "pcr_oi": round(put_oi / call_oi, 3) if call_oi else None,
+        "max_pain": max_pain(chain.strike, chain.is_call, chain.oi),
+        "call_oi_wall": wall(calls),
+        "put_oi_wall": wall(puts),
+        "vix": chain.vix,
+        "strikes": rows,
+    }
+
+
+# -- fetching and caching ------------------------------------------------
+
+
+def resolve_expiry(expiries: List[Dict[str, Any]], expiry: Any) -> Tuple[Optional[int], Optional[str]]:
+    """Map an expiry argument to a listed expiry timestamp; returns (timestamp, error).
+
+    Accepts None (nearest), an index into the list (0 = nearest), an epoch
+    timestamp, or a date as YYYY-MM-DD or DD-MM-YYYY.
+    """
+    if expiry is None or (isinstance(expiry, str) and not expiry.strip()):
+        return None, None
+    text = str(expiry).strip()
+    listed = {item["expiry"]: item for item in expiries}
+    if text.isdigit():
+        value = int(text)
+        if value < len(expiries):
+            return expiries[value]["expiry"], None
+        if value in listed or not expiries:
+            return value, None
+    for fmt in ("%Y-%m-%d", "%d-%m-%Y"):
+        try:
+            day = datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+        for item in expiries:
+            if datetime.fromtimestamp(item["expiry"], IST).date() == day:
+                return item["expiry"], None
+        break
+    dates = [datetime.fromtimestamp(item["expiry"], IST).strftime("%Y-%m-%d") for item in expiries]
+    return None, f"Unknown expiry '{expiry}'; listed expiries: {', '.join(dates) or 'none'}"
+
+
+class OptionChainCache:
+    """Analysed chains per (underlying, expiry, strike count) with a short TTL."""
+
+    def __init__(self, ttl_ms: Optional[float] = None, expiry_ttl_seconds: Optional[float] = None) -> None:
+        self.ttl_ms = ttl_ms if ttl_ms is not None else env_float("FYERS_OPTIONS_TTL_MS", 5000.0)
+        self.expiry_ttl_seconds = (
+            expiry_ttl_seconds if expiry_ttl_seconds is not None else env_float("FYERS_OPTIONS_EXPIRY_TTL_SECONDS", 3600.0)
+        )
+        self._chains: Dict[Tuple[str, Optional[int], int], Tuple[OptionChain, Dict[str, np.ndarray]]] = {}
+        self._expiries: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+        self._key_locks: Dict[Tuple[str, Optional[int], int], threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "fetches": 0, "failures": 0}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._chains.clear()
+            self._expiries.clear()
+
+    def expiries(self, client: Any, underlying: str) -> Dict[str, Any]:
+        """Listed expiries for ``underlying`` (from any recent chain fetch, else a minimal one)."""
+        cached = self._expiries.get(underlying)
+        if cached is not None and time.time() - cached[0] < self.expiry_ttl_seconds:
+            return {"success": True, "expiries": cached[1]}
+        result = self.get(client, underlying, None, 1)
+        if not result["success"]:
+            return result
+        return {"success": True, "expiries": result["chain"].expiries}
+
+    def get(self, client: Any, underlying: str, expiry: Optional[int] = None, strike_count: int = 10) -> Dict[str, Any]:
+        key = (underlying, expiry, int(strike_count))
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # Callers of the same chain wait for one fetch instead of each calling FYERS.
+        with key_lock:
+            cached = self._chains.get(key)
+            if cached is not None:
+                age_ms = (time.time() - cached[0].fetched_at) * 1000.0
+                if age_ms <= self.ttl_ms:
+                    self.stats["hits"] += 1
+                    return {"success": True, "chain": cached[0], "analytics": cached[1], "cached": True, "age_ms": round(age_ms, 1)}
+
+            response = client.option_chain(underlying, strike_count, expiry)
+            self.stats["fetches"] += 1
+            chain = parse_option_chain(response.get("data"), underlying, expiry) if response.get("success") else None
+            if chain is None:
+                self.stats["failures"] += 1
+                error = response.get("error") if not response.get("success") else f"No option contracts returned for {underlying}"
+                return {"success": False, "error": error, "status_code": response.get("status_code")}
+            started = time.perf_counter()
+            analytics = analyze_chain(chain)
+            analytics_ms = (time.perf_counter() - started) * 1000.0
+            with self._lock:
+                self._chains[key] = (chain, analytics)
+                if chain.expiries:
+                    self._expiries[underlying] = (chain.fetched_at, chain.expiries)
+            return {
+                "success": True,
+                "chain": chain,
+                "analytics": analytics,
+                "cached": False,
+                "age_ms": 0.0,
+                "analytics_ms": round(analytics_ms, 3),
+            }
+
+
+_OPTION_CHAIN_CACHE: Optional[OptionChainCache] = None
+_OPTION_CHAIN_CACHE_LOCK = threading.Lock()
+
+
+def get_option_chain_cache() -> OptionChainCache:
+    global _OPTION_CHAIN_CACHE
+    with _OPTION_CHAIN_CACHE_LOCK:
+        if _OPTION_CHAIN_CACHE is None:
+            _OPTION_CHAIN_CACHE = OptionChainCache()
+        return _OPTION_CHAIN_CACHE
+
+
+def option_chain_summary(client: Any, underlying: str, expiry: Any = None, strikes: int = 10, around: int = 5) -> Dict[str, Any]:
+    """Fetch (or reuse) one expiry of ``underlying``'s chain and summarize it."""
+    if not underlying or not underlying.strip():
+        return {"success": False, "error": "symbol is required"}
+    underlying = underlying.strip().upper()
+    cache = get_option_chain_cache()
+    expiry_ts = None
+    if expiry is not None and str(expiry).strip():
+        listed = cache.expiries(client, underlying)
+        if not listed["success"]:
+            return listed
+        expiry_ts, error = resolve_expiry(listed["expiries"], expiry)
+        if error:
+            return {"success": False, "error": error}
+    result = cache.get(client, underlying, expiry_ts, max(int(strikes), 1))
+    if not result["success"]:
+        return result
+    summary = summarize_chain(result["chain"], result["analytics"], max(int(around), 0))
+    return {
+        "success": True,
+        **summary,
+        "cached": result["cached"],
+        "age_ms": result["age_ms"],
+        "analytics_ms": result.get("analytics_ms"),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Fetch a FYERS option chain and print its IV/Greeks summary.")
+    parser.add_argument("--symbol", default="NSE:NIFTY50-INDEX", help="Underlying symbol")
+    parser.add_argument("--expiry", help="Expiry date (YYYY-MM-DD) or index (0 = nearest)")
+    parser.add_argument("--strikes", type=int, default=10, help="Strikes on each side of the money to fetch")
+    parser.add_argument("--around", type=int, default=5, help="Strikes on each side to print")
+    args = parser.parse_args(argv)
+
+    from .fyers_client import FyersClient
+
+    print(json.dumps(option_chain_summary(FyersClient(), args.symbol, args.expiry, args.strikes, args.around), indent=2))
+
+
+if __name__ == "__main__":
+    main()
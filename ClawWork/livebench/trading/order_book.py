@@ -0,0 +1,431 @@
+"""In-memory FYERS order and position book with background reconciliation.
+
+``AccountBook`` keeps positions, open orders, holdings and funds in memory so
+position, exposure and open-order questions are answered without an API
+call. Order acknowledgements and order updates are applied incrementally:
+every ``/orders`` load is diffed row by row through ``apply_order_update``,
+which tells listeners (e.g. the trigger engine arming a filled entry's
+stop/target) about new fills and status changes, and an update arriving on
+its own moves the position with the same average-price accounting as the
+paper broker. FYERS stays the source of truth: a background thread
+reconciles against ``/positions``, ``/orders`` and ``/funds`` every
+``FYERS_BOOK_RECONCILE_SECONDS``, and sooner when the book is marked dirty
+(a new order was acknowledged, or an update did not line up with what the
+book expected). ``/holdings`` changes rarely and is refreshed on a longer
+cycle. Every reconciliation records the positions that had diverged.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .env import env_flag, env_float
+from .market_feed import LastPriceTable, get_last_price_table, stream_max_age_ms
+from .paper_trading import ORDER_STATUS_PENDING, net_fill
+
+ClientFactory = Callable[[], Any]
+OrderListener = Callable[[Dict[str, Any]], None]
+
+OPEN_ORDER_STATUSES = {ORDER_STATUS_PENDING, 4}  # 4 = transit
+
+
+def _num(value: Any, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _payload(response: Dict[str, Any]) -> Dict[str, Any]:
+    data = response.get("data") if isinstance(response, dict) else None
+    return data if isinstance(data, dict) else {}
+
+
+def _snake(title: str) -> str:
+    return "_".join(str(title).lower().split())
+
+
+class AccountBook:
+    """Local view of the FYERS account, updated from order events and reconciled periodically."""
+
+    def __init__(
+        self,
+        table: Optional[LastPriceTable] = None,
+        reconcile_seconds: Optional[float] = None,
+        holdings_seconds: Optional[float] = None,
+        min_reconcile_gap_seconds: float = 1.0,
+    ) -> None:
+        self.table = table if table is not None else get_last_price_table()
+        self.reconcile_seconds = reconcile_seconds or env_float("FYERS_BOOK_RECONCILE_SECONDS", 60.0)
+        self.holdings_seconds = holdings_seconds or env_float("FYERS_BOOK_HOLDINGS_SECONDS", 900.0)
+        self.min_reconcile_gap_seconds = min_reconcile_gap_seconds
+
+        self._lock = threading.RLock()
+        self._positions: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._orders: Dict[str, Dict[str, Any]] = {}
+        self._holdings: List[Dict[str, Any]] = []
+        self._funds: Dict[str, float] = {}
+        # Symbols with orders acknowledged since the last reconciliation: FYERS
+        # is expected to differ there, so they are not reported as divergences.
+        self._acked_symbols: set = set()
+        self._listeners: List[OrderListener] = []
+        self.stats: Dict[str, Any] = {
+            "acks": 0,
+            "order_updates": 0,
+            "fills_applied": 0,
+            "reconciles": 0,
+            "reconcile_failures": 0,
+            "divergences": 0,
+        }
+        self.last_divergences: List[Dict[str, Any]] = []
+        self.reconciled_at: Optional[float] = None
+        self.holdings_at: Optional[float] = None
+        self.positions_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+        self._dirty = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # -- loading full FYERS payloads -----------------------------------
+
+    def load_positions(self, response: Dict[str, Any], settled: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+        """Replace positions from a ``/positions`` response; returns the positions that had diverged.
+
+        ``settled`` is the set of acked symbols snapshotted before the fetch; only
+        those stop counting as pending (all of them when omitted).
+        """
+        if not response.get("success"):
+            return []
+        fresh: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for item in _payload(response).get("netPositions") or []:
+            if not isinstance(item, dict) or not item.get("symbol"):
+                continue
+            key = (item["symbol"], str(item.get("productType") or "INTRADAY"))
+            fresh[key] = {
+                "symbol": key[0],
+                "product_type": key[1],
+                "net_qty": int(_num(item.get("netQty", item.get("qty")))),
+                "avg_price": _num(item.get("netAvg", item.get("avgPrice"))),
+                "realized_pnl": _num(item.get("realized_profit")),
+                "rest_ltp": _num(item.get("ltp"), default=0.0) or None,
+            }
+        with self._lock:
+            divergences = [
+                {"symbol": key[0], "product_type": key[1], "book_qty": self._positions.get(key, {}).get("net_qty", 0), "fyers_qty": fresh.get(key, {}).get("net_qty", 0)}
+                for key in set(self._positions) | set(fresh)
+                if self._positions.get(key, {}).get("net_qty", 0) != fresh.get(key, {}).get("net_qty", 0)
+                and key[0] not in self._acked_symbols
+            ]
+            self._positions = fresh
+            self.positions_at = time.time()
+            if settled is None:
+                self._acked_symbols.clear()
+            else:
+                # Orders acked while the fetch was in flight stay pending.
+                self._acked_symbols -= settled
+        return divergences
+
+    def load_orders(self, response: Dict[str, Any], move_positions: bool = True) -> None:
+        """Replace the order book from a ``/orders`` response, applying each row as an order update.
+
+        A reconcile passes ``move_positions=False``: its positions come from the
+        same snapshot, so the fills must not be applied to them a second time.
+        """
+        if not response.get("success"):
+            return
+        items = [item for item in _payload(response).get("orderBook") or [] if isinstance(item, dict) and item.get("id")]
+        fresh = {str(item["id"]) for item in items}
+        with self._lock:
+            self._orders = {order_id: row for order_id, row in self._orders.items() if order_id in fresh}
+        for item in items:
+            self.apply_order_update(item, move_position=move_positions)
+
+    def load_funds(self, response: Dict[str, Any]) -> None:
+        if not response.get("success"):
+            return
+        funds = {
+            _snake(item.get("title", item.get("id"))): _num(item.get("equityAmount"))
+            for item in _payload(response).get("fund_limit") or []
+            if isinstance(item, dict)
+        }
+        with self._lock:
+            self._funds = funds
+
+    def load_holdings(self, response: Dict[str, Any]) -> None:
+        if not response.get("success"):
+            return
+        holdings = [
+            {
+                "symbol": item.get("symbol"),
+                "quantity": int(_num(item.get("quantity", item.get("remainingQuantity")))),
+                "cost_price": _num(item.get("costPrice")),
+                "rest_ltp": _num(item.get("ltp"), default=0.0) or None,
+            }
+            for item in _payload(response).get("holdings") or []
+            if isinstance(item, dict) and item.get("symbol")
+        ]
+        with self._lock:
+            self._holdings = holdings
+            self.holdings_at = time.time()
+
+    # -- incremental updates -------------------------------------------
+
+    @staticmethod
+    def _order_row(item: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": str(item.get("id")),
+            "symbol": item.get("symbol"),
+            "side": int(_num(item.get("side"))),
+            "qty": int(_num(item.get("qty"))),
+            "filled_qty": int(_num(item.get("filledQty"))),
+            "traded_price": _num(item.get("tradedPrice")),
+            "limit_price": _num(item.get("limitPrice")),
+            "type": int(_num(item.get("type"))),
+            "product_type": str(item.get("productType") or "INTRADAY"),
+            "status": int(_num(item.get("status"), ORDER_STATUS_PENDING)),
+        }
+
+    def record_ack(self, payload: Dict[str, Any], result: Dict[str, Any]) -> Optional[str]:
+        """Track a live order FYERS acknowledged; the next reconciliation confirms its fills."""
+        order_id = _payload(result).get("id") if result.get("success") else None
+        if not order_id:
+            return None
+        row = self._order_row({**payload, "id": order_id, "status": ORDER_STATUS_PENDING, "filledQty": 0})
+        with self._lock:
+            self._orders[row["id"]] = row
+            self._acked_symbols.add(row["symbol"])
+            self.stats["acks"] += 1
+        self.mark_dirty()
+        return row["id"]
+
+    def add_listener(self, listener: OrderListener) -> None:
+        """Call ``listener(order_row)`` whenever an order's fill or status changes."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: OrderListener) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def apply_order_update(self, item: Dict[str, Any], move_position: bool = True) -> None:
+        """Apply an order-book row or order-update message; new fills move the position."""
+        update = self._order_row(item)
+        with self._lock:
+            known = self._orders.get(update["id"])
+            self._orders[update["id"]] = update
+            if known is not None and (known["filled_qty"], known["status"]) == (update["filled_qty"], update["status"]):
+                return
+            self.stats["order_updates"] += 1
+            if move_position:
+                self._apply_fill(update, known)
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(dict(update))
+            except Exception as exc:  # a broken listener must not stop the book
+                self.last_error = f"Order listener failed: {exc}"
+
+    def _apply_fill(self, update: Dict[str, Any], known: Optional[Dict[str, Any]]) -> None:
+        previous_filled = known["filled_qty"] if known else 0
+        previous_value = previous_filled * known["traded_price"] if known else 0.0
+        delta = update["filled_qty"] - previous_filled
+        if delta < 0 or (known is None and update["filled_qty"]):
+            # Missed updates: let FYERS settle the position.
+            self._dirty.set()
+            return
+        if delta == 0:
+            return
+        # tradedPrice is the average over all fills; recover this fill's price.
+        fill_price = (update["filled_qty"] * update["traded_price"] - previous_value) / delta
+        key = (update["symbol"], update["product_type"])
+        position = self._positions.setdefault(
+            key,
+            {"symbol": key[0], "product_type": key[1], "net_qty": 0, "avg_price": 0.0, "realized_pnl": 0.0, "rest_ltp": None},
+        )
+        position["net_qty"], position["avg_price"], position["realized_pnl"] = net_fill(
+            position["net_qty"], position["avg_price"], position["realized_pnl"], delta * update["side"], fill_price
+        )
+        self.stats["fills_applied"] += 1
+
+    # -- queries (memory only) -----------------------------------------
+
+    def _ltp(self, symbol: str, fallback: Optional[float]) -> Tuple[Optional[float], str]:
+        ltp = self.table.last_price(symbol, stream_max_age_ms())
+        if ltp is not None:
+            return ltp, "stream"
+        return fallback, "rest"
+
+    def positions(self, symbol: Optional[str] = None, include_flat: bool = False, mark: bool = True) -> List[Dict[str, Any]]:
+        """Net positions, marked to the streamed or REST price unless ``mark`` is False."""
+        with self._lock:
+            rows = [dict(p) for p in self._positions.values() if (symbol is None or p["symbol"] == symbol) and (include_flat or p["net_qty"])]
+        if not mark:
+            return rows
+        for row in rows:
+            ltp, source = self._ltp(row["symbol"], row["rest_ltp"] or row["avg_price"] or None)
+            row["ltp"] = ltp
+            row["price_source"] = source
+            row["market_value"] = round(ltp * row["net_qty"], 2) if ltp is not None else None
+            row["unrealized_pnl"] = round((ltp - row["avg_price"]) * row["net_qty"], 2) if ltp is not None else None
+        return rows
+
+    def order(self, order_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._orders.get(str(order_id))
+            return dict(row) if row else None
+
+    def open_orders(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                dict(order)
+                for order in self._orders.values()
+                if order["status"] in OPEN_ORDER_STATUSES and (symbol is None or order["symbol"] == symbol)
+            ]
+
+    def exposure(self, symbol: Optional[str] = None) -> Dict[str, Any]:
+        """Long, short, gross and net exposure from positions plus pending buy/sell notional."""
+        positions = self.positions(symbol)
+        long_value = sum(p["market_value"] for p in positions if p["market_value"] and p["net_qty"] > 0)
+        short_value = -sum(p["market_value"] for p in positions if p["market_value"] and p["net_qty"] < 0)
+        pending_buy = pending_sell = 0.0
+        for order in self.open_orders(symbol):
+            remaining = order["qty"] - order["filled_qty"]
+            price = order["limit_price"] or (self._ltp(order["symbol"], None)[0] or 0.0)
+            if order["side"] > 0:
+                pending_buy += remaining * price
+            else:
+                pending_sell += remaining * price
+        with self._lock:
+            available = self._funds.get("available_balance")
+        gross = long_value + short_value
+        by_symbol: Dict[str, float] = {}
+        for p in positions:
+            if p["market_value"]:
+                by_symbol[p["symbol"]] = round(by_symbol.get(p["symbol"], 0.0) + p["market_value"], 2)
+        return {
+            "long": round(long_value, 2),
+            "short": round(short_value, 2),
+            "gross": round(gross, 2),
+            "net": round(long_value - short_value, 2),
+            "pending_buy": round(pending_buy, 2),
+            "pending_sell": round(pending_sell, 2),
+            "available_balance": available,
+            "gross_pct_of_available": round(gross / available * 100.0, 2) if available else None,
+            "by_symbol": by_symbol,
+        }
+
+    def funds(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._funds)
+
+    def holdings(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(h) for h in self._holdings]
+
+    def status(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "reconciled_at": self.reconciled_at,
+            "reconciled_age_seconds": round(now - self.reconciled_at, 1) if self.reconciled_at else None,
+            "holdings_at": self.holdings_at,
+            "dirty": self._dirty.is_set(),
+            "reconciler_running": bool(self._thread and self._thread.is_alive()),
+            "last_error": self.last_error,
+            "last_divergences": list(self.last_divergences),
+            **self.stats,
+        }
+
+    # -- reconciliation ------------------------------------------------
+
+    def mark_dirty(self) -> None:
+        self._dirty.set()
+
+    def reconcile(self, client: Any, include_holdings: Optional[bool] = None) -> Dict[str, Any]:
+        """Fetch positions, orders and funds (and holdings when due) and replace the local state."""
+        self._dirty.clear()
+        with self._lock:
+            settled = set(self._acked_symbols)
+        positions = client.positions()
+        orders = client.orders()
+        funds = client.funds()
+        failed = [name for name, response in (("positions", positions), ("orders", orders), ("funds", funds)) if not response.get("success")]
+        if include_holdings is None:
+            include_holdings = self.holdings_at is None or time.time() - self.holdings_at >= self.holdings_seconds
+        if include_holdings:
+            holdings = client.holdings()
+            if holdings.get("success"):
+                self.load_holdings(holdings)
+            else:
+                failed.append("holdings")
+
+        divergences = self.load_positions(positions, settled)
+        self.load_orders(orders, move_positions=False)
+        self.load_funds(funds)
+        with self._lock:
+            self.stats["reconciles"] += 1
+            if divergences:
+                self.stats["divergences"] += len(divergences)
+                self.last_divergences = divergences
+            if failed:
+                self.stats["reconcile_failures"] += 1
+                self.last_error = f"Failed to fetch: {', '.join(failed)}"
+            else:
+                self.last_error = None
+            if "positions" not in failed:
+                self.reconciled_at = time.time()
+        return {"success": not failed, "failed": failed, "divergences": divergences}
+
+    def start_reconciler(self, client_factory: ClientFactory) -> None:
+        """Reconcile on a daemon thread every ``reconcile_seconds`` or soon after ``mark_dirty``."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._dirty.set()
+        self._thread = threading.Thread(target=self._run, args=(client_factory,), name="fyers-account-book", daemon=True)
+        self._thread.start()
+
+    def stop_reconciler(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._dirty.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self, client_factory: ClientFactory) -> None:
+        last = 0.0
+        while not self._stop.is_set():
+            self._dirty.wait(self.reconcile_seconds)
+            if self._stop.is_set():
+                break
+            # Coalesce bursts of acks into one reconciliation.
+            gap = self.min_reconcile_gap_seconds - (time.monotonic() - last)
+            if gap > 0 and self._stop.wait(gap):
+                break
+            try:
+                self.reconcile(client_factory())
+            except Exception as exc:  # keep the reconciler alive on unexpected client errors
+                self.last_error = f"Reconcile failed: {exc}"
+                self.stats["reconcile_failures"] += 1
+            last = time.monotonic()
+
+
+_ACCOUNT_BOOK: Optional[AccountBook] = None
+_ACCOUNT_BOOK_LOCK = threading.Lock()
+
+
+def get_account_book(start: bool = True) -> AccountBook:
+    """Return the process-wide account book; starts background reconciliation when a token is configured."""
+    global _ACCOUNT_BOOK
+    with _ACCOUNT_BOOK_LOCK:
+        if _ACCOUNT_BOOK is None:
+            _ACCOUNT_BOOK = AccountBook()
+        book = _ACCOUNT_BOOK
+    if start and os.getenv("FYERS_ACCESS_TOKEN") and env_flag("FYERS_BOOK_RECONCILE", True):
+        from .fyers_client import FyersClient
+
+        book.start_reconciler(FyersClient)
+    return book
@@ -0,0 +1,480 @@
+"""Local paper-trading engine for dry-run FYERS orders.
+
+``PaperBroker`` accepts the same payloads as ``/orders`` (``type`` 1 limit,
+2 market, 3 stop-market, 4 stop-limit; ``side`` 1/-1; ``productType``) and
+fills them against the last-price table, so a live stream or a replayed one
+drives the simulation. Market orders fill at the current price (with
+optional slippage); limit and stop orders rest in per-symbol ``heapq``
+books keyed by trigger price with a sequence tiebreak (time priority) and
+are matched on every tick, so resting or filling an order is O(log n) and a
+tick only touches the orders it fills.
+
+Cash moves with every fill; positions are netted per (symbol, productType)
+with average-price accounting, giving realized PnL on reductions and
+unrealized PnL marked at the last price. ``day_pnl`` reports PnL since the
+start of the IST day: the lifetime total is snapshotted as a baseline at the
+first fill or query after midnight IST. CNC sells are limited to the
+quantity held; intraday and margin products may go short.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .env import env_float
+from .market_feed import LastPriceTable, get_last_price_table, get_market_feed, stream_max_age_ms
+from .tick_store import IST
+
+ORDER_TYPE_LIMIT = 1
+ORDER_TYPE_MARKET = 2
+ORDER_TYPE_STOP = 3
+ORDER_TYPE_STOP_LIMIT = 4
+
+# FYERS order book status codes
+ORDER_STATUS_CANCELLED = 1
+ORDER_STATUS_FILLED = 2
+ORDER_STATUS_REJECTED = 5
+ORDER_STATUS_PENDING = 6
+STATUS_NAMES = {
+    ORDER_STATUS_CANCELLED: "cancelled",
+    ORDER_STATUS_FILLED: "filled",
+    ORDER_STATUS_REJECTED: "rejected",
+    ORDER_STATUS_PENDING: "pending",
+}
+
+PriceSource = Callable[[str], Optional[float]]
+OrderListener = Callable[[Dict[str, Any]], None]
+
+
+@dataclass
+class PaperOrder:
+    id: str
+    symbol: str
+    side: int
+    qty: int
+    type: int
+    productType: str
+    limitPrice: float
+    stopPrice: float
+    status: int = ORDER_STATUS_PENDING
+    filledQty: int = 0
+    tradedPrice: float = 0.0
+    orderTag: Optional[str] = None
+    message: str = ""
+    orderDateTime: float = 0.0
+    updatedAt: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "status_name": STATUS_NAMES[self.status]}
+
+
+@dataclass
+class PaperPosition:
+    symbol: str
+    productType: str
+    netQty: int = 0
+    netAvg: float = 0.0
+    realized: float = 0.0
+    buyQty: int = 0
+    sellQty: int = 0
+
+
+def net_fill(net_qty: int, avg_price: float, realized: float, fill_qty: int, price: float) -> Tuple[int, float, float]:
+    """Apply a signed fill to a net position with average-price accounting.
+
+    Returns the new (net_qty, avg_price, realized). Reducing a position books
+    realized PnL at the average price; crossing through zero opens the
+    remainder at ``price``.
+    """
+    if net_qty == 0 or (net_qty > 0) == (fill_qty > 0):
+        avg_price = (avg_price * abs(net_qty) + price * abs(fill_qty)) / (abs(net_qty) + abs(fill_qty))
+    else:
+        closed = min(abs(net_qty), abs(fill_qty))
+        realized += closed * (price - avg_price) * (1 if net_qty > 0 else -1)
+        if abs(fill_qty) > abs(net_qty):
+            avg_price = price
+        elif abs(fill_qty) == abs(net_qty):
+            avg_price = 0.0
+    return net_qty + fill_qty, avg_price, realized
+
+
+# Resting books: an order triggers when ``key <= sign * price``.
+_BOOK_SIGNS = {"buy_limit": -1.0, "sell_limit": 1.0, "buy_stop": 1.0, "sell_stop": -1.0}
+
+
+def _book_for(order: PaperOrder, triggered: bool = False) -> Tuple[str, float]:
+    if order.type in (ORDER_TYPE_STOP, ORDER_TYPE_STOP_LIMIT) and not triggered:
+        name = "buy_stop" if order.side > 0 else "sell_stop"
+        return name, _BOOK_SIGNS[name] * order.stopPrice
+    name = "buy_limit" if order.side > 0 else "sell_limit"
+    return name, _BOOK_SIGNS[name] * order.limitPrice
+
+
+class PaperBroker:
+    """Simulated FYERS account filled from last-price ticks."""
+
+    def __init__(
+        self,
+        table: Optional[LastPriceTable] = None,
+        cash: Optional[float] = None,
+        slippage_bps: Optional[float] = None,
+        max_age_ms: Optional[float] = None,
+        price_source: Optional[PriceSource] = None,
+    ) -> None:
+        self.table = table if table is not None else get_last_price_table()
+        self.starting_cash = cash if cash is not None else env_float("FYERS_PAPER_CASH", 100000.0)
+        self.slippage_bps = slippage_bps if slippage_bps is not None else env_float("FYERS_PAPER_SLIPPAGE_BPS", 0.0)
+        self.max_age_ms = max_age_ms
+        self.price_source = price_source
+
+        self._lock = threading.RLock()
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+        self._listeners: List[OrderListener] = []
+        self.reset()
+        self.table.add_listener(self.on_tick)
+
+    def reset(self) -> None:
+        """Forget all orders and positions and restore the starting cash."""
+        with self._lock:
+            self.cash = self.starting_cash
+            self.reserved = 0.0
+            self.fills = 0
+            self._orders: Dict[str, PaperOrder] = {}
+            self._reservations: Dict[str, float] = {}
+            self._positions: Dict[Tuple[str, str], PaperPosition] = {}
+            self._books: Dict[str, Dict[str, List[Tuple[float, int, str]]]] = {}
+            self._waiting: Dict[str, List[str]] = {}
+            # symbol -> quantity of pending CNC sells, so a new CNC sell is checked in O(1).
+            self._pending_sells: Dict[str, int] = {}
+            self._day_base_pnl = 0.0
+            self._day_ends_at = _next_ist_midnight(time.time())
+
+    def close(self) -> None:
+        self.table.remove_listener(self.on_tick)
+
+    def add_listener(self, listener: OrderListener) -> None:
+        """Call ``listener(order_dict)`` when an order fills or is cancelled."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: OrderListener) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def _notify(self, order: PaperOrder) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(order.to_dict())
+            except Exception:  # a broken listener must not break matching
+                pass
+
+    # -- prices --------------------------------------------------------
+
+    def price(self, symbol: str) -> Optional[float]:
+        ltp = self.table.last_price(symbol, self.max_age_ms)
+        if ltp is None and self.price_source is not None:
+            ltp = self.price_source(symbol)
+        return ltp
+
+    # -- orders --------------------------------------------------------
+
+    def _reject(self, order: PaperOrder, message: str) -> Dict[str, Any]:
+        order.status = ORDER_STATUS_REJECTED
+        order.message = message
+        return {"success": False, "paper": True, "error": message, "order": order.to_dict()}
+
+    def _parse(self, payload: Dict[str, Any]) -> PaperOrder:
+        now = time.time()
+        return PaperOrder(
+            id=f"PAPER{next(self._ids):08d}",
+            symbol=str(payload.get("symbol") or ""),
+            side=int(payload.get("side") or 0),
+            qty=int(payload.get("qty") or 0),
+            type=int(payload.get("type") or 0),
+            productType=str(payload.get("productType") or "INTRADAY").upper(),
+            limitPrice=float(payload.get("limitPrice") or 0.0),
+            stopPrice=float(payload.get("stopPrice") or 0.0),
+            orderTag=payload.get("orderTag"),
+            orderDateTime=now,
+            updatedAt=now,
+        )
+
+    def place(self, payload: Dict[str, Any], price: Optional[float] = None) -> Dict[str, Any]:
+        """Accept an ``/orders`` payload; fills immediately when marketable.
+
+        ``price`` overrides the last-price lookup (useful for replays that are
+        not driven through the table).
+        """
+        try:
+            order = self._parse(payload)
+        except (TypeError, ValueError) as exc:
+            return {"success": False, "paper": True, "error": f"Invalid order payload: {exc}"}
+
+        # Resolve the price before locking: the fallback source may hit REST.
+        ltp = price if price is not None else (self.price(order.symbol) if order.symbol else None)
+        with self._lock:
+            self._orders[order.id] = order
+            if not order.symbol:
+                return self._reject(order, "symbol is required")
+            if order.qty <= 0 or order.side not in (1, -1):
+                return self._reject(order, "qty must be positive and side must be 1 (buy) or -1 (sell)")
+            if order.type not in (ORDER_TYPE_LIMIT, ORDER_TYPE_MARKET, ORDER_TYPE_STOP, ORDER_TYPE_STOP_LIMIT):
+                return self._reject(order, f"Unsupported order type {order.type}")
+            if order.type in (ORDER_TYPE_LIMIT, ORDER_TYPE_STOP_LIMIT) and order.limitPrice <= 0:
+                return self._reject(order, "limitPrice is required for limit orders")
+            if order.type in (ORDER_TYPE_STOP, ORDER_TYPE_STOP_LIMIT) and order.stopPrice <= 0:
+                return self._reject(order, "stopPrice is required for stop orders")
+
+            if order.side < 0 and order.productType == "CNC":
+                held = self._positions.get((order.symbol, "CNC"))
+                if held is None or held.netQty - self._pending_sells.get(order.symbol, 0) < order.qty:
+                    return self._reject(order, "CNC sell exceeds quantity held")
+                self._pending_sells[order.symbol] = self._pending_sells.get(order.symbol, 0) + order.qty
+            if order.side > 0:
+                estimate = order.limitPrice if order.type == ORDER_TYPE_LIMIT else (ltp or order.limitPrice or order.stopPrice)
+                notional = order.qty * estimate
+                if estimate and notional > self.cash - self.reserved:
+                    return self._reject(order, f"Insufficient paper funds: need {notional:.2f}, available {self.cash - self.reserved:.2f}")
+                self._reservations[order.id] = notional
+                self.reserved += notional
+
+            self._route(order, ltp)
+
+        feed = get_market_feed()
+        if feed is not None and order.status == ORDER_STATUS_PENDING:
+            feed.subscribe([order.symbol])
+        return {
+            "success": True,
+            "paper": True,
+            "order_id": order.id,
+            "status": STATUS_NAMES[order.status],
+            "filled_qty": order.filledQty,
+            "fill_price": order.tradedPrice if order.filledQty else None,
+            "order": order.to_dict(),
+            "message": order.message or f"Paper order {STATUS_NAMES[order.status]}",
+        }
+
+    def _route(self, order: PaperOrder, ltp: Optional[float]) -> None:
+        if ltp is None:
+            if order.type == ORDER_TYPE_MARKET:
+                self._waiting.setdefault(order.symbol, []).append(order.id)
+                order.message = "Waiting for a price"
+            else:
+                self._rest(order)
+            return
+        if order.type == ORDER_TYPE_MARKET:
+            self._fill(order, ltp, slippage=True)
+            return
+        self._rest(order)
+        self._match(order.symbol, ltp)
+
+    def _rest(self, order: PaperOrder, triggered: bool = False) -> None:
+        name, key = _book_for(order, triggered)
+        book = self._books.setdefault(order.symbol, {}).setdefault(name, [])
+        heapq.heappush(book, (key, next(self._seq), order.id))
+
+    def cancel(self, order_id: str) -> Dict[str, Any]:
+        with self._lock:
+            order = self._orders.get(order_id)
+            if order is None:
+                return {"success": False, "paper": True, "error": f"Unknown paper order {order_id}"}
+            if order.status != ORDER_STATUS_PENDING:
+                return {"success": False, "paper": True, "error": f"Order is already {STATUS_NAMES[order.status]}"}
+            # Book entries are dropped lazily when they reach the front.
+            order.status = ORDER_STATUS_CANCELLED
+            order.updatedAt = time.time()
+            self._release(order)
+            self._notify(order)
+            return {"success": True, "paper": True, "order": order.to_dict()}
+
+    def _release(self, order: PaperOrder) -> None:
+        """Free what a pending order held: its cash reservation or its share of pending CNC sells."""
+        self.reserved -= self._reservations.pop(order.id, 0.0)
+        if order.side < 0 and order.productType == "CNC":
+            remaining = self._pending_sells.get(order.symbol, 0) - order.qty
+            if remaining > 0:
+                self._pending_sells[order.symbol] = remaining
+            else:
+                self._pending_sells.pop(order.symbol, None)
+
+    # -- matching ------------------------------------------------------
+
+    def on_tick(self, tick: Dict[str, Any]) -> None:
+        """``LastPriceTable`` listener: match resting orders for the ticked symbol."""
+        symbol = tick.get("symbol")
+        ltp = tick.get("ltp")
+        if ltp is None or (symbol not in self._books and symbol not in self._waiting):
+            return
+        with self._lock:
+            self._match(symbol, ltp)
+
+    def mark(self, symbol: str, price: float) -> None:
+        """Match resting orders at ``price`` without going through the table."""
+        with self._lock:
+            self._match(symbol, price)
+
+    def _match(self, symbol: str, price: float) -> None:
+        for order_id in self._waiting.pop(symbol, []):
+            order = self._orders[order_id]
+            if order.status == ORDER_STATUS_PENDING:
+                self._fill(order, price, slippage=True)
+
+        books = self._books.get(symbol)
+        if not books:
+            return
+        # Stops first: a triggered stop-limit may be fillable on the same tick.
+        for name in ("buy_stop", "sell_stop", "buy_limit", "sell_limit"):
+            book = books.get(name)
+            threshold = _BOOK_SIGNS[name] * price
+            while book and book[0][0] <= threshold:
+                _, _, order_id = heapq.heappop(book)
+                order = self._orders[order_id]
+                if order.status != ORDER_STATUS_PENDING:
+                    continue
+                if name.endswith("_stop"):
+                    if order.type == ORDER_TYPE_STOP:
+                        self._fill(order, price, slippage=True)
+                    else:
+                        self._rest(order, triggered=True)
+                    continue
+                # Limits fill at the limit or better.
+                fill_price = min(price, order.limitPrice) if order.side > 0 else max(price, order.limitPrice)
+                self._fill(order, fill_price, slippage=False)
+        if not any(books.values()):
+            del self._books[symbol]
+
+    def _roll_day(self) -> None:
+        """Snapshot lifetime PnL as the day's baseline once midnight IST has passed."""
+        now = time.time()
+        if now < self._day_ends_at:
+            return
+        with self._lock:
+            if now < self._day_ends_at:
+                return
+            self._day_base_pnl = sum(p["realized"] + p["unrealized"] for p in self.positions())
+            self._day_ends_at = _next_ist_midnight(now)
+
+    def _fill(self, order: PaperOrder, price: float, slippage: bool) -> None:
+        self._roll_day()
+        if slippage and self.slippage_bps:
+            price *= 1.0 + order.side * self.slippage_bps / 10000.0
+        price = round(price, 2)
+        qty = order.qty * order.side
+
+        position = self._positions.get((order.symbol, order.productType))
+        if position is None:
+            position = self._positions[(order.symbol, order.productType)] = PaperPosition(order.symbol, order.productType)
+        position.netQty, position.netAvg, position.realized = net_fill(
+            position.netQty, position.netAvg, position.realized, qty, price
+        )
+        if qty > 0:
+            position.buyQty += qty
+        else:
+            position.sellQty -= qty
+
+        self.cash -= qty * price
+        self._release(order)
+        self.fills += 1
+        order.status = ORDER_STATUS_FILLED
+        order.filledQty = order.qty
+        order.tradedPrice = price
+        order.message = "Filled"
+        order.updatedAt = time.time()
+        self._notify(order)
+
+    # -- reporting -----------------------------------------------------
+
+    def order(self, order_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            order = self._orders.get(order_id)
+            return order.to_dict() if order else None
+
+    def orders(self, status: Optional[int] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [order.to_dict() for order in self._orders.values() if status is None or order.status == status]
+
+    def open_orders(self) -> List[Dict[str, Any]]:
+        return self.orders(ORDER_STATUS_PENDING)
+
+    def positions(self) -> List[Dict[str, Any]]:
+        """Positions with ``ltp`` and unrealized PnL marked at the last price."""
+        with self._lock:
+            positions = [asdict(position) for position in self._positions.values()]
+        for position in positions:
+            ltp = self.table.last_price(position["symbol"])
+            position["ltp"] = ltp
+            position["unrealized"] = (
+                round((ltp - position["netAvg"]) * position["netQty"], 2) if ltp is not None and position["netQty"] else 0.0
+            )
+            position["realized"] = round(position["realized"], 2)
+            position["netAvg"] = round(position["netAvg"], 4)
+        return positions
+
+    def day_pnl(self, positions: Optional[List[Dict[str, Any]]] = None) -> float:
+        """Realized plus unrealized PnL since the start of the IST day."""
+        self._roll_day()
+        positions = positions if positions is not None else self.positions()
+        return round(sum(p["realized"] + p["unrealized"] for p in positions) - self._day_base_pnl, 2)
+
+    def snapshot(self, include_orders: bool = False) -> Dict[str, Any]:
+        positions = self.positions()
+        with self._lock:
+            cash, reserved, fills = self.cash, self.reserved, self.fills
+            counts = {name: 0 for name in STATUS_NAMES.values()}
+            for order in self._orders.values():
+                counts[STATUS_NAMES[order.status]] += 1
+        realized = sum(p["realized"] for p in positions)
+        unrealized = sum(p["unrealized"] for p in positions)
+        market_value = sum(p["ltp"] * p["netQty"] for p in positions if p["ltp"] is not None)
+        result = {
+            "success": True,
+            "paper": True,
+            "starting_cash": round(self.starting_cash, 2),
+            "cash": round(cash, 2),
+            "reserved_for_open_buys": round(reserved, 2),
+            "market_value": round(market_value, 2),
+            "equity": round(cash + market_value, 2),
+            "realized_pnl": round(realized, 2),
+            "unrealized_pnl": round(unrealized, 2),
+            "total_pnl": round(realized + unrealized, 2),
+            "day_pnl": self.day_pnl(positions),
+            "fills": fills,
+            "orders": counts,
+            "positions": [p for p in positions if p["netQty"] or p["realized"]],
+        }
+        if include_orders:
+            result["open_orders"] = self.open_orders()
+        return result
+
+
+def _next_ist_midnight(ts: float) -> float:
+    day_start = datetime.fromtimestamp(ts, IST).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (day_start + timedelta(days=1)).timestamp()
+
+
+def _quote_cache_price(symbol: str) -> Optional[float]:
+    """REST fallback used by the shared broker when the table has no fresh price."""
+    from .quote_cache import last_prices
+
+    return last_prices([symbol]).get(symbol)
+
+
+_PAPER_BROKER: Optional[PaperBroker] = None
+_PAPER_BROKER_LOCK = threading.Lock()
+
+
+def get_paper_broker() -> PaperBroker:
+    """Return the process-wide paper broker behind dry-run ``fyers_place_order``."""
+    global _PAPER_BROKER
+    with _PAPER_BROKER_LOCK:
+        if _PAPER_BROKER is None:
+            _PAPER_BROKER = PaperBroker(max_age_ms=stream_max_age_ms(), price_source=_quote_cache_price)
+        return _PAPER_BROKER
@@ -0,0 +1,243 @@
+"""Mark-to-market valuation of the FYERS account without API calls.
+
+``PortfolioValuer`` joins the ``AccountBook``'s holdings and net positions
+(kept current by its background reconciler) with prices that are already in
+memory: a fresh streamed tick, then a quote-cache row, then the last price
+FYERS returned with the holdings/positions payload, and finally cost (zero
+PnL). Market value and unrealized PnL for every lot are one array pass, and
+a valuation is reused for ``FYERS_PORTFOLIO_TTL_MS`` so frequent net-worth
+reads stay cheap. ``EconomicTracker`` adds ``mark_to_market()`` (unrealized
+PnL converted with ``FYERS_PORTFOLIO_FX_RATE``) to the cash balance; realized
+PnL keeps flowing through ``add_trading_profit``. There is no default rate:
+without one the adjustment is skipped, since rupee PnL added to a dollar
+balance would be wrong, and the account book is only created on the first
+net-worth read.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .env import env_flag, env_float
+from .market_feed import LastPriceTable, get_last_price_table, get_market_feed, stream_max_age_ms
+from .order_book import AccountBook, get_account_book
+from .quote_cache import QuoteCache, get_quote_cache
+
+PRICE_SOURCES = ("stream", "quote_cache", "rest", "cost")
+_STREAM, _CACHE, _REST, _COST = range(len(PRICE_SOURCES))
+HOLDING = 0
+POSITION = 1
+
+
+def fx_rate_from_env() -> Optional[float]:
+    """FYERS_PORTFOLIO_FX_RATE when set to a positive number, else None."""
+    rate = env_float("FYERS_PORTFOLIO_FX_RATE", 0.0)
+    return rate if rate > 0 else None
+
+
+_FX_WARNED = False
+
+
+def _warn_no_fx_rate() -> None:
+    global _FX_WARNED
+    if not _FX_WARNED:
+        _FX_WARNED = True
+        print("⚠️ FYERS_PORTFOLIO_FX_RATE is not set; FYERS portfolio left out of net worth")
+
+
+def lot_arrays(holdings: List[Dict[str, Any]], positions: List[Dict[str, Any]]) -> Tuple[List[str], Dict[str, np.ndarray]]:
+    """Holdings and net positions as parallel arrays (kind, qty, cost, rest_ltp, realized_pnl)."""
+    rows = holdings + positions
+    symbols = [row["symbol"] for row in rows]
+    arrays = {
+        "kind": np.repeat(np.array([HOLDING, POSITION], dtype=np.int64), [len(holdings), len(positions)]),
+        "qty": np.array([row["quantity"] for row in holdings] + [row["net_qty"] for row in positions], dtype=np.float64),
+        "cost": np.array([row["cost_price"] for row in holdings] + [row["avg_price"] for row in positions], dtype=np.float64),
+        # dtype=float turns a missing REST price (None) into NaN.
+        "rest_ltp": np.array([row.get("rest_ltp") for row in rows], dtype=np.float64),
+        "realized_pnl": np.array([0.0] * len(holdings) + [row.get("realized_pnl") or 0.0 for row in positions], dtype=np.float64),
+    }
+    return symbols, arrays
+
+
+def mark_lots(arrays: Dict[str, np.ndarray], price: np.ndarray, source: np.ndarray) -> Dict[str, Any]:
+    """Fill unpriced lots from REST then cost, and total market value and PnL per kind."""
+    qty, cost, rest = arrays["qty"], arrays["cost"], arrays["rest_ltp"]
+    with np.errstate(invalid="ignore"):
+        use_rest = np.isnan(price) & (rest > 0)
+    price = np.where(use_rest, rest, price)
+    source = np.where(use_rest, _REST, source)
+    at_cost = np.isnan(price)
+    price = np.where(at_cost, cost, price)
+    source = np.where(at_cost, _COST, source)
+
+    kind = arrays["kind"]
+    market_value = price * qty
+    unrealized = (price - cost) * qty
+    value_by_kind = np.bincount(kind, weights=market_value, minlength=2)
+    cost_by_kind = np.bincount(kind, weights=cost * qty, minlength=2)
+    pnl_by_kind = np.bincount(kind, weights=unrealized, minlength=2)
+    return {
+        "price": price,
+        "source": source,
+        "holdings_value": float(value_by_kind[HOLDING]),
+        "holdings_cost": float(cost_by_kind[HOLDING]),
+        "holdings_unrealized_pnl": float(pnl_by_kind[HOLDING]),
+        "positions_value": float(value_by_kind[POSITION]),
+        "positions_unrealized_pnl": float(pnl_by_kind[POSITION]),
+        "realized_pnl": float(arrays["realized_pnl"].sum()),
+        "unrealized_pnl": float(pnl_by_kind.sum()),
+        "gross_exposure": float(np.abs(market_value).sum()),
+    }
+
+
+class PortfolioValuer:
+    """Values the account book's holdings and positions from in-memory prices."""
+
+    def __init__(
+        self,
+        book: Optional[AccountBook] = None,
+        cache: Optional[QuoteCache] = None,
+        table: Optional[LastPriceTable] = None,
+        ttl_ms: Optional[float] = None,
+        quote_max_age_ms: Optional[float] = None,
+        fx_rate: Optional[float] = None,
+    ) -> None:
+        self.book = book if book is not None else get_account_book()
+        self.cache = cache if cache is not None else get_quote_cache()
+        self.table = table if table is not None else get_last_price_table()
+        self.ttl_ms = ttl_ms if ttl_ms is not None else env_float("FYERS_PORTFOLIO_TTL_MS", 5000.0)
+        self.quote_max_age_ms = quote_max_age_ms if quote_max_age_ms is not None else env_float("FYERS_PORTFOLIO_QUOTE_MAX_AGE_MS", 300000.0)
+        self.fx_rate = fx_rate if fx_rate is not None else fx_rate_from_env()
+        self._lock = threading.Lock()
+        self._last: Optional[Dict[str, Any]] = None
+        self._subscribed: frozenset = frozenset()
+        self._layout: Optional[Tuple[List[str], List[str], np.ndarray, Dict[str, int]]] = None
+        self.stats = {"valuations": 0, "cached": 0, "quote_fetches": 0}
+
+    def _memory_prices(self, symbols: List[str], index: Dict[str, int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Price per unique symbol from the stream, else the quote cache; NaN where neither has one."""
+        price = np.full(len(symbols), np.nan)
+        source = np.full(len(symbols), _COST, dtype=np.int64)
+        cutoff = time.time() - stream_max_age_ms() / 1000.0
+        for symbol, tick in self.table.snapshot(symbols).items():
+            if tick["received_at"] >= cutoff and tick["ltp"] is not None:
+                price[index[symbol]], source[index[symbol]] = tick["ltp"], _STREAM
+        missing = [symbols[i] for i in np.flatnonzero(np.isnan(price))]
+        for symbol, row in self.cache.peek(missing, self.quote_max_age_ms).items():
+            details = row.get("v") if isinstance(row.get("v"), dict) else row
+            lp = details.get("lp", details.get("ltp"))
+            if lp:
+                price[index[symbol]], source[index[symbol]] = lp, _CACHE
+        return price, source
+
+    def _symbol_layout(self, symbols: List[str]) -> Tuple[List[str], np.ndarray, Dict[str, int]]:
+        """Unique symbols, each lot's code into them and a symbol index; reused while the lots are unchanged."""
+        layout = self._layout
+        if layout is not None and layout[0] == symbols:
+            return layout[1:]
+        unique_symbols = list(dict.fromkeys(symbols))
+        index = {symbol: i for i, symbol in enumerate(unique_symbols)}
+        codes = np.fromiter((index[symbol] for symbol in symbols), dtype=np.int64, count=len(symbols))
+        self._layout = (symbols, unique_symbols, codes, index)
+        self._subscribe(unique_symbols)
+        return unique_symbols, codes, index
+
+    def _subscribe(self, symbols: List[str]) -> None:
+        held = frozenset(symbols)
+        if not held or held <= self._subscribed:
+            return
+        feed = get_market_feed()
+        if feed is not None:
+            # Later valuations then price these from the stream.
+            feed.subscribe(sorted(held - self._subscribed))
+        self._subscribed = self._subscribed | held
+
+    def valuation(self, client: Any = None, max_age_ms: Optional[float] = None) -> Dict[str, Any]:
+        """Current valuation, reused while younger than ``max_age_ms`` (default the TTL).
+
+        With a ``client``, symbols without a streamed or cached price are
+        fetched once through the quote cache; without one no API call is made.
+        """
+        max_age_ms = self.ttl_ms if max_age_ms is None else max_age_ms
+        with self._lock:
+            last = self._last
+        if client is None and last is not None and (time.time() - last["valued_at"]) * 1000.0 <= max_age_ms:
+            self.stats["cached"] += 1
+            return {**last, "cached": True, "age_ms": round((time.time() - last["valued_at"]) * 1000.0, 1)}
+
+        start = time.perf_counter()
+        symbols, arrays = lot_arrays(self.book.holdings(), self.book.positions(mark=False))
+        unique_symbols, codes, index = self._symbol_layout(symbols)
+        price_u, source_u = self._memory_prices(unique_symbols, index)
+        if client is not None and not np.isfinite(price_u).all():
+            missing = [unique_symbols[i] for i in np.flatnonzero(np.isnan(price_u))]
+            self.cache.get_quotes(client, missing)
+            self.stats["quote_fetches"] += 1
+            price_u, source_u = self._memory_prices(unique_symbols, index)
+
+        marked = mark_lots(arrays, price_u[codes], source_u[codes])
+        source = marked.pop("source")
+        marked.pop("price")
+        counts = np.bincount(source, minlength=len(PRICE_SOURCES))
+        result = {
+            "success": True,
+            **{key: round(value, 2) for key, value in marked.items()},
+            "holdings": int((arrays["kind"] == HOLDING).sum()),
+            "positions": int((arrays["kind"] == POSITION).sum()),
+            "price_sources": {name: int(counts[code]) for code, name in enumerate(PRICE_SOURCES)},
+            "priced_at_cost": sorted({symbols[i] for i in np.flatnonzero(source == _COST)}),
+            "fx_rate": self.fx_rate,
+            "net_worth_adjustment": round(marked["unrealized_pnl"] * self.fx_rate, 2) if self.fx_rate else None,
+            "book_reconciled_at": self.book.reconciled_at,
+            "valued_at": time.time(),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000.0, 3),
+        }
+        with self._lock:
+            self._last = result
+        self.stats["valuations"] += 1
+        return {**result, "cached": False, "age_ms": 0.0}
+
+    def mark_to_market(self) -> float:
+        """Unrealized PnL of holdings and positions in the tracker's currency (0 without an FX rate)."""
+        if not self.fx_rate:
+            _warn_no_fx_rate()
+            return 0.0
+        return self.valuation()["net_worth_adjustment"]
+
+
+_PORTFOLIO_VALUER: Optional[PortfolioValuer] = None
+_PORTFOLIO_VALUER_LOCK = threading.Lock()
+
+
+def get_portfolio_valuer() -> PortfolioValuer:
+    """Return the process-wide portfolio valuer."""
+    global _PORTFOLIO_VALUER
+    with _PORTFOLIO_VALUER_LOCK:
+        if _PORTFOLIO_VALUER is None:
+            _PORTFOLIO_VALUER = PortfolioValuer()
+        return _PORTFOLIO_VALUER
+
+
+def fyers_net_worth_valuer() -> Optional[Callable[[], float]]:
+    """Lazy ``mark_to_market`` of the shared valuer for ``EconomicTracker``.
+
+    None unless FYERS is configured, FYERS_PORTFOLIO_NET_WORTH is on and
+    FYERS_PORTFOLIO_FX_RATE is set. The valuer (and the account book's
+    background reconciler) is only created on the first call.
+    """
+    if not os.getenv("FYERS_ACCESS_TOKEN") or not env_flag("FYERS_PORTFOLIO_NET_WORTH", True):
+        return None
+    if not fx_rate_from_env():
+        _warn_no_fx_rate()
+        return None
+
+    def mark_to_market() -> float:
+        return get_portfolio_valuer().mark_to_market()
+
+    return mark_to_market
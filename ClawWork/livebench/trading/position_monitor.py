@@ -0,0 +1,99 @@
+"""Live position PnL from the streamed last-price table.
+
+Positions come from the shared ``AccountBook`` (kept current by its
+reconciler and order updates); ``refresh`` only loads a fresh ``/positions``
+payload into the book. Every ``snapshot`` marks the book's positions to the
+latest streamed tick without a network call, falling back to the ``ltp``
+FYERS returned with the positions.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .market_feed import LastPriceTable, get_last_price_table, get_market_feed
+from .order_book import AccountBook, get_account_book
+
+
+class PositionMonitor:
+    """Marks the account book's net positions to market from the last-price table."""
+
+    def __init__(self, book: Optional[AccountBook] = None, table: Optional[LastPriceTable] = None) -> None:
+        self.book = book if book is not None else get_account_book()
+        self.table = table if table is not None else get_last_price_table()
+
+    @property
+    def refreshed_at(self) -> Optional[float]:
+        return self.book.positions_at
+
+    def load_positions(self, response: Dict[str, Any]) -> Dict[str, Any]:
+        """Load a FYERS ``/positions`` response into the account book."""
+        if not response.get("success"):
+            return {"success": False, "error": response.get("error", "Failed to fetch positions")}
+        self.book.load_positions(response)
+        positions = self.book.positions(include_flat=True, mark=False)
+        feed = get_market_feed()
+        if feed is not None:
+            feed.subscribe(position["symbol"] for position in positions if position["net_qty"])
+        return {"success": True, "positions": len(positions)}
+
+    def refresh(self, client: Any) -> Dict[str, Any]:
+        return self.load_positions(client.positions())
+
+    def snapshot(self, max_age_ms: Optional[float] = None) -> Dict[str, Any]:
+        """Current PnL per position; ``price_source`` tells whether the stream or REST price was used."""
+        positions = self.book.positions(include_flat=True, mark=False)
+        refreshed_at = self.refreshed_at
+
+        now = time.time()
+        rows: List[Dict[str, Any]] = []
+        total_unrealized = 0.0
+        total_realized = 0.0
+        streamed = 0
+        for position in positions:
+            tick = self.table.get(position["symbol"], max_age_ms)
+            if tick is not None:
+                ltp, source = tick["ltp"], "stream"
+                age_ms = round((now - tick["received_at"]) * 1000.0, 1)
+                streamed += 1
+            else:
+                ltp, source, age_ms = position["rest_ltp"], "rest", None
+
+            unrealized = (ltp - position["avg_price"]) * position["net_qty"] if ltp is not None else None
+            total_realized += position["realized_pnl"]
+            if unrealized is not None:
+                total_unrealized += unrealized
+            rows.append(
+                {
+                    **position,
+                    "ltp": ltp,
+                    "price_source": source,
+                    "price_age_ms": age_ms,
+                    "unrealized_pnl": round(unrealized, 2) if unrealized is not None else None,
+                }
+            )
+
+        return {
+            "success": True,
+            "positions": rows,
+            "streamed": streamed,
+            "unrealized_pnl": round(total_unrealized, 2),
+            "realized_pnl": round(total_realized, 2),
+            "total_pnl": round(total_unrealized + total_realized, 2),
+            "positions_refreshed_at": refreshed_at,
+        }
+
+
+_POSITION_MONITOR: Optional[PositionMonitor] = None
+_POSITION_MONITOR_LOCK = threading.Lock()
+
+
+def get_position_monitor() -> PositionMonitor:
+    """Return the process-wide position monitor."""
+    global _POSITION_MONITOR
+    with _POSITION_MONITOR_LOCK:
+        if _POSITION_MONITOR is None:
+            _POSITION_MONITOR = PositionMonitor()
+        return _POSITION_MONITOR
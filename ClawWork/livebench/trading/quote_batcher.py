@@ -0,0 +1,132 @@
+"""Chunked, concurrent FYERS quote fetching for large watchlists."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from .env import env_int
+
+# FYERS accepts at most 50 symbols per quotes request.
+MAX_SYMBOLS_PER_REQUEST = 50
+
+
+def chunk_symbols(symbols: List[str], chunk_size: int) -> List[List[str]]:
+    size = max(1, chunk_size)
+    return [symbols[i : i + size] for i in range(0, len(symbols), size)]
+
+
+def row_symbol(row: Any) -> Optional[str]:
+    """Symbol of a FYERS quote row (``n``, falling back to ``symbol``/``name``)."""
+    if not isinstance(row, dict):
+        return None
+    return row.get("n") or row.get("symbol") or row.get("name")
+
+
+def _needs_route_discovery(client: Any) -> bool:
+    route_info = getattr(client, "quote_route_info", None)
+    if not callable(route_info):
+        return False
+    return not route_info().get("endpoint")
+
+
+def fetch_quotes_batched(
+    client: Any,
+    symbols: List[str],
+    chunk_size: Optional[int] = None,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Fetch quotes for many symbols in API-sized chunks on a bounded thread pool.
+
+    Returns a quotes-shaped response whose ``data.d`` rows follow the order of
+    ``symbols``. Failed chunks are listed in ``failed_chunks``; the response is
+    successful as long as at least one chunk succeeded.
+    """
+    chunk_size = chunk_size or env_int("FYERS_QUOTE_CHUNK_SIZE", MAX_SYMBOLS_PER_REQUEST)
+    chunk_size = min(max(chunk_size, 1), MAX_SYMBOLS_PER_REQUEST)
+    max_workers = max(max_workers or env_int("FYERS_QUOTE_MAX_WORKERS", 8), 1)
+
+    chunks = chunk_symbols(symbols, chunk_size)
+    responses: List[Optional[Dict[str, Any]]] = [None] * len(chunks)
+    if not chunks:
+        return {"success": False, "error": "No symbols to fetch", "chunks": 0}
+
+    def fetch(index: int) -> None:
+        responses[index] = client.quotes(",".join(chunks[index]))
+
+    pending = list(range(len(chunks)))
+    # Let the first chunk learn the quote endpoint before fanning out, so
+    # workers do not all probe the fallback endpoints in parallel.
+    if len(chunks) > 1 and _needs_route_discovery(client):
+        fetch(pending.pop(0))
+
+    if len(pending) == 1 or max_workers == 1:
+        for index in pending:
+            fetch(index)
+    elif pending:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as executor:
+            list(executor.map(fetch, pending))
+
+    rows_by_symbol: Dict[str, Dict[str, Any]] = {}
+    unmatched_rows: List[Any] = []
+    failed_chunks: List[Dict[str, Any]] = []
+    first_failure: Optional[Dict[str, Any]] = None
+    endpoint_used = None
+
+    for index, response in enumerate(responses):
+        response = response or {}
+        if not response.get("success"):
+            first_failure = first_failure or response
+            failed_chunks.append(
+                {
+                    "chunk": index,
+                    "symbols": chunks[index],
+                    "status_code": response.get("status_code"),
+                    "error": response.get("error", "Quote request failed"),
+                }
+            )
+            continue
+
+        endpoint_used = endpoint_used or response.get("quote_endpoint_used")
+        payload = response.get("data", {})
+        raw_rows = payload.get("d", []) if isinstance(payload, dict) else []
+        if not isinstance(raw_rows, list):
+            continue
+        for row in raw_rows:
+            symbol = row_symbol(row)
+            if symbol and symbol not in rows_by_symbol:
+                rows_by_symbol[symbol] = row
+            else:
+                unmatched_rows.append(row)
+
+    if len(failed_chunks) == len(chunks):
+        return {
+            "success": False,
+            "error": (first_failure or {}).get("error", "All quote chunks failed"),
+            "attempts": (first_failure or {}).get("attempts"),
+            "chunks": len(chunks),
+            "failed_chunks": failed_chunks,
+        }
+
+    ordered_rows: List[Any] = []
+    missing_symbols: List[str] = []
+    failed_symbols = {symbol for chunk in failed_chunks for symbol in chunk["symbols"]}
+    for symbol in symbols:
+        row = rows_by_symbol.pop(symbol, None)
+        if row is not None:
+            ordered_rows.append(row)
+        elif symbol not in failed_symbols:
+            missing_symbols.append(symbol)
+    # Rows FYERS returned under a different name than requested keep their chunk order.
+    ordered_rows.extend(rows_by_symbol.values())
+    ordered_rows.extend(unmatched_rows)
+
+    return {
+        "success": True,
+        "data": {"s": "ok", "d": ordered_rows},
+        "chunks": len(chunks),
+        "partial": bool(failed_chunks),
+        "failed_chunks": failed_chunks,
+        "missing_symbols": missing_symbols,
+        "quote_endpoint_used": endpoint_used,
+    }
@@ -0,0 +1,214 @@
+"""In-process FYERS quote cache with a short freshness TTL and request coalescing."""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+from .env import env_float
+from .market_feed import get_last_price_table, get_market_feed, stream_max_age_ms
+from .quote_batcher import fetch_quotes_batched, row_symbol
+
+
+class QuoteCache:
+    """Symbol-keyed cache of raw FYERS quote rows.
+
+    Symbols with a fresh streamed tick are served from the last-price table,
+    symbols that are fresh are served from memory, symbols already being
+    fetched by another caller wait on that fetch, and only the remaining
+    missing or stale symbols go to FYERS.
+    """
+
+    def __init__(self, ttl_ms: Optional[float] = None) -> None:
+        self.ttl_ms = ttl_ms if ttl_ms is not None else env_float("FYERS_QUOTE_TTL_MS", 2000.0)
+        self._entries: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "stream": 0,
+            "hits": 0,
+            "misses": 0,
+            "stale": 0,
+            "coalesced": 0,
+            "fetches": 0,
+            "fetched_symbols": 0,
+            "hit_age_ms_total": 0.0,
+            "hit_age_ms_max": 0.0,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def put_rows(self, rows: List[Any], fetched_at: Optional[float] = None) -> None:
+        fetched_at = fetched_at if fetched_at is not None else time.time()
+        with self._lock:
+            for row in rows:
+                symbol = row_symbol(row)
+                if symbol:
+                    self._entries[symbol] = (fetched_at, row)
+
+    def peek(self, symbols: List[str], max_age_ms: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Cached rows for ``symbols`` no older than ``max_age_ms`` (default: the TTL); never fetches."""
+        cutoff = time.time() - (max_age_ms if max_age_ms is not None else self.ttl_ms) / 1000.0
+        with self._lock:
+            return {
+                symbol: entry[1]
+                for symbol, entry in ((symbol, self._entries.get(symbol)) for symbol in symbols)
+                if entry is not None and entry[0] >= cutoff
+            }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            entries = len(self._entries)
+        lookups = stats["stream"] + stats["hits"] + stats["misses"] + stats["stale"] + stats["coalesced"]
+        hit_age_total = stats.pop("hit_age_ms_total")
+        return {
+            **stats,
+            "entries": entries,
+            "ttl_ms": self.ttl_ms,
+            "hit_ratio": round(stats["hits"] / lookups, 4) if lookups else None,
+            "avg_hit_age_ms": round(hit_age_total / stats["hits"], 3) if stats["hits"] else None,
+        }
+
+    def get_quotes(self, client: Any, symbols: List[str]) -> Dict[str, Any]:
+        """Return a quotes-shaped response for ``symbols``, fetching only what is needed."""
+        now = time.time()
+        ttl_seconds = self.ttl_ms / 1000.0
+        request_stats = {"stream": 0, "hits": 0, "misses": 0, "stale": 0, "coalesced": 0, "max_age_ms": 0.0}
+        table = get_last_price_table()
+        served: Dict[str, Dict[str, Any]] = table.quote_rows(symbols, stream_max_age_ms()) if len(table) else {}
+        request_stats["stream"] = len(served)
+        waiting: Dict[str, Future] = {}
+        to_fetch: List[str] = []
+        owned: Dict[str, Future] = {}
+
+        with self._lock:
+            for symbol in dict.fromkeys(symbols):
+                if symbol in served:
+                    continue
+                entry = self._entries.get(symbol)
+                age = now - entry[0] if entry else None
+                if entry and age <= ttl_seconds:
+                    served[symbol] = entry[1]
+                    age_ms = age * 1000.0
+                    request_stats["hits"] += 1
+                    request_stats["max_age_ms"] = max(request_stats["max_age_ms"], age_ms)
+                    self._stats["hit_age_ms_total"] += age_ms
+                    self._stats["hit_age_ms_max"] = max(self._stats["hit_age_ms_max"], age_ms)
+                elif symbol in self._inflight:
+                    waiting[symbol] = self._inflight[symbol]
+                    request_stats["coalesced"] += 1
+                else:
+                    request_stats["stale" if entry else "misses"] += 1
+                    future: Future = Future()
+                    self._inflight[symbol] = future
+                    owned[symbol] = future
+                    to_fetch.append(symbol)
+            for key in ("stream", "hits", "misses", "stale", "coalesced"):
+                self._stats[key] += request_stats[key]
+            if to_fetch:
+                self._stats["fetches"] += 1
+                self._stats["fetched_symbols"] += len(to_fetch)
+
+        failed_chunks: List[Dict[str, Any]] = []
+        fetch_response: Dict[str, Any] = {}
+        if to_fetch:
+            feed = get_market_feed()
+            if feed is not None:
+                # Stream these from now on; this request still goes over REST.
+                feed.subscribe(to_fetch)
+            try:
+                fetch_response = fetch_quotes_batched(client, to_fetch)
+            except Exception as exc:
+                fetch_response = {"success": False, "error": f"Quote fetch failed: {exc}"}
+            self._complete_fetch(to_fetch, owned, fetch_response)
+            failed_chunks.extend(fetch_response.get("failed_chunks", []))
+
+        for symbol, future in owned.items():
+            row = future.result()
+            if row is not None:
+                served[symbol] = row
+
+        for symbol, future in waiting.items():
+            row = future.result()
+            if row is not None:
+                served[symbol] = row
+
+        rows = [served[symbol] for symbol in dict.fromkeys(symbols) if symbol in served]
+        missing = [symbol for symbol in dict.fromkeys(symbols) if symbol not in served]
+        cache_info = {**request_stats, "max_age_ms": round(request_stats["max_age_ms"], 3), "fetched": len(to_fetch)}
+
+        if not rows and missing:
+            return {
+                "success": False,
+                "error": fetch_response.get("error", "No quote data returned"),
+                "attempts": fetch_response.get("attempts"),
+                "failed_chunks": failed_chunks,
+                "missing_symbols": missing,
+                "cache": cache_info,
+            }
+
+        return {
+            "success": True,
+            "data": {"s": "ok", "d": rows},
+            "partial": bool(failed_chunks),
+            "failed_chunks": failed_chunks,
+            "missing_symbols": missing,
+            "quote_endpoint_used": fetch_response.get("quote_endpoint_used"),
+            "cache": cache_info,
+        }
+
+    def _complete_fetch(self, symbols: List[str], owned: Dict[str, Future], response: Dict[str, Any]) -> None:
+        fetched_at = time.time()
+        rows_by_symbol: Dict[str, Dict[str, Any]] = {}
+        if response.get("success"):
+            payload = response.get("data", {})
+            raw_rows = payload.get("d", []) if isinstance(payload, dict) else []
+            for row in raw_rows if isinstance(raw_rows, list) else []:
+                symbol = row_symbol(row)
+                if symbol:
+                    rows_by_symbol[symbol] = row
+
+        with self._lock:
+            for symbol, row in rows_by_symbol.items():
+                self._entries[symbol] = (fetched_at, row)
+            for symbol in symbols:
+                self._inflight.pop(symbol, None)
+
+        for symbol in symbols:
+            owned[symbol].set_result(rows_by_symbol.get(symbol))
+
+
+_QUOTE_CACHE: Optional[QuoteCache] = None
+_QUOTE_CACHE_LOCK = threading.Lock()
+
+
+def get_quote_cache() -> QuoteCache:
+    """Return the process-wide quote cache."""
+    global _QUOTE_CACHE
+    with _QUOTE_CACHE_LOCK:
+        if _QUOTE_CACHE is None:
+            _QUOTE_CACHE = QuoteCache()
+        return _QUOTE_CACHE
+
+
+def last_prices(symbols: List[str]) -> Dict[str, float]:
+    """Last traded prices for ``symbols`` from the shared cache in one batched call; unpriced symbols are omitted."""
+    from .fyers_client import FyersClient
+
+    client = FyersClient()
+    if not symbols or not client.access_token:
+        return {}
+    response = get_quote_cache().get_quotes(client, list(symbols))
+    rows = ((response.get("data") or {}).get("d") or []) if response.get("success") else []
+    prices: Dict[str, float] = {}
+    for row in rows:
+        symbol = row_symbol(row)
+        value = row["v"].get("lp") if isinstance(row.get("v"), dict) else None
+        if symbol and value is not None:
+            prices[symbol] = float(value)
+    return prices
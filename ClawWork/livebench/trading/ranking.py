@@ -0,0 +1,356 @@
+"""Cross-sectional ranking of the whole watchlist universe.
+
+Where ``evaluate_symbols`` judges each symbol against absolute thresholds,
+the ranking mode scores symbols against each other on three factors:
+
+- momentum: today's change %
+- volume surge: today's volume over the average daily volume
+- volatility-adjusted return: today's change % over the daily return volatility
+
+Each factor becomes a percentile across the symbols that have it, the
+composite score is the weighted mean of the available percentiles, and the
+top ``k`` come from ``np.argpartition`` (only those ``k`` are sorted).
+Results are grouped by sector from ``FYERS_SECTOR_MAP``.
+
+Average volume and volatility come from the daily candle cache, computed
+once per IST day per symbol and kept as arrays aligned with the last symbol
+list, so a refresh over an unchanged universe is pure array work.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .candle_store import IST, CandleStore
+from .env import env_int
+from .indicators.batch import volatility
+
+FACTORS = ("momentum", "volume_surge", "vol_adjusted")
+UNCLASSIFIED = "UNCLASSIFIED"
+
+
+def _parse_weights(raw: Optional[str]) -> Dict[str, float]:
+    weights = {name: 1.0 for name in FACTORS}
+    for item in (raw or "").split(","):
+        name, _, value = item.partition("=")
+        if name.strip() in weights:
+            try:
+                weights[name.strip()] = float(value)
+            except ValueError:
+                pass
+    return weights
+
+
+@dataclass
+class RankingConfig:
+    top_k: int = 20
+    per_sector: int = 3
+    volume_window: int = 20
+    volatility_window: int = 20
+    weights: Dict[str, float] = field(default_factory=lambda: {name: 1.0 for name in FACTORS})
+
+
+def load_ranking_config() -> RankingConfig:
+    return RankingConfig(
+        top_k=env_int("FYERS_RANK_TOP_K", 20),
+        per_sector=env_int("FYERS_RANK_PER_SECTOR", 3),
+        volume_window=env_int("FYERS_RANK_VOLUME_WINDOW", 20),
+        volatility_window=env_int("FYERS_INDICATOR_VOLATILITY_WINDOW", 20),
+        weights=_parse_weights(os.getenv("FYERS_RANK_WEIGHTS")),
+    )
+
+
+# -- sector map --------------------------------------------------------
+
+_SECTOR_MAPS: Dict[Tuple[str, float], Dict[str, str]] = {}
+
+
+def load_sector_map(path: Optional[str] = None) -> Dict[str, str]:
+    """Symbol -> sector from ``FYERS_SECTOR_MAP``.
+
+    JSON may be ``{"NSE:SBIN-EQ": "Banks"}`` or ``{"Banks": ["NSE:SBIN-EQ", ...]}``;
+    CSV rows are ``symbol,sector``. Reloaded when the file changes.
+    """
+    path = path or os.getenv("FYERS_SECTOR_MAP")
+    if not path or not os.path.exists(path):
+        return {}
+    key = (path, os.path.getmtime(path))
+    cached = _SECTOR_MAPS.get(key)
+    if cached is not None:
+        return cached
+    mapping: Dict[str, str] = {}
+    try:
+        if path.lower().endswith(".json"):
+            raw = json.loads(Path(path).read_text(encoding="utf-8"))
+            for name, value in (raw.items() if isinstance(raw, dict) else []):
+                if isinstance(value, list):
+                    mapping.update({str(symbol).upper(): str(name) for symbol in value})
+                else:
+                    mapping[str(name).upper()] = str(value)
+        else:
+            with open(path, newline="", encoding="utf-8") as handle:
+                for row in csv.reader(handle):
+                    if len(row) >= 2 and row[0].strip() and row[0].strip().lower() != "symbol":
+                        mapping[row[0].strip().upper()] = row[1].strip()
+    except (OSError, ValueError):
+        return {}
+    _SECTOR_MAPS.clear()
+    _SECTOR_MAPS[key] = mapping
+    return mapping
+
+
+# -- scoring -------------------------------------------------------------
+
+
+def percentile_ranks(values: np.ndarray) -> np.ndarray:
+    """Percentile (0-100) of each finite value among the finite values; ties share the mean rank, NaN stays NaN."""
+    out = np.full(values.shape, np.nan)
+    finite = np.flatnonzero(np.isfinite(values))
+    count = len(finite)
+    if count == 0:
+        return out
+    if count == 1:
+        out[finite] = 50.0
+        return out
+    subset = values[finite]
+    order = np.argsort(subset, kind="stable")
+    ranks = np.empty(count)
+    ranks[order] = np.arange(count, dtype=np.float64)
+    # Average ranks across ties so equal values get equal percentiles.
+    sorted_values = subset[order]
+    boundaries = np.flatnonzero(np.diff(sorted_values)) + 1
+    if len(boundaries) < count - 1:
+        starts = np.concatenate(([0], boundaries))
+        lengths = np.diff(np.append(starts, count))
+        mean_rank = np.repeat(starts + (lengths - 1) / 2.0, lengths)
+        ranks[order] = mean_rank
+    out[finite] = ranks / (count - 1) * 100.0
+    return out
+
+
+def factor_values(
+    change_pct: np.ndarray,
+    volume: np.ndarray,
+    avg_volume: np.ndarray,
+    daily_volatility: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        surge = np.where(avg_volume > 0, volume / avg_volume, np.nan)
+        adjusted = np.where(daily_volatility > 0, change_pct / daily_volatility, np.nan)
+    return {"momentum": change_pct, "volume_surge": surge, "vol_adjusted": adjusted}
+
+
+def composite_scores(factors: Dict[str, np.ndarray], weights: Dict[str, float]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Weighted mean of the available factor percentiles per symbol."""
+    percentiles = {name: percentile_ranks(values) for name, values in factors.items()}
+    stacked = np.vstack([percentiles[name] for name in FACTORS])
+    w = np.array([weights.get(name, 0.0) for name in FACTORS])[:, None]
+    available = np.isfinite(stacked) & (w > 0)
+    total_weight = (available * w).sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        score = np.where(total_weight > 0, np.where(available, stacked * w, 0.0).sum(axis=0) / total_weight, np.nan)
+    return score, percentiles
+
+
+def top_k_indices(score: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` best finite scores, best first; only those ``k`` are sorted."""
+    finite = np.flatnonzero(np.isfinite(score))
+    k = min(k, len(finite))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    candidates = finite if k == len(finite) else finite[np.argpartition(-score[finite], k - 1)[:k]]
+    return candidates[np.argsort(-score[candidates], kind="stable")]
+
+
+class UniverseRanker:
+    """Keeps per-symbol daily baselines and ranks quote snapshots against them."""
+
+    def __init__(self, store: Optional[CandleStore] = None, config: Optional[RankingConfig] = None) -> None:
+        self.store = store or CandleStore()
+        self.config = config or load_ranking_config()
+        self._baseline: Dict[str, Tuple[float, float]] = {}
+        self._baseline_day: Optional[str] = None
+        self._aligned: Optional[Tuple[Tuple[str, ...], np.ndarray, np.ndarray]] = None
+        self._sectors: Optional[Tuple[Tuple[str, ...], Dict[str, str], Tuple[List[str], np.ndarray, np.ndarray]]] = None
+        self._lock = threading.Lock()
+
+    def _symbol_baseline(self, symbol: str, today_start: int) -> Tuple[float, float]:
+        """(average daily volume, daily return volatility %) from candles before today."""
+        candles = self.store.load(symbol, "D", columns=["ts", "close", "volume"])
+        before = candles["ts"] < today_start
+        close = candles["close"][before]
+        volume = candles["volume"][before][-self.config.volume_window :]
+        avg_volume = float(volume.mean()) if len(volume) else np.nan
+        window = self.config.volatility_window
+        vol = float(volatility(close[-(window + 1) :], window)[-1]) if len(close) > window else np.nan
+        return avg_volume, vol
+
+    def baselines(self, symbols: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Average volume and volatility arrays aligned with ``symbols``."""
+        today = datetime.now(IST).strftime("%Y-%m-%d")
+        key = tuple(symbols)
+        with self._lock:
+            if self._baseline_day != today:
+                self._baseline.clear()
+                self._aligned = None
+                self._baseline_day = today
+            if self._aligned is not None and self._aligned[0] == key:
+                return self._aligned[1], self._aligned[2]
+            today_start = int(datetime.strptime(today, "%Y-%m-%d").replace(tzinfo=IST).timestamp())
+            for symbol in key:
+                if symbol and symbol not in self._baseline:
+                    self._baseline[symbol] = self._symbol_baseline(symbol, today_start)
+            pairs = [self._baseline.get(symbol, (np.nan, np.nan)) for symbol in key]
+            avg_volume = np.array([pair[0] for pair in pairs], dtype=np.float64)
+            vol = np.array([pair[1] for pair in pairs], dtype=np.float64)
+            self._aligned = (key, avg_volume, vol)
+            return avg_volume, vol
+
+    def sector_codes(self, symbols: Sequence[str], sector_map: Dict[str, str]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Sector per symbol plus integer codes for ``np.bincount``; reused while symbols and map are unchanged."""
+        key = tuple(symbols)
+        cached = self._sectors
+        if cached is not None and cached[0] == key and cached[1] is sector_map:
+            return cached[2]
+        sectors = [sector_map.get(symbol.upper(), UNCLASSIFIED) for symbol in key]
+        if sectors:
+            names, codes = np.unique(np.array(sectors, dtype=str), return_inverse=True)
+        else:
+            names, codes = np.array([], dtype=str), np.array([], dtype=np.int64)
+        self._sectors = (key, sector_map, (sectors, names, codes))
+        return sectors, names, codes
+
+    def rank(
+        self,
+        columns: Any,
+        top_k: Optional[int] = None,
+        sector_map: Optional[Dict[str, str]] = None,
+        avg_volume: Optional[np.ndarray] = None,
+        daily_volatility: Optional[np.ndarray] = None,
+    ) -> Dict[str, Any]:
+        """Rank ``QuoteColumns``; baselines default to the candle cache."""
+        started = time.perf_counter()
+        config = self.config
+        symbols = [symbol or "" for symbol in columns.symbols]
+        if avg_volume is None or daily_volatility is None:
+            avg_volume, daily_volatility = self.baselines(symbols)
+        usable = columns.has_last_price & (columns.last_price > 0) & columns.has_change_pct
+        change_pct = np.where(usable, columns.change_pct, np.nan)
+        volume = np.where(columns.has_volume, columns.volume, np.nan)
+
+        factors = factor_values(change_pct, volume, avg_volume, daily_volatility)
+        score, percentiles = composite_scores(factors, config.weights)
+        score = np.where(usable, score, np.nan)
+        top = top_k_indices(score, top_k or config.top_k)
+
+        sectors, names, codes = self.sector_codes(symbols, load_sector_map() if sector_map is None else sector_map)
+        ranked = np.isfinite(score)
+        counts = np.bincount(codes[ranked], minlength=len(names))
+        totals = np.bincount(codes[ranked], weights=score[ranked], minlength=len(names))
+
+        def row(i: int, position: int) -> Dict[str, Any]:
+            return {
+                "rank": position,
+                "symbol": symbols[i],
+                "sector": sectors[i],
+                "score": round(float(score[i]), 2),
+                "last_price": float(columns.last_price[i]),
+                "change_pct": round(float(change_pct[i]), 4),
+                "volume_surge": None if not np.isfinite(factors["volume_surge"][i]) else round(float(factors["volume_surge"][i]), 3),
+                "vol_adjusted_return": None if not np.isfinite(factors["vol_adjusted"][i]) else round(float(factors["vol_adjusted"][i]), 3),
+                "percentiles": {name: None if not np.isfinite(percentiles[name][i]) else round(float(percentiles[name][i]), 1) for name in FACTORS},
+            }
+
+        top_rows = [row(int(i), position + 1) for position, i in enumerate(top)]
+        by_sector: Dict[str, List[Dict[str, Any]]] = {}
+        for item in top_rows:
+            by_sector.setdefault(item["sector"], []).append(item)
+
+        # Sector leaders: best ``per_sector`` symbols of each sector, top-k per group without a full sort.
+        leaders: Dict[str, List[str]] = {}
+        if config.per_sector > 0:
+            for code, name in enumerate(names.tolist()):
+                if not counts[code]:
+                    continue
+                members = np.flatnonzero((codes == code) & ranked)
+                best = members[top_k_indices(score[members], config.per_sector)]
+                leaders[name] = [symbols[i] for i in best]
+
+        sector_summary = sorted(
+            (
+                {"sector": name, "symbols": int(counts[code]), "mean_score": round(float(totals[code] / counts[code]), 2), "leaders": leaders.get(name, [])}
+                for code, name in enumerate(names.tolist())
+                if counts[code]
+            ),
+            key=lambda item: -item["mean_score"],
+        )
+        return {
+            "ranked": int(ranked.sum()),
+            "unranked": len(symbols) - int(ranked.sum()),
+            "top": top_rows,
+            "by_sector": by_sector,
+            "sectors": sector_summary,
+            "factor_coverage": {name: int(np.isfinite(values).sum()) for name, values in factors.items()},
+            "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 3),
+        }
+
+
+_RANKER: Optional[UniverseRanker] = None
+_RANKER_LOCK = threading.Lock()
+
+
+def get_universe_ranker() -> UniverseRanker:
+    global _RANKER
+    with _RANKER_LOCK:
+        if _RANKER is None:
+            _RANKER = UniverseRanker()
+        return _RANKER
+
+
+def run_ranking(client: Any, watchlist: Any = None, top_k: Optional[int] = None) -> Dict[str, Any]:
+    """Quote the universe (through the shared cache) and rank it."""
+    from .columnar_screener import decode_quote_columns
+    from .quote_cache import get_quote_cache
+    from .screener import parse_watchlist
+    from .symbol_master import get_symbol_master, symbol_master_enabled
+
+    symbols = parse_watchlist(watchlist)
+    if not symbols:
+        return {
+            "success": False,
+            "error": "No watchlist symbols provided",
+            "message": "Set FYERS_WATCHLIST in .env or pass watchlist argument",
+        }
+    if symbol_master_enabled():
+        master = get_symbol_master()
+        if master.available:
+            symbols = master.validate_watchlist(symbols)["symbols"]
+
+    quote_response = get_quote_cache().get_quotes(client, symbols)
+    if not quote_response.get("success"):
+        return {
+            "success": False,
+            "error": quote_response.get("error", "Quote request failed"),
+            "quotes_response": quote_response,
+        }
+
+    ranker = get_universe_ranker()
+    ranking = ranker.rank(decode_quote_columns(quote_response), top_k=top_k)
+    leaders = ", ".join(item["symbol"] for item in ranking["top"][:5])
+    return {
+        "success": True,
+        "universe": len(symbols),
+        "config": asdict(ranker.config),
+        **ranking,
+        "message": f"Ranked {ranking['ranked']} of {len(symbols)} symbols; top: {leaders or 'none'}",
+    }
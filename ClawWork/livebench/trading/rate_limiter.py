@@ -0,0 +1,193 @@
+"""Client-side token-bucket rate limiting for FYERS API calls.
+
+Every request takes one token from the shared account-wide buckets plus the
+buckets of its category (data, order or account). When callers have to wait,
+they are released in priority order: orders first, then account reads, then
+market data polling.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .env import env_flag, env_float
+
+CATEGORY_PRIORITY = {"order": 0, "account": 1, "data": 2}
+
+# FYERS documents 10 requests/second and 200 requests/minute per app.
+# Category defaults leave headroom in the shared bucket for orders.
+DEFAULT_LIMITS = {
+    "global": (10.0, 200.0),
+    "order": (10.0, 100.0),
+    "account": (4.0, 60.0),
+    "data": (8.0, 160.0),
+}
+
+
+ORDER_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+def classify_endpoint(method: str, path: str) -> str:
+    """Map a request method and path (or URL) to its rate-limit category.
+
+    Only order placement, modification and cancellation count as orders;
+    reading the order book (``GET /orders``) is an account read.
+    """
+    lowered = path.lower()
+    if "order" in lowered:
+        return "order" if method.upper() in ORDER_METHODS else "account"
+    if "quotes" in lowered or "/data/" in lowered or "history" in lowered or "depth" in lowered:
+        return "data"
+    return "account"
+
+
+class TokenBucket:
+    """Classic token bucket; capacity equals the refill amount per period."""
+
+    def __init__(self, capacity: float, period_seconds: float) -> None:
+        self.capacity = max(capacity, 1.0)
+        self.rate = self.capacity / period_seconds
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        self._refill(now)
+        if self.tokens >= 1.0:
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+    def consume(self, now: float) -> None:
+        self._refill(now)
+        self.tokens -= 1.0
+
+
+class FyersRateLimiter:
+    """Shared limiter with per-category buckets and a priority wait queue."""
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, float]]] = None, enabled: Optional[bool] = None) -> None:
+        limits = limits or {
+            name: (
+                env_float(f"FYERS_RATE_{name.upper()}_PER_SEC", per_sec),
+                env_float(f"FYERS_RATE_{name.upper()}_PER_MIN", per_min),
+            )
+            for name, (per_sec, per_min) in DEFAULT_LIMITS.items()
+        }
+        self.enabled = env_flag("FYERS_RATE_LIMIT", True) if enabled is None else enabled
+        self._buckets: Dict[str, List[TokenBucket]] = {
+            name: [TokenBucket(per_sec, 1.0), TokenBucket(per_min, 60.0)] for name, (per_sec, per_min) in limits.items()
+        }
+        self._cond = threading.Condition()
+        self._queue: List[Tuple[int, int]] = []
+        self._queued_category: Dict[int, str] = {}
+        self._seq = itertools.count()
+        self._stats = {
+            name: {"requests": 0, "waited": 0, "wait_seconds_total": 0.0, "wait_seconds_max": 0.0, "queue_depth_max": 0}
+            for name in CATEGORY_PRIORITY
+        }
+
+    def _buckets_for(self, category: str) -> List[TokenBucket]:
+        return self._buckets.get("global", []) + self._buckets.get(category, [])
+
+    def _wait_for(self, category: str, now: float) -> float:
+        return max((bucket.wait_time(now) for bucket in self._buckets_for(category)), default=0.0)
+
+    def _take(self, category: str, now: float, waited: float) -> None:
+        for bucket in self._buckets_for(category):
+            bucket.consume(now)
+        stats = self._stats[category]
+        stats["requests"] += 1
+        if waited > 0:
+            stats["waited"] += 1
+            stats["wait_seconds_total"] += waited
+            stats["wait_seconds_max"] = max(stats["wait_seconds_max"], waited)
+
+    def try_acquire(self, category: str) -> bool:
+        """Take a token without waiting; fails if anyone is queued or buckets are empty."""
+        category = category if category in CATEGORY_PRIORITY else "account"
+        if not self.enabled:
+            return True
+        with self._cond:
+            now = time.monotonic()
+            if self._queue or self._wait_for(category, now) > 0:
+                return False
+            self._take(category, now, 0.0)
+            return True
+
+    def acquire(self, category: str) -> float:
+        """Block until a token is available for ``category``; returns seconds waited."""
+        category = category if category in CATEGORY_PRIORITY else "account"
+        if not self.enabled:
+            return 0.0
+
+        start = time.monotonic()
+        with self._cond:
+            if not self._queue and self._wait_for(category, start) == 0:
+                self._take(category, start, 0.0)
+                return 0.0
+
+            ticket = (CATEGORY_PRIORITY[category], next(self._seq))
+            heapq.heappush(self._queue, ticket)
+            self._queued_category[ticket[1]] = category
+            depth = sum(1 for seq_category in self._queued_category.values() if seq_category == category)
+            self._stats[category]["queue_depth_max"] = max(self._stats[category]["queue_depth_max"], depth)
+            try:
+                while True:
+                    now = time.monotonic()
+                    next_ticket, timeout = self._next_eligible(now)
+                    if next_ticket == ticket:
+                        waited = now - start
+                        self._take(category, now, waited)
+                        return waited
+                    self._cond.wait(timeout=timeout)
+            finally:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+                self._queued_category.pop(ticket[1], None)
+                self._cond.notify_all()
+
+    def _next_eligible(self, now: float) -> Tuple[Optional[Tuple[int, int]], float]:
+        """Highest-priority queued ticket whose buckets have a token, and the shortest wait otherwise."""
+        shortest = 1.0
+        for ticket in sorted(self._queue):
+            wait = self._wait_for(self._queued_category[ticket[1]], now)
+            if wait == 0:
+                return ticket, 0.0
+            shortest = min(shortest, wait)
+        return None, max(shortest, 0.001)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            depth: Dict[str, int] = {name: 0 for name in CATEGORY_PRIORITY}
+            for category in self._queued_category.values():
+                depth[category] += 1
+            out: Dict[str, Any] = {"enabled": self.enabled, "categories": {}}
+            for name, stats in self._stats.items():
+                out["categories"][name] = {
+                    **stats,
+                    "wait_seconds_total": round(stats["wait_seconds_total"], 6),
+                    "queue_depth": depth[name],
+                    "wait_seconds_avg": round(stats["wait_seconds_total"] / stats["waited"], 6) if stats["waited"] else 0.0,
+                }
+            return out
+
+
+_RATE_LIMITER: Optional[FyersRateLimiter] = None
+_RATE_LIMITER_LOCK = threading.Lock()
+
+
+def get_rate_limiter() -> FyersRateLimiter:
+    """Return the process-wide FYERS rate limiter."""
+    global _RATE_LIMITER
+    with _RATE_LIMITER_LOCK:
+        if _RATE_LIMITER is None:
+            _RATE_LIMITER = FyersRateLimiter()
+        return _RATE_LIMITER
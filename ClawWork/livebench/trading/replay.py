@@ -0,0 +1,649 @@
+"""Deterministic market replay behind a local FYERS-compatible HTTP stub.
+
+Recorded quote snapshots (a ``TickStore`` directory, tick JSONL written by
+``MarketFeed``, or screener audit JSONL with full ``results``) are served
+through the same REST routes ``FyersClient`` and ``AsyncFyersClient`` call:
+
+    /quotes, /data/quotes          latest recorded quote per symbol at the replay clock
+    /data/history                  candles aggregated from the recorded ticks
+    /funds, /positions, /holdings  a simulated account
+    /orders (GET / POST)           order book / place an order (market and marketable limits fill at the replay price)
+    /multi-order/sync              place up to 10 orders in one request (``multi_order=False`` answers 404)
+    /data/options-chain-v3         synthetic weekly option chain priced off the replayed underlying
+    /profile
+
+The replay clock runs at ``speed`` times real time; ``speed <= 0`` (max
+speed) only moves when ``ReplayClock.step()`` is called (or ``POST
+/replay/step``), so every screener run sees exactly one recorded snapshot.
+Latency (``latency_ms`` plus uniform ``jitter_ms``) and error injection
+(``error_rate`` of requests answered with ``error_status``) are seeded, so
+runs are reproducible.
+
+Usage:
+    python -m livebench.trading.replay --tick-store <agent_data>/trading/ticks --port 8900 --speed 10
+    FYERS_API_BASE_URL=http://127.0.0.1:8900/api/v3 FYERS_ACCESS_TOKEN=replay ./scripts/fyers_screener.sh
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from .candle_store import resolution_seconds
+from .feed_replay import ReplayTick, load_tick_store, load_ticks
+from .paper_trading import ORDER_STATUS_FILLED, ORDER_STATUS_PENDING, ORDER_STATUS_REJECTED
+
+IST_OFFSET_SECONDS = 5 * 3600 + 30 * 60
+
+_API_PREFIXES = ("/api/v3", "/api/v2", "/api")
+
+
+def _num(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+class QuoteTimeline:
+    """Recorded quotes as arrays sorted by (symbol, time) for as-of lookups."""
+
+    def __init__(self, ticks: Sequence[ReplayTick]) -> None:
+        symbols = sorted({tick["symbol"] for _, tick in ticks})
+        self.symbols: List[str] = symbols
+        self._ids = {symbol: i for i, symbol in enumerate(symbols)}
+
+        sym = np.fromiter((self._ids[tick["symbol"]] for _, tick in ticks), dtype=np.int64, count=len(ticks))
+        ts = np.fromiter((stamp for stamp, _ in ticks), dtype=np.float64, count=len(ticks))
+
+        def column(*keys: str) -> np.ndarray:
+            return np.fromiter(
+                (_num(next((tick[k] for k in keys if tick.get(k) is not None), None)) for _, tick in ticks),
+                dtype=np.float64,
+                count=len(ticks),
+            )
+
+        ltp = column("ltp", "last_price")
+        prev_close = column("prev_close_price", "prev_close")
+        chp = column("chp", "change_pct")
+        volume = column("vol_traded_today", "volume")
+
+        order = np.lexsort((ts, sym))
+        self.sym, self.ts = sym[order], ts[order]
+        self.ltp, self.prev_close, self.chp, self.volume = ltp[order], prev_close[order], chp[order], volume[order]
+        self.offsets = np.searchsorted(self.sym, np.arange(len(symbols) + 1))
+        self.times = np.unique(self.ts)
+
+    @classmethod
+    def from_jsonl(cls, path: Union[str, Path]) -> "QuoteTimeline":
+        return cls(load_ticks(path))
+
+    @classmethod
+    def from_tick_store(cls, root: Union[str, Path], start: Optional[float] = None, end: Optional[float] = None) -> "QuoteTimeline":
+        return cls(load_tick_store(root, start, end))
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    @property
+    def start(self) -> float:
+        return float(self.times[0]) if len(self.times) else 0.0
+
+    @property
+    def end(self) -> float:
+        return float(self.times[-1]) if len(self.times) else 0.0
+
+    def _rows_at(self, symbols: Sequence[str], at: float) -> np.ndarray:
+        """Index of each symbol's latest quote at or before ``at`` (-1 when none)."""
+        rows = np.full(len(symbols), -1, dtype=np.int64)
+        for i, symbol in enumerate(symbols):
+            sid = self._ids.get(symbol)
+            if sid is None:
+                continue
+            lo, hi = self.offsets[sid], self.offsets[sid + 1]
+            pos = lo + int(np.searchsorted(self.ts[lo:hi], at, side="right")) - 1
+            if pos >= lo:
+                rows[i] = pos
+        return rows
+
+    def last_price(self, symbol: str, at: float) -> Optional[float]:
+        row = self._rows_at([symbol], at)[0]
+        return float(self.ltp[row]) if row >= 0 else None
+
+    def quotes(self, symbols: Sequence[str], at: float) -> List[Dict[str, Any]]:
+        """FYERS ``/quotes`` ``d`` rows as of ``at``."""
+        out: List[Dict[str, Any]] = []
+        for symbol, row in zip(symbols, self._rows_at(symbols, at).tolist()):
+            if row < 0:
+                out.append({"n": symbol, "s": "error", "v": {"code": -300, "errmsg": "No data for symbol"}})
+                continue
+            ltp, prev_close, chp = self.ltp[row], self.prev_close[row], self.chp[row]
+            if chp != chp and prev_close > 0:
+                chp = (ltp - prev_close) / prev_close * 100.0
+            values = {
+                "lp": float(ltp),
+                "prev_close_price": float(prev_close),
+                "ch": round(float(ltp - prev_close), 2),
+                "chp": round(float(chp), 2),
+                "volume": float(self.volume[row]),
+                "tt": int(self.ts[row]),
+            }
+            out.append({"n": symbol, "s": "ok", "v": {key: (None if value != value else value) for key, value in values.items()}})
+        return out
+
+    def candles(self, symbol: str, resolution: str, range_from: float, range_to: float) -> List[List[float]]:
+        """OHLCV bars built from the recorded ticks; volume is the change in cumulative day volume."""
+        sid = self._ids.get(symbol)
+        if sid is None:
+            return []
+        lo, hi = self.offsets[sid], self.offsets[sid + 1]
+        ts, ltp, volume = self.ts[lo:hi], self.ltp[lo:hi], self.volume[lo:hi]
+        keep = (ts >= range_from) & (ts <= range_to) & np.isfinite(ltp)
+        ts, ltp, volume = ts[keep], ltp[keep], np.nan_to_num(volume[keep])
+        if not len(ts):
+            return []
+
+        seconds = resolution_seconds(resolution)
+        if seconds >= 86400:
+            bucket = (ts.astype(np.int64) + IST_OFFSET_SECONDS) // seconds
+            bar_ts = bucket * seconds - IST_OFFSET_SECONDS
+        else:
+            bucket = ts.astype(np.int64) // seconds
+            bar_ts = bucket * seconds
+        starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+        ends = np.r_[starts[1:], len(ts)] - 1
+        # Feed volume is cumulative per trading day: the first bar of a day takes it as is.
+        last_volume = volume[ends]
+        day = (ts[ends].astype(np.int64) + IST_OFFSET_SECONDS) // 86400
+        same_day = np.r_[False, day[1:] == day[:-1]]
+        bar_volume = np.where(same_day, np.maximum(last_volume - np.r_[0.0, last_volume[:-1]], 0.0), last_volume)
+        bars = np.column_stack(
+            [
+                bar_ts[starts],
+                ltp[starts],
+                np.maximum.reduceat(ltp, starts),
+                np.minimum.reduceat(ltp, starts),
+                ltp[ends],
+                bar_volume,
+            ]
+        )
+        return [[int(row[0]), *row[1:5].tolist(), int(row[5])] for row in bars]
+
+
+class ReplayClock:
+    """Maps wall time to recorded time; ``speed <= 0`` steps one snapshot per ``step()``."""
+
+    def __init__(self, timeline: QuoteTimeline, speed: float = 1.0, loop: bool = False) -> None:
+        self.timeline = timeline
+        self.speed = speed
+        self.loop = loop
+        self._lock = threading.Lock()
+        self._index = 0
+        self._started = time.monotonic()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._index = 0
+            self._started = time.monotonic()
+
+    def now(self) -> float:
+        times = self.timeline.times
+        if not len(times):
+            return time.time()
+        with self._lock:
+            if self.speed <= 0:
+                return float(times[self._index])
+            elapsed = (time.monotonic() - self._started) * self.speed
+        span = times[-1] - times[0]
+        if self.loop and span > 0:
+            elapsed %= span
+        return float(times[0] + min(elapsed, span))
+
+    def step(self, count: int = 1) -> float:
+        """Advance to the next recorded snapshot (max-speed mode); returns the new replay time."""
+        times = self.timeline.times
+        with self._lock:
+            if len(times):
+                index = self._index + count
+                self._index = index % len(times) if self.loop else min(index, len(times) - 1)
+        return self.now()
+
+    def finished(self) -> bool:
+        times = self.timeline.times
+        if self.loop or not len(times):
+            return False
+        return self.now() >= times[-1] and (self.speed > 0 or self._index == len(times) - 1)
+
+
+class ReplayAccount:
+    """Simulated funds, positions, holdings and order book for the stub."""
+
+    def __init__(self, cash: float = 100000.0, holdings: Optional[List[Dict[str, Any]]] = None) -> None:
+        self.starting_cash = cash
+        self.cash = cash
+        self.holdings = list(holdings or [])
+        self.positions: Dict[str, Dict[str, float]] = {}
+        self.orders: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._next_id = 1
+
+    def _fill(self, order: Dict[str, Any], price: float, at: float) -> None:
+        qty = order["qty"] * order["side"]
+        position = self.positions.setdefault(order["symbol"], {"qty": 0.0, "avg": 0.0, "realized": 0.0, "buy_qty": 0.0, "sell_qty": 0.0})
+        held = position["qty"]
+        if held == 0 or (held > 0) == (qty > 0):
+            position["avg"] = (position["avg"] * abs(held) + price * abs(qty)) / (abs(held) + abs(qty))
+        else:
+            closed = min(abs(held), abs(qty))
+            position["realized"] += closed * (price - position["avg"]) * (1 if held > 0 else -1)
+            if abs(qty) > abs(held):
+                position["avg"] = price
+        position["qty"] = held + qty
+        position["buy_qty" if qty > 0 else "sell_qty"] += abs(qty)
+        self.cash -= qty * price
+        order.update(status=ORDER_STATUS_FILLED, filledQty=order["qty"], tradedPrice=price, fill_time=at)
+
+    @staticmethod
+    def _marketable(order: Dict[str, Any], price: float) -> bool:
+        if order["type"] == 2:
+            return True
+        limit = order["limitPrice"]
+        return price <= limit if order["side"] > 0 else price >= limit
+
+    def place(self, payload: Dict[str, Any], price: Optional[float], at: float) -> Tuple[int, Dict[str, Any]]:
+        symbol = payload.get("symbol")
+        try:
+            qty = int(payload.get("qty") or 0)
+            side = int(payload.get("side") or 0)
+            order_type = int(payload.get("type") or 0)
+            limit_price = float(payload.get("limitPrice") or 0)
+        except (TypeError, ValueError):
+            return 400, {"s": "error", "code": -50, "message": "Invalid order parameters"}
+        if not symbol or qty <= 0 or side not in (1, -1) or order_type not in (1, 2):
+            return 400, {"s": "error", "code": -50, "message": "Invalid order parameters (replay supports market and limit orders)"}
+
+        with self._lock:
+            order_id = f"REPLAY{self._next_id:08d}"
+            self._next_id += 1
+            order = {
+                "id": order_id,
+                "symbol": symbol,
+                "qty": qty,
+                "side": side,
+                "type": order_type,
+                "limitPrice": limit_price,
+                "productType": payload.get("productType"),
+                "status": ORDER_STATUS_PENDING,
+                "filledQty": 0,
+                "tradedPrice": 0.0,
+                "orderDateTime": at,
+            }
+            self.orders.append(order)
+            if price is None:
+                order["status"] = ORDER_STATUS_REJECTED
+                return 200, {"s": "error", "code": -300, "message": f"No replay price for {symbol}", "id": order_id}
+            if self._marketable(order, price):
+                self._fill(order, price, at)
+        return 200, {"s": "ok", "code": 1101, "message": "Order submitted successfully", "id": order_id}
+
+    def match(self, price_of: Any, at: float) -> None:
+        """Fill resting limit orders that became marketable at the replay time."""
+        with self._lock:
+            for order in self.orders:
+                if order["status"] != ORDER_STATUS_PENDING:
+                    continue
+                price = price_of(order["symbol"])
+                if price is not None and self._marketable(order, price):
+                    self._fill(order, price, at)
+
+    def funds_body(self) -> Dict[str, Any]:
+        with self._lock:
+            used = sum(abs(p["qty"]) * p["avg"] for p in self.positions.values())
+            return {
+                "s": "ok",
+                "code": 200,
+                "fund_limit": [
+                    {"id": 1, "title": "Total Balance", "equityAmount": round(self.starting_cash, 2)},
+                    {"id": 2, "title": "Utilized Amount", "equityAmount": round(used, 2)},
+                    {"id": 10, "title": "Available Balance", "equityAmount": round(self.cash, 2)},
+                ],
+            }
+
+    def positions_body(self, price_of: Any) -> Dict[str, Any]:
+        with self._lock:
+            rows = []
+            for symbol, position in self.positions.items():
+                ltp = price_of(symbol)
+                unrealized = (ltp - position["avg"]) * position["qty"] if ltp is not None else 0.0
+                rows.append(
+                    {
+                        "symbol": symbol,
+                        "netQty": int(position["qty"]),
+                        "qty": int(abs(position["qty"])),
+                        "netAvg": round(position["avg"], 4),
+                        "avgPrice": round(position["avg"], 4),
+                        "buyQty": int(position["buy_qty"]),
+                        "sellQty": int(position["sell_qty"]),
+                        "realized_profit": round(position["realized"], 2),
+                        "unrealized_profit": round(unrealized, 2),
+                        "pl": round(position["realized"] + unrealized, 2),
+                        "ltp": ltp,
+                        "productType": "INTRADAY",
+                    }
+                )
+        total = sum(row["pl"] for row in rows)
+        return {"s": "ok", "code": 200, "netPositions": rows, "overall": {"count_open": sum(1 for r in rows if r["netQty"]), "pl_total": round(total, 2)}}
+
+    def holdings_body(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"s": "ok", "code": 200, "holdings": list(self.holdings), "overall": {"count_total": len(self.holdings)}}
+
+    def orders_body(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"s": "ok", "code": 200, "orderBook": [dict(order) for order in self.orders]}
+
+
+_STRIKE_STEPS = (0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 50.0, 100.0, 250.0, 500.0, 1000.0)
+
+
+def _weekly_expiries(now: float, count: int = 4) -> List[int]:
+    """Next ``count`` Thursday 15:30 IST expiries after ``now``."""
+    local = now + IST_OFFSET_SECONDS
+    day_start = local - local % 86400
+    weekday = int(day_start // 86400 + 3) % 7  # 1970-01-01 was a Thursday (weekday 3)
+    first = day_start + ((3 - weekday) % 7) * 86400 + 15.5 * 3600 - IST_OFFSET_SECONDS
+    if first <= now:
+        first += 7 * 86400
+    return [int(first + week * 7 * 86400) for week in range(count)]
+
+
+def option_chain_body(
+    underlying: str,
+    spot: float,
+    strike_count: int,
+    now: float,
+    expiry: Optional[int] = None,
+    base_vol: float = 0.15,
+    smile: float = 0.6,
+    rate: float = 0.065,
+) -> Tuple[int, Dict[str, Any]]:
+    """An ``options-chain-v3`` response priced with Black-Scholes on a quadratic smile.
+
+    Strikes are spaced at a round step near 0.2% of ``spot``; every contract's
+    implied volatility is ``base_vol + smile * ln(K/S)^2``, so IV solvers can be
+    checked against known values.
+    """
+    from datetime import datetime, timezone
+
+    from .options import SECONDS_PER_YEAR, bs_price
+
+    expiries = _weekly_expiries(now)
+    if expiry is not None and expiry not in expiries:
+        return 400, {"s": "error", "code": -300, "message": f"Invalid expiry {expiry}"}
+    chosen = expiry if expiry is not None else expiries[0]
+    step = next((s for s in _STRIKE_STEPS if s >= spot * 0.002), _STRIKE_STEPS[-1])
+    atm = round(spot / step) * step
+    strikes = atm + step * np.arange(-strike_count, strike_count + 1)
+    strikes = strikes[strikes > 0]
+    t = (chosen - now) / SECONDS_PER_YEAR
+    vol = base_vol + smile * np.log(strikes / spot) ** 2
+
+    exchange, _, name = underlying.partition(":")
+    root = name.split("-", 1)[0]
+    day = datetime.fromtimestamp(chosen + IST_OFFSET_SECONDS, timezone.utc).strftime("%y%m%d")
+    rows: List[Dict[str, Any]] = [{"symbol": underlying, "ltp": round(spot, 2), "option_type": "", "strike_price": -1}]
+    for option_type in ("CE", "PE"):
+        prices = bs_price(spot, strikes, t, vol, rate, option_type == "CE")
+        for strike, price in zip(strikes.tolist(), prices.tolist()):
+            ltp = max(round(price / 0.05) * 0.05, 0.05)
+            half_spread = max(round(price * 0.0025 / 0.05) * 0.05, 0.05)
+            rows.append({
+                "symbol": f"{exchange}:{root}{day}{strike:g}{option_type}",
+                "option_type": option_type,
+                "strike_price": strike,
+                "ltp": round(ltp, 2),
+                "bid": round(max(price - half_spread, 0.05), 2),
+                "ask": round(price + half_spread, 2),
+                "oi": int(1e6 * np.exp(-12.0 * abs(np.log(strike / spot)))),
+                "oich": 0,
+                "volume": int(5e6 * np.exp(-20.0 * abs(np.log(strike / spot)))),
+            })
+    expiry_data = [
+        {"date": datetime.fromtimestamp(item + IST_OFFSET_SECONDS, timezone.utc).strftime("%d-%m-%Y"), "expiry": str(item)}
+        for item in expiries
+    ]
+    call_oi = sum(row["oi"] for row in rows if row["option_type"] == "CE")
+    put_oi = sum(row["oi"] for row in rows if row["option_type"] == "PE")
+    return 200, {"s": "ok", "code": 200, "data": {"expiryData": expiry_data, "optionsChain": rows, "callOi": call_oi, "putOi": put_oi}}
+
+
+class FyersReplayServer:
+    """Local FYERS REST stub serving a ``QuoteTimeline`` and a ``ReplayAccount``; runs on its own thread."""
+
+    def __init__(
+        self,
+        timeline: QuoteTimeline,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        speed: float = 1.0,
+        loop: bool = False,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        seed: int = 7,
+        account: Optional[ReplayAccount] = None,
+        multi_order: bool = True,
+    ) -> None:
+        self.timeline = timeline
+        self.clock = ReplayClock(timeline, speed=speed, loop=loop)
+        self.account = account or ReplayAccount()
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.multi_order = multi_order
+        self.stats: Dict[str, int] = {"requests": 0, "errors_injected": 0}
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Value for ``FYERS_API_BASE_URL`` / ``FyersClient(api_base_url=...)``."""
+        return f"http://{self.host}:{self.port}/api/v3"
+
+    def start(self) -> "FyersReplayServer":
+        self._httpd = ThreadingHTTPServer((self.host, self.port), _handler_for(self))
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fyers-replay", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(5.0)
+
+    def __enter__(self) -> "FyersReplayServer":
+        return self.start()
+
+    def __exit__(self, *_: Any) -> None:
+        self.stop()
+
+    def _draw(self) -> Tuple[float, bool]:
+        with self._rng_lock:
+            delay = self.latency_ms + (self._rng.uniform(0.0, self.jitter_ms) if self.jitter_ms > 0 else 0.0)
+            fail = self.error_rate > 0 and self._rng.random() < self.error_rate
+        return delay / 1000.0, fail
+
+    def handle(self, method: str, raw_path: str, body: Any) -> Tuple[int, Dict[str, Any]]:
+        """Route one request; returns (status, JSON body)."""
+        batch = body if isinstance(body, list) else None
+        body = body if isinstance(body, dict) else {}
+        parts = urlsplit(raw_path)
+        path = parts.path.rstrip("/") or "/"
+        for prefix in _API_PREFIXES:
+            if path.startswith(prefix + "/"):
+                path = path[len(prefix) :]
+                break
+        params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        self.stats["requests"] += 1
+        self.stats[path] = self.stats.get(path, 0) + 1
+
+        if path == "/replay/step" and method == "POST":
+            return 200, {"s": "ok", "replay_time": self.clock.step(int(body.get("count") or 1))}
+        if path == "/replay/status":
+            return 200, {"s": "ok", "replay_time": self.clock.now(), "finished": self.clock.finished(), "stats": dict(self.stats)}
+
+        delay, fail = self._draw()
+        if delay > 0:
+            time.sleep(delay)
+        if fail:
+            self.stats["errors_injected"] += 1
+            return self.error_status, {"s": "error", "code": -1, "message": f"Injected replay error ({self.error_status})"}
+
+        now = self.clock.now()
+
+        def price_of(symbol: str) -> Optional[float]:
+            return self.timeline.last_price(symbol, now)
+
+        if path in ("/quotes", "/data/quotes"):
+            symbols = [s.strip() for s in str(body.get("symbols") or params.get("symbols") or "").split(",") if s.strip()]
+            if not symbols:
+                return 400, {"s": "error", "code": -50, "message": "symbols is required"}
+            return 200, {"s": "ok", "code": 200, "d": self.timeline.quotes(symbols, now)}
+        if path == "/data/history":
+            range_from, range_to = _num(params.get("range_from")), _num(params.get("range_to"))
+            candles = self.timeline.candles(
+                params.get("symbol", ""),
+                params.get("resolution", "D"),
+                range_from if range_from == range_from else 0.0,
+                min(range_to, now) if range_to == range_to else now,
+            )
+            return 200, {"s": "ok", "candles": candles}
+        if path == "/data/options-chain-v3":
+            underlying = params.get("symbol", "")
+            spot = price_of(underlying)
+            if spot is None:
+                return 400, {"s": "error", "code": -300, "message": f"No replayed price for {underlying}"}
+            count, stamp = _num(params.get("strikecount")), params.get("timestamp")
+            return option_chain_body(underlying, spot, int(count) if count == count else 10, now, int(stamp) if stamp else None)
+        if (path == "/orders" and method == "POST") or path == "/orders/sync":
+            symbol = body.get("symbol") or ""
+            return self.account.place(body, price_of(symbol), now)
+        if path == "/multi-order/sync" and method == "POST" and self.multi_order:
+            if not batch or len(batch) > 10:
+                return 400, {"s": "error", "code": -50, "message": "multi-order takes a list of 1 to 10 orders"}
+            items = []
+            for order in batch:
+                order = order if isinstance(order, dict) else {}
+                status, reply = self.account.place(order, price_of(order.get("symbol") or ""), now)
+                items.append({"statusCode": status, "body": reply, "statusDescription": "HTTP OK" if status == 200 else "Bad Request"})
+            return 200, {"s": "ok", "code": 200, "data": items}
+
+        self.account.match(price_of, now)
+        if path == "/orders":
+            return 200, self.account.orders_body()
+        if path == "/funds":
+            return 200, self.account.funds_body()
+        if path == "/positions":
+            return 200, self.account.positions_body(price_of)
+        if path == "/holdings":
+            return 200, self.account.holdings_body()
+        if path == "/profile":
+            return 200, {"s": "ok", "code": 200, "data": {"fy_id": "REPLAY", "name": "Replay Account", "email_id": None}}
+        return 404, {"s": "error", "code": -404, "message": f"Unknown replay route: {path}"}
+
+
+def _handler_for(server: FyersReplayServer) -> type:
+    class _ReplayHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def _reply(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            body: Any = {}
+            if length:
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    body = {}
+            status, payload = server.handle(self.command, self.path, body)
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = _reply
+        do_POST = _reply
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return _ReplayHandler
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve recorded FYERS quotes through a local REST stub.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--ticks", help="Tick JSONL recorded by MarketFeed, or a screener audit JSONL")
+    source.add_argument("--tick-store", help="TickStore directory")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed multiplier; 0 = step per POST /replay/step")
+    parser.add_argument("--loop", action="store_true")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--cash", type=float, default=100000.0)
+    parser.add_argument("--no-multi-order", action="store_true", help="Answer /multi-order/sync with 404")
+    args = parser.parse_args(argv)
+
+    timeline = QuoteTimeline.from_tick_store(args.tick_store) if args.tick_store else QuoteTimeline.from_jsonl(args.ticks)
+    server = FyersReplayServer(
+        timeline,
+        host=args.host,
+        port=args.port,
+        speed=args.speed,
+        loop=args.loop,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        account=ReplayAccount(cash=args.cash),
+        multi_order=not args.no_multi_order,
+    ).start()
+    print(
+        f"Replaying {len(timeline)} quotes for {len(timeline.symbols)} symbols at {server.base_url} "
+        f"(speed {args.speed or 'step'})"
+    )
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
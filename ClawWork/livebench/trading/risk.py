@@ -0,0 +1,306 @@
+"""Pre-trade risk checks against cached account state.
+
+Orders are validated in-process, without API calls, against a ``RiskState``
+built from the in-memory account book (live trading) or the paper broker
+(dry run):
+
+- max notional per order
+- max open positions (new symbols beyond the limit are refused)
+- max exposure per symbol after the order
+- daily loss limit (once hit, only risk-reducing orders pass)
+- price band: limit/stop prices must stay within a percentage of the last traded price
+
+Last traded prices come from the websocket table, then from one batched
+``price_source`` call for every symbol the table could not price (the REST
+quote cache by default). An order that still has no price skips the
+notional, exposure and price-band checks with a warning instead of being
+rejected.
+
+Daily PnL is measured from the start of the IST trading day. Live state is
+only trusted once the account book has reconciled recently; otherwise the
+book is reconciled on the spot and, if that fails, every order is refused.
+
+``check_batch`` evaluates many orders as NumPy arrays, accumulating
+exposure and new positions in order, so a whole screener's BUY_CANDIDATE
+previews are validated at once. A limit of 0 disables that check.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+
+import numpy as np
+
+from .env import env_flag, env_float
+from .market_feed import LastPriceTable, get_last_price_table, stream_max_age_ms
+
+# Maps symbols to last traded prices; symbols it cannot price are left out.
+PriceSource = Callable[[Sequence[str]], Dict[str, float]]
+
+
+@dataclass
+class RiskLimits:
+    max_order_notional: float = 100000.0
+    max_open_positions: float = 10
+    max_symbol_exposure: float = 200000.0
+    daily_loss_limit: float = 5000.0
+    price_band_pct: float = 5.0
+
+
+RISK_ENV_VARS = {
+    "max_order_notional": "FYERS_RISK_MAX_ORDER_NOTIONAL",
+    "max_open_positions": "FYERS_RISK_MAX_OPEN_POSITIONS",
+    "max_symbol_exposure": "FYERS_RISK_MAX_SYMBOL_EXPOSURE",
+    "daily_loss_limit": "FYERS_RISK_DAILY_LOSS_LIMIT",
+    "price_band_pct": "FYERS_RISK_PRICE_BAND_PCT",
+}
+
+
+def load_risk_limits() -> RiskLimits:
+    defaults = RiskLimits()
+    return RiskLimits(**{name: env_float(env_name, getattr(defaults, name)) for name, env_name in RISK_ENV_VARS.items()})
+
+
+def risk_checks_enabled() -> bool:
+    return env_flag("FYERS_RISK_CHECKS", True)
+
+
+@dataclass
+class RiskState:
+    """Account snapshot the checks run against; values are signed market values."""
+
+    position_value: Dict[str, float] = field(default_factory=dict)
+    day_pnl: float = 0.0
+    available: Optional[float] = None
+    source: str = "empty"
+    # Set when the state cannot be trusted; every order is refused with this reason.
+    unavailable: Optional[str] = None
+
+    @property
+    def open_symbols(self) -> Set[str]:
+        return {symbol for symbol, value in self.position_value.items() if value}
+
+
+def state_from_account_book(book: Any) -> RiskState:
+    positions = book.positions()
+    values: Dict[str, float] = {}
+    pnl = 0.0
+    for position in book.positions(include_flat=True):
+        pnl += position["realized_pnl"] + (position["unrealized_pnl"] or 0.0)
+    for position in positions:
+        values[position["symbol"]] = values.get(position["symbol"], 0.0) + (position["market_value"] or 0.0)
+    return RiskState(values, pnl, book.funds().get("available_balance"), "account_book")
+
+
+def state_from_paper_broker(broker: Any) -> RiskState:
+    values: Dict[str, float] = {}
+    positions = broker.positions()
+    for position in positions:
+        price = position["ltp"] if position["ltp"] is not None else position["netAvg"]
+        values[position["symbol"]] = values.get(position["symbol"], 0.0) + price * position["netQty"]
+    return RiskState(values, broker.day_pnl(positions), broker.cash - broker.reserved, "paper")
+
+
+def book_max_age_seconds() -> float:
+    return env_float("FYERS_RISK_MAX_BOOK_AGE_SECONDS", 300.0)
+
+
+def _fresh_account_book(book: Any) -> Optional[str]:
+    """Reconcile ``book`` if it is unreconciled or stale; return why it still cannot be used, if so."""
+    max_age = book_max_age_seconds()
+    if book.reconciled_at is not None and (max_age <= 0 or time.time() - book.reconciled_at <= max_age):
+        return None
+    from .fyers_client import FyersClient
+
+    try:
+        book.reconcile(FyersClient())
+    except Exception as exc:
+        return f"Account book reconcile failed: {exc}"
+    if book.reconciled_at is None:
+        return f"Account book has not reconciled with FYERS ({book.last_error or 'no positions fetched'})"
+    if max_age > 0 and time.time() - book.reconciled_at > max_age:
+        return f"Account book last reconciled {time.time() - book.reconciled_at:.0f}s ago ({book.last_error or 'reconcile failed'})"
+    return None
+
+
+def current_risk_state() -> RiskState:
+    """State for the account orders would go to right now: paper broker in dry run, else the account book."""
+    dry_run = env_flag("FYERS_DRY_RUN", True) or not env_flag("FYERS_ALLOW_LIVE_ORDERS", False)
+    if dry_run:
+        if not env_flag("FYERS_PAPER_TRADING", True):
+            return RiskState()
+        from .paper_trading import get_paper_broker
+
+        return state_from_paper_broker(get_paper_broker())
+    from .order_book import get_account_book
+
+    book = get_account_book()
+    reason = _fresh_account_book(book)
+    if reason:
+        return RiskState(source="account_book", unavailable=reason)
+    return state_from_account_book(book)
+
+
+def _num(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+class RiskEngine:
+    """Validates order payloads against ``RiskLimits`` and a ``RiskState``."""
+
+    def __init__(
+        self,
+        limits: Optional[RiskLimits] = None,
+        table: Optional[LastPriceTable] = None,
+        price_source: Optional[PriceSource] = None,
+    ) -> None:
+        self.limits = limits or load_risk_limits()
+        self.table = table if table is not None else get_last_price_table()
+        self.price_source = price_source
+
+    def _last_prices(self, symbols: Sequence[str], prices: Optional[Sequence[Optional[float]]]) -> np.ndarray:
+        max_age = stream_max_age_ms()
+        resolved: Dict[str, Optional[float]] = {}
+        for i, symbol in enumerate(symbols):
+            if (prices is None or prices[i] is None) and symbol not in resolved:
+                resolved[symbol] = self.table.last_price(symbol, max_age)
+        missing = [symbol for symbol, value in resolved.items() if value is None and symbol]
+        if missing and self.price_source is not None:
+            resolved.update(self.price_source(missing))
+        ltp = np.full(len(symbols), np.nan)
+        for i, symbol in enumerate(symbols):
+            value = prices[i] if prices is not None and prices[i] is not None else resolved.get(symbol)
+            if value:
+                ltp[i] = value
+        return ltp
+
+    def check(self, payload: Dict[str, Any], state: Optional[RiskState] = None, price: Optional[float] = None) -> Dict[str, Any]:
+        """Check one order; ``price`` overrides the last traded price lookup."""
+        batch = self.check_batch([payload], state, None if price is None else [price])
+        return {
+            "allowed": bool(batch["allowed"][0]),
+            "violations": batch["violations"][0],
+            "notional": batch["notional"][0],
+            "state_source": batch["state_source"],
+            "warnings": batch["warnings"][0],
+            "elapsed_us": batch["elapsed_us"],
+        }
+
+    def check_batch(
+        self,
+        payloads: Sequence[Dict[str, Any]],
+        state: Optional[RiskState] = None,
+        prices: Optional[Sequence[Optional[float]]] = None,
+    ) -> Dict[str, Any]:
+        """Check orders in sequence as arrays; earlier orders count against later ones."""
+        started = time.perf_counter()
+        state = state if state is not None else current_risk_state()
+        limits = self.limits
+        n = len(payloads)
+        symbols = [str(p.get("symbol") or "") for p in payloads]
+        qty = np.array([_num(p.get("qty")) for p in payloads], dtype=np.float64)
+        side = np.array([_num(p.get("side")) for p in payloads], dtype=np.float64)
+        order_type = np.array([_num(p.get("type")) for p in payloads], dtype=np.float64)
+        limit_price = np.array([_num(p.get("limitPrice")) for p in payloads], dtype=np.float64)
+        stop_price = np.array([_num(p.get("stopPrice")) for p in payloads], dtype=np.float64)
+
+        ltp = self._last_prices(symbols, prices)
+        is_limit = (order_type == 1) | (order_type == 4)
+        reference = np.where(is_limit & (limit_price > 0), limit_price, ltp)
+        notional = qty * reference
+        signed = side * notional
+        signed_known = np.where(np.isfinite(signed), signed, 0.0)
+        existing = np.array([state.position_value.get(symbol, 0.0) for symbol in symbols], dtype=np.float64)
+
+        if n <= 1:
+            cumulative = signed_known
+            first_in_batch = np.ones(n, dtype=bool)
+        else:
+            # Exposure after each order, accumulating repeated symbols in order.
+            _, codes = np.unique(symbols, return_inverse=True)
+            order = np.argsort(codes, kind="stable")
+            sorted_codes = codes[order]
+            running = np.cumsum(signed_known[order])
+            starts = np.concatenate(([0], np.flatnonzero(sorted_codes[1:] != sorted_codes[:-1]) + 1)).astype(np.int64)
+            group_base = np.repeat(running[starts] - signed_known[order][starts], np.diff(np.append(starts, n)))
+            cumulative = np.empty(n)
+            cumulative[order] = running - group_base
+            first_in_batch = np.zeros(n, dtype=bool)
+            first_in_batch[order[starts]] = True
+        after = existing + cumulative
+        before = after - signed_known
+        increases = np.abs(after) > np.abs(before)
+        opening = (existing == 0) & first_in_batch & increases
+        open_count = len(state.open_symbols) + np.cumsum(opening)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            band = np.maximum(
+                np.where(is_limit, np.abs(limit_price - ltp) / ltp * 100.0, 0.0),
+                np.where(stop_price > 0, np.abs(stop_price - ltp) / ltp * 100.0, 0.0),
+            )
+
+        checks = [
+            (~(qty > 0) | ~((side == 1.0) | (side == -1.0)), lambda i: "qty must be positive and side must be 1 or -1"),
+        ]
+        if state.unavailable:
+            checks.append((np.ones(n, dtype=bool), lambda i: state.unavailable))
+        if limits.max_order_notional > 0:
+            checks.append(
+                (notional > limits.max_order_notional, lambda i: f"Order notional {notional[i]:.2f} exceeds {limits.max_order_notional:.2f}")
+            )
+        if limits.max_open_positions > 0:
+            checks.append(
+                (opening & (open_count > limits.max_open_positions), lambda i: f"Would open position #{int(open_count[i])} (max {int(limits.max_open_positions)})")
+            )
+        if limits.max_symbol_exposure > 0:
+            checks.append(
+                (increases & (np.abs(after) > limits.max_symbol_exposure), lambda i: f"{symbols[i]} exposure {abs(after[i]):.2f} exceeds {limits.max_symbol_exposure:.2f}")
+            )
+        if limits.daily_loss_limit > 0 and state.day_pnl <= -limits.daily_loss_limit:
+            checks.append((increases, lambda i: f"Daily loss limit reached (PnL {state.day_pnl:.2f}); only risk-reducing orders allowed"))
+        if limits.price_band_pct > 0:
+            checks.append((band > limits.price_band_pct, lambda i: f"Price {band[i]:.2f}% away from LTP {ltp[i]:.2f} (band {limits.price_band_pct:.2f}%)"))
+
+        # Unpriced orders compare as NaN, so the checks that need a price pass them.
+        warnings: List[List[str]] = [[] for _ in range(n)]
+        for i in np.flatnonzero(~np.isfinite(ltp)).tolist():
+            skipped = "price-band check" if np.isfinite(reference[i]) else "notional, exposure and price-band checks"
+            warnings[i].append(f"No last traded price for {symbols[i] or 'order'}; {skipped} skipped")
+
+        blocked = np.zeros(n, dtype=bool)
+        violations: List[List[str]] = [[] for _ in range(n)]
+        for failed, message in checks:
+            blocked |= failed
+            for i in np.flatnonzero(failed).tolist():
+                violations[i].append(message(i))
+
+        return {
+            "allowed": ~blocked,
+            "violations": violations,
+            "warnings": warnings,
+            "notional": [round(float(value), 2) if value == value else None for value in notional],
+            "blocked": int(blocked.sum()),
+            "state_source": state.source,
+            "elapsed_us": round((time.perf_counter() - started) * 1e6, 1),
+        }
+
+
+_RISK_ENGINE: Optional[RiskEngine] = None
+_RISK_ENGINE_LOCK = threading.Lock()
+
+
+def get_risk_engine() -> RiskEngine:
+    """Return the process-wide risk engine (limits are read from the environment once)."""
+    global _RISK_ENGINE
+    with _RISK_ENGINE_LOCK:
+        if _RISK_ENGINE is None:
+            from .quote_cache import last_prices
+
+            _RISK_ENGINE = RiskEngine(price_source=last_prices)
+        return _RISK_ENGINE
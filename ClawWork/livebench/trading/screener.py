@@ -5,7 +5,15 @@ from __future__ import annotations
 import json
 import os
 from dataclasses import asdict, dataclass
-from typing import Any, Dict, List, Optional
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .env import env_float
+from .quote_cache import get_quote_cache
+from .symbol_master import round_order_preview
+
+
+INDICATOR_RULE_FIELDS = ("rsi_min", "rsi_max", "max_volatility_pct", "min_pct_above_sma", "min_pct_above_ema")
 
 
 @dataclass
@@ -17,27 +25,37 @@ class ScreenerConfig:
     risk_pct: float = 1.0
     stop_loss_pct: float = 1.0
     target_pct: float = 2.0
-
-
-def _env_float(name: str, default: float) -> float:
-    raw = os.getenv(name)
-    if raw is None or not raw.strip():
-        return default
-    try:
-        return float(raw)
-    except ValueError:
-        return default
+    # Optional indicator filters for BUY candidates (None = not applied).
+    rsi_min: Optional[float] = None
+    rsi_max: Optional[float] = None
+    max_volatility_pct: Optional[float] = None
+    min_pct_above_sma: Optional[float] = None
+    min_pct_above_ema: Optional[float] = None
+
+    def indicator_rules_active(self) -> bool:
+        return any(getattr(self, field) is not None for field in INDICATOR_RULE_FIELDS)
+
+
+SCREENER_ENV_VARS = {
+    "buy_min_pct": "FYERS_SCREENER_BUY_MIN_PCT",
+    "buy_max_pct": "FYERS_SCREENER_BUY_MAX_PCT",
+    "avoid_drawdown_pct": "FYERS_SCREENER_AVOID_MAX_DRAWDOWN_PCT",
+    "default_capital": "FYERS_SCREENER_DEFAULT_CAPITAL",
+    "risk_pct": "FYERS_SCREENER_RISK_PCT",
+    "stop_loss_pct": "FYERS_SCREENER_STOP_LOSS_PCT",
+    "target_pct": "FYERS_SCREENER_TARGET_PCT",
+    "rsi_min": "FYERS_SCREENER_RSI_MIN",
+    "rsi_max": "FYERS_SCREENER_RSI_MAX",
+    "max_volatility_pct": "FYERS_SCREENER_MAX_VOLATILITY_PCT",
+    "min_pct_above_sma": "FYERS_SCREENER_MIN_PCT_ABOVE_SMA",
+    "min_pct_above_ema": "FYERS_SCREENER_MIN_PCT_ABOVE_EMA",
+}
 
 
 def load_screener_config() -> ScreenerConfig:
+    defaults = ScreenerConfig()
     return ScreenerConfig(
-        buy_min_pct=_env_float("FYERS_SCREENER_BUY_MIN_PCT", 0.3),
-        buy_max_pct=_env_float("FYERS_SCREENER_BUY_MAX_PCT", 2.5),
-        avoid_drawdown_pct=_env_float("FYERS_SCREENER_AVOID_MAX_DRAWDOWN_PCT", -2.0),
-        default_capital=_env_float("FYERS_SCREENER_DEFAULT_CAPITAL", 5000.0),
-        risk_pct=_env_float("FYERS_SCREENER_RISK_PCT", 1.0),
-        stop_loss_pct=_env_float("FYERS_SCREENER_STOP_LOSS_PCT", 1.0),
-        target_pct=_env_float("FYERS_SCREENER_TARGET_PCT", 2.0),
+        **{field: env_float(env_name, getattr(defaults, field)) for field, env_name in SCREENER_ENV_VARS.items()}
     )
 
 
@@ -91,13 +109,85 @@ def _get_number(mapping: Dict[str, Any], keys: List[str]) -> Optional[float]:
     return None
 
 
-def normalize_quote_rows(quote_response: Dict[str, Any]) -> List[Dict[str, Any]]:
+_LAST_PRICE_KEYS = ["lp", "ltp", "last_price", "lastPrice", "c"]
+_PREV_CLOSE_KEYS = ["prev_close_price", "prev_close", "prevClose", "pc", "close_price"]
+_CHANGE_PCT_KEYS = ["chp", "change_pct", "pChange", "changePercent"]
+_VOLUME_KEYS = ["volume", "vol", "v", "ttv"]  # best effort
+_QUOTE_FIELD_KEYS = (_LAST_PRICE_KEYS, _PREV_CLOSE_KEYS, _CHANGE_PCT_KEYS, _VOLUME_KEYS)
+
+QuoteValues = Tuple[Optional[float], Optional[float], Optional[float], Optional[float]]
+
+
+def _number(value: Any) -> Optional[float]:
+    kind = type(value)
+    if kind is float:
+        return value
+    if kind is int:
+        return float(value)
+    return _to_float(value)
+
+
+def _extract_generic(details: Dict[str, Any]) -> QuoteValues:
+    return (
+        _get_number(details, _LAST_PRICE_KEYS),
+        _get_number(details, _PREV_CLOSE_KEYS),
+        _get_number(details, _CHANGE_PCT_KEYS),
+        _get_number(details, _VOLUME_KEYS),
+    )
+
+
+def _compile_quote_extractor(details: Dict[str, Any]) -> Callable[[Dict[str, Any]], QuoteValues]:
+    """Resolve which alias key carries each field for rows shaped like ``details``.
+
+    The returned extractor is only valid for rows with the same key set; it
+    reads the resolved keys directly instead of probing every alias.
+    """
+    present = [[key for key in keys if key in details] for keys in _QUOTE_FIELD_KEYS]
+
+    if any(len(keys) > 1 for keys in present):
+        # Several aliases present: keep alias order, but skip the absent ones.
+        def extract_aliases(row: Dict[str, Any]) -> QuoteValues:
+            lp, pc, chp, vol = (_get_number(row, keys) if keys else None for keys in present)
+            return lp, pc, chp, vol
+
+        return extract_aliases
+
+    if all(present):
+        getter = itemgetter(*(keys[0] for keys in present))
+
+        def extract_direct(row: Dict[str, Any]) -> QuoteValues:
+            lp, pc, chp, vol = getter(row)
+            return _number(lp), _number(pc), _number(chp), _number(vol)
+
+        return extract_direct
+
+    resolved = [keys[0] if keys else None for keys in present]
+
+    def extract_partial(row: Dict[str, Any]) -> QuoteValues:
+        lp, pc, chp, vol = (_number(row[key]) if key is not None else None for key in resolved)
+        return lp, pc, chp, vol
+
+    return extract_partial
+
+
+def iter_quote_values(
+    quote_response: Dict[str, Any],
+    resolve_schema: bool = True,
+) -> Iterator[Tuple[Any, Optional[float], Optional[float], Optional[float], Optional[float]]]:
+    """Yield (symbol, last_price, prev_close, change_pct, volume) for each quote row.
+
+    Rows in one FYERS response share a shape, so the field layout is resolved
+    once from the first row and reused for every row with the same keys. Rows
+    with a different shape go through the generic alias lookup.
+    """
     payload = quote_response.get("data", {}) if isinstance(quote_response, dict) else {}
     raw_rows = payload.get("d", []) if isinstance(payload, dict) else []
-    rows: List[Dict[str, Any]] = []
 
     if not isinstance(raw_rows, list):
-        return rows
+        return
+
+    schema_keys: Optional[frozenset] = None
+    extract: Optional[Callable[[Dict[str, Any]], QuoteValues]] = None
 
     for item in raw_rows:
         if not isinstance(item, dict):
@@ -105,35 +195,42 @@ def normalize_quote_rows(quote_response: Dict[str, Any]) -> List[Dict[str, Any]]
         symbol = item.get("n") or item.get("symbol") or item.get("name")
         details = item.get("v", {}) if isinstance(item.get("v"), dict) else item
 
-        last_price = _get_number(details, ["lp", "ltp", "last_price", "lastPrice", "c"])
-        prev_close = _get_number(details, ["prev_close_price", "prev_close", "prevClose", "pc", "close_price"])
-        change_pct = _get_number(details, ["chp", "change_pct", "pChange", "changePercent"])
-        volume = _get_number(details, ["volume", "vol", "v", "ttv"])  # best effort
+        if resolve_schema and extract is None:
+            schema_keys = frozenset(details)
+            extract = _compile_quote_extractor(details)
+
+        if extract is not None and details.keys() == schema_keys:
+            last_price, prev_close, change_pct, volume = extract(details)
+        else:
+            last_price, prev_close, change_pct, volume = _extract_generic(details)
 
         if change_pct is None and last_price is not None and prev_close and prev_close != 0:
             change_pct = ((last_price - prev_close) / prev_close) * 100.0
 
-        rows.append(
-            {
-                "symbol": symbol,
-                "last_price": last_price,
-                "prev_close": prev_close,
-                "change_pct": change_pct,
-                "volume": volume,
-            }
-        )
+        yield symbol, last_price, prev_close, change_pct, volume
 
-    return rows
 
+def normalize_quote_rows(quote_response: Dict[str, Any], resolve_schema: bool = True) -> List[Dict[str, Any]]:
+    return [
+        {
+            "symbol": symbol,
+            "last_price": last_price,
+            "prev_close": prev_close,
+            "change_pct": change_pct,
+            "volume": volume,
+        }
+        for symbol, last_price, prev_close, change_pct, volume in iter_quote_values(quote_response, resolve_schema)
+    ]
 
-def _build_order_preview(symbol: str, last_price: float, config: ScreenerConfig) -> Dict[str, Any]:
+
+def _build_order_preview(symbol: str, last_price: float, config: ScreenerConfig) -> Optional[Dict[str, Any]]:
     risk_amount = max(config.default_capital * (config.risk_pct / 100.0), 1.0)
     stop_distance = max(last_price * (config.stop_loss_pct / 100.0), 0.01)
     quantity = max(int(risk_amount / stop_distance), 1)
     stop_loss = round(last_price * (1 - config.stop_loss_pct / 100.0), 2)
     target = round(last_price * (1 + config.target_pct / 100.0), 2)
 
-    return {
+    return round_order_preview({
         "symbol": symbol,
         "qty": quantity,
         "type": 2,
@@ -147,7 +244,7 @@ def _build_order_preview(symbol: str, last_price: float, config: ScreenerConfig)
         "stop_loss_level": stop_loss,
         "target_level": target,
         "orderTag": "dryrun_screener",
-    }
+    })
 
 
 def evaluate_symbols(rows: List[Dict[str, Any]], config: ScreenerConfig) -> List[Dict[str, Any]]:
@@ -206,8 +303,23 @@ def run_screener(client: Any, watchlist: str | List[str] | None = None) -> Dict[
             "message": "Set FYERS_WATCHLIST in .env or pass watchlist argument",
         }
 
-    symbols_csv = ",".join(symbols)
-    quote_response = client.quotes(symbols_csv)
+    from .symbol_master import get_symbol_master, symbol_master_enabled
+
+    # Normalize and drop unlisted symbols locally, before any quote request.
+    checked = None
+    if symbol_master_enabled():
+        master = get_symbol_master()
+        if master.available:
+            checked = master.validate_watchlist(symbols)
+            symbols = checked["symbols"]
+            if not symbols:
+                return {
+                    "success": False,
+                    "error": "No watchlist symbols found in the FYERS symbol master",
+                    "invalid_symbols": checked["invalid"],
+                }
+
+    quote_response = get_quote_cache().get_quotes(client, symbols)
     if not quote_response.get("success"):
         return {
             "success": False,
@@ -215,24 +327,71 @@ def run_screener(client: Any, watchlist: str | List[str] | None = None) -> Dict[
             "quotes_response": quote_response,
         }
 
+    # Columnar path: same output as normalize_quote_rows + evaluate_symbols
+    from .columnar_screener import (
+        apply_indicator_rules,
+        decode_quote_columns,
+        evaluate_columns,
+        materialize_results,
+    )
+
     config = load_screener_config()
-    rows = normalize_quote_rows(quote_response)
-    evaluated = evaluate_symbols(rows, config)
+    columns = decode_quote_columns(quote_response)
+    evaluation = evaluate_columns(columns, config)
+    if config.indicator_rules_active():
+        from .indicators.sources import get_daily_indicator_source
 
-    buy_candidates = [item for item in evaluated if item.get("signal") == "BUY_CANDIDATE"]
-    avoid = [item for item in evaluated if item.get("signal") == "AVOID"]
-    watch = [item for item in evaluated if item.get("signal") == "WATCH"]
+        indicators = get_daily_indicator_source().snapshot(columns.symbols, columns.last_price)
+        apply_indicator_rules(columns, evaluation, indicators, config)
+    evaluated = materialize_results(columns, evaluation, config)
+    counts = evaluation.counts()
 
-    return {
+    result = {
         "success": True,
         "watchlist": symbols,
         "summary": {
             "total": len(evaluated),
-            "buy_candidates": len(buy_candidates),
-            "watch": len(watch),
-            "avoid": len(avoid),
+            "buy_candidates": counts["BUY_CANDIDATE"],
+            "watch": counts["WATCH"],
+            "avoid": counts["AVOID"],
         },
         "config": asdict(config),
         "results": evaluated,
-        "message": f"Screener completed: {len(buy_candidates)} buy candidate(s), {len(watch)} watch, {len(avoid)} avoid",
+        "message": (
+            f"Screener completed: {counts['BUY_CANDIDATE']} buy candidate(s), "
+            f"{counts['WATCH']} watch, {counts['AVOID']} avoid"
+        ),
     }
+
+    from .risk import get_risk_engine, risk_checks_enabled
+
+    candidates = [row for row in evaluated if row["order_preview"]]
+    if candidates and risk_checks_enabled():
+        # One vectorized pass over every preview, as if all were placed in order.
+        risk = get_risk_engine().check_batch(
+            [row["order_preview"] for row in candidates], prices=[row["last_price"] for row in candidates]
+        )
+        for row, allowed, violations in zip(candidates, risk["allowed"].tolist(), risk["violations"]):
+            row["risk"] = {"allowed": allowed, "violations": violations}
+        result["summary"]["risk_blocked"] = risk["blocked"]
+        if risk["blocked"]:
+            result["message"] += f" ({risk['blocked']} blocked by risk checks)"
+
+    if checked is not None:
+        if checked["invalid"]:
+            result["invalid_symbols"] = checked["invalid"]
+            result["message"] += f" ({len(checked['invalid'])} unknown symbol(s) skipped)"
+        if checked["normalized"]:
+            result["normalized_symbols"] = checked["normalized"]
+        if checked["unchecked"]:
+            result["unchecked_symbols"] = checked["unchecked"]
+
+    if quote_response.get("partial"):
+        result["partial_failures"] = quote_response.get("failed_chunks", [])
+        result["message"] += f" ({len(result['partial_failures'])} quote chunk(s) failed)"
+    if quote_response.get("missing_symbols"):
+        result["missing_symbols"] = quote_response["missing_symbols"]
+    if quote_response.get("cache"):
+        result["quote_cache"] = quote_response["cache"]
+
+    return result
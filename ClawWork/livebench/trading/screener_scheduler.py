@@ -0,0 +1,329 @@
+"""Background screener runs during market hours, published as signal transitions.
+
+``ScreenerScheduler`` reruns ``run_screener`` every
+``FYERS_SCREENER_INTERVAL_SECONDS`` while the IST market is open
+(``FYERS_MARKET_HOURS``, Monday to Friday) and keeps the previous run's
+signal per symbol in memory. Each run yields only the transitions
+(``WATCH -> BUY_CANDIDATE``, ``BUY_CANDIDATE -> AVOID``, ...) instead of the
+full ``results`` list:
+
+- the agent drains them with ``pending_changes`` (the ``fyers_screener_changes`` tool),
+- listeners registered with ``add_listener`` get every event in-process,
+- ``<fyers data>/screener_changes.json`` holds the current non-WATCH signals and the
+  recent events; the API serves it at ``/api/fyers/screener/latest`` and broadcasts
+  new events over the websocket.
+
+Usage:
+    python -m livebench.trading.screener_scheduler --interval 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import threading
+import time
+from datetime import datetime, time as dt_time, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .env import env_flag, env_float
+from .screener import parse_watchlist, run_screener
+from .tick_store import IST
+
+ClientFactory = Callable[[], Any]
+Listener = Callable[[Dict[str, Any]], None]
+
+_DEFAULT_CHANGES_PATH = Path(__file__).resolve().parents[1] / "data" / "fyers" / "screener_changes.json"
+MAX_EVENTS = 50
+
+
+def screener_changes_path() -> Path:
+    """Where the scheduler writes its diff state: FYERS_SCREENER_CHANGES_PATH or data/fyers/screener_changes.json."""
+    return Path(os.getenv("FYERS_SCREENER_CHANGES_PATH") or _DEFAULT_CHANGES_PATH)
+
+
+def market_hours() -> Tuple[dt_time, dt_time]:
+    """``FYERS_MARKET_HOURS`` as (open, close) IST times; defaults to 09:15-15:30."""
+    raw = os.getenv("FYERS_MARKET_HOURS") or "09:15-15:30"
+    try:
+        start, end = (datetime.strptime(part.strip(), "%H:%M").time() for part in raw.split("-", 1))
+        return start, end
+    except ValueError:
+        return dt_time(9, 15), dt_time(15, 30)
+
+
+def is_market_open(now: Optional[float] = None) -> bool:
+    moment = datetime.fromtimestamp(time.time() if now is None else now, IST)
+    start, end = market_hours()
+    return moment.weekday() < 5 and start <= moment.time() <= end
+
+
+def seconds_until_open(now: Optional[float] = None) -> float:
+    """Seconds until the next weekday session opens (0 while open)."""
+    now = time.time() if now is None else now
+    if is_market_open(now):
+        return 0.0
+    moment = datetime.fromtimestamp(now, IST)
+    start, _ = market_hours()
+    candidate = moment.replace(hour=start.hour, minute=start.minute, second=0, microsecond=0)
+    for _ in range(8):
+        if candidate > moment and candidate.weekday() < 5:
+            return (candidate - moment).total_seconds()
+        candidate += timedelta(days=1)
+    return 24 * 3600.0
+
+
+def diff_signals(previous: Dict[str, str], rows: List[Dict[str, Any]]) -> Tuple[Dict[str, str], List[Dict[str, Any]]]:
+    """Signals by symbol for this run and the transitions from ``previous``.
+
+    Symbols missing from the previous run count as ``WATCH``, so the first run
+    reports every BUY_CANDIDATE/AVOID and nothing for the WATCH majority.
+    Symbols absent from this run (quote error, missing row) keep their previous
+    signal, so a dropped quote does not read as a transition when it returns.
+    """
+    signals: Dict[str, str] = dict(previous)
+    transitions: List[Dict[str, Any]] = []
+    for row in rows:
+        symbol = row.get("symbol")
+        if not symbol:
+            continue
+        signal = row.get("signal") or "WATCH"
+        signals[symbol] = signal
+        before = previous.get(symbol, "WATCH")
+        if signal == before:
+            continue
+        change = {
+            "symbol": symbol,
+            "from": before,
+            "to": signal,
+            "last_price": row.get("last_price"),
+            "change_pct": row.get("change_pct"),
+            "reason": row.get("reason"),
+        }
+        if row.get("order_preview"):
+            change["order_preview"] = row["order_preview"]
+        if row.get("risk"):
+            change["risk"] = row["risk"]
+        transitions.append(change)
+    return signals, transitions
+
+
+class ScreenerScheduler:
+    """Reruns the screener on an interval and keeps only what changed."""
+
+    def __init__(
+        self,
+        client_factory: ClientFactory,
+        watchlist: Optional[List[str]] = None,
+        interval_seconds: Optional[float] = None,
+        changes_path: Optional[Path] = None,
+        market_hours_only: Optional[bool] = None,
+    ) -> None:
+        self.client_factory = client_factory
+        self.watchlist = watchlist
+        self.interval_seconds = interval_seconds or env_float("FYERS_SCREENER_INTERVAL_SECONDS", 60.0)
+        self.changes_path = Path(changes_path) if changes_path else screener_changes_path()
+        self.market_hours_only = env_flag("FYERS_SCREENER_MARKET_HOURS_ONLY", True) if market_hours_only is None else market_hours_only
+
+        self._lock = threading.Lock()
+        self._signals: Dict[str, str] = {}
+        self._events: List[Dict[str, Any]] = []
+        # Transitions not yet handed to the agent, collapsed to one per symbol.
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._listeners: List[Listener] = []
+        self.seq = 0
+        self.summary: Dict[str, Any] = {}
+        self.last_run_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.stats: Dict[str, Any] = {"runs": 0, "failed_runs": 0, "transitions": 0, "skipped_closed": 0}
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_listener(self, listener: Listener) -> None:
+        self._listeners.append(listener)
+
+    def run_once(self) -> Dict[str, Any]:
+        """Run the screener now and publish its transitions."""
+        started = time.perf_counter()
+        result = run_screener(self.client_factory(), self.watchlist)
+        if not result.get("success"):
+            with self._lock:
+                self.stats["failed_runs"] += 1
+                self.last_error = result.get("error")
+            return {"success": False, "error": result.get("error")}
+
+        with self._lock:
+            signals, transitions = diff_signals(self._signals, result.get("results") or [])
+            self._signals = signals
+            self.seq += 1
+            self.last_run_at = time.time()
+            self.last_error = None
+            self.summary = result.get("summary") or {}
+            self.stats["runs"] += 1
+            self.stats["transitions"] += len(transitions)
+            event = {
+                "seq": self.seq,
+                "run_at": datetime.fromtimestamp(self.last_run_at, IST).isoformat(),
+                "summary": self.summary,
+                "transitions": transitions,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 1),
+            }
+            for change in transitions:
+                earlier = self._pending.get(change["symbol"])
+                merged = {**change, "from": earlier["from"]} if earlier else dict(change)
+                if merged["from"] == merged["to"]:
+                    self._pending.pop(change["symbol"], None)
+                else:
+                    self._pending[change["symbol"]] = merged
+            if transitions:
+                self._events = (self._events + [event])[-MAX_EVENTS:]
+            state = self._state()
+
+        self._persist(state)
+        for listener in list(self._listeners):
+            try:
+                listener(event)
+            except Exception as exc:  # a broken listener must not stop the schedule
+                self.last_error = f"Listener failed: {exc}"
+        return {"success": True, **event}
+
+    def pending_changes(self, clear: bool = True) -> Dict[str, Any]:
+        """Transitions since the agent last asked, one per symbol (first ``from``, latest ``to``)."""
+        with self._lock:
+            changes = list(self._pending.values())
+            if clear:
+                self._pending.clear()
+            return {
+                "seq": self.seq,
+                "last_run_at": self.last_run_at,
+                "market_open": is_market_open(),
+                "summary": self.summary,
+                "changes": changes,
+            }
+
+    def events_since(self, seq: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [event for event in self._events if event["seq"] > seq]
+
+    def current_signals(self, include_watch: bool = False) -> Dict[str, str]:
+        with self._lock:
+            return {symbol: signal for symbol, signal in self._signals.items() if include_watch or signal != "WATCH"}
+
+    def _state(self) -> Dict[str, Any]:
+        return {
+            "type": "screener_changes",
+            "seq": self.seq,
+            "run_at": self._events[-1]["run_at"] if self._events else None,
+            "last_run_at": datetime.fromtimestamp(self.last_run_at, IST).isoformat() if self.last_run_at else None,
+            "interval_seconds": self.interval_seconds,
+            "summary": self.summary,
+            "signals": {symbol: signal for symbol, signal in self._signals.items() if signal != "WATCH"},
+            "events": list(self._events),
+        }
+
+    def _persist(self, state: Dict[str, Any]) -> None:
+        try:
+            self.changes_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.changes_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+            tmp_path.replace(self.changes_path)
+        except OSError as exc:
+            self.last_error = f"Could not write {self.changes_path}: {exc}"
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "interval_seconds": self.interval_seconds,
+            "market_open": is_market_open(),
+            "seq": self.seq,
+            "last_run_at": self.last_run_at,
+            "last_error": self.last_error,
+            "pending": len(self._pending),
+            **self.stats,
+        }
+
+    # -- background loop ----------------------------------------------
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="fyers-screener-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if self.market_hours_only and not is_market_open():
+                self.stats["skipped_closed"] += 1
+                self._stop.wait(min(max(seconds_until_open(), 1.0), self.interval_seconds))
+                continue
+            started = time.monotonic()
+            try:
+                self.run_once()
+            except Exception as exc:  # keep the schedule alive on unexpected client errors
+                self.last_error = f"Screener run failed: {exc}"
+                self.stats["failed_runs"] += 1
+            self._stop.wait(max(self.interval_seconds - (time.monotonic() - started), 0.0))
+
+
+_SCHEDULER: Optional[ScreenerScheduler] = None
+_SCHEDULER_LOCK = threading.Lock()
+
+
+def get_screener_scheduler(start: bool = True) -> ScreenerScheduler:
+    """Return the process-wide scheduler over ``FYERS_WATCHLIST``; starts it when a token is configured."""
+    global _SCHEDULER
+    with _SCHEDULER_LOCK:
+        if _SCHEDULER is None:
+            from .fyers_client import FyersClient
+
+            _SCHEDULER = ScreenerScheduler(FyersClient)
+        scheduler = _SCHEDULER
+    if start and os.getenv("FYERS_ACCESS_TOKEN"):
+        scheduler.start()
+    return scheduler
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the FYERS screener on a schedule and print signal transitions.")
+    parser.add_argument("--watchlist", help="Comma-separated symbols (default FYERS_WATCHLIST)")
+    parser.add_argument("--interval", type=float, help="Seconds between runs (default FYERS_SCREENER_INTERVAL_SECONDS)")
+    parser.add_argument("--always", action="store_true", help="Run outside market hours too")
+    args = parser.parse_args(argv)
+
+    from .fyers_client import FyersClient
+
+    scheduler = ScreenerScheduler(
+        FyersClient,
+        watchlist=parse_watchlist(args.watchlist) if args.watchlist else None,
+        interval_seconds=args.interval,
+        market_hours_only=not args.always,
+    )
+
+    def show(event: Dict[str, Any]) -> None:
+        print(f"[{event['run_at']}] run #{event['seq']}: {len(event['transitions'])} transition(s)")
+        for change in event["transitions"]:
+            print(f"   {change['symbol']}: {change['from']} -> {change['to']} ({change['reason']})")
+
+    scheduler.add_listener(show)
+    scheduler.start()
+    print(f"Screener scheduler running every {scheduler.interval_seconds:.0f}s; writing {scheduler.changes_path}")
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        scheduler.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Parallel ScreenerConfig parameter sweep on top of the vectorized backtester.
+
+The candle panel is written once as ``.npy`` files and every worker process
+opens it with ``np.load(mmap_mode="r")``, so the arrays are shared through the
+page cache instead of being pickled per task. Each worker builds its
+``Backtester`` once and then only receives small config dicts.
+
+Usage:
+    python scripts/sweep_fyers_screener.py --symbols NSE:SBIN-EQ,NSE:TCS-EQ --start 2021-01-01 --end 2024-12-31 \\
+        --grid buy_min_pct=0.2:1.0:0.2 --grid target_pct=1.5,2,3 --metric total_pnl --output best_screener.env
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, replace
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .backtest import Backtester, CandlePanel
+from .screener import SCREENER_ENV_VARS, ScreenerConfig
+
+PANEL_FIELDS = ("ts", "open", "high", "low", "close", "volume")
+
+# Metrics where smaller is better; everything else is ranked descending.
+ASCENDING_METRICS = {"max_drawdown"}
+
+
+def save_panel(panel: CandlePanel, directory: Union[str, Path]) -> Path:
+    """Write a panel as one ``.npy`` file per field plus the symbol list."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for name in PANEL_FIELDS:
+        np.save(directory / f"{name}.npy", np.ascontiguousarray(getattr(panel, name)))
+    (directory / "symbols.json").write_text(json.dumps(panel.symbols), encoding="utf-8")
+    return directory
+
+
+def open_panel(directory: Union[str, Path], mmap: bool = True) -> CandlePanel:
+    """Open a panel written by ``save_panel``; arrays are read-only memory maps by default."""
+    directory = Path(directory)
+    mode = "r" if mmap else None
+    arrays = {name: np.load(directory / f"{name}.npy", mmap_mode=mode) for name in PANEL_FIELDS}
+    symbols = json.loads((directory / "symbols.json").read_text(encoding="utf-8"))
+    return CandlePanel(symbols=symbols, **arrays)
+
+
+def grid_configs(base: ScreenerConfig, grid: Dict[str, Sequence[float]]) -> List[ScreenerConfig]:
+    """Cartesian product of ``grid`` values applied on top of ``base``."""
+    names = list(grid)
+    configs = [replace(base, **dict(zip(names, values))) for values in itertools.product(*(grid[name] for name in names))]
+    return [config for config in configs if _is_valid(config)]
+
+
+def random_configs(
+    base: ScreenerConfig,
+    ranges: Dict[str, Tuple[float, float]],
+    count: int,
+    seed: Optional[int] = None,
+) -> List[ScreenerConfig]:
+    """``count`` valid configs with each field in ``ranges`` drawn uniformly (2 decimals)."""
+    rng = random.Random(seed)
+    configs: List[ScreenerConfig] = []
+    attempts = 0
+    while len(configs) < count and attempts < count * 20:
+        attempts += 1
+        values = {name: round(rng.uniform(low, high), 2) for name, (low, high) in ranges.items()}
+        config = replace(base, **values)
+        if _is_valid(config):
+            configs.append(config)
+    return configs
+
+
+def _is_valid(config: ScreenerConfig) -> bool:
+    return (
+        config.buy_min_pct <= config.buy_max_pct
+        and config.avoid_drawdown_pct < config.buy_max_pct
+        and config.stop_loss_pct > 0
+        and config.target_pct > 0
+    )
+
+
+def config_env_lines(config: ScreenerConfig) -> List[str]:
+    """``FYERS_SCREENER_*`` lines that ``load_screener_config`` reads back as ``config`` exactly."""
+    values = asdict(config)
+    return [
+        f"{env_name}={float(values[field])!r}"
+        for field, env_name in SCREENER_ENV_VARS.items()
+        if values[field] is not None
+    ]
+
+
+_WORKER_BACKTESTER: Optional[Backtester] = None
+
+
+def _init_worker(panel_dir: str, hold_bars: int, cost_bps: float) -> None:
+    global _WORKER_BACKTESTER
+    _WORKER_BACKTESTER = Backtester(open_panel(panel_dir), hold_bars=hold_bars, cost_bps=cost_bps)
+
+
+def _run_config(values: Dict[str, float]) -> Dict[str, Any]:
+    return _WORKER_BACKTESTER.run(ScreenerConfig(**values))
+
+
+def rank_results(results: Iterable[Dict[str, Any]], metric: str, min_trades: int = 1) -> List[Dict[str, Any]]:
+    eligible = [item for item in results if item["trades"] >= min_trades and item.get(metric) is not None]
+    return sorted(eligible, key=lambda item: item[metric], reverse=metric not in ASCENDING_METRICS)
+
+
+def run_sweep(
+    panel_dir: Union[str, Path],
+    configs: Sequence[ScreenerConfig],
+    metric: str = "total_pnl",
+    hold_bars: int = 1,
+    cost_bps: float = 0.0,
+    workers: Optional[int] = None,
+    min_trades: int = 1,
+) -> Dict[str, Any]:
+    """Backtest ``configs`` across a process pool and rank them by ``metric``."""
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    payloads = [asdict(config) for config in configs]
+    chunksize = max(1, len(payloads) // (workers * 4))
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(str(panel_dir), hold_bars, cost_bps),
+    ) as pool:
+        results = list(pool.map(_run_config, payloads, chunksize=chunksize))
+
+    ranked = rank_results(results, metric, min_trades=min_trades)
+    return {
+        "metric": metric,
+        "configs": len(payloads),
+        "ranked": ranked,
+        "best": ranked[0] if ranked else None,
+        "workers": workers,
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+    }
@@ -0,0 +1,477 @@
+"""FYERS symbol master: daily download into a compact, indexed on-disk table.
+
+FYERS publishes one CSV per exchange segment (``NSE_CM``, ``BSE_CM``,
+``NSE_FO``, ...). They are downloaded once per IST day and written as a
+single file of fixed-width NumPy rows sorted by ticker::
+
+    <root>/symbols.rows     SYMBOL_DTYPE records, sorted by ticker
+    <root>/meta.json        {"date": "2025-01-20", "segments": [...], "count": ...}
+
+Readers map ``symbols.rows`` with ``np.memmap``. Ticker lookups go through a
+dict built on first use (O(1)); prefix search is a ``searchsorted`` range
+over the sorted ticker column. Watchlists are validated and normalized
+(``sbin`` -> ``NSE:SBIN-EQ``) without any network call, and order previews
+are rounded down to the instrument's lot and to its tick size (dropped when
+less than one lot fits). Only symbols whose segment was downloaded are
+judged; the rest pass through unchecked. The download never runs on a
+request path: ``warm_symbol_master`` and ``refresh`` start it on a
+background thread.
+
+Usage:
+    python -m livebench.trading.symbol_master --download
+    python -m livebench.trading.symbol_master --search SBI
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import json
+import math
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import requests
+
+from .env import env_flag, env_float
+from .tick_store import segment_day
+
+SYMBOL_DTYPE = np.dtype(
+    [
+        ("ticker", "S48"),
+        ("description", "S40"),
+        ("fytoken", "S20"),
+        ("isin", "S12"),
+        ("underlying", "S24"),
+        ("lot", "<i4"),
+        ("tick", "<f8"),
+        ("exchange", "<i2"),
+        ("segment", "<i2"),
+        ("instrument", "<i2"),
+        ("option_type", "S2"),
+        ("expiry", "<i8"),
+        ("strike", "<f8"),
+    ]
+)
+ROWS_FILE = "symbols.rows"
+META_FILE = "meta.json"
+
+DEFAULT_SEGMENTS = "NSE_CM,BSE_CM,NSE_FO"
+DEFAULT_URL = "https://public.fyers.in/sym_details/{segment}.csv"
+_DEFAULT_ROOT = Path(__file__).resolve().parents[1] / "data" / "fyers" / "symbols"
+
+# Suffixes tried when a watchlist entry has no exact match ("NSE:SBIN" -> "NSE:SBIN-EQ").
+NORMALIZE_SUFFIXES = ("-EQ", "-INDEX", "-BE")
+
+# Futures and options tickers end in FUT/CE/PE; currency pairs list in the _CD segments.
+_DERIVATIVE = re.compile(r"(FUT|\d(CE|PE))$")
+_CURRENCY_PAIR = re.compile(r"^(USD|EUR|GBP|JPY)(INR|USD|JPY)\d")
+
+
+def symbol_master_enabled() -> bool:
+    return env_flag("FYERS_SYMBOL_MASTER", True)
+
+
+def configured_segments() -> List[str]:
+    raw = os.getenv("FYERS_SYMBOL_MASTER_SEGMENTS") or DEFAULT_SEGMENTS
+    return [segment.strip().upper() for segment in raw.split(",") if segment.strip()]
+
+
+def default_exchange() -> str:
+    """Exchange assumed for bare watchlist entries such as ``SBIN``."""
+    return (os.getenv("FYERS_DEFAULT_EXCHANGE") or "NSE").strip().upper()
+
+
+def listing_segment(ticker: str) -> str:
+    """The symbol-file segment a ticker is listed in (``NSE:SBIN-EQ`` -> ``NSE_CM``)."""
+    exchange, _, name = ticker.strip().upper().partition(":")
+    if exchange == "MCX":
+        return "MCX_COM"
+    if not _DERIVATIVE.search(name):
+        return f"{exchange}_CM"
+    return f"{exchange}_CD" if _CURRENCY_PAIR.match(name) else f"{exchange}_FO"
+
+
+def _text(value: str, width: int) -> bytes:
+    return value.strip().encode("utf-8")[:width]
+
+
+def _int(value: str) -> int:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _float(value: str) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def parse_symbol_csv(text: str) -> np.ndarray:
+    """Parse one FYERS symbol-master CSV (no header) into SYMBOL_DTYPE rows.
+
+    Columns used: 0 fytoken, 1 description, 2 instrument type, 3 lot size,
+    4 tick size, 5 ISIN, 8 expiry, 9 ticker, 10 exchange, 11 segment,
+    13 underlying, 15 strike, 16 option type.
+    """
+    records = []
+    for row in csv.reader(io.StringIO(text)):
+        if len(row) < 12:
+            continue
+        ticker = row[9].strip().upper()
+        if not ticker or ":" not in ticker or len(ticker.encode("utf-8")) > SYMBOL_DTYPE["ticker"].itemsize:
+            continue
+        records.append(
+            (
+                ticker.encode("utf-8"),
+                _text(row[1], 40),
+                _text(row[0], 20),
+                _text(row[5], 12),
+                _text(row[13], 24) if len(row) > 13 else b"",
+                max(_int(row[3]), 1),
+                _float(row[4]),
+                _int(row[10]),
+                _int(row[11]),
+                _int(row[2]),
+                _text(row[16], 2) if len(row) > 16 and row[16].strip() in ("CE", "PE") else b"",
+                _int(row[8]),
+                max(_float(row[15]), 0.0) if len(row) > 15 else 0.0,
+            )
+        )
+    return np.array(records, dtype=SYMBOL_DTYPE)
+
+
+def round_to_tick(price: float, tick: float) -> float:
+    if not tick or tick <= 0 or not math.isfinite(price):
+        return round(price, 2)
+    decimals = max(2, -int(math.floor(math.log10(tick))) + 1)
+    return round(float(round(price / tick)) * tick, decimals)
+
+
+def round_to_lot(quantity: int, lot: int) -> int:
+    """Whole lots, rounded down; 0 when less than one lot fits."""
+    if lot <= 1:
+        return quantity
+    return quantity // lot * lot
+
+
+class SymbolMaster:
+    """Indexed symbol table backed by ``<root>/symbols.rows``."""
+
+    def __init__(self, root: Union[str, Path, None] = None) -> None:
+        self.root = Path(root or os.getenv("FYERS_SYMBOL_MASTER_DIR") or _DEFAULT_ROOT)
+        self._lock = threading.Lock()
+        self._rows: Optional[np.ndarray] = None
+        self._index: Optional[Tuple[np.ndarray, Dict[bytes, int]]] = None
+        self.meta: Dict[str, Any] = {}
+        self.last_error: Optional[str] = None
+        self._last_attempt = 0.0
+        self._refreshing: Optional[threading.Thread] = None
+        self.load()
+
+    # -- storage --------------------------------------------------------
+
+    def load(self) -> bool:
+        """Map the on-disk table; returns False when there is none yet."""
+        rows_path = self.root / ROWS_FILE
+        meta_path = self.root / META_FILE
+        if not rows_path.exists() or not meta_path.exists():
+            return False
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        count = rows_path.stat().st_size // SYMBOL_DTYPE.itemsize
+        rows = np.memmap(rows_path, dtype=SYMBOL_DTYPE, mode="r", shape=(count,)) if count else np.empty(0, dtype=SYMBOL_DTYPE)
+        with self._lock:
+            self._rows = rows
+            self._index = None
+            self.meta = meta
+        return True
+
+    def write(self, rows: np.ndarray, segments: Sequence[str]) -> None:
+        """Sort, de-duplicate and atomically replace the on-disk table."""
+        rows = np.sort(rows, order="ticker", kind="stable")
+        if len(rows):
+            keep = np.ones(len(rows), dtype=bool)
+            keep[1:] = rows["ticker"][1:] != rows["ticker"][:-1]
+            rows = rows[keep]
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_rows = self.root / (ROWS_FILE + ".tmp")
+        rows.tofile(tmp_rows)
+        # Readers keep the old mapping (and its inode) until load() swaps it.
+        tmp_rows.replace(self.root / ROWS_FILE)
+        meta = {"date": segment_day(time.time()), "segments": list(segments), "count": int(len(rows)), "downloaded_at": int(time.time())}
+        tmp_meta = self.root / (META_FILE + ".tmp")
+        tmp_meta.write_text(json.dumps(meta), encoding="utf-8")
+        tmp_meta.replace(self.root / META_FILE)
+        self.load()
+
+    def download(self, segments: Optional[Sequence[str]] = None, session: Optional[requests.Session] = None) -> Dict[str, Any]:
+        """Fetch the segment CSVs and rebuild the table; nothing is replaced unless every segment succeeds."""
+        segments = list(segments or configured_segments())
+        url_template = os.getenv("FYERS_SYMBOL_MASTER_URL") or DEFAULT_URL
+        timeout = env_float("FYERS_SYMBOL_MASTER_TIMEOUT_SECONDS", 30.0)
+        http = session or requests.Session()
+        started = time.perf_counter()
+        parts, failed = [], []
+        for segment in segments:
+            url = url_template.format(segment=segment)
+            try:
+                response = http.get(url, timeout=timeout)
+                response.raise_for_status()
+            except requests.RequestException as exc:
+                failed.append({"segment": segment, "error": str(exc)})
+                continue
+            parts.append(parse_symbol_csv(response.text))
+        self._last_attempt = time.time()
+        if failed or not parts:
+            self.last_error = f"Symbol master download failed: {failed}"
+            return {"success": False, "error": self.last_error, "failed": failed}
+        rows = np.concatenate(parts)
+        self.write(rows, segments)
+        self.last_error = None
+        return {
+            "success": True,
+            "segments": segments,
+            "count": len(self),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 1),
+        }
+
+    @property
+    def available(self) -> bool:
+        return self._rows is not None and len(self._rows) > 0
+
+    def is_fresh(self) -> bool:
+        return (
+            self.available
+            and self.meta.get("date") == segment_day(time.time())
+            and set(configured_segments()) <= set(self.meta.get("segments") or [])
+        )
+
+    def refresh(self, wait: bool = False) -> None:
+        """Download today's files if the table is stale.
+
+        The download runs on a background thread (inline only with ``wait``);
+        a stale table keeps serving meanwhile, and with no table yet callers
+        skip validation. Failed attempts are retried after
+        ``FYERS_SYMBOL_MASTER_RETRY_SECONDS``.
+        """
+        if self.is_fresh() or time.time() - self._last_attempt < env_float("FYERS_SYMBOL_MASTER_RETRY_SECONDS", 300.0):
+            return
+        if wait:
+            self.download()
+            return
+        with self._lock:
+            if self._refreshing is not None and self._refreshing.is_alive():
+                return
+            self._last_attempt = time.time()
+            self._refreshing = threading.Thread(target=self.download, name="fyers-symbol-master", daemon=True)
+            self._refreshing.start()
+
+    # -- lookups --------------------------------------------------------
+
+    def __len__(self) -> int:
+        return 0 if self._rows is None else len(self._rows)
+
+    def _lookup_index(self) -> Tuple[np.ndarray, Dict[bytes, int]]:
+        """The mapped rows with their ticker -> position dict (built once per load)."""
+        indexed = self._index
+        if indexed is None:
+            with self._lock:
+                if self._index is None:
+                    rows = self._rows if self._rows is not None else np.empty(0, dtype=SYMBOL_DTYPE)
+                    self._index = (rows, {ticker: i for i, ticker in enumerate(rows["ticker"].tolist())})
+                indexed = self._index
+        return indexed
+
+    @staticmethod
+    def _row_dict(row: Any) -> Dict[str, Any]:
+        return {
+            "symbol": row["ticker"].decode("utf-8"),
+            "description": row["description"].decode("utf-8", errors="ignore"),
+            "fytoken": row["fytoken"].decode("utf-8"),
+            "isin": row["isin"].decode("utf-8") or None,
+            "underlying": row["underlying"].decode("utf-8", errors="ignore") or None,
+            "lot_size": int(row["lot"]),
+            "tick_size": float(row["tick"]),
+            "exchange": int(row["exchange"]),
+            "segment": int(row["segment"]),
+            "instrument_type": int(row["instrument"]),
+            "option_type": row["option_type"].decode("utf-8") or None,
+            "expiry": int(row["expiry"]) or None,
+            "strike": float(row["strike"]) or None,
+        }
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Instrument metadata for an exact ticker (case-insensitive)."""
+        rows, index = self._lookup_index()
+        position = index.get(symbol.strip().upper().encode("utf-8"))
+        return None if position is None else self._row_dict(rows[position])
+
+    def __contains__(self, symbol: object) -> bool:
+        return isinstance(symbol, str) and symbol.strip().upper().encode("utf-8") in self._lookup_index()[1]
+
+    def increments(self, symbol: str) -> Optional[Tuple[int, float]]:
+        """(lot size, tick size) for a ticker, or None when unknown."""
+        rows, index = self._lookup_index()
+        position = index.get(symbol.upper().encode("utf-8"))
+        if position is None:
+            return None
+        row = rows[position]
+        return int(row["lot"]), float(row["tick"])
+
+    def search(self, prefix: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Tickers starting with ``prefix``; without an exchange, every exchange is searched."""
+        rows = self._rows
+        text = prefix.strip().upper()
+        if rows is None or not len(rows) or not text:
+            return []
+        if ":" in text:
+            prefixes = [text]
+        else:
+            exchanges = sorted({segment.split("_", 1)[0] for segment in self.meta.get("segments") or []})
+            prefixes = [f"{exchange}:{text}" for exchange in exchanges]
+        tickers = rows["ticker"]
+        matches: List[Dict[str, Any]] = []
+        for item in prefixes:
+            key = item.encode("utf-8")
+            lo = int(np.searchsorted(tickers, key, side="left"))
+            hi = int(np.searchsorted(tickers, key + b"\xff", side="left"))
+            for position in range(lo, min(hi, lo + limit - len(matches))):
+                matches.append(self._row_dict(rows[position]))
+            if len(matches) >= limit:
+                break
+        return matches
+
+    def normalize(self, symbol: str) -> Optional[str]:
+        """Canonical ticker for a watchlist entry, or None when it is not listed."""
+        text = symbol.strip().upper()
+        if not text:
+            return None
+        if ":" not in text:
+            text = f"{default_exchange()}:{text}"
+        index = self._lookup_index()[1]
+        for candidate in (text, *(text + suffix for suffix in NORMALIZE_SUFFIXES)):
+            if candidate.encode("utf-8") in index:
+                return candidate
+        return None
+
+    def validate_watchlist(self, symbols: Sequence[str]) -> Dict[str, Any]:
+        """Normalize entries, drop unknown ones and duplicates created by normalization.
+
+        A symbol whose segment is not in the table (e.g. futures without
+        ``NSE_FO``) cannot be judged, so it is kept as given and listed as
+        ``unchecked`` instead of being dropped.
+        """
+        loaded = set(self.meta.get("segments") or [])
+        valid: List[str] = []
+        invalid: List[str] = []
+        unchecked: List[str] = []
+        renamed: Dict[str, str] = {}
+        for symbol in symbols:
+            canonical = self.normalize(symbol)
+            if canonical is None:
+                qualified = symbol.strip().upper() if ":" in symbol else f"{default_exchange()}:{symbol.strip().upper()}"
+                if listing_segment(qualified) not in loaded:
+                    unchecked.append(symbol)
+                    valid.append(qualified)
+                else:
+                    invalid.append(symbol)
+                continue
+            if canonical != symbol:
+                renamed[symbol] = canonical
+            valid.append(canonical)
+        return {"symbols": list(dict.fromkeys(valid)), "invalid": invalid, "unchecked": unchecked, "normalized": renamed}
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "available": self.available,
+            "fresh": self.is_fresh(),
+            "root": str(self.root),
+            "count": len(self),
+            "last_error": self.last_error,
+            **{key: self.meta.get(key) for key in ("date", "segments", "downloaded_at")},
+        }
+
+
+_SYMBOL_MASTER: Optional[SymbolMaster] = None
+_SYMBOL_MASTER_LOCK = threading.Lock()
+
+
+def get_symbol_master(refresh: bool = True) -> SymbolMaster:
+    """Return the process-wide symbol master, downloading today's files when due."""
+    global _SYMBOL_MASTER
+    with _SYMBOL_MASTER_LOCK:
+        if _SYMBOL_MASTER is None:
+            _SYMBOL_MASTER = SymbolMaster()
+        master = _SYMBOL_MASTER
+    if refresh and symbol_master_enabled():
+        master.refresh()
+    return master
+
+
+def warm_symbol_master() -> None:
+    """Start today's download in the background when FYERS is configured, so the first screener run finds it ready."""
+    if os.getenv("FYERS_ACCESS_TOKEN") and symbol_master_enabled():
+        get_symbol_master()
+
+
+def instrument_increments(symbol: str) -> Optional[Tuple[int, float]]:
+    """Lot and tick size from an already-loaded master; never downloads."""
+    master = _SYMBOL_MASTER if _SYMBOL_MASTER is not None else get_symbol_master(refresh=False)
+    if not master.available or not symbol_master_enabled():
+        return None
+    return master.increments(symbol)
+
+
+def round_order_preview(preview: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Round a preview's quantity down to whole lots and its stop/target levels to the tick size.
+
+    Returns None when the risk-sized quantity is less than one lot.
+    """
+    increments = instrument_increments(preview["symbol"])
+    if increments is None:
+        return preview
+    lot, tick = increments
+    preview["qty"] = round_to_lot(preview["qty"], lot)
+    if preview["qty"] <= 0:
+        return None
+    for key in ("stop_loss_level", "target_level"):
+        preview[key] = round_to_tick(preview[key], tick)
+    return preview
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Download and query the FYERS symbol master.")
+    parser.add_argument("--download", action="store_true", help="Download today's segment files now")
+    parser.add_argument("--segments", help=f"Comma-separated segments (default FYERS_SYMBOL_MASTER_SEGMENTS or {DEFAULT_SEGMENTS})")
+    parser.add_argument("--search", help="Ticker prefix to search")
+    parser.add_argument("--validate", help="Comma-separated watchlist to validate")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    master = get_symbol_master(refresh=False)
+    if args.download:
+        segments = [s.strip().upper() for s in args.segments.split(",")] if args.segments else None
+        print(json.dumps(master.download(segments), indent=2))
+    if args.search:
+        for row in master.search(args.search, args.limit):
+            print(f"{row['symbol']:<32} lot={row['lot_size']:<6} tick={row['tick_size']:<8} {row['description']}")
+    if args.validate:
+        print(json.dumps(master.validate_watchlist([s for s in args.validate.split(",") if s.strip()]), indent=2))
+    if not (args.download or args.search or args.validate):
+        print(json.dumps(master.status(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
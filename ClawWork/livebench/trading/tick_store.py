@@ -0,0 +1,259 @@
+"""Append-only binary tick/quote store with memory-mapped readers.
+
+Records are fixed-width NumPy structured rows (40 bytes) written to one raw
+segment file per IST trading day, with symbols stored once in a dictionary::
+
+    <root>/symbols.json        ["NSE:SBIN-EQ", ...]  (record symbol_id = list index)
+    <root>/2025-01-20.ticks    TICK_DTYPE records, appended in arrival order
+
+Segments have no header, so appends are plain byte writes and readers map
+them with ``np.memmap`` and slice by time with ``searchsorted`` without
+copying. Symbol filtering is a mask over the mapped slice.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+IST = timezone(timedelta(hours=5, minutes=30))
+IST_OFFSET_SECONDS = 5 * 3600 + 30 * 60
+
+TICK_DTYPE = np.dtype(
+    [
+        ("ts_us", "<i8"),
+        ("symbol_id", "<u4"),
+        ("ltp", "<f8"),
+        ("prev_close", "<f8"),
+        ("change_pct", "<f4"),
+        ("volume", "<f8"),
+    ]
+)
+SEGMENT_SUFFIX = ".ticks"
+
+
+def _nan_if_none(value: Any) -> float:
+    if value is None:
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def segment_day(ts_seconds: float) -> str:
+    return datetime.fromtimestamp(ts_seconds, IST).strftime("%Y-%m-%d")
+
+
+class TickStore:
+    """Day-segmented store of quote snapshots and streamed ticks."""
+
+    def __init__(self, root: Union[str, Path]) -> None:
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._symbols: List[str] = []
+        self._symbol_ids: Dict[str, int] = {}
+        self._load_symbols()
+
+    def _symbols_path(self) -> Path:
+        return self.root / "symbols.json"
+
+    def _load_symbols(self) -> None:
+        path = self._symbols_path()
+        if path.exists():
+            try:
+                self._symbols = list(json.loads(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                self._symbols = []
+        self._symbol_ids = {symbol: index for index, symbol in enumerate(self._symbols)}
+
+    def _save_symbols(self) -> None:
+        path = self._symbols_path()
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._symbols), encoding="utf-8")
+        tmp_path.replace(path)
+
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    def symbol_id(self, symbol: str) -> Optional[int]:
+        return self._symbol_ids.get(symbol)
+
+    def _intern(self, symbols: Iterable[str]) -> np.ndarray:
+        """Symbol ids for ``symbols``, adding unknown ones to the dictionary. Caller holds the lock."""
+        symbols = list(symbols)
+        if any(symbol not in self._symbol_ids for symbol in symbols):
+            # Another writer may have added symbols since we loaded the dictionary.
+            self._load_symbols()
+        ids: List[int] = []
+        added = False
+        for symbol in symbols:
+            symbol_id = self._symbol_ids.get(symbol)
+            if symbol_id is None:
+                symbol_id = len(self._symbols)
+                self._symbols.append(symbol)
+                self._symbol_ids[symbol] = symbol_id
+                added = True
+            ids.append(symbol_id)
+        if added:
+            self._save_symbols()
+        return np.asarray(ids, dtype=np.uint32)
+
+    def append(self, records: Sequence[Dict[str, Any]]) -> int:
+        """Append dicts with ``symbol``, ``ts`` (epoch seconds) and optional
+        ``ltp``/``prev_close``/``change_pct``/``volume``; returns records written."""
+        records = [record for record in records if record.get("symbol")]
+        if not records:
+            return 0
+
+        ts_seconds = np.array([float(record.get("ts") or time.time()) for record in records])
+        array = np.empty(len(records), dtype=TICK_DTYPE)
+        array["ts_us"] = np.round(ts_seconds * 1_000_000).astype(np.int64)
+        array["ltp"] = [_nan_if_none(record.get("ltp")) for record in records]
+        array["prev_close"] = [_nan_if_none(record.get("prev_close")) for record in records]
+        array["change_pct"] = [_nan_if_none(record.get("change_pct")) for record in records]
+        array["volume"] = [_nan_if_none(record.get("volume")) for record in records]
+        day_numbers = (array["ts_us"] // 1_000_000 + IST_OFFSET_SECONDS) // 86400
+
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            array["symbol_id"] = self._intern(record["symbol"] for record in records)
+            for day_number in np.unique(day_numbers):
+                day = segment_day(int(day_number) * 86400 - IST_OFFSET_SECONDS)
+                with (self.root / f"{day}{SEGMENT_SUFFIX}").open("ab") as handle:
+                    handle.write(array[day_numbers == day_number].tobytes())
+        return len(records)
+
+    def append_quote_rows(self, rows: Iterable[Dict[str, Any]], ts: Optional[float] = None) -> int:
+        """Store ``normalize_quote_rows``/screener result rows taken at ``ts``."""
+        stamp = ts if ts is not None else time.time()
+        return self.append(
+            [
+                {
+                    "symbol": row.get("symbol"),
+                    "ts": stamp,
+                    "ltp": row.get("last_price"),
+                    "prev_close": row.get("prev_close"),
+                    "change_pct": row.get("change_pct"),
+                    "volume": row.get("volume"),
+                }
+                for row in rows
+                if isinstance(row, dict)
+            ]
+        )
+
+    def append_ticks(self, ticks: Iterable[Dict[str, Any]]) -> int:
+        """Store ``market_feed`` ticks (``received_at`` is used as the timestamp)."""
+        return self.append([{**tick, "ts": tick.get("received_at")} for tick in ticks])
+
+    def days(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return sorted(path.name[: -len(SEGMENT_SUFFIX)] for path in self.root.glob(f"*{SEGMENT_SUFFIX}"))
+
+    def segment(self, day: str) -> np.ndarray:
+        """Memory-map one day's records (read-only, zero-copy)."""
+        path = self.root / f"{day}{SEGMENT_SUFFIX}"
+        if not path.exists() or path.stat().st_size < TICK_DTYPE.itemsize:
+            return np.empty(0, dtype=TICK_DTYPE)
+        # Ignore a partially written trailing record from a concurrent append.
+        count = path.stat().st_size // TICK_DTYPE.itemsize
+        return np.memmap(path, dtype=TICK_DTYPE, mode="r", shape=(count,))
+
+    def read(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        symbols: Optional[Iterable[str]] = None,
+    ) -> np.ndarray:
+        """Records with ``start <= ts <= end`` (epoch seconds), optionally limited to ``symbols``.
+
+        A single-day, all-symbols read returns a view into the mapped segment.
+        """
+        first_day = segment_day(start) if start is not None else None
+        last_day = segment_day(end) if end is not None else None
+        start_us = int(start * 1_000_000) if start is not None else None
+        end_us = int(end * 1_000_000) if end is not None else None
+
+        wanted_ids = None
+        if symbols is not None:
+            symbols = list(symbols)
+            if any(symbol not in self._symbol_ids for symbol in symbols):
+                self._load_symbols()
+            ids = [self._symbol_ids[symbol] for symbol in symbols if symbol in self._symbol_ids]
+            wanted_ids = np.asarray(ids, dtype=np.uint32)
+
+        parts: List[np.ndarray] = []
+        for day in self.days():
+            if (first_day and day < first_day) or (last_day and day > last_day):
+                continue
+            records = self._time_slice(self.segment(day), start_us, end_us)
+            if wanted_ids is not None:
+                records = records[np.isin(records["symbol_id"], wanted_ids)]
+            if len(records):
+                parts.append(records)
+
+        if not parts:
+            return np.empty(0, dtype=TICK_DTYPE)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    @staticmethod
+    def _time_slice(records: np.ndarray, start_us: Optional[int], end_us: Optional[int]) -> np.ndarray:
+        if start_us is None and end_us is None:
+            return records
+        ts = records["ts_us"]
+        if len(ts) > 1 and np.any(ts[1:] < ts[:-1]):
+            # Out-of-order appends (e.g. several writers): fall back to a mask.
+            mask = np.ones(len(ts), dtype=bool)
+            if start_us is not None:
+                mask &= ts >= start_us
+            if end_us is not None:
+                mask &= ts <= end_us
+            return records[mask]
+        lo = int(np.searchsorted(ts, start_us, side="left")) if start_us is not None else 0
+        hi = int(np.searchsorted(ts, end_us, side="right")) if end_us is not None else len(ts)
+        return records[lo:hi]
+
+    def to_rows(self, records: np.ndarray) -> List[Dict[str, Any]]:
+        """Expand records back into dicts (for JSON output or replay)."""
+        if len(records) and int(records["symbol_id"].max()) >= len(self._symbols):
+            self._load_symbols()
+        rows: List[Dict[str, Any]] = []
+        for ts_us, symbol_id, ltp, prev_close, change_pct, volume in records.tolist():
+            rows.append(
+                {
+                    "symbol": self._symbols[symbol_id] if symbol_id < len(self._symbols) else None,
+                    "ts": ts_us / 1_000_000,
+                    "ltp": None if ltp != ltp else ltp,
+                    "prev_close": None if prev_close != prev_close else prev_close,
+                    "change_pct": None if change_pct != change_pct else round(change_pct, 4),
+                    "volume": None if volume != volume else volume,
+                }
+            )
+        return rows
+
+    def stats(self) -> Dict[str, Any]:
+        days = self.days()
+        sizes = [(self.root / f"{day}{SEGMENT_SUFFIX}").stat().st_size for day in days]
+        return {
+            "root": str(self.root),
+            "segments": len(days),
+            "symbols": len(self._symbols),
+            "records": sum(sizes) // TICK_DTYPE.itemsize,
+            "bytes": sum(sizes),
+            "record_bytes": TICK_DTYPE.itemsize,
+        }
+
+
+def default_tick_store_dir() -> Path:
+    raw = os.getenv("FYERS_TICK_STORE_DIR")
+    if raw:
+        return Path(raw)
+    return Path(__file__).resolve().parents[1] / "data" / "fyers" / "ticks"
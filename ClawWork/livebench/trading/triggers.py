@@ -0,0 +1,483 @@
+"""Price triggers: stop-loss, target and alert levels watched on every tick.
+
+``TriggerEngine`` listens to the shared ``LastPriceTable``. Active triggers
+sit in two sorted books per symbol, kept with ``bisect``:
+
+- ``above``: fires when the price reaches the level from below (targets on
+  longs, stops on shorts, breakout alerts)
+- ``below``: fires when the price falls to the level (stops on longs, ...)
+
+Both books are ordered so the triggers closest to firing are at the end; a
+tick compares against the last entry (O(1) when nothing fires) and otherwise
+finds the crossed suffix with one bisect, so work per tick is O(log n) plus
+the triggers actually fired, regardless of how many are armed.
+
+A stop and target armed together form an OCO pair: when one fires the other
+is cancelled. An entry order's bracket is only armed once the entry fills:
+``watch_entry`` parks it by order id and ``entry_update`` (fed by the paper
+broker and the account book's order updates) arms it for the filled
+quantity, re-arming on further partial fills, and drops it when the entry
+is cancelled or rejected before any fill. Fired triggers are handed to a worker thread that places the
+trigger's exit order through the configured order handler (the gated
+``fyers_place_order`` path) and notifies listeners, so the feed thread never
+waits on an order round-trip. Active triggers and recent events are written
+to ``<fyers data>/triggers.json``; the API broadcasts new events over the
+websocket.
+"""
+
+from __future__ import annotations
+
+import bisect
+import itertools
+import json
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .env import env_flag
+from .market_feed import LastPriceTable, get_last_price_table, get_market_feed
+from .tick_store import IST
+
+Listener = Callable[[Dict[str, Any]], None]
+OrderHandler = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+ABOVE = "above"
+BELOW = "below"
+# Book key per direction: a trigger fires when ``key >= sign * price``.
+_KEY_SIGNS = {ABOVE: -1.0, BELOW: 1.0}
+
+_DEFAULT_TRIGGERS_PATH = Path(__file__).resolve().parents[1] / "data" / "fyers" / "triggers.json"
+MAX_EVENTS = 200
+
+
+def triggers_enabled() -> bool:
+    return env_flag("FYERS_TRIGGERS", True)
+
+
+@dataclass
+class Trigger:
+    id: str
+    symbol: str
+    kind: str
+    direction: str
+    level: float
+    order: Optional[Dict[str, Any]] = None
+    oco: Optional[str] = None
+    note: Optional[str] = None
+    status: str = "active"
+    created_at: float = 0.0
+    fired_at: Optional[float] = None
+    fired_price: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Shallow copy: ``asdict`` deep-copies and dominates arming cost at tens of thousands of triggers.
+        return {**vars(self), "order": dict(self.order) if self.order else None}
+
+
+def exit_order(entry: Dict[str, Any], tag: str) -> Dict[str, Any]:
+    """Market order closing ``entry``'s quantity on the opposite side."""
+    return {
+        "symbol": entry["symbol"],
+        "qty": int(entry.get("qty") or 0),
+        "type": 2,
+        "side": -int(entry.get("side") or 1),
+        "productType": str(entry.get("productType") or "INTRADAY"),
+        "limitPrice": 0,
+        "stopPrice": 0,
+        "validity": "DAY",
+        "disclosedQty": 0,
+        "offlineOrder": False,
+        "orderTag": tag,
+    }
+
+
+class TriggerEngine:
+    """Per-symbol sorted trigger books matched against last-price ticks."""
+
+    def __init__(
+        self,
+        table: Optional[LastPriceTable] = None,
+        order_handler: Optional[OrderHandler] = None,
+        state_path: Optional[Path] = None,
+        persist: bool = True,
+    ) -> None:
+        self.table = table if table is not None else get_last_price_table()
+        self.order_handler = order_handler
+        self.state_path = Path(state_path or os.getenv("FYERS_TRIGGERS_PATH") or _DEFAULT_TRIGGERS_PATH)
+        self.persist = persist
+
+        self._lock = threading.RLock()
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+        self._triggers: Dict[str, Trigger] = {}
+        # symbol -> direction -> [(key, seq, trigger_id)], ascending; entries of
+        # cancelled triggers are skipped when they reach the end.
+        self._books: Dict[str, Dict[str, List[Tuple[float, int, str]]]] = {}
+        self._stale = 0
+        # entry order id -> {"entry", "filled", "triggers"} for brackets waiting on fills
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._events: List[Dict[str, Any]] = []
+        self._listeners: List[Listener] = []
+        self.event_seq = 0
+        self.last_error: Optional[str] = None
+        self.stats: Dict[str, int] = {"ticks": 0, "fired": 0, "cancelled": 0, "orders": 0, "order_failures": 0}
+
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._dirty = False
+        self._worker: Optional[threading.Thread] = None
+        self.table.add_listener(self.on_tick)
+
+    def close(self) -> None:
+        self.table.remove_listener(self.on_tick)
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join(5.0)
+
+    def add_listener(self, listener: Listener) -> None:
+        self._listeners.append(listener)
+
+    # -- arming ---------------------------------------------------------
+
+    def add(
+        self,
+        symbol: str,
+        level: float,
+        direction: str = "auto",
+        kind: str = "alert",
+        order: Optional[Dict[str, Any]] = None,
+        oco: Optional[str] = None,
+        note: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Arm one trigger; ``direction="auto"`` picks the side of the last price the level is on."""
+        try:
+            level = float(level)
+        except (TypeError, ValueError):
+            return {"success": False, "error": "level must be a number"}
+        if not symbol or level <= 0:
+            return {"success": False, "error": "symbol and a positive level are required"}
+        if direction == "auto":
+            ltp = self.table.last_price(symbol)
+            if ltp is None:
+                return {"success": False, "error": f"No last price for {symbol}; pass direction 'above' or 'below'"}
+            direction = ABOVE if level > ltp else BELOW
+        if direction not in _KEY_SIGNS:
+            return {"success": False, "error": "direction must be 'above', 'below' or 'auto'"}
+
+        trigger = Trigger(
+            id=f"TRG{next(self._ids):08d}",
+            symbol=symbol,
+            kind=kind,
+            direction=direction,
+            level=level,
+            order=order,
+            oco=oco,
+            note=note,
+            created_at=time.time(),
+        )
+        with self._lock:
+            self._insert(trigger)
+            self._dirty = True
+        feed = get_market_feed()
+        if feed is not None:
+            feed.subscribe([symbol])
+        self._wake()
+        return {"success": True, "trigger": trigger.to_dict()}
+
+    def _insert(self, trigger: Trigger) -> None:
+        self._triggers[trigger.id] = trigger
+        book = self._books.setdefault(trigger.symbol, {}).setdefault(trigger.direction, [])
+        bisect.insort(book, (_KEY_SIGNS[trigger.direction] * trigger.level, next(self._seq), trigger.id))
+
+    def add_bracket(self, entry: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Arm the stop and target of an order carrying ``stop_loss_level``/``target_level`` as an OCO pair."""
+        symbol = entry.get("symbol")
+        side = int(entry.get("side") or 1)
+        levels = [
+            ("stop_loss", entry.get("stop_loss_level"), BELOW if side > 0 else ABOVE),
+            ("target", entry.get("target_level"), ABOVE if side > 0 else BELOW),
+        ]
+        levels = [(kind, level, direction) for kind, level, direction in levels if level]
+        if not symbol or not levels:
+            return []
+        oco = f"OCO{next(self._ids):08d}" if len(levels) > 1 else None
+        armed = []
+        for kind, level, direction in levels:
+            result = self.add(symbol, level, direction, kind=kind, order=exit_order(entry, f"trigger_{kind}"), oco=oco)
+            if result["success"]:
+                armed.append(result["trigger"])
+        return armed
+
+    def watch_entry(self, order_id: str, entry: Dict[str, Any]) -> None:
+        """Arm ``entry``'s stop/target only once order ``order_id`` fills (see ``entry_update``)."""
+        with self._lock:
+            self._entries.setdefault(order_id, {"entry": entry, "filled": 0, "triggers": []})
+
+    def entry_update(self, order_id: str, filled_qty: int, done: bool) -> List[Dict[str, Any]]:
+        """Track a watched entry's fills; returns the triggers armed by this update.
+
+        The bracket covers the filled quantity only, so a partial fill is
+        protected and later fills re-arm it for the new total. ``done`` (filled,
+        cancelled or rejected) stops watching; an entry that never filled
+        leaves nothing armed.
+        """
+        armed: List[Dict[str, Any]] = []
+        with self._lock:
+            watch = self._entries.get(order_id)
+            if watch is None:
+                return armed
+            if filled_qty > watch["filled"]:
+                if any(trigger_id not in self._triggers for trigger_id in watch["triggers"]):
+                    # A bracket leg already fired; do not re-open protection on a closed position.
+                    del self._entries[order_id]
+                    return armed
+                for trigger_id in watch["triggers"]:
+                    self._retire(self._triggers[trigger_id])
+                armed = self.add_bracket({**watch["entry"], "qty": int(filled_qty)})
+                watch["filled"] = int(filled_qty)
+                watch["triggers"] = [trigger["id"] for trigger in armed]
+            if done:
+                del self._entries[order_id]
+        return armed
+
+    def cancel(self, trigger_id: str) -> Dict[str, Any]:
+        with self._lock:
+            trigger = self._triggers.get(trigger_id)
+            if trigger is None:
+                return {"success": False, "error": f"Unknown or inactive trigger {trigger_id}"}
+            self._retire(trigger)
+            self._dirty = True
+        self._wake()
+        return {"success": True, "trigger": trigger.to_dict()}
+
+    def _retire(self, trigger: Trigger) -> None:
+        """Drop a cancelled trigger; its book entry goes lazily (or in a compaction)."""
+        trigger.status = "cancelled"
+        del self._triggers[trigger.id]
+        self.stats["cancelled"] += 1
+        self._stale += 1
+        if self._stale > max(len(self._triggers), 1024):
+            self._compact()
+
+    def _compact(self) -> None:
+        for books in self._books.values():
+            for direction, book in books.items():
+                books[direction] = [entry for entry in book if entry[2] in self._triggers]
+        self._books = {symbol: books for symbol, books in self._books.items() if any(books.values())}
+        self._stale = 0
+
+    # -- matching -------------------------------------------------------
+
+    def on_tick(self, tick: Dict[str, Any]) -> None:
+        """``LastPriceTable`` listener."""
+        symbol = tick.get("symbol")
+        ltp = tick.get("ltp")
+        if ltp is None or symbol not in self._books:
+            return
+        self.check(symbol, ltp)
+
+    def check(self, symbol: str, price: float) -> List[Dict[str, Any]]:
+        """Fire the triggers ``price`` crosses for ``symbol``; returns their events."""
+        fired: List[Trigger] = []
+        cancelled: List[Trigger] = []
+        with self._lock:
+            self.stats["ticks"] += 1
+            books = self._books.get(symbol)
+            if not books:
+                return []
+            for direction, book in books.items():
+                threshold = _KEY_SIGNS[direction] * price
+                if not book or book[-1][0] < threshold:
+                    continue
+                start = bisect.bisect_left(book, (threshold,))
+                crossed = book[start:]
+                del book[start:]
+                for _, _, trigger_id in crossed:
+                    trigger = self._triggers.pop(trigger_id, None)
+                    if trigger is None:
+                        self._stale -= 1
+                        continue
+                    trigger.status = "fired"
+                    trigger.fired_at = time.time()
+                    trigger.fired_price = price
+                    fired.append(trigger)
+            if not any(books.values()):
+                del self._books[symbol]
+            if not fired:
+                return []
+            fired_oco = {trigger.oco for trigger in fired if trigger.oco}
+            if fired_oco:
+                # OCO siblings share the symbol, so only its remaining book entries are scanned.
+                for book in self._books.get(symbol, {}).values():
+                    for _, _, trigger_id in book:
+                        sibling = self._triggers.get(trigger_id)
+                        if sibling is not None and sibling.oco in fired_oco:
+                            cancelled.append(sibling)
+                for sibling in cancelled:
+                    self._retire(sibling)
+            self.stats["fired"] += len(fired)
+            events = []
+            for trigger in fired:
+                self.event_seq += 1
+                events.append(
+                    {
+                        "seq": self.event_seq,
+                        "fired_at": datetime.fromtimestamp(trigger.fired_at, IST).isoformat(),
+                        "symbol": symbol,
+                        "price": price,
+                        "trigger": trigger.to_dict(),
+                        "oco_cancelled": [sibling.id for sibling in cancelled if sibling.oco == trigger.oco],
+                    }
+                )
+            self._dirty = True
+        for event in events:
+            self._enqueue(event)
+        return events
+
+    # -- dispatch -------------------------------------------------------
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            with self._lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(target=self._dispatch, name="fyers-triggers", daemon=True)
+                    self._worker.start()
+
+    def _enqueue(self, event: Dict[str, Any]) -> None:
+        self._ensure_worker()
+        self._queue.put(event)
+
+    def _wake(self) -> None:
+        """Have the worker persist the new state (coalesced with other changes)."""
+        if self.persist:
+            self._enqueue({})
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until queued events are dispatched; True when the queue drained."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.005)
+        return not self._queue.unfinished_tasks
+
+    def _dispatch(self) -> None:
+        while True:
+            event = self._queue.get()
+            try:
+                if event is None:
+                    return
+                if event:
+                    self._deliver(event)
+                if self._queue.empty() and self.persist and self._dirty:
+                    self._persist()
+            finally:
+                self._queue.task_done()
+
+    def _deliver(self, event: Dict[str, Any]) -> None:
+        order = event["trigger"].get("order")
+        if order and self.order_handler is not None:
+            try:
+                result = self.order_handler(order)
+            except Exception as exc:  # the trigger has fired either way; report the failure
+                result = {"success": False, "error": f"Order handler failed: {exc}"}
+            self.stats["orders" if result.get("success") else "order_failures"] += 1
+            event["order_result"] = {
+                key: result.get(key) for key in ("success", "dry_run", "error", "message", "id") if key in result
+            }
+        with self._lock:
+            self._events = (self._events + [event])[-MAX_EVENTS:]
+            self._dirty = True
+        for listener in list(self._listeners):
+            try:
+                listener(event)
+            except Exception as exc:  # a broken listener must not stop dispatch
+                self.last_error = f"Listener failed: {exc}"
+
+    def _persist(self) -> None:
+        with self._lock:
+            state = {
+                "type": "triggers",
+                "seq": self.event_seq,
+                "updated_at": datetime.now(IST).isoformat(),
+                "active": [trigger.to_dict() for trigger in self._triggers.values()],
+                "events": list(self._events),
+            }
+            self._dirty = False
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+            tmp_path.replace(self.state_path)
+        except OSError as exc:
+            self.last_error = f"Could not write {self.state_path}: {exc}"
+
+    def restore(self) -> int:
+        """Re-arm active triggers (and recent events) from the state file; returns how many were armed."""
+        try:
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return 0
+        restored = 0
+        with self._lock:
+            for item in state.get("active") or []:
+                try:
+                    trigger = Trigger(**item)
+                except TypeError:
+                    continue
+                if trigger.id in self._triggers or trigger.direction not in _KEY_SIGNS:
+                    continue
+                self._insert(trigger)
+                restored += 1
+            self._events = list(state.get("events") or [])[-MAX_EVENTS:]
+            self.event_seq = max(self.event_seq, int(state.get("seq") or 0))
+            # New ids continue after the restored ones.
+            numbers = [int(key[3:]) for key in self._triggers if key[3:].isdigit()]
+            self._ids = itertools.count(max(numbers, default=0) + 1)
+        feed = get_market_feed()
+        if feed is not None and self._books:
+            feed.subscribe(list(self._books))
+        return restored
+
+    # -- reporting ------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._triggers)
+
+    def active(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [trigger.to_dict() for trigger in self._triggers.values() if symbol is None or trigger.symbol == symbol]
+
+    def events_since(self, seq: int = 0) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [event for event in self._events if event["seq"] > seq]
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "active": len(self._triggers),
+                "entries_awaiting_fill": len(self._entries),
+                "symbols": len(self._books),
+                "event_seq": self.event_seq,
+                "last_error": self.last_error,
+                **self.stats,
+            }
+
+
+_TRIGGER_ENGINE: Optional[TriggerEngine] = None
+_TRIGGER_ENGINE_LOCK = threading.Lock()
+
+
+def get_trigger_engine(order_handler: Optional[OrderHandler] = None) -> TriggerEngine:
+    """Return the process-wide trigger engine, re-arming persisted triggers on first use."""
+    global _TRIGGER_ENGINE
+    with _TRIGGER_ENGINE_LOCK:
+        if _TRIGGER_ENGINE is None:
+            _TRIGGER_ENGINE = TriggerEngine()
+            _TRIGGER_ENGINE.restore()
+        engine = _TRIGGER_ENGINE
+    if order_handler is not None and engine.order_handler is None:
+        engine.order_handler = order_handler
+    return engine
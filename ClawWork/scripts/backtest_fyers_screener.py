@@ -0,0 +1,107 @@
+"""
+Backtest the FYERS screener rules over cached candles.
+
+Reads candles from the local Parquet cache (optionally syncing missing ranges
+from FYERS first) and reports PnL, hit rate and drawdown for the current
+FYERS_SCREENER_* config, or for every --config override given. With
+--synthetic a random-walk universe is used instead, which doubles as a
+throughput benchmark.
+
+Usage:
+    python scripts/backtest_fyers_screener.py --symbols NSE:SBIN-EQ,NSE:TCS-EQ --start 2021-01-01 --end 2024-12-31 --sync
+    python scripts/backtest_fyers_screener.py --synthetic 2000x750 --hold-bars 3
+    python scripts/backtest_fyers_screener.py --synthetic 500x500 --config buy_min_pct=0.5 --config buy_min_pct=1.0,target_pct=3
+"""
+
+import argparse
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from livebench.trading.backtest import Backtester, load_panel, panel_from_series
+from livebench.trading.candle_store import CandleStore
+from livebench.trading.screener import load_screener_config, parse_watchlist
+
+
+def synthetic_series(n_symbols, n_bars, seed=11):
+    rng = np.random.default_rng(seed)
+    ts = 1577836800 + 3 * 3600 + np.arange(n_bars, dtype=np.int64) * 86400
+    series = {}
+    for i in range(n_symbols):
+        close = rng.uniform(50, 3000) * np.exp(np.cumsum(rng.normal(0.0003, 0.02, n_bars)))
+        open_ = close * np.exp(rng.normal(0, 0.006, n_bars))
+        spread = np.abs(rng.normal(0, 0.008, n_bars))
+        series[f"NSE:SYN{i:05d}-EQ"] = {
+            "ts": ts,
+            "open": open_,
+            "high": np.maximum(open_, close) * (1 + spread),
+            "low": np.minimum(open_, close) * (1 - spread),
+            "close": close,
+            "volume": rng.integers(1_000, 5_000_000, n_bars).astype(np.float64),
+        }
+    return series
+
+
+def parse_override(base, text):
+    values = {}
+    for item in text.split(","):
+        key, _, value = item.partition("=")
+        values[key.strip()] = float(value)
+    return replace(base, **values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", help="Comma-separated symbols (defaults to FYERS_WATCHLIST)")
+    parser.add_argument("--resolution", default="D")
+    parser.add_argument("--start")
+    parser.add_argument("--end")
+    parser.add_argument("--sync", action="store_true", help="Fetch missing candle ranges from FYERS first")
+    parser.add_argument("--synthetic", help="Use a random universe instead, e.g. 2000x750 (symbols x bars)")
+    parser.add_argument("--hold-bars", type=int, default=1)
+    parser.add_argument("--cost-bps", type=float, default=0.0)
+    parser.add_argument("--config", action="append", default=[], help="Config override, e.g. buy_min_pct=0.5,target_pct=3")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        n_symbols, _, n_bars = args.synthetic.lower().partition("x")
+        panel = panel_from_series(synthetic_series(int(n_symbols), int(n_bars)))
+    else:
+        symbols = parse_watchlist(args.symbols)
+        if args.sync:
+            from livebench.trading.fyers_client import FyersClient
+
+            if not (args.start and args.end):
+                print("❌ --sync needs --start and --end")
+                sys.exit(1)
+            sync = CandleStore().sync_many(FyersClient(), symbols, args.resolution, args.start, args.end)
+            print(f"🔄 Synced {len(symbols)} symbols: {sync['requests']} requests, {sync['rows_added']} new candles")
+        panel = load_panel(symbols, args.resolution, args.start, args.end)
+
+    base = load_screener_config()
+    configs = [parse_override(base, text) for text in args.config] or [base]
+    backtester = Backtester(panel, hold_bars=args.hold_bars, cost_bps=args.cost_bps)
+
+    print("=" * 72)
+    print(f"Screener backtest: {panel.shape[0]:,} symbols x {panel.shape[1]:,} bars, hold {args.hold_bars} bar(s)")
+    print("=" * 72)
+
+    for config in configs:
+        result = backtester.run(config)
+        rate = result["symbol_bars"] / max(result["elapsed_ms"], 1e-9)
+        print(f"\n{result['config']}")
+        print(f"   trades:        {result['trades']:,}  (exits {result['exits']})")
+        print(f"   hit rate:      {result['hit_rate']}")
+        print(f"   total PnL:     {result['total_pnl']:,.2f}")
+        print(f"   avg return %:  {result['avg_return_pct']}")
+        print(f"   max drawdown:  {result['max_drawdown']:,.2f}")
+        print(f"   elapsed:       {result['elapsed_ms']:.2f} ms  ({rate:,.0f} symbol-bars/ms)")
+
+
+if __name__ == "__main__":
+    main()
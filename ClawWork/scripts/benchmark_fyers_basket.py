@@ -0,0 +1,89 @@
+"""
+Benchmark basket order dispatch against the local FYERS replay stub.
+
+Places the same basket three ways with simulated network latency: one
+POST /orders per order in sequence (the single-order tool path), the
+multi-order endpoint (10 orders per request), and concurrent single orders
+(the fallback when the stub answers /multi-order/sync with 404).
+
+Usage:
+    python scripts/benchmark_fyers_basket.py --orders 40 --latency-ms 25
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from livebench.trading.async_fyers_client import AsyncFyersClient, close_shared_async_http_clients
+from livebench.trading.fyers_client import FyersClient
+from livebench.trading.replay import FyersReplayServer, QuoteTimeline, ReplayAccount
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--orders", type=int, default=40)
+    parser.add_argument("--latency-ms", type=float, default=25.0)
+    parser.add_argument("--workers", type=int, default=5, help="Concurrent single orders in the fallback")
+    args = parser.parse_args()
+
+    os.environ["FYERS_QUOTE_ROUTE_CACHE"] = os.path.join(tempfile.mkdtemp(), "quote_routes.json")
+    # Measure dispatch, not the client-side order rate limit
+    os.environ["FYERS_RATE_LIMIT"] = "false"
+
+    symbols = [f"NSE:SYM{i:04d}-EQ" for i in range(args.orders)]
+    now = time.time()
+    timeline = QuoteTimeline([(now, {"symbol": symbol, "ltp": 100.0 + i, "prev_close_price": 100.0}) for i, symbol in enumerate(symbols)])
+    basket = [{"symbol": symbol, "qty": 1, "type": 2, "side": 1, "productType": "INTRADAY"} for symbol in symbols]
+
+    print("=" * 60)
+    print(f"FYERS basket benchmark: {args.orders} orders, {args.latency_ms:.0f} ms simulated latency")
+    print("=" * 60)
+
+    timings = {}
+    for label, multi_order in (("sequential", True), ("multi_order", True), ("concurrent", False)):
+        server = FyersReplayServer(
+            timeline, speed=0, latency_ms=args.latency_ms, account=ReplayAccount(cash=1e9), multi_order=multi_order
+        ).start()
+        client = FyersClient(access_token="replay-token", api_base_url=server.base_url)
+        start = time.perf_counter()
+        if label == "sequential":
+            results = [client.place_order(order) for order in basket]
+            placed, mode = sum(1 for r in results if r.get("success")), "single"
+        else:
+            result = client.place_basket(basket, max_workers=args.workers)
+            placed, mode = result["placed"], result["mode"]
+        timings[label] = time.perf_counter() - start
+        requests_sent = server.stats["requests"]
+        server.stop()
+        print(f"\n📦 {label:<12} {timings[label] * 1000:9.1f} ms  placed {placed}/{args.orders}  "
+              f"mode={mode}  requests={requests_sent}")
+
+    server = FyersReplayServer(timeline, speed=0, latency_ms=args.latency_ms, account=ReplayAccount(cash=1e9)).start()
+
+    async def run_async():
+        try:
+            start = time.perf_counter()
+            result = await AsyncFyersClient(access_token="replay-token", api_base_url=server.base_url).place_basket(basket)
+            return result, time.perf_counter() - start
+        finally:
+            await close_shared_async_http_clients()
+
+    result, elapsed = asyncio.run(run_async())
+    server.stop()
+    print(f"\n⚡ async multi_order {elapsed * 1000:8.1f} ms  placed {result['placed']}/{args.orders}")
+
+    print(f"\n🚀 multi-order speedup: {timings['sequential'] / timings['multi_order']:.1f}x, "
+          f"concurrent fallback: {timings['sequential'] / timings['concurrent']:.1f}x")
+    if not result["success"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark the streaming FYERS feed against a local replay server.
+
+Starts a FeedReplayServer with synthetic ticks, connects a MarketFeed, and
+reports tick throughput plus the cost of reading quotes from the last-price
+table vs a cold REST-style path. It then restarts the server on the same port
+to check that the feed reconnects and resubscribes by itself. No network
+access or FYERS credentials are needed.
+
+Usage:
+    python scripts/benchmark_fyers_feed.py --symbols 500 --updates 200
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from livebench.trading.feed_replay import FeedReplayServer, synthetic_ticks
+from livebench.trading.market_feed import LastPriceTable, MarketFeed
+from livebench.trading.screener import normalize_quote_rows
+
+
+def wait_for(predicate, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--updates", type=int, default=200, help="Ticks per symbol")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    symbols = [f"NSE:SYN{i:05d}-EQ" for i in range(args.symbols)]
+    ticks = synthetic_ticks(symbols, args.updates)
+    expected = len(ticks)
+
+    print("=" * 60)
+    print(f"FYERS feed benchmark: {args.symbols} symbols x {args.updates} updates = {expected:,} ticks")
+    print("=" * 60)
+
+    server = FeedReplayServer(ticks, speed=0).start()
+    table = LastPriceTable()
+    feed = MarketFeed(url=server.url, access_token="", table=table)
+    feed.reconnect_initial = 0.05
+    feed.start()
+    feed.subscribe(symbols)
+
+    started = time.perf_counter()
+    if not wait_for(lambda: feed.status()["ticks"] >= expected, args.timeout):
+        print(f"❌ Only {feed.status()['ticks']:,} of {expected:,} ticks arrived")
+        sys.exit(1)
+    elapsed = time.perf_counter() - started
+    print(f"\n📈 Streamed {expected:,} ticks in {elapsed:.2f}s ({expected / elapsed:,.0f} ticks/s)")
+
+    reads = 200
+    start = time.perf_counter()
+    for _ in range(reads):
+        rows = table.quote_rows(symbols, max_age_ms=60_000)
+    table_ms = (time.perf_counter() - start) / reads * 1000
+    start = time.perf_counter()
+    for _ in range(reads):
+        normalize_quote_rows({"success": True, "data": {"s": "ok", "d": list(rows.values())}})
+    normalize_ms = (time.perf_counter() - start) / reads * 1000
+    print(f"📖 Table read for {len(rows)} symbols: {table_ms:.3f} ms (+{normalize_ms:.3f} ms normalize), no network")
+
+    print("\n🔌 Restarting replay server to test reconnect...")
+    port = server.port
+    server.stop()
+    wait_for(lambda: not feed.connected, 5.0)
+    before = feed.status()["ticks"]
+    server = FeedReplayServer(ticks[: len(symbols)], port=port, speed=0).start()
+    if not wait_for(lambda: feed.status()["ticks"] >= before + len(symbols), args.timeout):
+        print(f"❌ Feed did not resume after reconnect: {feed.status()}")
+        sys.exit(1)
+    status = feed.status()
+    print(f"✅ Reconnected ({status['reconnects']} reconnect attempt(s)) and resubscribed {status['subscribed']} symbols")
+
+    feed.stop()
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
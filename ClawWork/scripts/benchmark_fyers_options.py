@@ -0,0 +1,78 @@
+"""
+Benchmark option-chain IV and Greeks on a synthetic chain.
+
+Builds an ``options-chain-v3`` body priced on a known volatility smile (the
+same one the replay server serves), parses it, and times ``analyze_chain``
+against solving each contract's implied volatility one at a time. Recovered
+IVs must match the smile to within the error left by tick-rounded prices.
+
+Usage:
+    python scripts/benchmark_fyers_options.py --strikes 150
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from livebench.trading.options import analyze_chain, implied_volatility, option_prices, parse_option_chain, summarize_chain
+from livebench.trading.replay import option_chain_body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--strikes", type=int, default=150, help="Strikes on each side of the money")
+    parser.add_argument("--spot", type=float, default=23010.0)
+    parser.add_argument("--base-vol", type=float, default=0.15)
+    parser.add_argument("--smile", type=float, default=0.6)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--tolerance", type=float, default=0.005, help="Largest acceptable IV error (absolute)")
+    args = parser.parse_args()
+
+    now = time.time()
+    _, body = option_chain_body("NSE:NIFTY50-INDEX", args.spot, args.strikes, now, base_vol=args.base_vol, smile=args.smile)
+    chain = parse_option_chain(body, "NSE:NIFTY50-INDEX")
+
+    print("=" * 60)
+    print(f"FYERS option chain benchmark: {len(chain)} contracts, spot {chain.spot:g}")
+    print("=" * 60)
+
+    analytics = analyze_chain(chain, now)
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        analytics = analyze_chain(chain, now)
+    vector_ms = (time.perf_counter() - start) / args.rounds * 1000.0
+    print(f"\n⚡ vectorized IV + Greeks  {vector_ms:8.3f} ms per chain")
+
+    price = option_prices(chain)
+    t = analytics["t_years"][0]
+    start = time.perf_counter()
+    looped = np.array([
+        implied_volatility(price[i], chain.spot, chain.strike[i], t, 0.065, chain.is_call[i]) if price[i] > 0.1 else np.nan
+        for i in range(len(chain))
+    ], dtype=np.float64)
+    loop_ms = (time.perf_counter() - start) * 1000.0
+    print(f"🐢 per-contract IV solve   {loop_ms:8.3f} ms per chain")
+
+    solved = np.isfinite(analytics["iv"])
+    expected = args.base_vol + args.smile * np.log(chain.strike / chain.spot) ** 2
+    error = float(np.max(np.abs(analytics["iv"][solved] - expected[solved]))) if solved.any() else float("inf")
+    summary = summarize_chain(chain, analytics)
+    print(f"\n🔎 IV solved for {int(solved.sum())}/{len(chain)} contracts, max error {error * 100:.3f} vol pts "
+          f"{'✓' if error <= args.tolerance else '✗'}")
+    direct = np.isfinite(looped)
+    agree = bool(np.allclose(looped[direct], analytics["iv"][direct], atol=1e-6))
+    print(f"🔁 per-contract solve matches on {int(direct.sum())} directly solved contracts: {'✓' if agree else '✗'}")
+    print(f"📈 ATM {summary['atm_strike']:g} IV {summary['atm_iv']}%  25d skew {summary['skew_25d']}  "
+          f"PCR {summary['pcr_oi']}  max pain {summary['max_pain']:g}")
+    if error > args.tolerance or not agree:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
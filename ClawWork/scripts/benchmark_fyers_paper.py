@@ -0,0 +1,86 @@
+"""
+Benchmark the paper-trading engine behind dry-run FYERS orders.
+
+Feeds random-walk ticks into a LastPriceTable with a PaperBroker attached,
+places a mix of market, limit and stop orders between ticks, and reports
+order placement and tick matching throughput plus the resulting account.
+
+Usage:
+    python scripts/benchmark_fyers_paper.py --symbols 500 --orders 50000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from livebench.trading.market_feed import LastPriceTable, normalize_tick
+from livebench.trading.paper_trading import PaperBroker
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--orders", type=int, default=50000)
+    parser.add_argument("--ticks-per-order", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    symbols = [f"NSE:SYM{i:04d}-EQ" for i in range(args.symbols)]
+    prices = {symbol: round(rng.uniform(50, 3000), 2) for symbol in symbols}
+
+    table = LastPriceTable()
+    broker = PaperBroker(table=table, cash=1e12)
+    now = time.time()
+    for symbol in symbols:
+        table.update(normalize_tick({"symbol": symbol, "ltp": prices[symbol], "prev_close_price": prices[symbol]}, now))
+
+    def random_order():
+        symbol = rng.choice(symbols)
+        price = prices[symbol]
+        kind = rng.random()
+        side = rng.choice((1, -1))
+        payload = {"symbol": symbol, "qty": rng.randint(1, 50), "side": side, "productType": "INTRADAY"}
+        if kind < 0.4:
+            payload["type"] = 2
+        elif kind < 0.85:
+            payload.update(type=1, limitPrice=round(price * (1 - side * rng.uniform(0, 0.01)), 2))
+        else:
+            payload.update(type=3, stopPrice=round(price * (1 + side * rng.uniform(0, 0.01)), 2))
+        return payload
+
+    orders = [random_order() for _ in range(args.orders)]
+    place_seconds = tick_seconds = 0.0
+    ticks = 0
+    for payload in orders:
+        start = time.perf_counter()
+        broker.place(payload)
+        place_seconds += time.perf_counter() - start
+
+        for _ in range(args.ticks_per_order):
+            symbol = rng.choice(symbols)
+            prices[symbol] = round(prices[symbol] * (1 + rng.gauss(0, 0.002)), 2)
+            tick = normalize_tick({"symbol": symbol, "ltp": prices[symbol]}, now)
+            start = time.perf_counter()
+            table.update(tick)
+            tick_seconds += time.perf_counter() - start
+            ticks += 1
+
+    account = broker.snapshot()
+    print("=" * 60)
+    print(f"Paper broker benchmark: {args.orders:,} orders, {ticks:,} ticks, {args.symbols} symbols")
+    print("=" * 60)
+    print(f"\n📝 Order placement:   {args.orders / place_seconds:12,.0f} orders/s  ({place_seconds / args.orders * 1e6:.1f} µs/order)")
+    print(f"📈 Tick + matching:   {ticks / tick_seconds:12,.0f} ticks/s   ({tick_seconds / ticks * 1e6:.1f} µs/tick)")
+    print(f"\n📦 Orders: {account['orders']}  fills: {account['fills']:,}")
+    print(f"💰 Realized PnL: {account['realized_pnl']:,.2f}  unrealized: {account['unrealized_pnl']:,.2f}  "
+          f"open positions: {sum(1 for p in account['positions'] if p['netQty'])}")
+
+
+if __name__ == "__main__":
+    main()
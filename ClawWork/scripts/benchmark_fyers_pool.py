@@ -0,0 +1,93 @@
+"""
+Benchmark pooled keep-alive FYERS sessions against cold requests.
+
+Starts the local FYERS replay stub (livebench.trading.replay), then sends N sequential quote calls
+twice: once with a fresh connection per call (module-level requests.request,
+the old FyersClient behaviour) and once through FyersClient's shared pool.
+
+Usage:
+    python scripts/benchmark_fyers_pool.py --calls 100
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import requests
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from livebench.trading.fyers_client import FyersClient, close_shared_sessions
+from livebench.trading.replay import FyersReplayServer, QuoteTimeline
+
+
+QUOTE_TICKS = [(time.time(), {"symbol": "NSE:SBIN-EQ", "ltp": 812.5, "prev_close_price": 805.0, "chp": 0.93, "vol_traded_today": 1200})]
+
+
+def _summarize(label, samples):
+    ms = [s * 1000.0 for s in samples]
+    ordered = sorted(ms)
+    p95 = ordered[int(len(ordered) * 0.95) - 1] if len(ordered) > 1 else ordered[0]
+    print(
+        f"   {label:<8} mean={statistics.mean(ms):7.3f} ms  "
+        f"p50={statistics.median(ms):7.3f} ms  p95={p95:7.3f} ms  total={sum(ms):8.1f} ms"
+    )
+    return statistics.mean(ms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=100, help="Sequential quote calls per mode")
+    args = parser.parse_args()
+
+    # Keep the learned stub route out of the real quote route cache
+    os.environ["FYERS_QUOTE_ROUTE_CACHE"] = os.path.join(tempfile.mkdtemp(), "quote_routes.json")
+    # Measure connection reuse, not the client-side rate limiter
+    os.environ["FYERS_RATE_LIMIT"] = "false"
+
+    server = FyersReplayServer(QuoteTimeline(QUOTE_TICKS), speed=0).start()
+    base_url = server.base_url
+
+    print("=" * 60)
+    print(f"FYERS connection pool benchmark ({args.calls} sequential quotes)")
+    print("=" * 60)
+
+    cold = []
+    for _ in range(args.calls):
+        start = time.perf_counter()
+        response = requests.request(
+            "POST",
+            f"{base_url}/quotes",
+            json={"symbols": "NSE:SBIN-EQ"},
+            headers={"Connection": "close"},
+            timeout=5,
+        )
+        response.json()
+        cold.append(time.perf_counter() - start)
+
+    client = FyersClient(access_token="bench-token", api_base_url=base_url, timeout_seconds=5)
+    pooled = []
+    for _ in range(args.calls):
+        start = time.perf_counter()
+        result = client.quotes("NSE:SBIN-EQ")
+        pooled.append(time.perf_counter() - start)
+        if not result.get("success"):
+            print(f"❌ Pooled request failed: {result.get('error')}")
+            sys.exit(1)
+
+    cold_mean = _summarize("cold", cold)
+    pooled_mean = _summarize("pooled", pooled)
+    print(f"\n✓ Per-call latency reduced by {(1 - pooled_mean / cold_mean) * 100:.1f}% ({cold_mean / pooled_mean:.2f}x)")
+    print("   Note: the stub is plain HTTP, so TLS handshake savings against FYERS are not included.")
+
+    close_shared_sessions()
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark mark-to-market portfolio valuation on a synthetic account book.
+
+Loads synthetic holdings and net positions into an ``AccountBook``, prices a
+third of the symbols from the stream, a third from the quote cache and leaves
+the rest on the REST price from the book, then compares ``PortfolioValuer``
+with marking every row in Python (``AccountBook.positions`` plus a holdings
+loop with the same price fallbacks). Both must agree on unrealized PnL.
+
+Usage:
+    python scripts/benchmark_fyers_portfolio.py --holdings 2000 --positions 500
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from livebench.trading.market_feed import LastPriceTable, normalize_tick
+from livebench.trading.order_book import AccountBook
+from livebench.trading.portfolio import PortfolioValuer
+from livebench.trading.quote_cache import QuoteCache
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--holdings", type=int, default=2000)
+    parser.add_argument("--positions", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(5)
+    n = args.holdings + args.positions
+    symbols = [f"NSE:SYM{i:05d}-EQ" for i in range(n)]
+    cost = np.round(rng.uniform(50.0, 3000.0, n), 2)
+    last = np.round(cost * rng.uniform(0.8, 1.25, n), 2)
+    qty = rng.integers(1, 500, n) * np.where(rng.random(n) < 0.2, -1, 1)
+    qty[: args.holdings] = np.abs(qty[: args.holdings])
+
+    table = LastPriceTable()
+    cache = QuoteCache(ttl_ms=60000.0)
+    book = AccountBook(table=table)
+    book.load_holdings({"success": True, "data": {"holdings": [
+        {"symbol": symbols[i], "quantity": int(qty[i]), "costPrice": float(cost[i]), "ltp": float(cost[i])}
+        for i in range(args.holdings)
+    ]}})
+    book.load_positions({"success": True, "data": {"netPositions": [
+        {"symbol": symbols[i], "netQty": int(qty[i]), "netAvg": float(cost[i]), "ltp": float(cost[i]), "productType": "INTRADAY"}
+        for i in range(args.holdings, n)
+    ]}})
+    # Stream prices a third, the quote cache another third; the rest stay on the book's REST price (cost).
+    streamed, cached = np.arange(0, n, 3), np.arange(1, n, 3)
+    for i in streamed:
+        table.update(normalize_tick({"symbol": symbols[i], "ltp": float(last[i])}))
+    cache.put_rows([{"n": symbols[i], "s": "ok", "v": {"lp": float(last[i])}} for i in cached])
+    expected_price = cost.copy()
+    expected_price[streamed] = last[streamed]
+    expected_price[cached] = last[cached]
+    expected = float(((expected_price - cost) * qty).sum())
+
+    valuer = PortfolioValuer(book=book, cache=cache, table=table, ttl_ms=0.0)
+
+    print("=" * 60)
+    print(f"FYERS portfolio valuation benchmark: {args.holdings} holdings, {args.positions} positions")
+    print("=" * 60)
+
+    def row_loop():
+        cached_rows = cache.peek(symbols, valuer.quote_max_age_ms)
+        pnl = 0.0
+        for row in book.holdings():
+            ltp = table.last_price(row["symbol"], 5000.0)
+            if ltp is None and row["symbol"] in cached_rows:
+                ltp = cached_rows[row["symbol"]]["v"]["lp"]
+            ltp = ltp if ltp is not None else (row["rest_ltp"] or row["cost_price"])
+            pnl += (ltp - row["cost_price"]) * row["quantity"]
+        for row in book.positions():
+            ltp = row["ltp"] if row["price_source"] == "stream" else None
+            if ltp is None and row["symbol"] in cached_rows:
+                ltp = cached_rows[row["symbol"]]["v"]["lp"]
+            ltp = ltp if ltp is not None else (row["rest_ltp"] or row["avg_price"])
+            pnl += (ltp - row["avg_price"]) * row["net_qty"]
+        return pnl
+
+    def timed(fn):
+        fn()
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            result = fn()
+        return (time.perf_counter() - start) / args.rounds * 1000.0, result
+
+    vector_ms, valuation = timed(lambda: valuer.valuation(max_age_ms=0.0))
+    loop_ms, loop_pnl = timed(row_loop)
+    cached_ms, _ = timed(lambda: valuer.valuation(max_age_ms=60000.0))
+    print(f"\n⚡ vectorized valuation   {vector_ms:8.3f} ms")
+    print(f"🐢 per-row marking        {loop_ms:8.3f} ms")
+    print(f"💾 reused valuation       {cached_ms * 1000.0:8.3f} µs")
+
+    same = abs(valuation["unrealized_pnl"] - round(expected, 2)) < 0.05 and abs(loop_pnl - expected) < 0.05
+    print(f"\n🔎 unrealized PnL {valuation['unrealized_pnl']:,.2f} matches per-row marking: {'✓' if same else '✗'}")
+    print(f"   price sources: {valuation['price_sources']}")
+    if not same:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
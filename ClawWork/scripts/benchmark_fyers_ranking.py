@@ -0,0 +1,80 @@
+"""
+Benchmark cross-sectional universe ranking on synthetic quotes.
+
+Ranks a synthetic universe on momentum, volume surge and volatility-adjusted
+return with precomputed daily baselines (as after the first refresh of the
+day), and compares top-k selection by np.argpartition with a full argsort.
+
+Usage:
+    python scripts/benchmark_fyers_ranking.py --symbols 2000 --top-k 20
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from livebench.trading.columnar_screener import QuoteColumns
+from livebench.trading.ranking import RankingConfig, UniverseRanker, composite_scores, factor_values, top_k_indices
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=2000)
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--sectors", type=int, default=15)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    n = args.symbols
+    symbols = [f"NSE:SYM{i:05d}-EQ" for i in range(n)]
+    ones = np.ones(n, dtype=bool)
+    columns = QuoteColumns(
+        symbols,
+        rng.uniform(20.0, 3000.0, n),
+        rng.uniform(20.0, 3000.0, n),
+        rng.normal(0.0, 2.0, n),
+        rng.lognormal(12.0, 1.0, n),
+        ones, ones, ones, ones,
+    )
+    avg_volume = rng.lognormal(12.0, 1.0, n)
+    daily_volatility = rng.uniform(0.5, 4.0, n)
+    sector_map = {symbol: f"SECTOR{i % args.sectors:02d}" for i, symbol in enumerate(symbols)}
+    ranker = UniverseRanker(store=object(), config=RankingConfig(top_k=args.top_k))
+
+    print("=" * 60)
+    print(f"FYERS universe ranking benchmark: {n} symbols, top {args.top_k}, {args.sectors} sectors")
+    print("=" * 60)
+
+    def timed(fn):
+        fn()
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            result = fn()
+        return (time.perf_counter() - start) / args.rounds * 1000.0, result
+
+    rank_ms, ranking = timed(lambda: ranker.rank(columns, sector_map=sector_map, avg_volume=avg_volume, daily_volatility=daily_volatility))
+    print(f"\n🏁 full ranking           {rank_ms:8.3f} ms per refresh")
+
+    score, _ = composite_scores(factor_values(columns.change_pct, columns.volume, avg_volume, daily_volatility), ranker.config.weights)
+    partition_ms, top = timed(lambda: top_k_indices(score, args.top_k))
+    sort_ms, full = timed(lambda: np.argsort(-score, kind="stable")[: args.top_k])
+    print(f"✂️  top-k argpartition     {partition_ms:8.3f} ms")
+    print(f"📶 top-k full argsort     {sort_ms:8.3f} ms")
+
+    same = np.array_equal(score[top], score[full])
+    print(f"\n🔎 top-k matches full sort: {'✓' if same else '✗'}")
+    print(f"🥇 leader: {ranking['top'][0]['symbol']} score {ranking['top'][0]['score']} "
+          f"({ranking['top'][0]['sector']}); best sector {ranking['sectors'][0]['sector']}")
+    if not same:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
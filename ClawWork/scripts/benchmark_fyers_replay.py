@@ -0,0 +1,165 @@
+"""
+Benchmark the screener and order flow against the local FYERS replay stub.
+
+Serves recorded (or synthetic) quote snapshots through
+livebench.trading.replay, then for every snapshot runs run_screener with a
+real FyersClient and places each BUY candidate's order preview as a market
+order. Nothing touches the network, so it can run in CI: the replay is run
+twice and the script fails if the signals differ between runs or if any
+request fails without error injection.
+
+Usage:
+    python scripts/benchmark_fyers_replay.py --symbols 200 --snapshots 100
+    python scripts/benchmark_fyers_replay.py --latency-ms 20 --jitter-ms 10 --error-rate 0.02
+    python scripts/benchmark_fyers_replay.py --tick-store livebench/data/fyers/ticks
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Every snapshot must reach the stub: no quote caching, client-side throttling or streaming feed.
+os.environ["FYERS_QUOTE_TTL_MS"] = "0"
+os.environ["FYERS_RATE_LIMIT"] = "false"
+os.environ.pop("FYERS_FEED_URL", None)
+os.environ["FYERS_QUOTE_ROUTE_CACHE"] = os.path.join(tempfile.mkdtemp(), "quote_routes.json")
+# Replayed symbols need not be listed in today's symbol master (and no download is attempted).
+os.environ["FYERS_SYMBOL_MASTER"] = "false"
+
+from livebench.trading.feed_replay import synthetic_ticks
+from livebench.trading.fyers_client import FyersClient, close_shared_sessions
+from livebench.trading.replay import FyersReplayServer, QuoteTimeline
+from livebench.trading.screener import run_screener
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * pct), len(ordered) - 1)] if ordered else 0.0
+
+
+def _summarize(label, samples_ms):
+    if not samples_ms:
+        print(f"   {label:<16} (none)")
+        return
+    print(
+        f"   {label:<16} n={len(samples_ms):<6} mean={statistics.mean(samples_ms):8.3f} ms  "
+        f"p50={statistics.median(samples_ms):8.3f} ms  p95={_percentile(samples_ms, 0.95):8.3f} ms"
+    )
+
+
+def replay_once(timeline, symbols, snapshots, args):
+    server = FyersReplayServer(
+        timeline,
+        speed=0,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    ).start()
+    client = FyersClient(access_token="replay-token", api_base_url=server.base_url, timeout_seconds=10)
+
+    screener_ms, order_ms, signals = [], [], []
+    failed_runs = failed_orders = 0
+    started = time.perf_counter()
+    for _ in range(snapshots):
+        t0 = time.perf_counter()
+        result = run_screener(client, symbols)
+        screener_ms.append((time.perf_counter() - t0) * 1000)
+        if not result.get("success"):
+            failed_runs += 1
+            server.clock.step()
+            continue
+
+        buys = [row for row in result["results"] if row["signal"] == "BUY_CANDIDATE"]
+        signals.append(tuple(sorted(row["symbol"] for row in buys)))
+        if args.orders:
+            for row in buys:
+                t0 = time.perf_counter()
+                placed = client.place_order(row["order_preview"])
+                order_ms.append((time.perf_counter() - t0) * 1000)
+                failed_orders += 0 if placed.get("success") else 1
+        server.clock.step()
+    elapsed = time.perf_counter() - started
+
+    positions = client.positions()
+    orders = client.orders()
+    close_shared_sessions()
+    server.stop()
+    return {
+        "elapsed": elapsed,
+        "screener_ms": screener_ms,
+        "order_ms": order_ms,
+        "signals": signals,
+        "failed_runs": failed_runs,
+        "failed_orders": failed_orders,
+        "stats": server.stats,
+        "open_positions": len((positions.get("data") or {}).get("netPositions", [])),
+        "order_book": len((orders.get("data") or {}).get("orderBook", [])),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--tick-store", help="Replay a TickStore directory instead of synthetic quotes")
+    source.add_argument("--ticks", help="Replay tick JSONL or a screener audit JSONL")
+    parser.add_argument("--symbols", type=int, default=200, help="Synthetic universe size")
+    parser.add_argument("--snapshots", type=int, default=100, help="Screener runs (one per recorded snapshot)")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--no-orders", dest="orders", action="store_false", help="Skip placing BUY candidate orders")
+    args = parser.parse_args()
+
+    if args.tick_store:
+        timeline = QuoteTimeline.from_tick_store(args.tick_store)
+    elif args.ticks:
+        timeline = QuoteTimeline.from_jsonl(args.ticks)
+    else:
+        names = [f"NSE:SYM{i:04d}-EQ" for i in range(args.symbols)]
+        timeline = QuoteTimeline(synthetic_ticks(names, args.snapshots, interval_seconds=1.0, seed=args.seed))
+    symbols = timeline.symbols
+    snapshots = min(args.snapshots, len(timeline.times))
+    if not snapshots:
+        print("❌ No quotes to replay")
+        sys.exit(1)
+
+    print("=" * 60)
+    print(f"FYERS replay benchmark: {snapshots} snapshots x {len(symbols)} symbols")
+    print(f"   latency={args.latency_ms} ms  jitter={args.jitter_ms} ms  error_rate={args.error_rate}")
+    print("=" * 60)
+
+    first = replay_once(timeline, symbols, snapshots, args)
+    second = replay_once(timeline, symbols, snapshots, args)
+
+    runs = snapshots - first["failed_runs"]
+    print(f"\n⏱️  {first['elapsed']:.2f} s total, {runs / first['elapsed']:.1f} screener runs/s, "
+          f"{runs * len(symbols) / first['elapsed']:,.0f} quotes/s")
+    _summarize("screener run", first["screener_ms"])
+    _summarize("order placement", first["order_ms"])
+    print(f"\n📦 Orders placed: {first['order_book']}  open positions: {first['open_positions']}")
+    print(f"📡 Stub requests: {first['stats']['requests']}  injected errors: {first['stats']['errors_injected']}")
+    print(f"   Failed screener runs: {first['failed_runs']}  failed orders: {first['failed_orders']}")
+
+    ok = True
+    if args.error_rate == 0 and (first["failed_runs"] or first["failed_orders"]):
+        print("❌ Requests failed without error injection")
+        ok = False
+    if args.error_rate == 0 and first["signals"] != second["signals"]:
+        print("❌ Signals differ between two replays of the same data")
+        ok = False
+    elif args.error_rate == 0:
+        print("✓ Two replays produced identical signals")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
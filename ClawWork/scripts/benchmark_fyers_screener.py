@@ -0,0 +1,122 @@
+"""
+Benchmark the columnar screener against the row-by-row path.
+
+Builds a synthetic FYERS quotes response (mixed payload shapes, missing and
+string-typed fields), checks that both paths produce identical results and
+reports timings for each universe size. The row-by-row baseline uses the
+generic alias lookup; normalization is also timed with and without the
+schema-resolved fast path.
+
+Usage:
+    python scripts/benchmark_fyers_screener.py --sizes 10000 50000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from livebench.trading.columnar_screener import (
+    SIGNAL_BUY,
+    decode_quote_columns,
+    evaluate_columns,
+    materialize_results,
+)
+from livebench.trading.screener import ScreenerConfig, evaluate_symbols, normalize_quote_rows
+
+
+def build_quote_response(size, seed=7):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(size):
+        prev_close = round(rng.uniform(20, 4000), 2)
+        last_price = round(prev_close * (1 + rng.gauss(0, 0.02)), 2)
+        details = {
+            "lp": last_price,
+            "prev_close_price": prev_close,
+            "chp": round((last_price - prev_close) / prev_close * 100, 2),
+            "volume": rng.randint(1_000, 5_000_000),
+        }
+        roll = rng.random()
+        if roll < 0.05:
+            details.pop("chp")
+        elif roll < 0.07:
+            details["lp"] = None
+        elif roll < 0.08:
+            details["lp"] = f"{last_price:,.2f}"
+        elif roll < 0.09:
+            details = {"ltp": str(last_price), "pc": prev_close}
+        rows.append({"n": f"NSE:SYM{i:05d}-EQ", "s": "ok", "v": details})
+    return {"success": True, "data": {"s": "ok", "d": rows}}
+
+
+def _best_of(fn, repeats):
+    best = None
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    config = ScreenerConfig()
+
+    print("=" * 72)
+    print("FYERS screener benchmark: row-by-row vs columnar")
+    print("=" * 72)
+
+    for size in args.sizes:
+        response = build_quote_response(size)
+
+        rows_time, expected = _best_of(
+            lambda: evaluate_symbols(normalize_quote_rows(response, resolve_schema=False), config), args.repeats
+        )
+        generic_time, generic_rows = _best_of(lambda: normalize_quote_rows(response, resolve_schema=False), args.repeats)
+        schema_time, schema_rows = _best_of(lambda: normalize_quote_rows(response), args.repeats)
+        if schema_rows != generic_rows:
+            print("❌ Schema-resolved normalization differs from the generic path")
+            sys.exit(1)
+
+        def columnar_all():
+            columns = decode_quote_columns(response)
+            return materialize_results(columns, evaluate_columns(columns, config), config)
+
+        def columnar_buy_only():
+            columns = decode_quote_columns(response)
+            evaluation = evaluate_columns(columns, config)
+            return materialize_results(columns, evaluation, config, evaluation.indices(SIGNAL_BUY))
+
+        decode_time, columns = _best_of(lambda: decode_quote_columns(response), args.repeats)
+        eval_time, _ = _best_of(lambda: evaluate_columns(columns, config), args.repeats)
+        all_time, actual = _best_of(columnar_all, args.repeats)
+        buy_time, buy_rows = _best_of(columnar_buy_only, args.repeats)
+
+        if actual != expected:
+            mismatch = next(i for i, (a, b) in enumerate(zip(actual, expected)) if a != b)
+            print(f"❌ Output mismatch at row {mismatch}:\n   row-by-row: {expected[mismatch]}\n   columnar:   {actual[mismatch]}")
+            sys.exit(1)
+
+        print(f"\n{size:,} symbols ({len(buy_rows):,} buy candidates) — outputs identical ✓")
+        print(f"   row-by-row (normalize + evaluate):    {rows_time * 1000:8.2f} ms")
+        print(f"   columnar, all rows materialized:      {all_time * 1000:8.2f} ms  ({rows_time / all_time:.2f}x)")
+        print(f"   columnar, buy candidates only:        {buy_time * 1000:8.2f} ms  ({rows_time / buy_time:.2f}x)")
+        print(f"   normalize_quote_rows, generic:        {generic_time * 1000:8.2f} ms")
+        print(f"   normalize_quote_rows, schema-resolved:{schema_time * 1000:8.2f} ms  ({generic_time / schema_time:.2f}x)")
+        print(f"   columnar decode into arrays:          {decode_time * 1000:8.2f} ms")
+        print(f"   columnar classification + sizing:     {eval_time * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
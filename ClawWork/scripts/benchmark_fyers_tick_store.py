@@ -0,0 +1,106 @@
+"""
+Compare the binary tick store with JSONL screener logs.
+
+Writes the same synthetic screener runs both as full JSON lines (the old
+fyers_screener.jsonl format) and into a TickStore, then reports disk size
+and the time to load everything, a one-hour slice, and a single symbol.
+
+Usage:
+    python scripts/benchmark_fyers_tick_store.py --symbols 200 --runs 500
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from livebench.trading.tick_store import TickStore
+
+
+def build_runs(n_symbols, n_runs, seed=3):
+    rng = random.Random(seed)
+    symbols = [f"NSE:SYM{i:04d}-EQ" for i in range(n_symbols)]
+    prev_close = {symbol: round(rng.uniform(50, 3000), 2) for symbol in symbols}
+    start = 1737344700.0  # 2025-01-20 09:15 IST
+    runs = []
+    for run in range(n_runs):
+        stamp = start + run * 30
+        rows = []
+        for symbol in symbols:
+            last_price = round(prev_close[symbol] * (1 + rng.gauss(0, 0.01)), 2)
+            change_pct = round((last_price - prev_close[symbol]) / prev_close[symbol] * 100, 2)
+            rows.append(
+                {
+                    "symbol": symbol,
+                    "last_price": last_price,
+                    "prev_close": prev_close[symbol],
+                    "change_pct": change_pct,
+                    "volume": rng.randint(1_000, 5_000_000),
+                    "signal": "WATCH",
+                    "reason": f"Below momentum threshold ({change_pct:.2f}% < 0.30%)",
+                    "order_preview": None,
+                }
+            )
+        runs.append((stamp, rows))
+    return symbols, runs
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=500)
+    args = parser.parse_args()
+
+    symbols, runs = build_runs(args.symbols, args.runs)
+    total = args.symbols * args.runs
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl_path = Path(tmp) / "fyers_screener.jsonl"
+        with jsonl_path.open("w", encoding="utf-8") as handle:
+            for stamp, rows in runs:
+                handle.write(json.dumps({"timestamp": stamp, "results": rows}) + "\n")
+
+        store = TickStore(Path(tmp) / "ticks")
+        write_ms, _ = timed(lambda: [store.append_quote_rows(rows, ts=stamp) for stamp, rows in runs])
+
+        def load_jsonl():
+            with jsonl_path.open(encoding="utf-8") as handle:
+                return [json.loads(line) for line in handle]
+
+        jsonl_ms, _ = timed(load_jsonl)
+        all_ms, records = timed(lambda: store.read())
+        sum_ms, _ = timed(lambda: float(records["ltp"].sum()))
+        hour_start = runs[0][0] + 3600
+        slice_ms, hour = timed(lambda: store.read(hour_start, hour_start + 3600))
+        symbol_ms, one = timed(lambda: store.read(symbols=[symbols[0]]))
+
+        jsonl_bytes = jsonl_path.stat().st_size
+        store_bytes = store.stats()["bytes"]
+
+        print("=" * 60)
+        print(f"Tick store vs JSONL: {args.runs} runs x {args.symbols} symbols = {total:,} quotes")
+        print("=" * 60)
+        print(f"\n💾 JSONL:      {jsonl_bytes / 1e6:8.2f} MB")
+        print(f"💾 Tick store: {store_bytes / 1e6:8.2f} MB  ({store_bytes / jsonl_bytes:.1%} of JSONL)")
+        print(f"\n✍️  Tick store append (all runs):     {write_ms:8.2f} ms")
+        print(f"📖 JSONL full parse:                 {jsonl_ms:8.2f} ms")
+        print(f"📖 Tick store map all records:       {all_ms:8.2f} ms  ({len(records):,} records)")
+        print(f"📖 Tick store sum of ltp (full scan):{sum_ms:8.2f} ms  ({store_bytes / 1e6 / max(sum_ms / 1000, 1e-9):,.0f} MB/s)")
+        print(f"📖 Tick store one-hour slice:        {slice_ms:8.2f} ms  ({len(hour):,} records)")
+        print(f"📖 Tick store single symbol:         {symbol_ms:8.2f} ms  ({len(one):,} records)")
+
+
+if __name__ == "__main__":
+    main()
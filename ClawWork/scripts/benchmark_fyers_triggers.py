@@ -0,0 +1,96 @@
+"""
+Benchmark the price-trigger engine against a linear scan.
+
+Arms stop/target/alert triggers spread over a synthetic universe, replays a
+random-walk tick stream through ``TriggerEngine.check``, and compares the
+sorted per-symbol books with checking every trigger of the ticked symbol.
+Both must fire the same triggers.
+
+Usage:
+    python scripts/benchmark_fyers_triggers.py --triggers 50000 --symbols 100 --ticks 200000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from livebench.trading.market_feed import LastPriceTable
+from livebench.trading.triggers import ABOVE, BELOW, TriggerEngine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--triggers", type=int, default=50000)
+    parser.add_argument("--symbols", type=int, default=100)
+    parser.add_argument("--ticks", type=int, default=200000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(11)
+    symbols = [f"NSE:SYM{i:04d}-EQ" for i in range(args.symbols)]
+    start_price = rng.uniform(50.0, 2000.0, args.symbols)
+    owner = rng.integers(0, args.symbols, args.triggers)
+    # Levels within +/-5% of the starting price, on the side their direction watches
+    offset = rng.uniform(0.002, 0.05, args.triggers)
+    above = rng.random(args.triggers) < 0.5
+    levels = np.round(start_price[owner] * np.where(above, 1 + offset, 1 - offset), 2)
+
+    tick_symbols = rng.integers(0, args.symbols, args.ticks)
+    steps = rng.normal(0.0, 0.002, args.ticks)
+
+    print("=" * 60)
+    print(f"FYERS trigger benchmark: {args.triggers} triggers, {args.symbols} symbols, {args.ticks} ticks")
+    print("=" * 60)
+
+    engine = TriggerEngine(table=LastPriceTable(), state_path=Path(tempfile.mkdtemp()) / "triggers.json", persist=False)
+    start = time.perf_counter()
+    for i in range(args.triggers):
+        engine.add(symbols[owner[i]], float(levels[i]), ABOVE if above[i] else BELOW)
+    arm_s = time.perf_counter() - start
+    print(f"\n🎯 armed {len(engine)} triggers in {arm_s * 1000:.1f} ms ({arm_s / args.triggers * 1e6:.2f} µs each)")
+
+    # Linear baseline: every armed trigger of the ticked symbol is compared on each tick.
+    linear = {symbol: [] for symbol in symbols}
+    for i in range(args.triggers):
+        linear[symbols[owner[i]]].append((float(levels[i]), bool(above[i])))
+
+    prices = start_price.copy()
+    tick_prices = np.empty(args.ticks)
+    for n in range(args.ticks):
+        j = tick_symbols[n]
+        prices[j] *= 1.0 + steps[n]
+        tick_prices[n] = round(prices[j], 2)
+
+    start = time.perf_counter()
+    for n in range(args.ticks):
+        engine.check(symbols[tick_symbols[n]], float(tick_prices[n]))
+    book_s = time.perf_counter() - start
+    engine.flush()
+
+    start = time.perf_counter()
+    linear_fired = 0
+    for n in range(args.ticks):
+        price = tick_prices[n]
+        armed = linear[symbols[tick_symbols[n]]]
+        keep = [(level, up) for level, up in armed if not (price >= level if up else price <= level)]
+        linear_fired += len(armed) - len(keep)
+        linear[symbols[tick_symbols[n]]] = keep
+    linear_s = time.perf_counter() - start
+
+    fired = engine.stats["fired"]
+    print(f"⚡ sorted books  {book_s / args.ticks * 1e6:8.2f} µs per tick   fired {fired}")
+    print(f"🐢 linear scan   {linear_s / args.ticks * 1e6:8.2f} µs per tick  fired {linear_fired}")
+    print(f"\n🔎 same triggers fired: {'✓' if fired == linear_fired else '✗'}  ({len(engine)} still armed)")
+    engine.close()
+    if fired != linear_fired:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
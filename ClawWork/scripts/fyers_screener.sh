@@ -28,6 +28,7 @@ from datetime import datetime
 from pathlib import Path
 
 from livebench.trading.fyers_client import FyersClient
+from livebench.trading.rate_limiter import get_rate_limiter
 from livebench.trading.screener import run_screener
 
 client = FyersClient()
@@ -54,6 +55,15 @@ print(f"   Buy candidates: {summary.get('buy_candidates', 0)}")
 print(f"   Watch: {summary.get('watch', 0)}")
 print(f"   Avoid: {summary.get('avoid', 0)}")
 
+route = client.quote_route_info()
+print(f"   Quote endpoint: {route.get('endpoint')} (discovery probes so far: {route.get('discovery_probes', 0)})")
+
+data_limits = get_rate_limiter().stats()["categories"]["data"]
+print(
+    f"   Rate limiter (data): {data_limits['requests']} request(s), "
+    f"{data_limits['waited']} waited, max wait {data_limits['wait_seconds_max']:.3f}s"
+)
+
 print("\nTop signals:")
 for row in result.get("results", [])[:10]:
     symbol = row.get("symbol")
@@ -0,0 +1,121 @@
+"""
+Sweep FYERS screener thresholds over cached candles across all cores.
+
+Writes the candle panel once as memory-mapped .npy files, backtests every
+--grid / --random config in a process pool (livebench.trading.sweep) and
+prints the best ones; --output writes the winner as FYERS_SCREENER_* env lines.
+
+Usage:
+    python scripts/sweep_fyers_screener.py --symbols NSE:SBIN-EQ,NSE:TCS-EQ --start 2021-01-01 --end 2024-12-31 \\
+        --grid buy_min_pct=0.2:1.0:0.2 --grid target_pct=1.5,2,3 --metric total_pnl --output best_screener.env
+    python scripts/sweep_fyers_screener.py --panel-dir /tmp/panel --random 200 --range buy_min_pct=0.1:1.5 --seed 7
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from livebench.trading.backtest import load_panel
+from livebench.trading.screener import ScreenerConfig, load_screener_config, parse_watchlist
+from livebench.trading.sweep import config_env_lines, grid_configs, random_configs, run_sweep, save_panel
+
+
+def parse_grid_spec(spec):
+    """``name=start:stop:step`` (inclusive) or ``name=v1,v2,...``."""
+    name, _, values = spec.partition("=")
+    if ":" in values:
+        start, stop, step = (float(part) for part in values.split(":"))
+        count = int(round((stop - start) / step)) + 1
+        return name.strip(), [round(start + i * step, 6) for i in range(count)]
+    return name.strip(), [float(value) for value in values.split(",")]
+
+
+def parse_range_spec(spec):
+    """``name=low:high``."""
+    name, _, values = spec.partition("=")
+    low, high = (float(part) for part in values.split(":"))
+    return name.strip(), (low, high)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", help="Comma-separated symbols (defaults to FYERS_WATCHLIST)")
+    parser.add_argument("--resolution", default="D")
+    parser.add_argument("--start")
+    parser.add_argument("--end")
+    parser.add_argument("--panel-dir", help="Panel directory; reused if it exists, otherwise written there")
+    parser.add_argument("--grid", action="append", default=[], help="name=start:stop:step or name=v1,v2")
+    parser.add_argument("--random", type=int, default=0, help="Number of random configs (uses --range)")
+    parser.add_argument("--range", action="append", default=[], help="name=low:high for --random")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--metric", default="total_pnl")
+    parser.add_argument("--min-trades", type=int, default=20)
+    parser.add_argument("--hold-bars", type=int, default=1)
+    parser.add_argument("--cost-bps", type=float, default=0.0)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--output", help="Write the best config as FYERS_SCREENER_* env lines")
+    args = parser.parse_args()
+
+    base = load_screener_config()
+    configs = []
+    if args.grid:
+        configs.extend(grid_configs(base, dict(parse_grid_spec(spec) for spec in args.grid)))
+    if args.random:
+        configs.extend(random_configs(base, dict(parse_range_spec(spec) for spec in args.range), args.random, args.seed))
+    if not configs:
+        parser.error("give at least one --grid or --random with --range")
+
+    temp_dir = None
+    panel_dir = args.panel_dir
+    if not (panel_dir and (Path(panel_dir) / "symbols.json").exists()):
+        if not panel_dir:
+            temp_dir = tempfile.TemporaryDirectory(prefix="fyers_panel_")
+            panel_dir = temp_dir.name
+        panel = load_panel(parse_watchlist(args.symbols), args.resolution, args.start, args.end)
+        save_panel(panel, panel_dir)
+        print(f"Panel: {panel.shape[0]} symbols x {panel.shape[1]} bars -> {panel_dir}")
+
+    try:
+        summary = run_sweep(
+            panel_dir,
+            configs,
+            metric=args.metric,
+            hold_bars=args.hold_bars,
+            cost_bps=args.cost_bps,
+            workers=args.workers,
+            min_trades=args.min_trades,
+        )
+    finally:
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+    print(
+        f"Evaluated {summary['configs']} configs on {summary['workers']} workers "
+        f"in {summary['elapsed_seconds']}s, ranked by {summary['metric']}"
+    )
+    for rank, item in enumerate(summary["ranked"][: args.top], start=1):
+        print(
+            f"{rank:>3}. {summary['metric']}={item[summary['metric']]}  "
+            f"trades={item['trades']} hit_rate={item['hit_rate']} pnl={item['total_pnl']} "
+            f"max_dd={item['max_drawdown']}  {item['config']}"
+        )
+
+    best = summary["best"]
+    if best is None:
+        print("No configuration met --min-trades")
+        return
+    lines = config_env_lines(ScreenerConfig(**best["config"]))
+    if args.output:
+        Path(args.output).write_text("\n".join(lines) + "\n", encoding="utf-8")
+        print(f"Best config written to {args.output}")
+    else:
+        print("\n".join(lines))
+
+
+if __name__ == "__main__":
+    main()